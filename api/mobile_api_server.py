@@ -9,8 +9,10 @@ import asyncio
 import json
 import logging
 import os
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from dataclasses import asdict
+from typing import AsyncIterator, Dict, List, Optional, Any
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -19,7 +21,7 @@ from pydantic import BaseModel
 
 # Import authentication and rate limiting
 from api.auth_middleware import require_auth, require_role, require_permission
-from api.rate_limiter import rate_limit
+from api.rate_limiter import rate_limit, rate_limiter
 from api.input_validation import (
     OTACheckRequest, CreateSessionRequest, SuggestChangeRequest,
     SubmitRunRequest, LeaderboardRequest, CreateRecordRequest,
@@ -69,6 +71,7 @@ telemetry_data: Dict[str, float] = {}
 active_websockets: List[WebSocket] = []
 config_monitor = None
 ai_advisor = None
+rag_advisor = None  # Streams answers token by token
 backup_manager = None
 hardware_manager = None
 camera_manager = None
@@ -175,7 +178,7 @@ except ImportError:
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup."""
-    global config_monitor, ai_advisor, backup_manager, hardware_manager, camera_manager
+    global config_monitor, ai_advisor, rag_advisor, backup_manager, hardware_manager, camera_manager
     
     try:
         # Initialize configuration monitor
@@ -193,6 +196,13 @@ async def startup_event():
     except Exception as e:
         LOGGER.warning("Failed to initialize AI advisor: %s", e)
     
+    try:
+        # Initialize RAG advisor (streaming answers)
+        from services.ai_advisor_rag import RAGAIAdvisor
+        rag_advisor = RAGAIAdvisor(telemetry_provider=lambda: dict(telemetry_data) or None)
+    except Exception as e:
+        LOGGER.warning("Failed to initialize RAG advisor: %s", e)
+    
     try:
         # Initialize backup manager
         from services.backup_manager import BackupManager
@@ -218,6 +228,9 @@ async def startup_event():
     # Start telemetry broadcast task
     asyncio.create_task(broadcast_telemetry())
     
+    # Drop refilled rate limit buckets
+    asyncio.create_task(rate_limiter.run_cleanup())
+    
     # Initialize remote access service
     if REMOTE_ACCESS_AVAILABLE:
         try:
@@ -445,7 +458,8 @@ async def get_best_config(config_type: str = "ecu_tuning", metric: str = "power"
 # ============================================================================
 
 @app.post("/api/ai/ask")
-async def ask_ai_advisor(request: AIQuestionRequest):
+@rate_limit("/api/ai/ask")
+async def ask_ai_advisor(request: AIQuestionRequest, http_request: Request):
     """Ask AI advisor Q a question."""
     if not ai_advisor:
         raise HTTPException(status_code=503, detail="AI advisor not available")
@@ -461,8 +475,120 @@ async def ask_ai_advisor(request: AIQuestionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _advisor_events(
+    question: str,
+    context: Optional[Dict[str, Any]],
+    cancel: threading.Event
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run RAGAIAdvisor.answer_stream in a worker thread, yielding its events as JSON-ready dicts.
+    
+    Closing the iterator (client gone) sets ``cancel``, which stops generation.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+    
+    def produce():
+        try:
+            for event in rag_advisor.answer_stream(question, context=context, cancel=cancel):
+                if event["type"] == "done":
+                    event = {"type": "done", "response": asdict(event["response"])}
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+        except Exception as e:
+            LOGGER.error("Error streaming AI advisor answer: %s", e)
+            loop.call_soon_threadsafe(queue.put_nowait, {"type": "error", "detail": str(e)})
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, finished)
+    
+    loop.run_in_executor(None, produce)
+    try:
+        while True:
+            event = await queue.get()
+            if event is finished:
+                break
+            yield event
+    finally:
+        cancel.set()
+
+
+@app.post("/api/ai/ask/stream")
+@rate_limit("/api/ai/ask/stream")
+async def ask_ai_advisor_stream(request: AIQuestionRequest, http_request: Request):
+    """
+    Ask the RAG AI advisor a question, streaming the answer as Server-Sent Events.
+    
+    Events: ``sources`` (before generation), ``token`` (answer fragments),
+    ``done`` (final response) or ``error``. Generation stops when the
+    client disconnects.
+    """
+    if not rag_advisor:
+        raise HTTPException(status_code=503, detail="AI advisor not available")
+    
+    async def event_stream():
+        async for event in _advisor_events(request.question, request.context, threading.Event()):
+            yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.websocket("/ws/ai")
+async def websocket_ai_advisor(websocket: WebSocket):
+    """
+    WebSocket endpoint for streamed AI advisor answers.
+    
+    Send {"question": ..., "context": {...}} to ask; sources/token/done
+    events follow. Send {"type": "cancel"} to stop the current answer.
+    A new question cancels the previous answer. Each question counts
+    against the /api/ai rate limits; a rejected one gets an error event
+    with ``retry_after``.
+    """
+    await websocket.accept()
+    cancel = threading.Event()
+    task: Optional[asyncio.Task] = None
+    
+    async def stream(question: str, context: Optional[Dict[str, Any]], cancel: threading.Event):
+        async for event in _advisor_events(question, context, cancel):
+            await websocket.send_text(json.dumps(event, default=str))
+    
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except json.JSONDecodeError:
+                continue
+            if message.get("type") == "ping":
+                await websocket.send_json({"type": "pong", "timestamp": time.time()})
+                continue
+            cancel.set()
+            if task:
+                await asyncio.gather(task, return_exceptions=True)
+            if message.get("type") == "cancel":
+                continue
+            if not rag_advisor:
+                await websocket.send_json({"type": "error", "detail": "AI advisor not available"})
+                continue
+            allowed, rate_info = rate_limiter.check_rate_limit(websocket, "/api/ai/ws")
+            if not allowed:
+                await websocket.send_json({
+                    "type": "error",
+                    "detail": "Rate limit exceeded",
+                    "retry_after": rate_info["retry_after"],
+                })
+                continue
+            cancel = threading.Event()
+            task = asyncio.create_task(stream(str(message.get("question", "")), message.get("context"), cancel))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        cancel.set()
+        if task:
+            task.cancel()
+
+
 @app.get("/api/ai/suggestions")
-async def get_ai_suggestions(partial: str = ""):
+@rate_limit("/api/ai/suggestions")
+async def get_ai_suggestions(http_request: Request, partial: str = ""):
     """Get AI advisor question suggestions."""
     if not ai_advisor:
         raise HTTPException(status_code=503, detail="AI advisor not available")
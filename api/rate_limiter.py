@@ -5,68 +5,131 @@ Prevents API abuse with configurable rate limits.
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import inspect
 import logging
+import math
+import threading
 import time
-from collections import defaultdict
-from dataclasses import dataclass, field
-from typing import Dict, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, Request, status
+from starlette.requests import HTTPConnection
 
 LOGGER = logging.getLogger(__name__)
 
+DEFAULT_MAX_ENTRIES = 50_000  # Bucket states kept (about 200 bytes each)
+SWEEP_PER_CHECK = 4  # Idle buckets dropped from the LRU end on each check
+_EPSILON = 1e-9  # Absorbs float rounding so a client at exactly the limit rate is admitted
+
 
 @dataclass
 class RateLimit:
     """Rate limit configuration."""
     requests: int  # Number of requests
     window: int  # Time window in seconds
-    burst: Optional[int] = None  # Burst allowance
+    burst: Optional[int] = None  # Requests allowed back to back (bucket size, at least 1; None: requests)
 
+    @property
+    def interval(self) -> float:
+        """Seconds per token (the sustained rate is requests per window)."""
+        return self.window / self.requests
+
+    @property
+    def capacity(self) -> int:
+        return self.requests if self.burst is None else self.burst
 
-@dataclass
-class RateLimitEntry:
-    """Rate limit entry for tracking."""
-    count: int = 0
-    reset_time: float = field(default_factory=time.time)
-    burst_used: int = 0
+
+def _validate_limit(limit: RateLimit) -> None:
+    if limit.requests <= 0 or limit.window <= 0:
+        raise ValueError(f"Rate limit needs positive requests and window, got {limit.requests}/{limit.window}s")
+    if limit.burst is not None and limit.burst <= 0:
+        raise ValueError(f"Rate limit burst must be positive (None: requests), got {limit.burst}")
 
 
 class RateLimiter:
     """
     Rate limiter for API endpoints.
     
-    Supports:
-    - Per-IP rate limiting
-    - Per-user rate limiting
-    - Token bucket algorithm
-    - Burst allowance
+    Token buckets, stored as GCRA theoretical arrival times (one float per
+    bucket): each bucket refills at ``requests / window`` and holds
+    ``burst`` tokens (``requests`` if unset), so over any interval ``t`` a
+    bucket admits at most ``burst + t * requests / window`` requests.
+    
+    A request passes three tiers and must fit all of them; a rejected
+    request consumes nothing:
+    - Per client, for the longest matching endpoint prefix (default limit otherwise)
+    - Per endpoint prefix, all clients together (``add_endpoint_limit``)
+    - Global, all requests (``set_global_limit``)
+    
+    Bucket states live in an LRU table of at most ``max_entries``. Buckets
+    that have refilled carry no state and are swept from the LRU end on
+    every check and by ``cleanup_old_entries``. Checks never await, so they
+    are atomic on the event loop; a short lock covers thread-pool callers.
     """
     
-    def __init__(self):
-        """Initialize rate limiter."""
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, clock: Callable[[], float] = time.time):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            max_entries: Bucket states kept before the least recently used are evicted
+            clock: Time source in seconds (reset times are reported on this clock)
+        """
         self.limits: Dict[str, RateLimit] = {}
-        self.entries: Dict[str, RateLimitEntry] = {}
+        self.endpoint_limits: Dict[str, RateLimit] = {}
+        self.global_limit: Optional[RateLimit] = None
         self.default_limit = RateLimit(requests=100, window=60)  # 100 requests per minute
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries: "OrderedDict[str, float]" = OrderedDict()  # Bucket key -> theoretical arrival time
+        self.stats: Dict[str, int] = {"allowed": 0, "rejected": 0, "evicted_active": 0}
+        self._prefixes: List[str] = []  # Longest first
+        self._lock = threading.Lock()
     
     def add_limit(self, endpoint: str, limit: RateLimit) -> None:
         """
-        Add rate limit for endpoint.
+        Add per-client rate limit for endpoint.
         
         Args:
-            endpoint: Endpoint path or pattern
+            endpoint: Endpoint path or prefix
             limit: Rate limit configuration
         """
+        _validate_limit(limit)
         self.limits[endpoint] = limit
+        self._update_prefixes()
         LOGGER.info("Rate limit added for %s: %d requests per %d seconds", 
                    endpoint, limit.requests, limit.window)
     
-    def get_client_id(self, request: Request) -> str:
+    def add_endpoint_limit(self, endpoint: str, limit: RateLimit) -> None:
+        """
+        Add rate limit shared by all clients of an endpoint prefix.
+        
+        Args:
+            endpoint: Endpoint path or prefix
+            limit: Rate limit configuration
+        """
+        _validate_limit(limit)
+        self.endpoint_limits[endpoint] = limit
+        self._update_prefixes()
+        LOGGER.info("Shared rate limit added for %s: %d requests per %d seconds",
+                   endpoint, limit.requests, limit.window)
+    
+    def set_global_limit(self, limit: Optional[RateLimit]) -> None:
+        """Set (or remove with None) the rate limit shared by all requests."""
+        if limit is not None:
+            _validate_limit(limit)
+        self.global_limit = limit
+    
+    def get_client_id(self, request: HTTPConnection) -> str:
         """
         Get client identifier for rate limiting.
         
         Args:
-            request: FastAPI request
+            request: FastAPI request or WebSocket
         
         Returns:
             Client ID (IP or user ID)
@@ -82,88 +145,119 @@ class RateLimiter:
         client_ip = request.client.host if request.client else "unknown"
         return f"ip:{client_ip}"
     
+    def match_endpoint(self, endpoint: str) -> Optional[str]:
+        """Longest configured prefix of the endpoint (matching whole path segments)."""
+        for prefix in self._prefixes:
+            if endpoint == prefix or endpoint.startswith(prefix.rstrip("/") + "/"):
+                return prefix
+        return None
+    
     def check_rate_limit(
         self,
-        request: Request,
+        request: HTTPConnection,
         endpoint: str,
-    ) -> tuple[bool, Optional[Dict[str, Any]]]:
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
         """
         Check if request is within rate limit.
         
         Args:
-            request: FastAPI request
+            request: FastAPI request or WebSocket (checked once per message)
             endpoint: Endpoint path
         
         Returns:
             Tuple of (allowed, rate_limit_info)
         """
-        client_id = self.get_client_id(request)
-        key = f"{endpoint}:{client_id}"
-        
-        # Get limit for endpoint or use default
-        limit = self.limits.get(endpoint, self.default_limit)
-        
-        # Get or create entry
-        entry = self.entries.get(key)
-        current_time = time.time()
-        
-        if not entry:
-            entry = RateLimitEntry(reset_time=current_time + limit.window)
-            self.entries[key] = entry
-        
-        # Check if window expired
-        if current_time >= entry.reset_time:
-            entry.count = 0
-            entry.burst_used = 0
-            entry.reset_time = current_time + limit.window
-        
-        # Check burst allowance
-        if limit.burst and entry.burst_used < limit.burst:
-            entry.burst_used += 1
-            return True, {
-                "limit": limit.requests,
-                "remaining": limit.requests - entry.count,
-                "reset_time": entry.reset_time,
-                "burst_remaining": limit.burst - entry.burst_used if limit.burst else None,
-            }
+        return self.check(self.get_client_id(request), endpoint)
+    
+    def check(self, client_id: str, endpoint: str) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Check a request by client ID and consume a token from each tier if allowed.
         
-        # Check regular limit
-        if entry.count >= limit.requests:
-            retry_after = int(entry.reset_time - current_time)
-            return False, {
-                "limit": limit.requests,
-                "remaining": 0,
-                "reset_time": entry.reset_time,
-                "retry_after": retry_after,
-            }
+        Returns:
+            Tuple of (allowed, rate_limit_info) where the info describes the
+            most restrictive tier: limit, remaining, reset_time and, when
+            rejected, retry_after (seconds)
+        """
+        prefix = self.match_endpoint(endpoint)
+        tiers = [(f"client:{prefix or '*'}:{client_id}", self.limits.get(prefix, self.default_limit))]
+        if prefix in self.endpoint_limits:
+            tiers.append((f"endpoint:{prefix}", self.endpoint_limits[prefix]))
+        if self.global_limit is not None:
+            tiers.append(("global", self.global_limit))
         
-        # Increment count
-        entry.count += 1
+        with self._lock:
+            now = self.clock()
+            updates = []
+            wait = 0.0
+            binding = None  # (remaining, limit, reset_time) of the most restrictive tier
+            for key, limit in tiers:
+                interval = limit.interval
+                tat = max(self.entries.get(key, now), now)
+                # Time until a token is free: the bucket is full at tat, empty at now + capacity * interval
+                excess = tat - now - (limit.capacity - 1) * interval
+                if excess > _EPSILON:
+                    wait = max(wait, excess)
+                    remaining = 0
+                else:
+                    tat += interval
+                    updates.append((key, tat))
+                    remaining = max(0, int((now + limit.capacity * interval - tat) / interval + _EPSILON))
+                if binding is None or remaining < binding[0]:
+                    binding = (remaining, limit, tat)
+            
+            allowed = wait == 0.0
+            if allowed:
+                for key, tat in updates:
+                    self.entries[key] = tat
+                    self.entries.move_to_end(key)
+                self._sweep(now, SWEEP_PER_CHECK)
+                while len(self.entries) > self.max_entries:
+                    _, tat = self.entries.popitem(last=False)
+                    if tat > now:
+                        self.stats["evicted_active"] += 1
+            self.stats["allowed" if allowed else "rejected"] += 1
         
-        return True, {
-            "limit": limit.requests,
-            "remaining": limit.requests - entry.count,
-            "reset_time": entry.reset_time,
-        }
+        remaining, limit, reset_time = binding
+        info: Dict[str, Any] = {"limit": limit.requests, "remaining": remaining, "reset_time": reset_time}
+        if not allowed:
+            info["retry_after"] = max(1, math.ceil(wait))
+        return allowed, info
     
-    def cleanup_old_entries(self, max_age: int = 3600) -> None:
+    def cleanup_old_entries(self) -> int:
         """
-        Clean up old rate limit entries.
+        Drop buckets that have refilled (they are equivalent to no entry).
         
-        Args:
-            max_age: Maximum age in seconds
+        Returns:
+            Number of entries removed
         """
-        current_time = time.time()
-        keys_to_remove = [
-            key for key, entry in self.entries.items()
-            if current_time - entry.reset_time > max_age
-        ]
+        with self._lock:
+            now = self.clock()
+            expired = [key for key, tat in self.entries.items() if tat <= now]
+            for key in expired:
+                del self.entries[key]
         
-        for key in keys_to_remove:
+        if expired:
+            LOGGER.debug("Cleaned up %d old rate limit entries", len(expired))
+        return len(expired)
+    
+    async def run_cleanup(self, interval: float = 60.0) -> None:
+        """Call cleanup_old_entries every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            self.cleanup_old_entries()
+    
+    def _sweep(self, now: float, count: int) -> None:
+        # Least recently used first; stop at the first bucket still refilling
+        for _ in range(count):
+            if not self.entries:
+                return
+            key, tat = next(iter(self.entries.items()))
+            if tat > now:
+                return
             del self.entries[key]
-        
-        if keys_to_remove:
-            LOGGER.debug("Cleaned up %d old rate limit entries", len(keys_to_remove))
+    
+    def _update_prefixes(self) -> None:
+        self._prefixes = sorted(set(self.limits) | set(self.endpoint_limits), key=len, reverse=True)
 
 
 # Global rate limiter instance
@@ -177,6 +271,7 @@ rate_limiter.add_limit("/api/social", RateLimit(requests=200, window=60))
 rate_limiter.add_limit("/api/fleet", RateLimit(requests=100, window=60))
 rate_limiter.add_limit("/api/blockchain", RateLimit(requests=50, window=60))
 rate_limiter.add_limit("/api/ai", RateLimit(requests=50, window=60, burst=10))  # Burst for AI
+rate_limiter.add_endpoint_limit("/api/ai", RateLimit(requests=120, window=60, burst=20))  # Shared local LLM
 
 
 def rate_limit(endpoint: str):
@@ -190,9 +285,10 @@ def rate_limit(endpoint: str):
             ...
     """
     def decorator(func):
+        @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             request = None
-            for arg in args:
+            for arg in (*args, *kwargs.values()):
                 if isinstance(arg, Request):
                     request = arg
                     break
@@ -233,6 +329,10 @@ def rate_limit(endpoint: str):
             
             return await func(*args, **kwargs)
         
+        # FastAPI reads the parameters through wraps; resolve them here, where
+        # the route's module globals are known (string annotations otherwise
+        # resolve against this module)
+        wrapper.__signature__ = inspect.signature(func, eval_str=True)
         return wrapper
     return decorator
 
@@ -7,7 +7,7 @@ REST API for mobile app and fleet management platform integration.
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel
@@ -49,14 +49,17 @@ class AlertResponse(BaseModel):
 
 
 class GeofenceRequest(BaseModel):
-    """Geofence request model."""
+    """Geofence request model (a polygon when vertices are given, otherwise a circle)."""
     name: str
-    center_lat: float
-    center_lon: float
-    radius_meters: float
+    center_lat: float = 0.0
+    center_lon: float = 0.0
+    radius_meters: float = 0.0
     enabled: bool = True
     alert_on_exit: bool = True
     alert_on_enter: bool = False
+    vertices: Optional[List[Tuple[float, float]]] = None
+    hysteresis_meters: float = 10.0
+    dwell_seconds: Optional[float] = None
 
 
 class GeofenceResponse(BaseModel):
@@ -68,6 +71,9 @@ class GeofenceResponse(BaseModel):
     enabled: bool
     alert_on_exit: bool
     alert_on_enter: bool
+    vertices: Optional[List[Tuple[float, float]]] = None
+    hysteresis_meters: float = 10.0
+    dwell_seconds: Optional[float] = None
 
 
 # Global tracking services (in production, use dependency injection)
@@ -164,15 +170,26 @@ async def add_geofence(vehicle_id: str, geofence: GeofenceRequest):
     if not service:
         raise HTTPException(status_code=404, detail="Vehicle not found")
     
-    gf = Geofence(
-        name=geofence.name,
-        center_lat=geofence.center_lat,
-        center_lon=geofence.center_lon,
-        radius_meters=geofence.radius_meters,
+    options = dict(
         enabled=geofence.enabled,
         alert_on_exit=geofence.alert_on_exit,
         alert_on_enter=geofence.alert_on_enter,
+        hysteresis_meters=geofence.hysteresis_meters,
+        dwell_seconds=geofence.dwell_seconds,
     )
+    if geofence.vertices:
+        try:
+            gf = Geofence.polygon(geofence.name, geofence.vertices, **options)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    else:
+        gf = Geofence(
+            name=geofence.name,
+            center_lat=geofence.center_lat,
+            center_lon=geofence.center_lon,
+            radius_meters=geofence.radius_meters,
+            **options,
+        )
     
     service.add_geofence(gf)
     
@@ -184,6 +201,9 @@ async def add_geofence(vehicle_id: str, geofence: GeofenceRequest):
         enabled=gf.enabled,
         alert_on_exit=gf.alert_on_exit,
         alert_on_enter=gf.alert_on_enter,
+        vertices=gf.vertices,
+        hysteresis_meters=gf.hysteresis_meters,
+        dwell_seconds=gf.dwell_seconds,
     )
 
 
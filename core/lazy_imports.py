@@ -0,0 +1,114 @@
+"""
+Lazy Package Exports
+
+PEP 562 helpers that let a package ``__init__`` advertise its public names
+without importing the submodules that define them. A submodule is imported
+the first time one of its names is accessed (``from services import
+DataLogger`` or ``services.DataLogger``), and the resolved value is cached in
+the package namespace so later lookups never reach ``__getattr__`` again.
+
+Usage in a package ``__init__``::
+
+    from core.lazy_imports import lazy_exports
+
+    _EXPORTS = {
+        ".data_logger": ("DataLogger",),
+        ".can_decoder": ("CANDecoder", "DecodedMessage"),
+    }
+    _OPTIONAL = {".can_decoder"}
+
+    __getattr__, __dir__, __all__ = lazy_exports(__name__, globals(), _EXPORTS, optional=_OPTIONAL)
+
+Names from modules listed in ``optional`` resolve to ``None`` when the module
+(or one of its dependencies) cannot be imported, matching the previous
+``try: from .x import Y / except ImportError: Y = None`` blocks. When a name
+is exported by several modules, later entries take precedence and earlier
+ones are used as fallbacks, which mirrors the old "later import wins" order.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+
+def lazy_exports(
+    package: str,
+    namespace: MutableMapping[str, Any],
+    exports: Mapping[str, Sequence[str]],
+    optional: Iterable[str] = (),
+    flags: Optional[Mapping[str, str]] = None,
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """
+    Build ``__getattr__``, ``__dir__`` and ``__all__`` for a package.
+
+    Args:
+        package: The package's ``__name__``
+        namespace: The package's ``globals()``; resolved names are cached here
+        exports: Relative module name -> names it exports, in import order
+        optional: Modules whose ImportError makes their names resolve to None
+        flags: Extra boolean names -> module; True when the module imports
+
+    Returns:
+        (__getattr__, __dir__, __all__) for the package
+    """
+    optional = frozenset(optional)
+    flags = dict(flags or {})
+
+    # name -> candidate modules, most preferred first
+    sources: Dict[str, List[str]] = {}
+    for module, names in exports.items():
+        for name in names:
+            sources.setdefault(name, []).insert(0, module)
+
+    failed: Dict[str, BaseException] = {}
+
+    def _import(module: str) -> Optional[Any]:
+        if module in failed:
+            return None
+        try:
+            # Builtin __import__ (not importlib) so -X importtime still sees the load
+            return __import__(package + module, fromlist=("__name__",))
+        except ImportError as e:
+            if module not in optional:
+                raise
+            failed[module] = e
+            LOGGER.debug("Optional module %s%s unavailable: %s", package, module, e)
+            return None
+
+    def __getattr__(name: str) -> Any:
+        if name in flags:
+            value = _import(flags[name]) is not None
+        elif name in sources:
+            value = None
+            for module in sources[name]:
+                mod = _import(module)
+                if mod is not None:
+                    value = getattr(mod, name)
+                    break
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(sources) | set(flags))
+
+    return __getattr__, __dir__, list(sources)
+
+
+def import_all(package: str) -> Dict[str, Any]:
+    """
+    Resolve every lazy export of an already-imported package.
+
+    Useful for tests and for warming a package in a background thread once the
+    UI is up.
+    """
+    module = importlib.import_module(package)
+    return {name: getattr(module, name) for name in getattr(module, "__all__", ())}
+
+
+__all__ = ["import_all", "lazy_exports"]
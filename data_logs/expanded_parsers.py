@@ -13,14 +13,13 @@ Additional parsers for:
 
 from __future__ import annotations
 
-import csv
 import json
 import logging
 import struct
 from pathlib import Path
 from typing import Dict, List, Optional, Sequence
 
-from data_logs.ingestor import DataLogParser, ParsedLogSession, SupportedProtocol, _CSVLogParser, _safe_float
+from data_logs.ingestor import DataLogParser, ParsedLogSession, SupportedProtocol, _CSVLogParser, _read_sample
 
 LOGGER = logging.getLogger(__name__)
 
@@ -44,21 +43,8 @@ class AEMDataLogParser(_CSVLogParser):
 
     def parse(self, path: Path) -> ParsedLogSession:
         """Parse AEM data logger file."""
-        text = path.read_text(errors="ignore")
-        reader = csv.DictReader(text.splitlines())
-        headers = reader.fieldnames or []
-        records: List[Dict[str, float]] = []
-        
-        for row in reader:
-            cleaned: Dict[str, float] = {}
-            for key, value in row.items():
-                if value is None or key is None:
-                    continue
-                numeric = _safe_float(value)
-                if numeric is not None:
-                    cleaned[key.strip()] = numeric
-            if cleaned:
-                records.append(cleaned)
+        table, records = self._read_columnar(path)
+        headers = table.columns
         
         protocol = SupportedProtocol.CAN if any("can" in h.lower() for h in headers) else SupportedProtocol.UNKNOWN
         
@@ -69,6 +55,7 @@ class AEMDataLogParser(_CSVLogParser):
             channels=headers,
             records=records,
             metadata={"records": str(len(records)), "format": "AEM"},
+            columns=table.data,
         )
 
 
@@ -91,21 +78,8 @@ class RacepakDataLogParser(_CSVLogParser):
 
     def parse(self, path: Path) -> ParsedLogSession:
         """Parse Racepak file."""
-        text = path.read_text(errors="ignore")
-        reader = csv.DictReader(text.splitlines())
-        headers = reader.fieldnames or []
-        records: List[Dict[str, float]] = []
-        
-        for row in reader:
-            cleaned: Dict[str, float] = {}
-            for key, value in row.items():
-                if value is None or key is None:
-                    continue
-                numeric = _safe_float(value)
-                if numeric is not None:
-                    cleaned[key.strip()] = numeric
-            if cleaned:
-                records.append(cleaned)
+        table, records = self._read_columnar(path)
+        headers = table.columns
         
         protocol = SupportedProtocol.CAN
         
@@ -116,6 +90,7 @@ class RacepakDataLogParser(_CSVLogParser):
             channels=headers,
             records=records,
             metadata={"records": str(len(records)), "format": "Racepak"},
+            columns=table.data,
         )
 
 
@@ -144,21 +119,8 @@ class RaceCaptureParser(_CSVLogParser):
 
     def _parse_csv(self, path: Path) -> ParsedLogSession:
         """Parse RaceCapture CSV."""
-        text = path.read_text(errors="ignore")
-        reader = csv.DictReader(text.splitlines())
-        headers = reader.fieldnames or []
-        records: List[Dict[str, float]] = []
-        
-        for row in reader:
-            cleaned: Dict[str, float] = {}
-            for key, value in row.items():
-                if value is None or key is None:
-                    continue
-                numeric = _safe_float(value)
-                if numeric is not None:
-                    cleaned[key.strip()] = numeric
-            if cleaned:
-                records.append(cleaned)
+        table, records = self._read_columnar(path)
+        headers = table.columns
         
         return ParsedLogSession(
             vendor=self.name,
@@ -167,6 +129,7 @@ class RaceCaptureParser(_CSVLogParser):
             channels=headers,
             records=records,
             metadata={"records": str(len(records)), "format": "RaceCapture"},
+            columns=table.data,
         )
 
     def _parse_json(self, path: Path) -> ParsedLogSession:
@@ -223,21 +186,8 @@ class AIMDataLogParser(_CSVLogParser):
 
     def _parse_text(self, path: Path) -> ParsedLogSession:
         """Parse AIM text format."""
-        text = path.read_text(errors="ignore")
-        reader = csv.DictReader(text.splitlines())
-        headers = reader.fieldnames or []
-        records: List[Dict[str, float]] = []
-        
-        for row in reader:
-            cleaned: Dict[str, float] = {}
-            for key, value in row.items():
-                if value is None or key is None:
-                    continue
-                numeric = _safe_float(value)
-                if numeric is not None:
-                    cleaned[key.strip()] = numeric
-            if cleaned:
-                records.append(cleaned)
+        table, records = self._read_columnar(path)
+        headers = table.columns
         
         return ParsedLogSession(
             vendor=self.name,
@@ -246,6 +196,7 @@ class AIMDataLogParser(_CSVLogParser):
             channels=headers,
             records=records,
             metadata={"records": str(len(records)), "format": "AIM"},
+            columns=table.data,
         )
 
     def _parse_vbo(self, path: Path) -> ParsedLogSession:
@@ -281,7 +232,7 @@ class ExpandedDataLogAutoParser:
 
     def detect(self, path: Path) -> DataLogParser:
         """Auto-detect file format."""
-        sample = path.read_text(errors="ignore")[:2000]
+        sample = _read_sample(path)
         candidates = sorted(
             (
                 (parser.sniff(sample), parser)
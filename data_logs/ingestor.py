@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-import csv
 import json
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Protocol, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Union, overload
+
+from services.columnar_log_reader import NUMPY_AVAILABLE, ColumnarLog, read_delimited
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+SNIFF_BYTES = 2000
 
 
 class SupportedProtocol(str, Enum):
@@ -22,8 +29,9 @@ class ParsedLogSession:
     source_file: Path
     protocol: SupportedProtocol
     channels: Sequence[str]
-    records: List[Dict[str, float]]
+    records: Sequence[Dict[str, float]]
     metadata: Dict[str, str]
+    columns: Dict[str, Sequence[float]] = field(default_factory=dict)  # Channel -> float64 column (CSV logs)
 
 
 class DataLogParser(Protocol):
@@ -57,6 +65,71 @@ def _safe_float(value: str) -> Optional[float]:
         return None
 
 
+def _read_sample(path: Path, size: int = SNIFF_BYTES) -> str:
+    with open(path, "r", errors="ignore") as f:
+        return f.read(size)
+
+
+class ColumnarRecords(Sequence[Dict[str, float]]):
+    """
+    Row-dict view over columnar log data.
+
+    Behaves like the old ``List[Dict[str, float]]`` of records (non-numeric
+    cells omitted, rows without any numeric cell skipped) but builds each
+    dict on access instead of keeping one per row in memory.
+    """
+
+    def __init__(self, table: ColumnarLog) -> None:
+        self._names = list(table.data)
+        self._columns = [table.data[name] for name in self._names]
+        self._rows = self._valid_rows(self._columns, table.row_count)
+
+    @staticmethod
+    def _valid_rows(columns: List[Sequence[float]], row_count: int) -> Sequence[int]:
+        if not columns:
+            return range(0)
+        if NUMPY_AVAILABLE:
+            valid = np.zeros(row_count, dtype=bool)
+            for column in columns:
+                valid |= ~np.isnan(np.asarray(column))
+            return np.flatnonzero(valid)
+        return [
+            row for row in range(row_count)
+            if any(not math.isnan(column[row]) for column in columns)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _record(self, row: int) -> Dict[str, float]:
+        record = {}
+        for name, column in zip(self._names, self._columns):
+            value = float(column[row])
+            if value == value:  # Not NaN
+                record[name] = value
+        return record
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, float]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, float]]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, float], List[Dict[str, float]]]:
+        if isinstance(index, slice):
+            return [self._record(int(row)) for row in self._rows[index]]
+        return self._record(int(self._rows[index]))
+
+    def __iter__(self) -> Iterator[Dict[str, float]]:
+        for row in self._rows:
+            yield self._record(int(row))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, ColumnarRecords)):
+            return list(self) == list(other)
+        return NotImplemented
+
+
 class _CSVLogParser:
     """Shared helpers for CSV-based vendor logs."""
 
@@ -68,31 +141,24 @@ class _CSVLogParser:
         return 0.9 if self.vendor_marker and self.vendor_marker.lower() in sample.lower() else 0.2
 
     def parse(self, path: Path) -> ParsedLogSession:
-        text = path.read_text(errors="ignore")
-        reader = csv.DictReader(text.splitlines())
-        headers = reader.fieldnames or []
-        records: List[Dict[str, float]] = []
-        for row in reader:
-            cleaned: Dict[str, float] = {}
-            for key, value in row.items():
-                if value is None or key is None:
-                    continue
-                numeric = _safe_float(value)
-                if numeric is None:
-                    continue
-                cleaned[key.strip()] = numeric
-            if cleaned:
-                records.append(cleaned)
-        protocol = _infer_protocol(headers, text)
+        table, records = self._read_columnar(path)
+        protocol = _infer_protocol(table.columns, _read_sample(path))
         return ParsedLogSession(
             vendor=self.name,
             source_file=path,
             protocol=protocol,
-            channels=headers,
+            channels=table.columns,
             records=records,
             metadata={"records": str(len(records))},
+            columns=table.data,
         )
 
+    @staticmethod
+    def _read_columnar(path: Path) -> "tuple[ColumnarLog, ColumnarRecords]":
+        """Read a CSV log into float64 columns (NaN for non-numeric cells)."""
+        table = read_delimited(path, delimiter=",")
+        return table, ColumnarRecords(table)
+
 
 class HolleyDataLogParser(_CSVLogParser):
     name = "Holley EFI"
@@ -163,7 +229,7 @@ class DataLogAutoParser:
             self.parsers.extend(extra_parsers)
 
     def detect(self, path: Path) -> DataLogParser:
-        sample = path.read_text(errors="ignore")[:2000]
+        sample = _read_sample(path)
         candidates = sorted(
             (
                 (parser.sniff(sample), parser)
@@ -7,14 +7,14 @@ Supports multiple camera sources:
 - CSI cameras (Raspberry Pi) - Auto-detected
 
 Automatically detects and configures cameras with optimal settings.
-Provides unified interface for video capture with telemetry synchronization.
+Provides unified interface for video capture with telemetry synchronization;
+capture timing and the frame buffer pool are in interfaces.frame_capture.
 """
 
 from __future__ import annotations
 
 import logging
 import os
-import queue
 import re
 import socket
 import subprocess
@@ -36,6 +36,8 @@ try:
 except ImportError:
     np = None  # type: ignore
 
+from interfaces.frame_capture import CaptureStats, Frame, FrameCapture
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -60,17 +62,8 @@ class CameraConfig:
     fps: int = 30
     enabled: bool = True
     position: str = "front"  # front, rear, or other
-
-
-@dataclass
-class Frame:
-    """Video frame with metadata."""
-
-    image: "np.ndarray"  # type: ignore
-    timestamp: float
-    frame_number: int
-    camera_name: str
-    telemetry_sync: Optional[dict] = None
+    latency_ms: Optional[float] = None  # Exposure-to-grab latency; estimated from driver timestamps if None
+    pool_size: int = 8  # Preallocated frame buffers
 
 
 @dataclass
@@ -680,11 +673,18 @@ class CameraInterface:
         self.cap: Optional["cv2.VideoCapture"] = None
         self.running = False
         self.thread: Optional[threading.Thread] = None
-        self.frame_queue: queue.Queue[Frame] = queue.Queue(maxsize=30)
-        self.frame_count = 0
-        self.last_frame_time = 0.0
+        self.capture: Optional[FrameCapture] = None
         self._lock = threading.Lock()
 
+    @property
+    def frame_count(self) -> int:
+        return self.capture.frame_count if self.capture else 0
+
+    @property
+    def last_frame_time(self) -> float:
+        """time.monotonic() of the last grabbed frame (0.0 before the first)."""
+        return self.capture.last_grab if self.capture else 0.0
+
     def start(self) -> bool:
         """Start camera capture with automatic configuration."""
         if self.running:
@@ -752,9 +752,18 @@ class CameraInterface:
                         self.config.name, actual_width, actual_height, actual_fps,
                         self.config.width, self.config.height, self.config.fps)
 
+            latency = self.config.latency_ms / 1000.0 if self.config.latency_ms is not None else None
+            self.capture = FrameCapture(
+                self.cap,
+                self.config.name,
+                fps=self.config.fps,
+                pool_size=self.config.pool_size,
+                callback=self._dispatch_frame,
+                latency=latency,
+            )
             self.running = True
-            self.thread = threading.Thread(target=self._capture_loop, daemon=True)
-            self.thread.start()
+            self.capture.start()
+            self.thread = self.capture.thread
             LOGGER.info(
                 "Camera started successfully: %s (%s) - %dx%d @ %dfps",
                 self.config.name,
@@ -801,8 +810,8 @@ class CameraInterface:
     def stop(self) -> None:
         """Stop camera capture."""
         self.running = False
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=2.0)
+        if self.capture:
+            self.capture.stop()
 
         if self.cap:
             self.cap.release()
@@ -811,11 +820,40 @@ class CameraInterface:
         LOGGER.info("Camera stopped: %s", self.config.name)
 
     def get_frame(self, timeout: float = 1.0) -> Optional[Frame]:
-        """Get latest frame from queue."""
-        try:
-            return self.frame_queue.get(timeout=timeout)
-        except queue.Empty:
+        """
+        Get the oldest queued frame.
+
+        The frame's buffer is reused once the capture pool runs out; call
+        ``frame.release()`` when done with it to keep it out of reuse until then.
+        """
+        if self.capture is None:
+            return None
+        return self.capture.get_frame(timeout=timeout)
+
+    def calibrate_latency(self, event_time: float, frame: Frame) -> Optional[float]:
+        """
+        Calibrate capture latency from a telemetry event seen in a frame.
+
+        Args:
+            event_time: Event time on the telemetry clock (time.time())
+            frame: First frame showing the event
+
+        Returns:
+            Latency estimate in seconds
+        """
+        if self.capture is None:
             return None
+        return self.capture.calibrate_latency(event_time, frame)
+
+    def stats(self) -> Optional[CaptureStats]:
+        """Capture statistics (frame drops, jitter, latency)."""
+        return self.capture.stats() if self.capture else None
+
+    def _dispatch_frame(self, frame: Frame) -> None:
+        # Looked up per frame: callers replace frame_callback while capturing
+        callback = self.frame_callback
+        if callback is not None:
+            callback(frame)
 
     def _open_camera(self) -> Optional["cv2.VideoCapture"]:
         """Open camera based on type."""
@@ -908,73 +946,9 @@ class CameraInterface:
 
         return None
 
-    def _capture_loop(self) -> None:
-        """Main capture loop running in background thread - OPTIMIZED."""
-        # Pre-allocate frame buffer to avoid memory allocation
-        target_interval = 1.0 / self.config.fps
-        last_frame_time = 0.0
-
-        while self.running and self.cap and self.cap.isOpened():
-            try:
-                # Use grab() + retrieve() for better performance
-                if not self.cap.grab():
-                    time.sleep(0.01)
-                    continue
-
-                ret, frame = self.cap.retrieve()
-                if not ret or frame is None:
-                    LOGGER.warning("Failed to retrieve frame from %s", self.config.name)
-                    time.sleep(0.01)
-                    continue
-
-                timestamp = time.time()
-                self.frame_count += 1
-
-                # Only create frame object if needed (optimization)
-                if self.frame_callback or not self.frame_queue.empty():
-                    frame_obj = Frame(
-                        image=frame,
-                        timestamp=timestamp,
-                        frame_number=self.frame_count,
-                        camera_name=self.config.name,
-                    )
-
-                    # Add to queue (drop oldest if full - non-blocking)
-                    try:
-                        self.frame_queue.put_nowait(frame_obj)
-                    except queue.Full:
-                        try:
-                            self.frame_queue.get_nowait()  # Remove oldest
-                            self.frame_queue.put_nowait(frame_obj)
-                        except queue.Empty:
-                            pass
-
-                    # Call callback if provided
-                    if self.frame_callback:
-                        try:
-                            self.frame_callback(frame_obj)
-                        except Exception as e:
-                            LOGGER.error("Error in frame callback: %s", e)
-
-                self.last_frame_time = timestamp
-
-                # Optimized frame rate limiting
-                elapsed = time.time() - timestamp
-                sleep_time = target_interval - elapsed
-                if sleep_time > 0.001:  # Only sleep if significant
-                    time.sleep(sleep_time)
-                elif sleep_time < -0.1:  # Falling behind
-                    # Skip frame if too far behind
-                    if self.frame_count % 2 == 0:
-                        continue
-
-            except Exception as e:
-                LOGGER.error("Error in capture loop for %s: %s", self.config.name, e)
-                time.sleep(0.01)  # Shorter sleep on error
-
     def is_healthy(self, timeout: float = 5.0) -> bool:
         """Check if camera is healthy (receiving frames)."""
-        return (time.time() - self.last_frame_time) < timeout
+        return self.frame_count > 0 and (time.monotonic() - self.last_frame_time) < timeout
 
 
 class CameraManager:
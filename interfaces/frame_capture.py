@@ -0,0 +1,384 @@
+"""
+Frame Capture
+
+Capture loop for camera sources with OpenCV's VideoCapture interface
+(``isOpened``, ``grab``, ``retrieve``, ``get``).
+
+- Frames are stamped with their exposure time on the telemetry clock
+  (``time.time`` by default). When the source reports driver buffer
+  timestamps on the monotonic clock (V4L2 does), those are used as they
+  are free of host scheduling delay. Otherwise the monotonic time at which
+  ``grab()`` returned, taken before the frame is decoded, is used minus
+  the camera's latency: the median of recent driver-timestamp offsets, a
+  configured value, or one calibrated against telemetry events (e.g. an
+  LED flash seen in a frame).
+- Frames are decoded into a fixed pool of preallocated buffers, allocated
+  once from the first frame's shape, so steady-state capture allocates no
+  image memory. Frame objects are pooled with their buffers.
+- Every frame is queued for ``get_frame`` (oldest dropped when full) and
+  passed to the callback, so polling-only consumers are served.
+
+A frame returned by ``get_frame`` stays valid until ``release()`` is
+called on it (or it is used as a context manager); consumers that never
+release get ring semantics: the frame is reused once ``pool_size`` newer
+frames need buffers. Callbacks run on the capture thread and must copy
+what they keep after returning.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+LOGGER = logging.getLogger(__name__)
+
+CAP_PROP_POS_MSEC = 0  # cv2.CAP_PROP_POS_MSEC
+JITTER_WINDOW = 256  # Frame intervals kept for jitter statistics
+LATENCY_WINDOW = 64  # Latency samples kept for the median estimate
+MAX_PLAUSIBLE_LATENCY = 1.0  # Seconds; larger driver-timestamp offsets are not monotonic stamps
+
+_FREE, _CAPTURING, _QUEUED, _BORROWED = range(4)
+
+
+@dataclass(eq=False)
+class Frame:
+    """Video frame with metadata (pooled buffers: frames compare by identity)."""
+
+    image: "np.ndarray"  # type: ignore
+    timestamp: float  # Exposure time on the telemetry clock
+    frame_number: int
+    camera_name: str
+    telemetry_sync: Optional[dict] = None
+    monotonic: float = 0.0  # Monotonic clock (time.monotonic by default) when grab() returned
+    exposure: float = 0.0  # Exposure time on the monotonic clock
+    _owner: Optional["FrameCapture"] = field(default=None, repr=False)
+    _state: int = field(default=_FREE, repr=False)
+
+    def release(self) -> None:
+        """Return the frame's buffer to its capture pool (no-op for unpooled frames)."""
+        if self._owner is not None:
+            self._owner._release(self)
+
+    def __enter__(self) -> "Frame":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+@dataclass
+class CaptureStats:
+    """Capture statistics snapshot."""
+
+    frames_captured: int
+    frames_dropped: int  # Queued frames discarded unread because the queue was full
+    frames_missed: int  # Frames the source skipped (gaps in the grab interval)
+    grab_failures: int
+    pool_reclaims: int  # Borrowed frames reused because the pool ran out
+    buffer_allocations: int
+    fps: float
+    jitter_ms: float  # Standard deviation of the frame interval
+    max_jitter_ms: float  # Largest deviation from the mean frame interval
+    latency_ms: float
+
+
+class LatencyCalibrator:
+    """Median of recent latency samples (seconds)."""
+
+    def __init__(self, initial: float = 0.0, window: int = LATENCY_WINDOW) -> None:
+        self.initial = initial
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._estimate = initial
+
+    @property
+    def estimate(self) -> float:
+        return self._estimate
+
+    @property
+    def samples(self) -> int:
+        return len(self._samples)
+
+    def add_sample(self, latency: float) -> None:
+        self._samples.append(latency)
+        ordered = sorted(self._samples)
+        middle = len(ordered) // 2
+        self._estimate = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+    def reset(self, latency: Optional[float] = None) -> None:
+        self._samples.clear()
+        self._estimate = self.initial if latency is None else latency
+
+
+class FrameCapture:
+    """Exposure-stamped capture into a recycled frame pool."""
+
+    def __init__(
+        self,
+        source: Any,
+        camera_name: str,
+        fps: float = 30.0,
+        pool_size: int = 8,
+        queue_depth: int = 4,
+        callback: Optional[Callable[[Frame], None]] = None,
+        telemetry_clock: Callable[[], float] = time.time,
+        latency: Optional[float] = None,
+        driver_timestamps: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize frame capture.
+
+        Args:
+            source: Opened VideoCapture (or compatible) source
+            camera_name: Name stored on frames
+            fps: Nominal frame rate (used to detect skipped frames)
+            pool_size: Frame buffers, at least queue_depth + 2
+            queue_depth: Frames kept for get_frame
+            callback: Called on the capture thread with each frame
+            telemetry_clock: Clock that frame timestamps are reported on
+            latency: Known exposure-to-grab latency in seconds (disables driver_timestamps)
+            driver_timestamps: Use the source's buffer timestamps when they are on the monotonic clock
+            clock: Monotonic clock that grabs are stamped on (and driver timestamps are expected on)
+        """
+        if np is None:
+            raise RuntimeError("numpy is required for frame capture")
+        self.source = source
+        self.camera_name = camera_name
+        self.period = 1.0 / fps if fps and fps > 0 else 0.0
+        self.pool_size = max(pool_size, queue_depth + 2)
+        self.queue_depth = max(1, queue_depth)
+        self.callback = callback
+        self.telemetry_clock = telemetry_clock
+        self.clock = clock
+        self.driver_timestamps = driver_timestamps and latency is None
+        self.latency = LatencyCalibrator(latency or 0.0)
+
+        self.frame_count = 0
+        self.last_grab = 0.0  # Monotonic
+        self._last_exposure = 0.0
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+        self._pool: List[Frame] = []
+        self._free: Deque[Frame] = deque()
+        self._queue: Deque[Frame] = deque()
+        self._borrowed: Deque[Frame] = deque()
+        self._cond = threading.Condition()
+        self._intervals = np.zeros(JITTER_WINDOW, dtype=np.float64)
+        self._stats = {"dropped": 0, "missed": 0, "grab_failures": 0, "reclaims": 0, "allocations": 0}
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=f"capture-{self.camera_name}", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self.running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+
+    def get_frame(self, timeout: float = 1.0) -> Optional[Frame]:
+        """Oldest queued frame (call release() when done with it), or None on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self._queue:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    return None
+                self._cond.wait(remaining)
+            frame = self._queue.popleft()
+            frame._state = _BORROWED
+            self._borrowed.append(frame)
+            return frame
+
+    def set_latency(self, latency: float) -> None:
+        """Use a fixed exposure-to-grab latency (seconds)."""
+        self.driver_timestamps = False
+        self.latency.reset(latency)
+
+    def calibrate_latency(self, event_time: float, frame: Frame) -> float:
+        """
+        Add a latency sample from a telemetry event visible in a frame.
+
+        Args:
+            event_time: When the event happened, on the telemetry clock
+            frame: First frame showing the event
+
+        Returns:
+            Updated latency estimate (seconds)
+        """
+        grab_time = frame.timestamp + (frame.monotonic - frame.exposure)
+        if self.driver_timestamps:
+            self.driver_timestamps = False
+            self.latency.reset()
+        self.latency.add_sample(grab_time - event_time)
+        return self.latency.estimate
+
+    def stats(self) -> CaptureStats:
+        count = min(self.frame_count - 1, JITTER_WINDOW) if self.frame_count > 1 else 0
+        intervals = self._intervals[:count]
+        if self.period:
+            intervals = intervals[intervals < 1.5 * self.period]  # Leave out skipped-frame gaps
+        if intervals.size:
+            mean = float(intervals.mean())
+            fps = 1.0 / mean if mean > 0 else 0.0
+            jitter = float(intervals.std()) * 1000.0
+            max_jitter = float(np.abs(intervals - mean).max()) * 1000.0
+        else:
+            fps = jitter = max_jitter = 0.0
+        return CaptureStats(
+            frames_captured=self.frame_count,
+            frames_dropped=self._stats["dropped"],
+            frames_missed=self._stats["missed"],
+            grab_failures=self._stats["grab_failures"],
+            pool_reclaims=self._stats["reclaims"],
+            buffer_allocations=self._stats["allocations"],
+            fps=fps,
+            jitter_ms=jitter,
+            max_jitter_ms=max_jitter,
+            latency_ms=self.latency.estimate * 1000.0,
+        )
+
+    def _run(self) -> None:
+        while self.running and self.source.isOpened():
+            try:
+                self._capture_one()
+            except Exception as e:
+                LOGGER.error("Error in capture loop for %s: %s", self.camera_name, e)
+                time.sleep(0.01)
+        self.running = False
+        with self._cond:
+            self._cond.notify_all()
+
+    def _capture_one(self) -> None:
+        if not self.source.grab():
+            self._stats["grab_failures"] += 1
+            time.sleep(0.01)
+            return
+        grabbed = self.clock()
+        clock_offset = self.telemetry_clock() - self.clock()
+
+        frame = self._acquire()
+        if frame is None:
+            ok, image = self.source.retrieve()
+            if not ok or image is None:
+                self._stats["grab_failures"] += 1
+                return
+            frame = self._allocate_pool(image)
+        else:
+            ok, image = self.source.retrieve(frame.image)
+            if not ok or image is None:
+                self._stats["grab_failures"] += 1
+                self._recycle(frame)
+                return
+            if image is not frame.image:
+                if image.shape == frame.image.shape and image.dtype == frame.image.dtype:
+                    np.copyto(frame.image, image)
+                else:
+                    LOGGER.info("Frame size of %s changed to %s, reallocating buffers", self.camera_name, image.shape)
+                    self._recycle(frame)
+                    frame = self._allocate_pool(image)
+
+        exposure = grabbed - self.latency.estimate
+        if self.driver_timestamps:
+            driver_ms = self.source.get(CAP_PROP_POS_MSEC)
+            latency = grabbed - driver_ms / 1000.0 if driver_ms else -1.0
+            if 0.0 <= latency < MAX_PLAUSIBLE_LATENCY:
+                self.latency.add_sample(latency)
+                exposure = grabbed - latency
+
+        if self.frame_count:
+            interval = exposure - self._last_exposure
+            self._intervals[(self.frame_count - 1) % JITTER_WINDOW] = interval
+            if self.period and interval > 1.5 * self.period:
+                self._stats["missed"] += int(round(interval / self.period)) - 1
+        self.frame_count += 1
+        self.last_grab = grabbed
+        self._last_exposure = exposure
+
+        frame.monotonic = grabbed
+        frame.exposure = exposure
+        frame.timestamp = exposure + clock_offset
+        frame.frame_number = self.frame_count
+        frame.telemetry_sync = None
+
+        if self.callback is not None:
+            try:
+                self.callback(frame)
+            except Exception as e:
+                LOGGER.error("Error in frame callback: %s", e)
+
+        with self._cond:
+            if len(self._queue) >= self.queue_depth:
+                dropped = self._queue.popleft()
+                dropped._state = _FREE
+                self._free.append(dropped)
+                self._stats["dropped"] += 1
+            frame._state = _QUEUED
+            self._queue.append(frame)
+            self._cond.notify()
+
+    def _acquire(self) -> Optional[Frame]:
+        """A buffer to capture into (None before the pool exists)."""
+        with self._cond:
+            if self._free:
+                frame = self._free.pop()
+            elif self._borrowed:
+                frame = self._borrowed.popleft()
+                self._stats["reclaims"] += 1
+            elif self._queue:
+                frame = self._queue.popleft()
+                self._stats["dropped"] += 1
+            else:
+                return None
+            frame._state = _CAPTURING
+            return frame
+
+    def _allocate_pool(self, image: "np.ndarray") -> Frame:
+        """Allocate every buffer for the image's shape; returns one holding the image."""
+        with self._cond:
+            for frame in self._queue:
+                frame._owner = None  # Still valid for readers, never reused
+            for frame in self._borrowed:
+                frame._owner = None
+            self._queue.clear()
+            self._borrowed.clear()
+            self._free.clear()
+            self._pool = [
+                Frame(np.empty_like(image), 0.0, 0, self.camera_name, _owner=self) for _ in range(self.pool_size)
+            ]
+            self._stats["allocations"] += self.pool_size
+            frame = self._pool[0]
+            self._free.extend(self._pool[1:])
+            frame._state = _CAPTURING
+        np.copyto(frame.image, image)
+        return frame
+
+    def _recycle(self, frame: Frame) -> None:
+        with self._cond:
+            frame._state = _FREE
+            self._free.append(frame)
+
+    def _release(self, frame: Frame) -> None:
+        with self._cond:
+            if frame._state == _BORROWED:
+                self._borrowed.remove(frame)
+                frame._state = _FREE
+                self._free.append(frame)
+
+
+__all__ = ["CaptureStats", "Frame", "FrameCapture", "LatencyCalibrator"]
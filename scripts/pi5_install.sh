@@ -70,6 +70,13 @@ mkdir -p "$PROJECT_DIR/backups"
 chmod -R 755 "$PROJECT_DIR/logs"
 chmod -R 755 "$PROJECT_DIR/data"
 
+# OTA updates install into slots/a or slots/b and repoint slots/current;
+# until the first update it links to the project directory itself
+mkdir -p "$PROJECT_DIR/slots"
+if [ ! -e "$PROJECT_DIR/slots/current" ] && [ ! -L "$PROJECT_DIR/slots/current" ]; then
+    ln -s .. "$PROJECT_DIR/slots/current"
+fi
+
 # Create systemd service file (optional)
 echo ""
 read -p "Create systemd service for auto-start? (y/n) " -n 1 -r
@@ -86,7 +93,7 @@ Type=simple
 User=$USER
 WorkingDirectory=$PROJECT_DIR
 Environment="PATH=$VENV_DIR/bin"
-ExecStart=$VENV_DIR/bin/python $PROJECT_DIR/demo.py
+ExecStart=$VENV_DIR/bin/python $PROJECT_DIR/slots/current/demo.py
 Restart=always
 RestartSec=10
 
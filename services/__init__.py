@@ -1,407 +1,153 @@
-"""Service layer exports for the AI Tuner agent."""
-
-from .advanced_analytics import AdvancedAnalytics, LapData, TrendAnalysis
-from .drag_racing_analyzer import (
-    DRAG_DISTANCES,
-    DragCoachingAdvice,
-    DragRacingAnalyzer,
-    DragRun,
-    DragSegment,
-)
-from .can_analyzer import CANAnalysis, CANAnalyzer
-from .can_vendor_detector import CANVendor, CANVendorDetector, VendorSignature
-
-# CAN decoder and simulator (optional)
-try:
-    from .can_decoder import CANDecoder, DecodedMessage, DecodedSignal
-except ImportError:
-    CANDecoder = None  # type: ignore
-    DecodedMessage = None  # type: ignore
-    DecodedSignal = None  # type: ignore
-
-try:
-    from .can_simulator import CANSimulator, MessageType, SimulatedMessage
-except ImportError:
-    CANSimulator = None  # type: ignore
-    MessageType = None  # type: ignore
-    SimulatedMessage = None  # type: ignore
-from .cloud_sync import CloudSync
-from .connectivity_manager import ConnectivityManager, ConnectivityStatus
-from .database_manager import DatabaseConfig, DatabaseManager, DatabaseType
-from .data_logger import DataLogger
-from .ecu_auto_setup import ECUAutoSetup, ECUProfile, Manufacturer
-from .ecu_control import ECUBackup, ECUChange, ECUControl, ECUOperation, ECUParameter, SafetyLevel
-from .ecu_presets import ECUPreset, ECUPresetManager
-from .display_manager import DisplayInfo, DisplayManager
-from .geo_logger import GeoLogger
-from .ai_pit_strategist import AIPitStrategist, PitStrategy, RaceConditions, TireCondition
-from .ai_racing_coach import AIRacingCoach, CoachingAdvice, LapAnalysis
-from .ar_racing_overlay import AROverlayElement, AROverlayMode, ARRacingOverlay
-from .auto_tuning_engine import AutoTuningEngine, TuningAdjustment, TuningParameter
-from .biometric_integration import BiometricData, BiometricIntegration, DriverPerformance, DriverState
-from .blockchain_verified_records import BlockchainVerifiedRecords, VerifiedRecord
-from .crowdsourced_track_database import CommunityTrackData, CrowdsourcedTrackDatabase, TrackSubmission
-from .fleet_management import FleetManagement, FleetPerformance, PerformanceComparison, Vehicle
-from .predictive_crash_prevention import DangerAlert, DangerLevel, PredictiveCrashPrevention
-from .track_learning_ai import TrackLearningAI, TrackPoint, TrackProfile
-
-# Auto knowledge ingestion service (runs automatically in background)
-try:
-    from .auto_knowledge_ingestion_service import (
-        AutoKnowledgeIngestionService,
-        get_auto_ingestion_service,
-        start_auto_ingestion,
-        stop_auto_ingestion,
-    )
-    AUTO_INGESTION_AVAILABLE = True
-except ImportError:
-    AUTO_INGESTION_AVAILABLE = False
-    AutoKnowledgeIngestionService = None  # type: ignore
-    get_auto_ingestion_service = None  # type: ignore
-    start_auto_ingestion = None  # type: ignore
-    stop_auto_ingestion = None  # type: ignore
-from .voice_ecu_control import ECUAdjustment, VoiceCommand, VoiceECUControl
-from .weather_adaptive_tuning import WeatherAdaptiveTuning, WeatherConditions, WeatherTuningAdjustment
-from .live_streamer import LiveStreamer, StreamConfig, StreamingPlatform
-from .logging_health_monitor import LoggingHealth, LoggingHealthMonitor, LoggingStatus
-
-# Error monitoring service
-try:
-    from .error_monitoring_service import (
-        Breadcrumb,
-        ErrorMonitoringService,
-        ErrorPriority,
-        ErrorReport,
-        ResourceSnapshot,
-        SessionInfo,
-        get_error_monitor,
-    )
-    ERROR_MONITORING_AVAILABLE = True
-except ImportError:
-    ERROR_MONITORING_AVAILABLE = False
-    ErrorMonitoringService = None  # type: ignore
-    ErrorReport = None  # type: ignore
-    ErrorPriority = None  # type: ignore
-    Breadcrumb = None  # type: ignore
-    ResourceSnapshot = None  # type: ignore
-    SessionInfo = None  # type: ignore
-    get_error_monitor = None  # type: ignore
-from .predictive_parts_ordering import FailurePrediction, Part, PartOrder, PartStatus, PredictivePartsOrdering
-from .social_racing_platform import Achievement, AchievementType, Challenge, LeaderboardEntry, SocialRacingPlatform, UserProfile
-
-# Optional imports
-try:
-    from .disk_cleanup import DiskCleanup
-except ImportError:
-    DiskCleanup = None  # type: ignore
-
-try:
-    from .optimized_streamer import HardwareAccel, OptimizedStreamConfig, OptimizedStreamer
-except ImportError:
-    HardwareAccel = None  # type: ignore
-    OptimizedStreamConfig = None  # type: ignore
-    OptimizedStreamer = None  # type: ignore
-from .offline_manager import OfflineManager, SyncItem, SyncStatus
-from .performance_tracker import PerformanceSnapshot, PerformanceTracker
-from .driver_performance_summary import (
-    DriverPerformanceSummary,
-    DriverPerformanceSummaryService,
-)
-from .session_analysis_service import (
-    ChannelSummary,
-    SessionAnalysisReport,
-    SessionAnalysisService,
-    SessionAnomaly,
-)
-from .system_diagnostics import ComponentDiagnostic, DiagnosticStatus, SystemDiagnostics
-from .startup_diagnostics import DiagnosticResult, StartupDiagnostics
-from .usb_manager import USBDevice, USBManager
-from .video_logger import VideoLogger
-from .voice_feedback import FeedbackEvent, FeedbackPriority, VoiceFeedback
-from .cylinder_pressure_analyzer import (
-    CombustionMetrics,
-    CylinderPressureAnalyzer,
-    PressureCycle,
-    PressureReading,
-    PressureUnit,
-    StabilityMetrics,
-)
-from .virtual_dyno import (
-    DynoCurve,
-    DynoMethod,
-    DynoReading,
-    EnvironmentalConditions,
-    VehicleSpecs,
-    VirtualDyno,
-)
-from .dyno_analyzer import (
-    DynoAnalyzer,
-    DynoComparison,
-    ModImpact,
-    PowerBandAnalysis,
-    WeatherStandard,
-)
-from .dyno_calibration import DynoCalibration
-
-# Optional: Boost/Nitrous and Fuel/Additive management
-try:
-    from .boost_nitrous_advisor import BoostNitrousAdvisor, BoostNitrousAdvice, BoostNitrousRecommendation
-except ImportError:
-    BoostNitrousAdvisor = None  # type: ignore
-    BoostNitrousAdvice = None  # type: ignore
-    BoostNitrousRecommendation = None  # type: ignore
-
-try:
-    from .fuel_additive_manager import (
-        AdditiveAdvice,
-        FuelAdditiveManager,
-        FuelAdditiveRecommendation,
-        FuelAdditiveStatus,
-        FuelAdditiveType,
-    )
-except ImportError:
-    FuelAdditiveManager = None  # type: ignore
-    FuelAdditiveType = None  # type: ignore
-    AdditiveAdvice = None  # type: ignore
-    FuelAdditiveStatus = None  # type: ignore
-    FuelAdditiveRecommendation = None  # type: ignore
-
-try:
-    from .diesel_tuner import (
-        DieselEngineProfile,
-        DieselEngineType,
-        DieselParameter,
-        DieselTuner,
-        DieselTuningRecommendation,
-    )
-except ImportError:
-    DieselTuner = None  # type: ignore
-    DieselEngineType = None  # type: ignore
-    DieselParameter = None  # type: ignore
-    DieselTuningRecommendation = None  # type: ignore
-    DieselEngineProfile = None  # type: ignore
-
-__all__ = [
-    "AdvancedAnalytics",
-    "LapData",
-    "TrendAnalysis",
-    "AIPitStrategist",
-    "PitStrategy",
-    "RaceConditions",
-    "TireCondition",
-    "AIRacingCoach",
-    "CoachingAdvice",
-    "LapAnalysis",
-    "AROverlayElement",
-    "AROverlayMode",
-    "ARRacingOverlay",
-    "AutoTuningEngine",
-    "TuningAdjustment",
-    "TuningParameter",
-    "BiometricData",
-    "BiometricIntegration",
-    "DriverPerformance",
-    "DriverState",
-    "BlockchainVerifiedRecords",
-    "VerifiedRecord",
-    "CommunityTrackData",
-    "CrowdsourcedTrackDatabase",
-    "TrackSubmission",
-    "FleetManagement",
-    "FleetPerformance",
-    "PerformanceComparison",
-    "Vehicle",
-    "DangerAlert",
-    "DangerLevel",
-    "PredictiveCrashPrevention",
-    "TrackLearningAI",
-    "TrackPoint",
-    "TrackProfile",
-    "ECUAdjustment",
-    "VoiceCommand",
-    "VoiceECUControl",
-    "WeatherAdaptiveTuning",
-    "WeatherConditions",
-    "WeatherTuningAdjustment",
-    "CANAnalysis",
-    "CANAnalyzer",
-    "CANVendor",
-    "CANVendorDetector",
-    "VendorSignature",
-    "CANDecoder",
-    "DecodedMessage",
-    "DecodedSignal",
-    "CANSimulator",
-    "MessageType",
-    "SimulatedMessage",
-    "CloudSync",
-    "ConnectivityManager",
-    "ConnectivityStatus",
-    "DatabaseConfig",
-    "DatabaseManager",
-    "DatabaseType",
-    "DataLogger",
-    "ComponentDiagnostic",
-    "DiagnosticResult",
-    "DiagnosticStatus",
-    "StartupDiagnostics",
-    "SystemDiagnostics",
-    "ECUAutoSetup",
-    "ECUProfile",
-    "Manufacturer",
-    "ECUBackup",
-    "ECUChange",
-    "ECUControl",
-    "ECUOperation",
-    "ECUParameter",
-    "SafetyLevel",
-    "ECUPreset",
-    "ECUPresetManager",
-    "DisplayInfo",
-    "DisplayManager",
-    "GeoLogger",
-    "LiveStreamer",
-    "LoggingHealth",
-    "LoggingHealthMonitor",
-    "LoggingStatus",
-    "OfflineManager",
-    "FailurePrediction",
-    "Part",
-    "PartOrder",
-    "PartStatus",
-    "PredictivePartsOrdering",
-    "Achievement",
-    "AchievementType",
-    "Challenge",
-    "LeaderboardEntry",
-    "SocialRacingPlatform",
-    "UserProfile",
-    "SyncItem",
-    "SyncStatus",
-    "PerformanceTracker",
-    "PerformanceSnapshot",
-    "DriverPerformanceSummaryService",
-    "DriverPerformanceSummary",
-    "SessionAnalysisService",
-    "SessionAnalysisReport",
-    "SessionAnomaly",
-    "ChannelSummary",
-    "DragRacingAnalyzer",
-    "DragRun",
-    "DragCoachingAdvice",
-    "DragSegment",
-    "DRAG_DISTANCES",
-    "StreamConfig",
-    "StreamingPlatform",
-    "SystemDiagnostics",
-    "USBDevice",
-    "USBManager",
-    "VideoLogger",
-    "VoiceFeedback",
-    "FeedbackPriority",
-    "FeedbackEvent",
-    # Virtual Dyno
-    "VirtualDyno",
-    "DynoCurve",
-    "DynoReading",
-    "CylinderPressureAnalyzer",
-    "PressureCycle",
-    "PressureReading",
-    "CombustionMetrics",
-    "StabilityMetrics",
-    "PressureUnit",
-    "DynoMethod",
-    "VehicleSpecs",
-    "EnvironmentalConditions",
-    "DynoAnalyzer",
-    "DynoComparison",
-    "ModImpact",
-    "PowerBandAnalysis",
-    "WeatherStandard",
-    "DynoCalibration",
-]
-
-# Add error monitoring service if available
-if ERROR_MONITORING_AVAILABLE:
-    __all__.extend([
+"""Service layer exports for the AI Tuner agent.
+
+Exports are resolved lazily (PEP 562): ``from services import DataLogger``
+imports ``services.data_logger`` only, instead of every service module and
+their OpenCV/sklearn/requests dependencies. Names from optional modules
+resolve to ``None`` when the module cannot be imported.
+"""
+
+from core.lazy_imports import lazy_exports
+
+_EXPORTS = {
+    ".advanced_analytics": ("AdvancedAnalytics", "LapData", "TrendAnalysis"),
+    ".drag_racing_analyzer": (
+        "DRAG_DISTANCES",
+        "DragCoachingAdvice",
+        "DragRacingAnalyzer",
+        "DragRun",
+        "DragSegment",
+    ),
+    ".can_analyzer": ("CANAnalysis", "CANAnalyzer"),
+    ".can_vendor_detector": ("CANVendor", "CANVendorDetector", "VendorSignature"),
+    # CAN decoder and simulator (optional)
+    ".can_decoder": ("CANDecoder", "DecodedMessage", "DecodedSignal"),
+    ".can_simulator": ("CANSimulator", "MessageType", "SimulatedMessage"),
+    ".cloud_sync": ("CloudSync",),
+    ".connectivity_manager": ("ConnectivityManager", "ConnectivityStatus"),
+    ".database_manager": ("DatabaseConfig", "DatabaseManager", "DatabaseType"),
+    ".data_logger": ("DataLogger",),
+    ".ecu_auto_setup": ("ECUAutoSetup", "ECUProfile", "Manufacturer"),
+    ".ecu_control": ("ECUBackup", "ECUChange", "ECUControl", "ECUOperation", "ECUParameter", "SafetyLevel"),
+    ".ecu_presets": ("ECUPreset", "ECUPresetManager"),
+    ".display_manager": ("DisplayInfo", "DisplayManager"),
+    ".geo_logger": ("GeoLogger",),
+    ".ai_pit_strategist": ("AIPitStrategist", "PitStrategy", "RaceConditions", "TireCondition"),
+    ".ai_racing_coach": ("AIRacingCoach", "CoachingAdvice", "LapAnalysis"),
+    ".ar_racing_overlay": ("AROverlayElement", "AROverlayMode", "ARRacingOverlay"),
+    ".auto_tuning_engine": ("AutoTuningEngine", "TuningAdjustment", "TuningParameter"),
+    ".biometric_integration": ("BiometricData", "BiometricIntegration", "DriverPerformance", "DriverState"),
+    ".blockchain_verified_records": ("BlockchainVerifiedRecords", "VerifiedRecord"),
+    ".crowdsourced_track_database": ("CommunityTrackData", "CrowdsourcedTrackDatabase", "TrackSubmission"),
+    ".fleet_management": ("FleetManagement", "FleetPerformance", "PerformanceComparison", "Vehicle"),
+    ".predictive_crash_prevention": ("DangerAlert", "DangerLevel", "PredictiveCrashPrevention"),
+    ".track_learning_ai": ("TrackLearningAI", "TrackPoint", "TrackProfile"),
+    # Auto knowledge ingestion service (runs automatically in background)
+    ".auto_knowledge_ingestion_service": (
+        "AutoKnowledgeIngestionService",
+        "get_auto_ingestion_service",
+        "start_auto_ingestion",
+        "stop_auto_ingestion",
+    ),
+    ".voice_ecu_control": ("ECUAdjustment", "VoiceCommand", "VoiceECUControl"),
+    ".weather_adaptive_tuning": ("WeatherAdaptiveTuning", "WeatherConditions", "WeatherTuningAdjustment"),
+    ".live_streamer": ("LiveStreamer", "StreamConfig", "StreamingPlatform"),
+    ".logging_health_monitor": ("LoggingHealth", "LoggingHealthMonitor", "LoggingStatus"),
+    # Error monitoring service
+    ".error_monitoring_service": (
+        "Breadcrumb",
         "ErrorMonitoringService",
-        "ErrorReport",
         "ErrorPriority",
-        "Breadcrumb",
+        "ErrorReport",
         "ResourceSnapshot",
         "SessionInfo",
         "get_error_monitor",
-    ])
-
-# Add auto ingestion service if available
-if AUTO_INGESTION_AVAILABLE:
-    __all__.extend([
-        "AutoKnowledgeIngestionService",
-        "get_auto_ingestion_service",
-        "start_auto_ingestion",
-        "stop_auto_ingestion",
-    ])
-
-# Knowledge update service (unified service)
-try:
-    from .knowledge_update_service import (
-        KnowledgeUpdateService,
-        get_knowledge_update_service,
-        start_knowledge_update_service,
-        stop_knowledge_update_service,
-    )
-    KNOWLEDGE_UPDATE_AVAILABLE = True
-except ImportError:
-    KNOWLEDGE_UPDATE_AVAILABLE = False
-    KnowledgeUpdateService = None  # type: ignore
-    get_knowledge_update_service = None  # type: ignore
-    start_knowledge_update_service = None  # type: ignore
-    stop_knowledge_update_service = None  # type: ignore
-
-if KNOWLEDGE_UPDATE_AVAILABLE:
-    __all__.extend([
-        "KnowledgeUpdateService",
-        "get_knowledge_update_service",
-        "start_knowledge_update_service",
-        "stop_knowledge_update_service",
-    ])
-
-# Add optional fuel/additive management if available
-if BoostNitrousAdvisor is not None:
-    __all__.extend(["BoostNitrousAdvisor", "BoostNitrousAdvice", "BoostNitrousRecommendation"])
-
-if FuelAdditiveManager is not None:
-    __all__.extend([
-        "FuelAdditiveManager",
-        "FuelAdditiveType",
+    ),
+    ".predictive_parts_ordering": ("FailurePrediction", "Part", "PartOrder", "PartStatus", "PredictivePartsOrdering"),
+    ".social_racing_platform": (
+        "Achievement",
+        "AchievementType",
+        "Challenge",
+        "LeaderboardEntry",
+        "SocialRacingPlatform",
+        "UserProfile",
+    ),
+    ".disk_cleanup": ("DiskCleanup",),
+    ".optimized_streamer": ("HardwareAccel", "OptimizedStreamConfig", "OptimizedStreamer"),
+    ".offline_manager": ("OfflineManager", "SyncItem", "SyncStatus"),
+    ".performance_tracker": ("PerformanceSnapshot", "PerformanceTracker"),
+    ".driver_performance_summary": ("DriverPerformanceSummary", "DriverPerformanceSummaryService"),
+    ".session_analysis_service": (
+        "ChannelSummary",
+        "SessionAnalysisReport",
+        "SessionAnalysisService",
+        "SessionAnomaly",
+    ),
+    ".system_diagnostics": ("ComponentDiagnostic", "DiagnosticStatus", "SystemDiagnostics"),
+    ".startup_diagnostics": ("DiagnosticResult", "StartupDiagnostics"),
+    ".usb_manager": ("USBDevice", "USBManager"),
+    ".video_logger": ("VideoLogger",),
+    ".voice_feedback": ("FeedbackEvent", "FeedbackPriority", "VoiceFeedback"),
+    ".cylinder_pressure_analyzer": (
+        "CombustionMetrics",
+        "CylinderPressureAnalyzer",
+        "PressureCycle",
+        "PressureReading",
+        "PressureUnit",
+        "StabilityMetrics",
+    ),
+    # Virtual Dyno
+    ".virtual_dyno": (
+        "DynoCurve",
+        "DynoMethod",
+        "DynoReading",
+        "EnvironmentalConditions",
+        "VehicleSpecs",
+        "VirtualDyno",
+    ),
+    ".dyno_analyzer": ("DynoAnalyzer", "DynoComparison", "ModImpact", "PowerBandAnalysis", "WeatherStandard"),
+    ".dyno_calibration": ("DynoCalibration",),
+    # Optional: Boost/Nitrous and Fuel/Additive management
+    ".boost_nitrous_advisor": ("BoostNitrousAdvisor", "BoostNitrousAdvice", "BoostNitrousRecommendation"),
+    ".fuel_additive_manager": (
         "AdditiveAdvice",
-        "FuelAdditiveStatus",
+        "FuelAdditiveManager",
         "FuelAdditiveRecommendation",
-    ])
-
-if DieselTuner is not None:
-    __all__.extend([
-        "DieselTuner",
+        "FuelAdditiveStatus",
+        "FuelAdditiveType",
+    ),
+    ".diesel_tuner": (
+        "DieselEngineProfile",
         "DieselEngineType",
         "DieselParameter",
+        "DieselTuner",
         "DieselTuningRecommendation",
-        "DieselEngineProfile",
-    ])
-
-# Add optional imports if available
-if CANVendor is not None:
-    __all__.extend(["CANVendor", "CANVendorDetector", "VendorSignature"])
-
-if DiskCleanup is not None:
-    __all__.append("DiskCleanup")
-
-if HardwareAccel is not None:
-    __all__.extend(["HardwareAccel", "OptimizedStreamConfig", "OptimizedStreamer"])
-
-# Add CAN decoder and simulator if available
-if CANDecoder is not None:
-    __all__.extend(["CANDecoder", "DecodedMessage", "DecodedSignal"])
-
-if CANSimulator is not None:
-    __all__.extend(["CANSimulator", "MessageType", "SimulatedMessage"])
-
+    ),
+    # Knowledge update service (unified service)
+    ".knowledge_update_service": (
+        "KnowledgeUpdateService",
+        "get_knowledge_update_service",
+        "start_knowledge_update_service",
+        "stop_knowledge_update_service",
+    ),
+}
+
+_OPTIONAL = {
+    ".can_decoder",
+    ".can_simulator",
+    ".auto_knowledge_ingestion_service",
+    ".error_monitoring_service",
+    ".disk_cleanup",
+    ".optimized_streamer",
+    ".boost_nitrous_advisor",
+    ".fuel_additive_manager",
+    ".diesel_tuner",
+    ".knowledge_update_service",
+}
+
+_FLAGS = {
+    "AUTO_INGESTION_AVAILABLE": ".auto_knowledge_ingestion_service",
+    "ERROR_MONITORING_AVAILABLE": ".error_monitoring_service",
+    "KNOWLEDGE_UPDATE_AVAILABLE": ".knowledge_update_service",
+}
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, globals(), _EXPORTS, optional=_OPTIONAL, flags=_FLAGS)
@@ -13,26 +13,32 @@ Features:
 from __future__ import annotations
 
 import logging
+import threading
 import time
-from collections import deque
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
 try:
+    from sklearn.base import clone
     from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
     from sklearn.preprocessing import StandardScaler
     ML_AVAILABLE = True
 except ImportError:
     ML_AVAILABLE = False
+    clone = None  # type: ignore
     GradientBoostingRegressor = None  # type: ignore
     RandomForestRegressor = None  # type: ignore
     StandardScaler = None  # type: ignore
 
 LOGGER = logging.getLogger(__name__)
 
+# Column order of the action one-hot block in the feature matrix
+ACTION_PARAMETERS = ("fuel", "timing", "boost", "lambda_target")
+
 
 class OptimizationTarget(Enum):
     """Optimization targets."""
@@ -74,6 +80,18 @@ class TuningAction:
     reason: str = ""
 
 
+@dataclass
+class ModelSnapshot:
+    """Immutable set of fitted predictors, swapped in atomically after retraining."""
+    version: int
+    scaler: Any
+    hp_model: Any
+    efficiency_model: Any
+    safety_model: Any
+    trained_samples: int = 0
+    trained_at: float = field(default_factory=time.time)
+
+
 @dataclass
 class TuningResult:
     """Result of applying a tuning action."""
@@ -124,12 +142,30 @@ class AdvancedTuningEngine:
         # Q-table for reinforcement learning (state -> action -> value)
         self.q_table: Dict[str, Dict[str, float]] = {}
         
-        # Predictive models
+        # Predictive models (unfitted prototypes; fitted copies live in _models)
         self.hp_predictor = None
         self.efficiency_predictor = None
         self.safety_predictor = None
         self.scaler = None
         
+        # Current fitted snapshot - replaced wholesale by the retrain worker
+        self._models: Optional[ModelSnapshot] = None
+        self._model_version = 0
+        
+        # Prediction memo: (model version, feature row bytes) -> outcomes
+        self.prediction_cache_size = 4096
+        self._prediction_cache: OrderedDict[Tuple[int, bytes], Tuple[float, float, float]] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Background retraining
+        self._retrain_lock = threading.Lock()
+        self._retrain_requested = threading.Event()
+        self._retrain_idle = threading.Event()
+        self._retrain_idle.set()
+        self._retrain_thread: Optional[threading.Thread] = None
+        self._stop_retrain = threading.Event()
+        
         # Optimal settings learned per condition
         self.learned_optimal: Dict[str, Dict[str, float]] = {}
         
@@ -199,24 +235,8 @@ class AdvancedTuningEngine:
         # Generate candidate actions
         candidates = self._generate_candidate_actions(state)
         
-        # Evaluate and rank actions
-        evaluated = []
-        for action in candidates:
-            # Predict outcomes
-            hp_gain, eff_gain, safety = self._predict_outcomes(state, action)
-            action.expected_hp_gain = hp_gain
-            action.expected_efficiency_gain = eff_gain
-            action.safety_score = safety
-            
-            # Multi-objective scoring
-            score = self._calculate_multi_objective_score(
-                hp_gain, eff_gain, safety, action
-            )
-            
-            evaluated.append((score, action))
-        
-        # Sort by score (highest first)
-        evaluated.sort(key=lambda x: x[0], reverse=True)
+        # Evaluate and rank actions (one vectorized pass over all candidates)
+        evaluated = self.score_candidates(state, candidates)
         
         # Filter by safety threshold
         safe_actions = [
@@ -363,6 +383,34 @@ class AdvancedTuningEngine:
         
         return actions
     
+    def score_candidates(
+        self,
+        state: TuningState,
+        actions: List[TuningAction],
+    ) -> List[Tuple[float, TuningAction]]:
+        """
+        Predict outcomes for all candidate actions and rank them.
+        
+        Sets expected gains and safety score on each action.
+        
+        Returns:
+            (score, action) pairs, highest score first
+        """
+        if not actions:
+            return []
+        
+        hp, eff, safety = self._predict_outcomes_batch(state, actions)
+        confidence = np.fromiter((a.confidence for a in actions), dtype=np.float64, count=len(actions))
+        scores = self._multi_objective_scores(hp, eff, safety) * confidence
+        
+        for i, action in enumerate(actions):
+            action.expected_hp_gain = float(hp[i])
+            action.expected_efficiency_gain = float(eff[i])
+            action.safety_score = float(safety[i])
+        
+        order = np.argsort(-scores, kind="stable")
+        return [(float(scores[i]), actions[i]) for i in order]
+    
     def _predict_outcomes(
         self,
         state: TuningState,
@@ -374,24 +422,70 @@ class AdvancedTuningEngine:
         Returns:
             (hp_gain, efficiency_gain, safety_score)
         """
-        # Use ML models if available and trained
-        if (self.hp_predictor and self.efficiency_predictor and
-            self.safety_predictor and len(self.action_history) > 50):
+        hp, eff, safety = self._predict_outcomes_batch(state, [action])
+        return float(hp[0]), float(eff[0]), float(safety[0])
+    
+    def _predict_outcomes_batch(
+        self,
+        state: TuningState,
+        actions: List[TuningAction],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Predict outcomes for a batch of actions from one state.
+        
+        Uses the current model snapshot when one has been trained: the
+        actions are featurized into one matrix, predictions are reused for
+        rows seen before (keyed on the full feature row, so any input the
+        models use - knock, EGT, current value - changes the key), and the
+        remaining rows are scored with a single predict() call per model.
+        Falls back to heuristics otherwise.
+        
+        Returns:
+            (hp_gain, efficiency_gain, safety_score) arrays
+        """
+        n = len(actions)
+        hp = np.zeros(n)
+        eff = np.zeros(n)
+        safety = np.ones(n)
+        
+        models = self._models  # Single read - a concurrent swap cannot tear this call
+        if models is not None:
             try:
-                features = self._extract_features(state, action)
-                features_scaled = self.scaler.transform([features])[0]
+                features = self._feature_matrix(state, actions)
+                keys = [(models.version, row.tobytes()) for row in features]
+                pending: List[int] = []
+                for i, key in enumerate(keys):
+                    cached = self._prediction_cache.get(key)
+                    if cached is None:
+                        pending.append(i)
+                    else:
+                        self._prediction_cache.move_to_end(key)
+                        hp[i], eff[i], safety[i] = cached
+                self.cache_hits += n - len(pending)
+                self.cache_misses += len(pending)
                 
-                hp_gain = float(self.hp_predictor.predict([features_scaled])[0])
-                eff_gain = float(self.efficiency_predictor.predict([features_scaled])[0])
-                safety = float(self.safety_predictor.predict([features_scaled])[0])
-                safety = max(0.0, min(1.0, safety))  # Clamp to 0-1
-                
-                return hp_gain, eff_gain, safety
+                if pending:
+                    X = models.scaler.transform(features[pending])
+                    p_hp = models.hp_model.predict(X)
+                    p_eff = models.efficiency_model.predict(X)
+                    p_safety = np.clip(models.safety_model.predict(X), 0.0, 1.0)
+                    for j, i in enumerate(pending):
+                        hp[i], eff[i], safety[i] = p_hp[j], p_eff[j], p_safety[j]
+                        self._cache_prediction(keys[i], (float(p_hp[j]), float(p_eff[j]), float(p_safety[j])))
+                return hp, eff, safety
             except Exception as e:
                 LOGGER.debug(f"ML prediction failed: {e}, using heuristics")
         
         # Fallback to heuristic predictions
-        return self._heuristic_predict_outcomes(state, action)
+        for i, action in enumerate(actions):
+            hp[i], eff[i], safety[i] = self._heuristic_predict_outcomes(state, action)
+        return hp, eff, safety
+    
+    def _cache_prediction(self, key: Tuple[int, bytes], value: Tuple[float, float, float]) -> None:
+        """Store a prediction, evicting least recently used entries."""
+        self._prediction_cache[key] = value
+        while len(self._prediction_cache) > self.prediction_cache_size:
+            self._prediction_cache.popitem(last=False)
     
     def _heuristic_predict_outcomes(
         self,
@@ -477,6 +571,32 @@ class AdvancedTuningEngine:
             action.current_value / 200.0,  # Normalized
         ]
     
+    def _feature_matrix(
+        self,
+        state: TuningState,
+        actions: List[TuningAction],
+    ) -> np.ndarray:
+        """Featurize many actions from one state; row i matches _extract_features(state, actions[i])."""
+        n = len(actions)
+        X = np.empty((n, 16), dtype=np.float64)
+        X[:, :10] = (
+            state.rpm / 10000.0,
+            state.load,
+            state.boost / 50.0,
+            state.lambda_value,
+            state.timing / 50.0,
+            state.fuel_map_value / 200.0,
+            state.coolant_temp / 150.0,
+            state.iat / 100.0,
+            state.knock_count / 10.0,
+            state.egt / 1500.0,
+        )
+        for col, parameter in enumerate(ACTION_PARAMETERS, start=10):
+            X[:, col] = [1.0 if a.parameter == parameter else 0.0 for a in actions]
+        X[:, 14] = [a.delta for a in actions]
+        X[:, 15] = [a.current_value / 200.0 for a in actions]
+        return X
+    
     def _calculate_multi_objective_score(
         self,
         hp_gain: float,
@@ -503,6 +623,21 @@ class AdvancedTuningEngine:
         
         return score
     
+    def _multi_objective_scores(
+        self,
+        hp_gain: np.ndarray,
+        eff_gain: np.ndarray,
+        safety: np.ndarray,
+    ) -> np.ndarray:
+        """Vectorized _calculate_multi_objective_score without the confidence factor."""
+        if self.target == OptimizationTarget.PERFORMANCE:
+            return 0.7 * hp_gain + 0.3 * safety * 10.0
+        if self.target == OptimizationTarget.EFFICIENCY:
+            return 0.7 * eff_gain + 0.3 * safety * 10.0
+        if self.target == OptimizationTarget.SAFETY:
+            return safety * 20.0
+        return 0.4 * hp_gain + 0.3 * eff_gain + 0.3 * safety * 10.0
+    
     def _apply_action(
         self,
         action: TuningAction,
@@ -575,7 +710,7 @@ class AdvancedTuningEngine:
         
         # Update Q-table (simplified Q-learning)
         state_key = self._state_to_key(state)
-        action_key = f"{action.parameter}_{action.delta:.2f}"
+        action_key = self._action_to_key(action)
         
         if state_key not in self.q_table:
             self.q_table[state_key] = {}
@@ -597,9 +732,9 @@ class AdvancedTuningEngine:
         new_q = current_q + self.learning_rate * (reward - current_q)
         self.q_table[state_key][action_key] = new_q
         
-        # Retrain predictive models periodically
+        # Retrain predictive models periodically (off the caller's thread)
         if len(self.action_history) % 50 == 0 and ML_AVAILABLE:
-            self._retrain_predictive_models()
+            self.request_retrain()
     
     def _state_to_key(self, state: TuningState) -> str:
         """Convert state to key for Q-table."""
@@ -609,8 +744,60 @@ class AdvancedTuningEngine:
         boost_bin = int(state.boost / 5) * 5
         return f"{rpm_bin}_{load_bin:.1f}_{boost_bin}"
     
+    def _action_to_key(self, action: TuningAction) -> str:
+        """Convert action to key for Q-table."""
+        return f"{action.parameter}_{action.delta:.2f}"
+    
+    def request_retrain(self) -> None:
+        """
+        Schedule a model retrain on the background worker.
+        
+        Requests made while a retrain is running are coalesced into one
+        follow-up run. The worker thread is started on first use.
+        """
+        with self._retrain_lock:
+            if self._retrain_thread is None or not self._retrain_thread.is_alive():
+                self._stop_retrain.clear()
+                self._retrain_thread = threading.Thread(
+                    target=self._retrain_worker, daemon=True, name="TuningModelRetrain"
+                )
+                self._retrain_thread.start()
+            self._retrain_idle.clear()
+            self._retrain_requested.set()
+    
+    def wait_for_retrain(self, timeout: Optional[float] = None) -> bool:
+        """Block until no retrain is pending or running. Returns False on timeout."""
+        return self._retrain_idle.wait(timeout)
+    
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the background retrain worker."""
+        self._stop_retrain.set()
+        self._retrain_requested.set()
+        thread = self._retrain_thread
+        if thread and thread.is_alive():
+            thread.join(timeout=timeout)
+    
+    def _retrain_worker(self) -> None:
+        """Background loop: wait for requests and retrain."""
+        while not self._stop_retrain.is_set():
+            self._retrain_requested.wait()
+            if self._stop_retrain.is_set():
+                break
+            self._retrain_requested.clear()
+            try:
+                self._retrain_predictive_models()
+            finally:
+                if not self._retrain_requested.is_set():
+                    self._retrain_idle.set()
+        self._retrain_idle.set()
+    
     def _retrain_predictive_models(self) -> None:
-        """Retrain predictive models on accumulated data."""
+        """
+        Fit fresh copies of the predictive models and swap them in.
+        
+        Fitting happens on private copies so predictions keep using the
+        previous snapshot until the new one is complete.
+        """
         if not ML_AVAILABLE or len(self.action_history) < 50:
             return
         
@@ -620,7 +807,7 @@ class AdvancedTuningEngine:
             y_eff = []
             y_safety = []
             
-            for result in self.action_history:
+            for result in list(self.action_history):
                 if result.after_state:
                     features = self._extract_features(result.before_state, result.action)
                     X.append(features)
@@ -634,22 +821,47 @@ class AdvancedTuningEngine:
                 y_eff = np.array(y_eff)
                 y_safety = np.array(y_safety)
                 
+                prototypes = (self.scaler, self.hp_predictor, self.efficiency_predictor, self.safety_predictor)
+                if any(p is None for p in prototypes):
+                    return
+                
                 # Scale features
-                self.scaler.fit(X)
-                X_scaled = self.scaler.transform(X)
+                scaler = clone(self.scaler).fit(X)
+                X_scaled = scaler.transform(X)
                 
                 # Retrain models
-                if self.hp_predictor:
-                    self.hp_predictor.fit(X_scaled, y_hp)
-                if self.efficiency_predictor:
-                    self.efficiency_predictor.fit(X_scaled, y_eff)
-                if self.safety_predictor:
-                    self.safety_predictor.fit(X_scaled, y_safety)
+                hp_model = clone(self.hp_predictor).fit(X_scaled, y_hp)
+                efficiency_model = clone(self.efficiency_predictor).fit(X_scaled, y_eff)
+                safety_model = clone(self.safety_predictor).fit(X_scaled, y_safety)
                 
-                LOGGER.info("Predictive models retrained on %d samples", len(X))
+                self._install_models(scaler, hp_model, efficiency_model, safety_model, len(X))
+                LOGGER.info("Predictive models retrained on %d samples (v%d)", len(X), self._model_version)
         except Exception as e:
             LOGGER.warning(f"Failed to retrain predictive models: {e}")
     
+    def _install_models(
+        self,
+        scaler: Any,
+        hp_model: Any,
+        efficiency_model: Any,
+        safety_model: Any,
+        trained_samples: int = 0,
+    ) -> ModelSnapshot:
+        """Publish a new model snapshot and drop predictions from older versions."""
+        with self._retrain_lock:
+            self._model_version += 1
+            snapshot = ModelSnapshot(
+                version=self._model_version,
+                scaler=scaler,
+                hp_model=hp_model,
+                efficiency_model=efficiency_model,
+                safety_model=safety_model,
+                trained_samples=trained_samples,
+            )
+            self._models = snapshot
+            self._prediction_cache = OrderedDict()
+        return snapshot
+    
     def get_statistics(self) -> Dict:
         """Get engine statistics."""
         return {
@@ -658,11 +870,11 @@ class AdvancedTuningEngine:
             "q_table_size": sum(len(actions) for actions in self.q_table.values()),
             "target": self.target.value,
             "ml_available": ML_AVAILABLE,
-            "models_trained": (
-                self.hp_predictor is not None and
-                self.efficiency_predictor is not None and
-                self.safety_predictor is not None
-            ),
+            "models_trained": self._models is not None,
+            "model_version": self._models.version if self._models else 0,
+            "prediction_cache_size": len(self._prediction_cache),
+            "prediction_cache_hits": self.cache_hits,
+            "prediction_cache_misses": self.cache_misses,
         }
 
 
@@ -671,6 +883,7 @@ __all__ = [
     "TuningAction",
     "TuningState",
     "TuningResult",
+    "ModelSnapshot",
     "OptimizationTarget",
 ]
 
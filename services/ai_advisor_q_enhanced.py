@@ -15,6 +15,8 @@ from typing import Dict, List, Optional, Tuple, Any
 
 LOGGER = logging.getLogger(__name__)
 
+STALE_WEB_NOTE = "⚠️ Offline: these are saved results from an earlier search and may be out of date."
+
 # Try to import LLM libraries (optional)
 try:
     import openai
@@ -1378,9 +1380,10 @@ Tips:
             knowledge_matches[0][1] >= 3.0  # Lower threshold - was 5.0, now 3.0
         )
         
-        # Check if we need web search (ALWAYS search if no good local matches)
+        # Check if we need web search (ALWAYS search if no good local matches).
+        # Offline, WebSearchService still serves cached results (marked stale).
         web_search_results = None
-        if self.web_search and self.web_search.is_available():
+        if self.web_search:
             question_lower = question.lower()
             
             # Detect vehicle-specific questions
@@ -1533,7 +1536,7 @@ Tips:
     
     def _perform_web_search(self, question: str, intent: IntentType):
         """Perform web search based on question and intent."""
-        if not self.web_search or not self.web_search.is_available():
+        if not self.web_search:
             return None
         
         try:
@@ -1681,6 +1684,8 @@ What would you like to know?"""
                             response_parts.append(f"  {result.snippet[:200]}")
                         response_parts.append(f"  🔗 {result.url}\n")
                     response_parts.append("\n💡 Note: This information is from web research. Please verify for your specific application.")
+                    if web_search_results.stale:
+                        response_parts.append(STALE_WEB_NOTE)
                     return "\n".join(response_parts)
             elif knowledge_score < 3.0 and web_search_results and web_search_results.results:
                 # Low relevance knowledge - prioritize web search to avoid erroneous info
@@ -1691,6 +1696,8 @@ What would you like to know?"""
                         response_parts.append(f"  {result.snippet[:200]}")
                     response_parts.append(f"  🔗 {result.url}\n")
                 response_parts.append("\n💡 Note: This information is from web research. Please verify for your specific application.")
+                if web_search_results.stale:
+                    response_parts.append(STALE_WEB_NOTE)
                 return "\n".join(response_parts)
             
             # Primary knowledge (high relevance)
@@ -1721,6 +1728,8 @@ What would you like to know?"""
                     if result.snippet:
                         response_parts.append(f"  {result.snippet[:150]}...")
                     response_parts.append(f"  Source: {result.url}")
+                if web_search_results.stale:
+                    response_parts.append(f"\n{STALE_WEB_NOTE}")
             
             return "\n".join(response_parts)
         
@@ -1733,10 +1742,12 @@ What would you like to know?"""
                     response_parts.append(f"  {result.snippet}")
                 response_parts.append(f"  🔗 {result.url}\n")
             response_parts.append("\n💡 Note: This information is from web research. Please verify for your specific application.")
+            if web_search_results.stale:
+                response_parts.append(STALE_WEB_NOTE)
             return "\n".join(response_parts)
         
         # If no knowledge AND no web search results, try web search one more time
-        if not has_good_knowledge and not web_search_results and self.web_search and self.web_search.is_available():
+        if not has_good_knowledge and not web_search_results and self.web_search:
             try:
                 LOGGER.info("Retrying web search for question: %s", question)
                 web_search_results = self._perform_web_search(question, intent)
@@ -1748,6 +1759,8 @@ What would you like to know?"""
                             response_parts.append(f"  {result.snippet}")
                         response_parts.append(f"  🔗 {result.url}\n")
                     response_parts.append("\n💡 Note: This information is from web research. Please verify for your specific application.")
+                    if web_search_results.stale:
+                        response_parts.append(STALE_WEB_NOTE)
                     return "\n".join(response_parts)
             except Exception as e:
                 LOGGER.warning("Retry web search failed: %s", e)
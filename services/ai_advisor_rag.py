@@ -8,12 +8,34 @@ from __future__ import annotations
 
 import logging
 import os
+import re
+import threading
 import time
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field, asdict, replace
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
+
+from services.answer_cache import AnswerCache
 
 LOGGER = logging.getLogger(__name__)
 
+OLLAMA_OPTIONS = {
+    "temperature": 0.6,  # Slightly lower for more focused reasoning
+    "top_p": 0.9,
+    "num_predict": 800,  # More tokens for detailed reasoning
+    "repeat_penalty": 1.1,  # Reduce repetition
+}
+ANSWER_PREFIXES = ["Answer:", "Response:", "Based on", "Here's"]
+NO_ANSWER = "I need more information to answer that question accurately."
+
+SETUP_KEYWORDS = ["setup", "handling", "balance", "launch", "traction", "mid corner", "understeer", "oversteer", "drag"]
+
+# Questions that lean on the conversation ("why is that happening", "what about the rear?") - never cached
+FOLLOW_UP_RE = re.compile(
+    r"\b(it|its|it's|this|that|these|those|they|them|their|again|also|same|above|previous|earlier|instead|else)\b"
+    r"|^\s*(and|but|so|then|what about|how about)\b",
+    re.IGNORECASE,
+)
+
 # Import vector store
 try:
     from services.vector_knowledge_store import VectorKnowledgeStore
@@ -118,6 +140,64 @@ class RAGResponse:
     warnings: List[str] = field(default_factory=list)
 
 
+@dataclass
+class _AnswerDraft:
+    """Retrieved knowledge and context for a question, ready for generation."""
+    question: str
+    telemetry: Optional[Dict[str, float]]
+    context: Optional[Dict[str, Any]]
+    start_time: float
+    question_analysis: Optional[Dict[str, Any]]
+    retrieved_knowledge: List[Dict[str, Any]]
+    web_search_results: Optional[List[Dict[str, Any]]]
+    used_web_search: bool
+    context_text: str
+    cache_fingerprint: Optional[Tuple]
+
+
+class _AnswerStreamCleaner:
+    """
+    Applies an answer cleanup function to generated text as it streams in.
+    
+    The cleanup is re-run on the text received so far and only output that
+    later text can no longer change is released: the unfinished line is
+    left out while it is blank or may be a bold reasoning header, and
+    nothing is released while the answer still starts with a header or may
+    still start with an answer prefix. The released fragments join to the
+    cleanup of the complete text.
+    """
+    
+    HOLD_CHARS = max(len(prefix) for prefix in ANSWER_PREFIXES)
+    
+    def __init__(self, clean) -> None:
+        self._clean = clean
+        self._raw = ""
+        self.emitted = ""
+    
+    def feed(self, text: str) -> str:
+        """Add generated text; returns the newly releasable cleaned text."""
+        self._raw += text
+        settled, _, tail = self._raw.rpartition("\n")
+        tail = tail.strip()
+        if tail and not tail.startswith("*"):
+            settled = self._raw
+        cleaned = self._clean(settled).rstrip()
+        if cleaned.startswith("**") or ("\n" not in cleaned and len(cleaned) < self.HOLD_CHARS):
+            return ""
+        return self._release(cleaned)
+    
+    def finish(self) -> str:
+        """Remaining cleaned text once generation has ended."""
+        return self._release(self._clean(self._raw))
+    
+    def _release(self, cleaned: str) -> str:
+        if not cleaned.startswith(self.emitted):
+            return ""
+        delta = cleaned[len(self.emitted):]
+        self.emitted = cleaned
+        return delta
+
+
 class RAGAIAdvisor:
     """
     Production RAG-based AI Advisor.
@@ -135,7 +215,8 @@ class RAGAIAdvisor:
         enable_web_search: bool = True,
         telemetry_provider=None,
         vector_store: Optional[VectorKnowledgeStore] = None,
-        max_history: int = 20
+        max_history: int = 20,
+        enable_answer_cache: bool = True
     ):
         """
         Initialize RAG-based AI advisor.
@@ -149,6 +230,7 @@ class RAGAIAdvisor:
             telemetry_provider: Function to get current telemetry data
             vector_store: Optional pre-initialized vector store
             max_history: Maximum conversation history length
+            enable_answer_cache: Reuse answers to repeated or paraphrased questions
         """
         self.use_local_llm = use_local_llm and OLLAMA_AVAILABLE
         self.llm_model = llm_model
@@ -339,6 +421,12 @@ class RAGAIAdvisor:
 - Prioritize safety in all recommendations
 - Be encouraging and supportive"""
 
+        # Answers to repeated/paraphrased questions, invalidated by knowledge and telemetry changes
+        self.answer_cache = None
+        if enable_answer_cache:
+            embed = self.vector_store.embed_query if isinstance(getattr(self.vector_store, "version", None), int) else None
+            self.answer_cache = AnswerCache(embed=embed)
+
         LOGGER.info("RAG AI Advisor initialized (LLM: %s, Vector Store: %s, Web Search: %s)",
                    self.llm_available, self.vector_store is not None, self.web_search is not None)
     
@@ -401,6 +489,82 @@ class RAGAIAdvisor:
         Returns:
             RAGResponse with answer, sources, and metadata
         """
+        draft = self._prepare_answer(question, telemetry, context)
+        if isinstance(draft, RAGResponse):
+            return draft
+        
+        # Step 5: Generate response
+        if self.llm_available:
+            answer = self._generate_llm_response(draft.question, draft.context_text, draft.question_analysis)
+        else:
+            answer = self._generate_template_response(draft.question, draft.retrieved_knowledge, draft.web_search_results)
+        
+        return self._finish_answer(draft, answer)
+    
+    def answer_stream(
+        self,
+        question: str,
+        telemetry: Optional[Dict[str, float]] = None,
+        context: Optional[Dict[str, Any]] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Answer a question using RAG, yielding the answer as it is generated.
+        
+        Yields event dicts:
+            {"type": "sources", "sources": [...]} once retrieval is done, before generation
+            {"type": "token", "text": "..."} for each fragment of the generated answer
+            {"type": "done", "response": RAGResponse} with the final response, as answer() returns it
+        
+        The final answer may extend the streamed text (setup insights, notes).
+        When ``cancel`` is set or the iterator is closed, generation stops
+        and no ``done`` event follows; the exchange is not recorded or cached.
+        
+        Args:
+            question: User's question
+            telemetry: Optional current telemetry data
+            context: Optional additional context
+            cancel: Optional event that stops generation when set
+        """
+        draft = self._prepare_answer(question, telemetry, context)
+        if isinstance(draft, RAGResponse):
+            yield {"type": "sources", "sources": draft.sources}
+            yield {"type": "token", "text": draft.answer}
+            yield {"type": "done", "response": draft}
+            return
+        
+        yield {"type": "sources", "sources": self._extract_sources(draft.retrieved_knowledge, draft.web_search_results)}
+        
+        # Step 5: Generate response, passing fragments on as they arrive
+        if self.llm_available:
+            fragments = self._stream_llm_response(draft.question, draft.context_text, draft.question_analysis, cancel)
+        else:
+            fragments = iter([self._generate_template_response(draft.question, draft.retrieved_knowledge, draft.web_search_results)])
+        
+        answer_parts = []
+        try:
+            for text in fragments:
+                if cancel is not None and cancel.is_set():
+                    break
+                answer_parts.append(text)
+                yield {"type": "token", "text": text}
+        finally:
+            close = getattr(fragments, "close", None)
+            if close:
+                close()
+        if cancel is not None and cancel.is_set():
+            LOGGER.debug("Answer generation cancelled")
+            return
+        
+        yield {"type": "done", "response": self._finish_answer(draft, "".join(answer_parts))}
+    
+    def _prepare_answer(
+        self,
+        question: str,
+        telemetry: Optional[Dict[str, float]],
+        context: Optional[Dict[str, Any]]
+    ) -> Union[RAGResponse, _AnswerDraft]:
+        """Retrieval and context building (steps 0-4); a response if none needs generating."""
         if not question or not question.strip():
             return RAGResponse(
                 answer="Please ask a question.",
@@ -411,6 +575,21 @@ class RAGAIAdvisor:
         question = question.strip()
         start_time = time.time()
         
+        # Get telemetry if provider available
+        if not telemetry and self.telemetry_provider:
+            try:
+                telemetry = self.telemetry_provider()
+            except Exception as e:
+                LOGGER.debug(f"Failed to get telemetry: {e}")
+        
+        # Serve repeated (or paraphrased) questions from the answer cache
+        cache_fingerprint = None
+        if self._is_cacheable(question):
+            cache_fingerprint = self._telemetry_fingerprint(question, telemetry)
+            cached = self.answer_cache.get(question, self._knowledge_version(), cache_fingerprint)
+            if cached is not None:
+                return self._serve_cached_answer(question, cached, telemetry, context, start_time)
+        
         # Step 0: Analyze question with reasoning engine
         question_analysis = None
         if self.reasoning_engine:
@@ -420,13 +599,6 @@ class RAGAIAdvisor:
             except Exception as e:
                 LOGGER.debug(f"Question analysis failed: {e}")
         
-        # Get telemetry if provider available
-        if not telemetry and self.telemetry_provider:
-            try:
-                telemetry = self.telemetry_provider()
-            except Exception as e:
-                LOGGER.debug(f"Failed to get telemetry: {e}")
-        
         # Step 1: Retrieve relevant knowledge
         retrieved_knowledge = []
         if self.vector_store:
@@ -602,34 +774,36 @@ class RAGAIAdvisor:
             except Exception as e:
                 LOGGER.debug(f"Source synthesis failed: {e}")
         
-        # Step 5: Generate response
-        if self.llm_available:
-            answer = self._generate_llm_response(question, context_text, question_analysis)
-        else:
-            answer = self._generate_template_response(question, retrieved_knowledge, web_search_results)
+        return _AnswerDraft(
+            question=question,
+            telemetry=telemetry,
+            context=context,
+            start_time=start_time,
+            question_analysis=question_analysis,
+            retrieved_knowledge=retrieved_knowledge,
+            web_search_results=web_search_results,
+            used_web_search=use_web_search,
+            context_text=context_text,
+            cache_fingerprint=cache_fingerprint
+        )
+    
+    def _finish_answer(self, draft: _AnswerDraft, answer: str) -> RAGResponse:
+        """Post-processing, attribution and bookkeeping for a generated answer (steps 6-12)."""
+        question = draft.question
+        telemetry = draft.telemetry
+        context = draft.context
+        start_time = draft.start_time
+        retrieved_knowledge = draft.retrieved_knowledge
+        web_search_results = draft.web_search_results
         
         # Step 6: Post-process response
         answer = self._post_process_response(answer, question)
         
         # Step 7: Calculate confidence
-        confidence = self._calculate_confidence(retrieved_knowledge, use_web_search, self.llm_available)
+        confidence = self._calculate_confidence(retrieved_knowledge, draft.used_web_search, self.llm_available)
         
         # Step 8: Extract sources
-        sources = []
-        for item in retrieved_knowledge[:3]:
-            sources.append({
-                "text": item["text"][:200],
-                "metadata": item["metadata"],
-                "similarity": item["similarity"]
-            })
-        
-        if web_search_results:
-            for result in web_search_results[:2]:
-                sources.append({
-                    "text": result.get("snippet", "")[:200],
-                    "url": result.get("url", ""),
-                    "title": result.get("title", "")
-                })
+        sources = self._extract_sources(retrieved_knowledge, web_search_results)
         
         # Step 9: Generate follow-up questions
         follow_ups = self._generate_follow_ups(question, retrieved_knowledge)
@@ -658,23 +832,10 @@ class RAGAIAdvisor:
             except Exception as e:
                 LOGGER.debug(f"Answer validation failed: {e}")
         
-        # Store in history
-        self.conversation_history.append(ChatMessage(
-            role="user",
-            content=question,
-            sources=[],
-            confidence=1.0
-        ))
-        self.conversation_history.append(ChatMessage(
-            role="assistant",
-            content=answer,
-            sources=[s.get("title", s.get("text", ""))[:50] for s in sources],
-            confidence=confidence
-        ))
+        # Knowledge added from here on (auto-population) invalidates the cached answer
+        knowledge_version = self._knowledge_version()
         
-        # Keep history manageable
-        if len(self.conversation_history) > self.max_history:
-            self.conversation_history = self.conversation_history[-self.max_history:]
+        self._append_history(question, answer, sources, confidence)
         
         elapsed = time.time() - start_time
         LOGGER.info(f"Generated response in {elapsed:.2f}s (confidence: {confidence:.2f})")
@@ -714,15 +875,129 @@ class RAGAIAdvisor:
             except Exception as e:
                 LOGGER.debug(f"Failed to record interaction: {e}")
         
-        return RAGResponse(
+        response = RAGResponse(
             answer=answer,
             confidence=confidence,
             sources=sources,
-            used_web_search=use_web_search,
+            used_web_search=draft.used_web_search,
             used_telemetry=telemetry is not None,
             follow_up_questions=follow_ups,
             warnings=warnings
         )
+        if draft.cache_fingerprint is not None:
+            self.answer_cache.put(question, self._copy_response(response), knowledge_version, draft.cache_fingerprint)
+        return response
+    
+    @staticmethod
+    def _extract_sources(
+        retrieved_knowledge: List[Dict[str, Any]],
+        web_search_results: Optional[List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Sources shown with an answer: top knowledge entries and web results."""
+        sources = []
+        for item in retrieved_knowledge[:3]:
+            sources.append({
+                "text": item["text"][:200],
+                "metadata": item["metadata"],
+                "similarity": item["similarity"]
+            })
+        
+        if web_search_results:
+            for result in web_search_results[:2]:
+                sources.append({
+                    "text": result.get("snippet", "")[:200],
+                    "url": result.get("url", ""),
+                    "title": result.get("title", ""),
+                    "stale": result.get("stale", False),
+                })
+        return sources
+    
+    def _serve_cached_answer(
+        self,
+        question: str,
+        cached: RAGResponse,
+        telemetry: Optional[Dict[str, float]],
+        context: Optional[Dict[str, Any]],
+        start_time: float
+    ) -> RAGResponse:
+        """Return a cached answer, recording the exchange as for a generated one."""
+        response = self._copy_response(cached)
+        response.used_telemetry = telemetry is not None
+        self._append_history(question, response.answer, response.sources, response.confidence)
+        elapsed = time.time() - start_time
+        LOGGER.debug(f"Served cached answer in {elapsed * 1000:.1f} ms")
+        
+        if self.learning_system:
+            try:
+                self.learning_system.record_interaction(
+                    question=question,
+                    answer=response.answer,
+                    confidence=response.confidence,
+                    sources=response.sources,
+                    session_id=context.get("session_id") if context else None,
+                    vehicle_id=context.get("vehicle_id") if context else None,
+                    response_time=elapsed
+                )
+            except Exception as e:
+                LOGGER.debug(f"Failed to record interaction: {e}")
+        return response
+    
+    @staticmethod
+    def _copy_response(response: RAGResponse) -> RAGResponse:
+        return replace(
+            response,
+            sources=[dict(s) for s in response.sources],
+            follow_up_questions=list(response.follow_up_questions),
+            warnings=list(response.warnings)
+        )
+    
+    def _append_history(self, question: str, answer: str, sources: List[Dict[str, Any]], confidence: float) -> None:
+        """Store a question/answer exchange in the conversation history."""
+        self.conversation_history.append(ChatMessage(
+            role="user",
+            content=question,
+            sources=[],
+            confidence=1.0
+        ))
+        self.conversation_history.append(ChatMessage(
+            role="assistant",
+            content=answer,
+            sources=[s.get("title", s.get("text", ""))[:50] for s in sources],
+            confidence=confidence
+        ))
+        
+        # Keep history manageable
+        if len(self.conversation_history) > self.max_history:
+            self.conversation_history = self.conversation_history[-self.max_history:]
+    
+    def _is_cacheable(self, question: str) -> bool:
+        """Questions whose answers may be reused (not time-sensitive or conversational follow-ups)."""
+        return (
+            self.answer_cache is not None
+            and self._knowledge_version() is not None
+            and len(question.split()) >= 3
+            and not FOLLOW_UP_RE.search(question)
+            and not self._is_current_information_question(question)
+        )
+    
+    def _knowledge_version(self) -> Optional[int]:
+        """Knowledge store version (None if the store does not track changes)."""
+        if self.vector_store is None:
+            return 0
+        version = getattr(self.vector_store, "version", None)
+        return version if isinstance(version, int) else None
+    
+    def _telemetry_fingerprint(self, question: str, telemetry: Optional[Dict[str, float]]) -> Tuple:
+        """
+        The telemetry an answer depends on: the values as formatted into the
+        prompt or passed to setup advice, and which warning thresholds are crossed.
+        """
+        if not telemetry:
+            return (None, ())
+        shown = None
+        if self._is_telemetry_relevant(question) or self._is_setup_question(question):
+            shown = self._format_telemetry(telemetry)
+        return (shown, tuple(self._check_warnings(question, telemetry)))
     
     def _build_context(
         self,
@@ -756,6 +1031,8 @@ class RAGAIAdvisor:
                 snippet = result.get("snippet", "")
                 url = result.get("url", "")
                 source = result.get("source", "web")
+                if result.get("stale"):
+                    source += ", saved from an earlier search - may be out of date"
                 
                 context_parts.append(f"\n[{i}] {title} (Source: {source})")
                 context_parts.append(f"URL: {url}")
@@ -817,17 +1094,84 @@ class RAGAIAdvisor:
     def _generate_ollama_response(self, question: str, context: str, question_analysis: Optional[Dict[str, Any]] = None) -> str:
         """Generate response using Ollama with advanced reasoning."""
         try:
-            # Build reasoning chain if analysis available
-            reasoning_hint = ""
-            if question_analysis and self.reasoning_engine:
-                try:
-                    reasoning_chain = self.reasoning_engine.generate_reasoning_chain(question, question_analysis)
-                    reasoning_hint = f"\n\nReasoning Framework:\n{reasoning_chain}\n"
-                except Exception as e:
-                    LOGGER.debug(f"Failed to generate reasoning chain: {e}")
+            prompt = self._build_ollama_prompt(question, context, question_analysis)
+            
+            # Generate response with better parameters for reasoning
+            response = ollama.generate(
+                model=self.llm_model,
+                prompt=prompt,
+                system=self.system_prompt,
+                options=OLLAMA_OPTIONS
+            )
+            
+            answer = self._clean_llm_answer(response.get("response", ""))
+            return answer if answer else NO_ANSWER
             
-            # Enhanced prompt with chain-of-thought reasoning
-            prompt = f"""Context Information:
+        except Exception as e:
+            LOGGER.error(f"Ollama generation failed: {e}")
+            return f"I encountered an error generating a response: {str(e)}"
+    
+    def _stream_llm_response(
+        self,
+        question: str,
+        context: str,
+        question_analysis: Optional[Dict[str, Any]] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Iterator[str]:
+        """
+        Generate response using LLM, yielding cleaned text as it is generated.
+        
+        The fragments join to what _generate_llm_response returns. Backends
+        without streaming yield their whole answer at once.
+        """
+        if not (self.use_local_llm and OLLAMA_AVAILABLE):
+            yield self._generate_llm_response(question, context, question_analysis)
+            return
+        
+        cleaner = _AnswerStreamCleaner(self._clean_llm_answer)
+        chunks = None
+        try:
+            prompt = self._build_ollama_prompt(question, context, question_analysis)
+            chunks = ollama.generate(
+                model=self.llm_model,
+                prompt=prompt,
+                system=self.system_prompt,
+                options=OLLAMA_OPTIONS,
+                stream=True
+            )
+            for chunk in chunks:
+                if cancel is not None and cancel.is_set():
+                    return
+                text = cleaner.feed(chunk.get("response", ""))
+                if text:
+                    yield text
+            text = cleaner.finish()
+        except Exception as e:
+            LOGGER.error(f"Ollama generation failed: {e}")
+            text = ("\n\n" if cleaner.emitted else "") + f"I encountered an error generating a response: {str(e)}"
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()  # Stops generation when the caller stopped early
+        
+        if not cleaner.emitted and not text:
+            text = NO_ANSWER
+        if text:
+            yield text
+    
+    def _build_ollama_prompt(self, question: str, context: str, question_analysis: Optional[Dict[str, Any]]) -> str:
+        """Chain-of-thought prompt for the local LLM."""
+        # Build reasoning chain if analysis available
+        reasoning_hint = ""
+        if question_analysis and self.reasoning_engine:
+            try:
+                reasoning_chain = self.reasoning_engine.generate_reasoning_chain(question, question_analysis)
+                reasoning_hint = f"\n\nReasoning Framework:\n{reasoning_chain}\n"
+            except Exception as e:
+                LOGGER.debug(f"Failed to generate reasoning chain: {e}")
+        
+        # Enhanced prompt with chain-of-thought reasoning
+        return f"""Context Information:
 {context}
 {reasoning_hint}
 User Question: {question}
@@ -859,60 +1203,46 @@ User Question: {question}
    - Note any uncertainties
 
 Now provide your answer. Be thorough, technical, and helpful. If you're uncertain about anything, explain what you know and what you're not sure about."""
-
-            # Generate response with better parameters for reasoning
-            response = ollama.generate(
-                model=self.llm_model,
-                prompt=prompt,
-                system=self.system_prompt,
-                options={
-                    "temperature": 0.6,  # Slightly lower for more focused reasoning
-                    "top_p": 0.9,
-                    "num_predict": 800,  # More tokens for detailed reasoning
-                    "repeat_penalty": 1.1,  # Reduce repetition
-                }
-            )
-            
-            answer = response.get("response", "").strip()
-            
-            # Clean up response - remove thinking process if it's too verbose
-            lines = answer.split('\n')
-            # Skip lines that are clearly part of thinking process
-            cleaned_lines = []
-            skip_thinking = False
-            for line in lines:
-                if line.strip().startswith('**') and ('Think' in line or 'Step' in line):
-                    skip_thinking = True
-                elif skip_thinking and (line.strip() == '' or not line.strip().startswith('**')):
-                    skip_thinking = False
-                    if line.strip():
-                        cleaned_lines.append(line)
-                elif not skip_thinking:
+    
+    @staticmethod
+    def _clean_llm_answer(answer: str) -> str:
+        """Strip reasoning steps, leading headers and answer prefixes from raw LLM output."""
+        answer = answer.strip()
+        
+        # Clean up response - remove thinking process if it's too verbose
+        lines = answer.split('\n')
+        # Skip lines that are clearly part of thinking process
+        cleaned_lines = []
+        skip_thinking = False
+        for line in lines:
+            if line.strip().startswith('**') and ('Think' in line or 'Step' in line):
+                skip_thinking = True
+            elif skip_thinking and (line.strip() == '' or not line.strip().startswith('**')):
+                skip_thinking = False
+                if line.strip():
                     cleaned_lines.append(line)
-            
-            answer = '\n'.join(cleaned_lines).strip()
-            
-            # Remove thinking markers if present
-            if answer.startswith("**"):
-                # Find first non-markdown line
-                for i, line in enumerate(answer.split('\n')):
-                    if not line.strip().startswith('**') and line.strip():
-                        answer = '\n'.join(answer.split('\n')[i:]).strip()
-                        break
-            
-            # Clean up common prefixes
-            for prefix in ["Answer:", "Response:", "Based on", "Here's"]:
-                if answer.startswith(prefix):
-                    answer = answer[len(prefix):].strip()
-                    if answer.startswith(':'):
-                        answer = answer[1:].strip()
+            elif not skip_thinking:
+                cleaned_lines.append(line)
+        
+        answer = '\n'.join(cleaned_lines).strip()
+        
+        # Remove thinking markers if present
+        if answer.startswith("**"):
+            # Find first non-markdown line
+            for i, line in enumerate(answer.split('\n')):
+                if not line.strip().startswith('**') and line.strip():
+                    answer = '\n'.join(answer.split('\n')[i:]).strip()
                     break
-            
-            return answer if answer else "I need more information to answer that question accurately."
-            
-        except Exception as e:
-            LOGGER.error(f"Ollama generation failed: {e}")
-            return f"I encountered an error generating a response: {str(e)}"
+        
+        # Clean up common prefixes
+        for prefix in ANSWER_PREFIXES:
+            if answer.startswith(prefix):
+                answer = answer[len(prefix):].strip()
+                if answer.startswith(':'):
+                    answer = answer[1:].strip()
+                break
+        
+        return answer
     
     def _generate_openai_response(self, question: str, context: str) -> str:
         """Generate response using OpenAI."""
@@ -1030,6 +1360,8 @@ Please provide a helpful, clear, and conversational answer. Structure it well wi
                     answer_parts.append(f"**{title}**\n{snippet[:300]}")
                     if url:
                         answer_parts.append(f"\n*Source: {url[:60]}...*")
+                    if result.get('stale'):
+                        answer_parts.append("*(Saved from an earlier search - may be out of date)*")
                     if i < len(web_search_results[:2]):
                         answer_parts.append("")
         
@@ -1214,9 +1546,7 @@ Please provide a helpful, clear, and conversational answer. Structure it well wi
         if not self.race_setup_recommender:
             return None
 
-        keywords = ["setup", "handling", "balance", "launch", "traction", "mid corner", "understeer", "oversteer", "drag"]
-        question_lower = question.lower()
-        if not any(kw in question_lower for kw in keywords):
+        if not self._is_setup_question(question):
             return None
 
         try:
@@ -1237,7 +1567,8 @@ Please provide a helpful, clear, and conversational answer. Structure it well wi
                     {
                         "title": r.title,
                         "snippet": r.snippet,
-                        "url": r.url
+                        "url": r.url,
+                        "stale": results.stale,  # Cached result served offline
                     }
                     for r in results.results
                 ]
@@ -1262,6 +1593,11 @@ Please provide a helpful, clear, and conversational answer. Structure it well wi
         question_lower = question.lower()
         return any(ck in question_lower for ck in current_keywords)
     
+    def _is_setup_question(self, question: str) -> bool:
+        """Check if question asks for race setup guidance."""
+        question_lower = question.lower()
+        return any(kw in question_lower for kw in SETUP_KEYWORDS)
+    
     def _is_telemetry_relevant(self, question: str) -> bool:
         """Check if question is about current telemetry."""
         telemetry_keywords = [
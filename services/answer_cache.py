@@ -0,0 +1,192 @@
+"""
+Answer Cache
+
+Multi-tier cache for advisor answers:
+
+- Exact tier: answers keyed by the normalized question text.
+- Semantic tier: near-duplicate questions (paraphrases) found by cosine
+  similarity of question embeddings above a threshold.
+
+Every entry records the knowledge-store version and a fingerprint of the
+telemetry that influenced the answer; an entry whose version or
+fingerprint differs from the current one is dropped instead of served.
+Entries are evicted least-recently-used. Question embeddings come from
+the caller (e.g. the vector store's encoder) or, without one, from a
+hashed bag-of-words embedding.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+HASHED_EMBEDDING_DIM = 1024
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words that do not change what is being asked
+_FILLER_WORDS = frozenset(
+    "a an the is are was were be do does did i me my you your we our it its this that of to in on at for "
+    "with about please can could would will tell explain describe define meaning mean means what whats "
+    "s so just again exactly quick quickly briefly".split()
+)
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return " ".join(question.lower().split()).rstrip(" ?!.")
+
+
+def hashed_embedding(text: str, dim: int = HASHED_EMBEDDING_DIM) -> np.ndarray:
+    """
+    Unit-length hashed bag of content words and word pairs.
+
+    A dependency-free stand-in for a sentence encoder: paraphrases that only
+    change filler words ("what's X", "explain X") map to the same vector.
+    """
+    words = [w for w in _TOKEN_RE.findall(text.lower()) if w not in _FILLER_WORDS]
+    words = [w[:-1] if len(w) > 3 and w.endswith("s") else w for w in words]  # Crude plural folding
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        vector[int.from_bytes(digest[:4], "little") % dim] += 1.0 if digest[4] & 1 else -1.0
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+@dataclass
+class _Entry:
+    key: str
+    value: Any
+    version: Hashable
+    fingerprint: Hashable
+    embedding: Optional[np.ndarray]
+    created: float
+
+
+class AnswerCache:
+    """LRU answer cache with exact and semantic (near-duplicate) lookup."""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        similarity_threshold: float = 0.9,
+        embed: Optional[Callable[[str], Optional[Sequence[float]]]] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize answer cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            embed: Question embedding function (hashed bag of words if None or if it returns None)
+            ttl_seconds: Optional maximum entry age
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed
+        self.ttl_seconds = ttl_seconds
+        self.stats: Dict[str, int] = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "invalidated": 0}
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._matrix: Optional[np.ndarray] = None  # Stacked embeddings, rebuilt when entries change
+        self._matrix_keys: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def embedding(self, question: str) -> np.ndarray:
+        """Unit-length embedding of a question."""
+        vector = self.embed(question) if self.embed else None
+        if vector is None:
+            return hashed_embedding(question)
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def get(self, question: str, version: Hashable, fingerprint: Hashable = ()) -> Optional[Any]:
+        """
+        Cached value for the question (or a paraphrase of it), if still valid.
+
+        Args:
+            question: Question text
+            version: Current knowledge-store version
+            fingerprint: Current telemetry fingerprint for this question
+        """
+        key = normalize_question(question)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._valid(entry, version, fingerprint):
+                self._entries.move_to_end(key)
+                self.stats["exact_hits"] += 1
+                return entry.value
+
+        if self.similarity_threshold <= 1.0 and self._entries:
+            query = self.embedding(question)
+            with self._lock:
+                entry = self._nearest(query)
+                if entry is not None and self._valid(entry, version, fingerprint):
+                    self._entries.move_to_end(entry.key)
+                    self.stats["semantic_hits"] += 1
+                    return entry.value
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, question: str, value: Any, version: Hashable, fingerprint: Hashable = ()) -> None:
+        """Store a value for the question."""
+        key = normalize_question(question)
+        embedding = self.embedding(question) if self.similarity_threshold <= 1.0 else None
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = _Entry(key, value, version, fingerprint, embedding, time.time())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._matrix = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+    def hit_rate(self) -> float:
+        hits = self.stats["exact_hits"] + self.stats["semantic_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def _valid(self, entry: _Entry, version: Hashable, fingerprint: Hashable) -> bool:
+        expired = self.ttl_seconds is not None and time.time() - entry.created > self.ttl_seconds
+        if not expired and entry.version == version and entry.fingerprint == fingerprint:
+            return True
+        # Stale: drop it so it is neither served nor matched again
+        del self._entries[entry.key]
+        self._matrix = None
+        self.stats["invalidated"] += 1
+        return False
+
+    def _nearest(self, query: np.ndarray) -> Optional[_Entry]:
+        if self._matrix is None:
+            self._matrix_keys = [k for k, e in self._entries.items() if e.embedding is not None]
+            if not self._matrix_keys:
+                return None
+            self._matrix = np.stack([self._entries[k].embedding for k in self._matrix_keys])
+        if self._matrix.shape[1] != query.shape[0]:
+            return None
+        similarities = self._matrix @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        return self._entries.get(self._matrix_keys[best])
+
+
+__all__ = ["AnswerCache", "hashed_embedding", "normalize_question"]
@@ -267,7 +267,38 @@ class AutoTuningEngine:
         """
         self.learned_optimal[condition_key] = optimal_values
         LOGGER.info(f"Learned optimal settings for condition: {condition_key}")
-    
+
+    def analyze_log(self, log_data, tuning_map, **engine_kwargs):
+        """
+        Compute per-cell corrections for a map from a whole parsed log.
+
+        Unlike analyze_and_tune(), which looks at one telemetry snapshot, this
+        bins every sample of the log into the map's RPM x load cells.
+
+        Args:
+            log_data: LogData from UniversalLogParser
+            tuning_map: TuningMap with rpm_axis/load_axis in its data
+            **engine_kwargs: Passed to MapCorrectionEngine
+
+        Returns:
+            CellCorrectionTable
+        """
+        from services.map_correction_engine import MapCorrectionEngine
+
+        engine = MapCorrectionEngine.from_tuning_map(tuning_map, **engine_kwargs)
+        table = engine.analyze_log(log_data)
+        self.tuning_history.append(
+            {
+                "parameter": tuning_map.category.value,
+                "map": tuning_map.name,
+                "samples_used": table.samples_used,
+                "cells_hit": int((table.hit_count > 0).sum()),
+                "timestamp": time.time(),
+                "reason": "batch log correction",
+            }
+        )
+        return table
+
     def use_advanced_engine(self) -> bool:
         """
         Check if advanced tuning engine is available and should be used.
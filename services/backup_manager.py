@@ -1,20 +1,28 @@
 """
 Backup Manager Service
 Auto-backup and version control for ECU tuning files and global configuration
+
+Backups are stored deduplicated in a content-addressed chunk store
+(``services.chunk_store``): each backup is a manifest of hash-keyed chunks,
+so repeated saves of a file with small edits only add the changed chunks.
+Backups made by earlier versions (plain or ``.gz`` copies) remain readable.
 """
 
 from __future__ import annotations
 
+import gzip
 import hashlib
 import json
 import logging
-import shutil
+import os
 import time
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from .chunk_store import MANIFEST_SUFFIX, ChunkStore
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -68,8 +76,8 @@ class BackupManager:
     - Auto-backup on file save/change
     - Version control with revert capability
     - Configurable backup retention
-    - File integrity checking (hash)
-    - Backup compression
+    - File integrity checking (hash), verified on revert
+    - Deduplicated, compressed chunk storage
     - Global and per-file backup settings
     """
     
@@ -100,6 +108,9 @@ class BackupManager:
         (self.backup_dir / "dashboard").mkdir(exist_ok=True)
         (self.backup_dir / "global").mkdir(exist_ok=True)
         
+        # Deduplicated chunk store shared by all backup types
+        self.chunk_store = ChunkStore(self.backup_dir / "store", compress=self.settings.compress_backups)
+        
         # Backup registry (in-memory index)
         self.backup_registry: Dict[str, List[BackupEntry]] = {}
         self._load_registry()
@@ -143,8 +154,8 @@ class BackupManager:
                 return None  # Too soon since last backup
         
         try:
-            # Calculate file hash
-            file_hash = self._calculate_file_hash(file_path_obj)
+            data = file_path_obj.read_bytes()
+            file_hash = hashlib.sha256(data).hexdigest()
             
             # Check if identical backup already exists
             existing_backups = self.backup_registry.get(file_path, [])
@@ -154,27 +165,17 @@ class BackupManager:
                     LOGGER.debug("File unchanged, skipping backup: %s", file_path)
                     return latest  # Return existing backup
             
-            # Generate backup filename
+            # Generate backup ID (unique even for several backups within a second)
             timestamp = time.time()
-            backup_id = f"{int(timestamp)}_{hashlib.md5(file_path.encode()).hexdigest()[:8]}"
-            backup_filename = f"{file_path_obj.stem}_{backup_id}{file_path_obj.suffix}"
-            
-            # Determine backup subdirectory
-            backup_subdir = self.backup_dir / backup_type.value
-            backup_path = backup_subdir / backup_filename
+            base_id = backup_id = f"{int(timestamp)}_{hashlib.md5(file_path.encode()).hexdigest()[:8]}"
+            existing_ids = {b.backup_id for b in existing_backups}
+            suffix = 1
+            while backup_id in existing_ids:
+                backup_id = f"{base_id}_{suffix}"
+                suffix += 1
             
-            # Copy file
-            shutil.copy2(file_path_obj, backup_path)
-            
-            # Compress if enabled
-            if self.settings.compress_backups:
-                compressed_path = backup_path.with_suffix(backup_path.suffix + ".gz")
-                import gzip
-                with open(backup_path, 'rb') as f_in:
-                    with gzip.open(compressed_path, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-                backup_path.unlink()  # Remove uncompressed
-                backup_path = compressed_path
+            # Store only chunks not already in the store
+            backup_path, _ = self.chunk_store.put(data, f"{backup_type.value}_{file_path_obj.stem}_{backup_id}")
             
             # Create backup entry
             backup_entry = BackupEntry(
@@ -183,7 +184,7 @@ class BackupManager:
                 file_path=str(file_path_obj.absolute()),
                 backup_path=str(backup_path.absolute()),
                 timestamp=timestamp,
-                file_size=file_path_obj.stat().st_size,
+                file_size=len(data),
                 file_hash=file_hash,
                 description=description or f"Auto-backup at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))}",
                 metadata=metadata or {},
@@ -200,10 +201,7 @@ class BackupManager:
                 # Remove oldest backups
                 to_remove = backups[:-self.settings.max_backups_per_file]
                 for old_backup in to_remove:
-                    try:
-                        Path(old_backup.backup_path).unlink()
-                    except Exception:
-                        pass
+                    self._remove_backup_data(old_backup)
                 self.backup_registry[file_path] = backups[-self.settings.max_backups_per_file:]
             
             # Update last backup time
@@ -251,6 +249,12 @@ class BackupManager:
                 LOGGER.error("Backup file does not exist: %s", backup_path)
                 return False
             
+            # Read and verify the backup before touching the file
+            data = self._read_backup_data(backup_entry)
+            if hashlib.sha256(data).hexdigest() != backup_entry.file_hash:
+                LOGGER.error("Backup failed verification (hash mismatch): %s", backup_entry.backup_id)
+                return False
+            
             # Create backup of current file if it exists
             if create_backup and file_path.exists():
                 self.create_backup(
@@ -260,21 +264,11 @@ class BackupManager:
                     force=True
                 )
             
-            # Decompress if needed
-            if backup_path.suffix == ".gz":
-                import gzip
-                temp_path = backup_path.with_suffix("")
-                with gzip.open(backup_path, 'rb') as f_in:
-                    with open(temp_path, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-                backup_path = temp_path
-            
-            # Restore file
-            shutil.copy2(backup_path, file_path)
-            
-            # Cleanup temp file if decompressed
-            if backup_path.suffix == "" and Path(backup_entry.backup_path).suffix == ".gz":
-                backup_path.unlink()
+            # Restore file (write beside it, then replace)
+            temp_path = file_path.with_name(file_path.name + ".restore")
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, file_path)
             
             LOGGER.info("Reverted file to backup: %s (backup: %s)", file_path, backup_entry.backup_id)
             return True
@@ -283,12 +277,27 @@ class BackupManager:
             LOGGER.error("Failed to revert file: %s", e)
             return False
     
+    def _read_backup_data(self, backup_entry: BackupEntry) -> bytes:
+        """Content of a backup (chunk store manifest, or a plain/.gz copy from earlier versions)."""
+        backup_path = Path(backup_entry.backup_path)
+        if backup_path.name.endswith(MANIFEST_SUFFIX):
+            return self.chunk_store.get(backup_path)
+        if backup_path.suffix == ".gz":
+            return gzip.decompress(backup_path.read_bytes())
+        return backup_path.read_bytes()
+    
+    def _remove_backup_data(self, backup_entry: BackupEntry) -> None:
+        """Delete a backup's stored data; chunks still used by other backups are kept."""
+        backup_path = Path(backup_entry.backup_path)
+        if backup_path.name.endswith(MANIFEST_SUFFIX):
+            self.chunk_store.delete(backup_path)
+        elif backup_path.exists():
+            backup_path.unlink()
+    
     def delete_backup(self, backup_entry: BackupEntry) -> bool:
         """Delete a backup entry."""
         try:
-            backup_path = Path(backup_entry.backup_path)
-            if backup_path.exists():
-                backup_path.unlink()
+            self._remove_backup_data(backup_entry)
             
             # Remove from registry
             if backup_entry.file_path in self.backup_registry:
@@ -313,11 +322,11 @@ class BackupManager:
         deleted_count = 0
         current_time = time.time()
         
-        # Daily backups (keep N days)
-        daily_threshold = current_time - (self.settings.keep_daily_backups * 24 * 3600)
+        # Daily backups (keep N days), as a maximum age
+        daily_threshold = self.settings.keep_daily_backups * 24 * 3600
         
-        # Weekly backups (keep N weeks)
-        weekly_threshold = current_time - (self.settings.keep_weekly_backups * 7 * 24 * 3600)
+        # Weekly backups (keep N weeks), as a maximum age
+        weekly_threshold = self.settings.keep_weekly_backups * 7 * 24 * 3600
         
         for file_path, backups in list(self.backup_registry.items()):
             # Keep most recent backups
@@ -358,6 +367,11 @@ class BackupManager:
             self.backup_registry[file_path] = backups_to_keep
         
         self._save_registry()
+        
+        # Chunks are released as backups are deleted; also drop any unreferenced leftovers
+        orphans, freed = self.chunk_store.collect_garbage()
+        if orphans:
+            LOGGER.info("Removed %d unreferenced backup chunks (%d bytes)", orphans, freed)
         LOGGER.info("Cleaned up %d old backups", deleted_count)
         return deleted_count
     
@@ -426,12 +440,15 @@ class BackupManager:
         """Get backup statistics."""
         total_backups = sum(len(backups) for backups in self.backup_registry.values())
         total_files = len(self.backup_registry)
-        total_size = 0
+        logical_size = sum(b.file_size for backups in self.backup_registry.values() for b in backups)
         
+        # Chunk store (shared by all backups) plus copies made by earlier versions
+        store_usage = self.chunk_store.disk_usage()
+        total_size = store_usage["chunk_bytes"] + store_usage["manifest_bytes"]
         for backups in self.backup_registry.values():
             for backup in backups:
                 backup_path = Path(backup.backup_path)
-                if backup_path.exists():
+                if not backup_path.name.endswith(MANIFEST_SUFFIX) and backup_path.exists():
                     total_size += backup_path.stat().st_size
         
         return {
@@ -439,21 +456,8 @@ class BackupManager:
             "total_files": total_files,
             "total_size_bytes": total_size,
             "total_size_mb": total_size / (1024 * 1024),
+            "logical_size_bytes": logical_size,
+            "dedup_ratio": logical_size / total_size if total_size else 0.0,
+            "chunk_count": store_usage["chunk_count"],
             "backup_directory": str(self.backup_dir),
         }
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
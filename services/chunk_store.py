@@ -0,0 +1,263 @@
+"""
+Chunk Store
+
+Content-addressed, deduplicated storage for file versions (used by the
+backup manager).
+
+Files are split with content-defined chunking: a Gear rolling hash over a
+32-byte window is computed for every byte position (vectorized with numpy)
+and a chunk ends where its top bits are zero, within min/max size limits.
+Boundaries therefore move with the content, so a small edit changes only
+the chunks around it. Chunks are stored once, keyed by SHA-256, optionally
+zlib-compressed. Each stored version is a manifest listing its chunks;
+chunks are reference-counted by manifests and removed when no manifest
+uses them.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MIN_CHUNK = 4 * 1024
+DEFAULT_AVG_CHUNK = 16 * 1024
+DEFAULT_MAX_CHUNK = 64 * 1024
+
+MANIFEST_SUFFIX = ".manifest.gz"
+
+# Fixed per-byte Gear values (derived, not random, so boundaries never change)
+_GEAR = np.array(
+    [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], "little") for i in range(256)],
+    dtype=np.uint32,
+)
+
+_RAW = b"r"
+_ZLIB = b"z"
+
+
+def chunk_boundaries(
+    data: bytes,
+    min_size: int = DEFAULT_MIN_CHUNK,
+    avg_size: int = DEFAULT_AVG_CHUNK,
+    max_size: int = DEFAULT_MAX_CHUNK,
+) -> List[int]:
+    """
+    Content-defined chunk end offsets for ``data``.
+
+    Returns:
+        Increasing end offsets; the last one is ``len(data)`` (empty list for empty data)
+    """
+    n = len(data)
+    if n <= min_size:
+        return [n] if n else []
+
+    # Gear hash h_i = sum_j G[b_(i-j)] << j (mod 2^32), built by window doubling
+    h = _GEAR[np.frombuffer(data, dtype=np.uint8)]
+    width = 1
+    while width < 32:
+        h[width:] += h[:-width] << np.uint32(width)
+        width *= 2
+
+    bits = max(1, int(avg_size).bit_length() - 1)
+    mask = np.uint32(((1 << bits) - 1) << (32 - bits))  # Top bits depend on the whole window
+    candidates = np.flatnonzero((h & mask) == 0) + 1
+
+    ends = []
+    position = 0
+    while position < n:
+        i = int(np.searchsorted(candidates, position + min_size))
+        if i < candidates.size and candidates[i] <= position + max_size:
+            end = int(candidates[i])
+        else:
+            end = min(position + max_size, n)
+        ends.append(end)
+        position = end
+    return ends
+
+
+class ChunkStore:
+    """Deduplicated storage of file versions as manifests of hash-keyed chunks."""
+
+    def __init__(
+        self,
+        root: Path,
+        compress: bool = True,
+        min_size: int = DEFAULT_MIN_CHUNK,
+        avg_size: int = DEFAULT_AVG_CHUNK,
+        max_size: int = DEFAULT_MAX_CHUNK,
+    ) -> None:
+        self.root = Path(root)
+        self.chunks_dir = self.root / "chunks"
+        self.manifests_dir = self.root / "manifests"
+        self.chunks_dir.mkdir(parents=True, exist_ok=True)
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        self.compress = compress
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+        self._refs: Optional[Counter] = None
+
+    @property
+    def refs(self) -> Counter:
+        """Chunk digest -> number of manifest references (built from the manifests on first use)."""
+        if self._refs is None:
+            refs: Counter = Counter()
+            for manifest_path in self.manifests_dir.glob(f"*{MANIFEST_SUFFIX}"):
+                try:
+                    refs.update(digest for digest, _ in self.read_manifest(manifest_path)["chunks"])
+                except Exception as e:
+                    LOGGER.error("Failed to read manifest %s: %s", manifest_path, e)
+            self._refs = refs
+        return self._refs
+
+    def put(self, data: bytes, name: str) -> Tuple[Path, str]:
+        """
+        Store a file version.
+
+        Args:
+            data: File content
+            name: Manifest name (unique per version)
+
+        Returns:
+            (manifest path, SHA-256 of the content)
+        """
+        refs = self.refs
+        chunks = []
+        start = 0
+        for end in chunk_boundaries(data, self.min_size, self.avg_size, self.max_size):
+            chunk = data[start:end]
+            digest = hashlib.sha256(chunk).hexdigest()
+            if not refs[digest]:
+                self._write_chunk(digest, chunk)
+            chunks.append((digest, end - start))
+            start = end
+
+        file_hash = hashlib.sha256(data).hexdigest()
+        manifest = {"version": 1, "size": len(data), "file_hash": file_hash, "chunks": chunks}
+        manifest_path = self.manifests_dir / f"{name}{MANIFEST_SUFFIX}"
+        self._write_atomic(manifest_path, gzip.compress(json.dumps(manifest).encode("utf-8"), mtime=0))
+        refs.update(digest for digest, _ in chunks)
+        return manifest_path, file_hash
+
+    def get(self, manifest_path: Path) -> bytes:
+        """
+        Reassemble a stored version, verifying every chunk and the whole file.
+
+        Raises:
+            ValueError: If a chunk or the reassembled file does not match its hash
+            OSError: If the manifest or a chunk is missing
+        """
+        manifest = self.read_manifest(manifest_path)
+        parts = []
+        for digest, size in manifest["chunks"]:
+            chunk = self._read_chunk(digest)
+            if len(chunk) != size or hashlib.sha256(chunk).hexdigest() != digest:
+                raise ValueError(f"Corrupt chunk {digest} in {manifest_path}")
+            parts.append(chunk)
+        data = b"".join(parts)
+        if len(data) != manifest["size"] or hashlib.sha256(data).hexdigest() != manifest["file_hash"]:
+            raise ValueError(f"Reassembled file does not match {manifest_path}")
+        return data
+
+    def delete(self, manifest_path: Path) -> int:
+        """
+        Remove a stored version and every chunk no other version uses.
+
+        Returns:
+            Bytes freed
+        """
+        manifest_path = Path(manifest_path)
+        try:
+            digests = [digest for digest, _ in self.read_manifest(manifest_path)["chunks"]]
+        except FileNotFoundError:
+            return 0
+        refs = self.refs  # Counted before the unlink, so the deleted manifest is subtracted once
+        freed = manifest_path.stat().st_size
+        manifest_path.unlink()
+
+        refs.subtract(digests)
+        for digest in set(digests):
+            if refs[digest] <= 0:
+                del refs[digest]
+                freed += self._remove_chunk(digest)
+        return freed
+
+    def collect_garbage(self) -> Tuple[int, int]:
+        """
+        Remove chunk files no manifest references (e.g. left by an interrupted backup).
+
+        Returns:
+            (chunks removed, bytes freed)
+        """
+        self._refs = None  # Recount from the manifests on disk
+        refs = self.refs
+        removed = freed = 0
+        for chunk_path in self.chunks_dir.glob("*/*"):
+            if not refs[chunk_path.name]:
+                freed += self._remove_chunk(chunk_path.name)
+                removed += 1
+        return removed, freed
+
+    def disk_usage(self) -> Dict[str, int]:
+        """Bytes used by chunks and manifests, and the chunk count."""
+        chunk_files = [p for p in self.chunks_dir.glob("*/*") if p.is_file()]
+        return {
+            "chunk_count": len(chunk_files),
+            "chunk_bytes": sum(p.stat().st_size for p in chunk_files),
+            "manifest_bytes": sum(p.stat().st_size for p in self.manifests_dir.glob(f"*{MANIFEST_SUFFIX}")),
+        }
+
+    @staticmethod
+    def read_manifest(manifest_path: Path) -> Dict:
+        with open(manifest_path, "rb") as f:
+            return json.loads(gzip.decompress(f.read()))
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunks_dir / digest[:2] / digest
+
+    def _write_chunk(self, digest: str, chunk: bytes) -> None:
+        path = self._chunk_path(digest)
+        if path.exists():
+            return  # Unreferenced leftover with the same content
+        payload = _RAW + chunk
+        if self.compress:
+            packed = zlib.compress(chunk, 6)
+            if len(packed) < len(chunk):
+                payload = _ZLIB + packed
+        path.parent.mkdir(exist_ok=True)
+        self._write_atomic(path, payload)
+
+    def _read_chunk(self, digest: str) -> bytes:
+        with open(self._chunk_path(digest), "rb") as f:
+            payload = f.read()
+        return zlib.decompress(payload[1:]) if payload[:1] == _ZLIB else payload[1:]
+
+    def _remove_chunk(self, digest: str) -> int:
+        path = self._chunk_path(digest)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            return size
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _write_atomic(path: Path, payload: bytes) -> None:
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+
+
+__all__ = ["ChunkStore", "MANIFEST_SUFFIX", "chunk_boundaries"]
@@ -0,0 +1,429 @@
+"""
+Columnar Log Reader
+
+Chunked reader for delimited (CSV/TSV) data logs that produces one contiguous
+float64 column per channel instead of a dict or list entry per cell.
+
+The file is read ``chunk_rows`` lines at a time. With NumPy available each
+chunk is parsed by ``np.loadtxt`` (C parser). Empty cells are filled with a
+regex pass before retrying ``loadtxt``; only chunks with text values or
+ragged rows are re-parsed row by row, so dirty files stay correct and clean
+files stay fast. Without NumPy, columns are accumulated in ``array('d')``
+buffers, which are still contiguous doubles. Peak memory is the output
+columns plus a few copies of one chunk of text.
+
+Header handling (column names, unit detection, optional units row and which
+columns are time axes) happens once per file, not per row.
+
+For logs too large to hold as columns, ``read_header`` and ``iter_chunks``
+stream (rows, channels) blocks of bounded size instead, optionally over a
+byte range of the file so several processes can share one log.
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import logging
+import math
+import os
+import re
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None  # type: ignore
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+TIME_COLUMN_NAMES = ("time", "timestamp", "t")
+
+# "Boost (psi)", "Oil Temp [degF]"
+_UNIT_SUFFIX = re.compile(r"^(?P<name>.*?)\s*[\(\[](?P<unit>[^\)\]]{1,16})[\)\]]\s*$")
+
+Column = Union["np.ndarray", array]
+
+
+@dataclass
+class ColumnarLog:
+    """Delimited log parsed into columns."""
+
+    columns: List[str]  # Header names in file order (stripped)
+    data: Dict[str, Column]  # Column name -> float64 values (one per row)
+    units: Dict[str, str] = field(default_factory=dict)
+    time_columns: List[str] = field(default_factory=list)
+    row_count: int = 0
+    engine: str = "python"
+
+    @property
+    def time_column(self) -> Optional[str]:
+        """First column that looks like a time axis, if any."""
+        return self.time_columns[0] if self.time_columns else None
+
+
+@dataclass
+class DelimitedHeader:
+    """Header of a delimited log and where its data starts."""
+
+    columns: List[str]
+    units: Dict[str, str] = field(default_factory=dict)
+    time_columns: List[str] = field(default_factory=list)
+    data_offset: int = 0  # Byte offset of the first data line
+
+    @property
+    def time_column(self) -> Optional[str]:
+        """First column that looks like a time axis, if any."""
+        return self.time_columns[0] if self.time_columns else None
+
+
+def split_unit(name: str) -> Tuple[str, Optional[str]]:
+    """Split ``"Boost (psi)"`` into ``("Boost", "psi")``."""
+    match = _UNIT_SUFFIX.match(name)
+    if not match or not match.group("name"):
+        return name, None
+    return match.group("name"), match.group("unit").strip()
+
+
+def _to_float(value: Optional[str], missing: float) -> float:
+    if value is None:
+        return missing
+    try:
+        return float(value)
+    except ValueError:
+        return missing
+
+
+def _looks_like_units_row(cells: Sequence[str]) -> bool:
+    """True if a row has text but no numbers (MoTeC-style units line)."""
+    filled = [c.strip() for c in cells if c and c.strip()]
+    if not filled:
+        return False
+    for cell in filled:
+        try:
+            float(cell)
+            return False
+        except ValueError:
+            continue
+    return True
+
+
+def _python_rows(lines: Iterable[str], delimiter: str) -> Iterator[List[str]]:
+    return csv.reader(lines, delimiter=delimiter)
+
+
+def read_delimited(
+    file_path: Union[str, Path],
+    delimiter: str = ",",
+    missing: float = math.nan,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    engine: str = "auto",
+    detect_units_row: bool = True,
+    encoding: str = "utf-8",
+) -> ColumnarLog:
+    """
+    Read a delimited log into float64 columns.
+
+    Args:
+        file_path: Log file; the first non-blank line is the header
+        delimiter: Field delimiter (``","`` or ``"\\t"``)
+        missing: Value stored for empty, non-numeric or absent cells
+        chunk_rows: Lines parsed per chunk (bounds the text held in memory)
+        engine: ``"numpy"``, ``"python"`` or ``"auto"`` (numpy when installed)
+        detect_units_row: Treat a text-only line right after the header as units
+        encoding: File encoding; undecodable bytes are ignored
+
+    Returns:
+        ColumnarLog with one column per header name. Duplicate header names
+        keep the first occurrence.
+    """
+    if engine == "auto":
+        engine = "numpy" if NUMPY_AVAILABLE else "python"
+    if engine == "numpy" and not NUMPY_AVAILABLE:
+        raise ImportError("NumPy is required for engine='numpy'")
+    if engine not in ("numpy", "python"):
+        raise ValueError(f"Unknown engine: {engine}")
+    chunk_rows = max(1, int(chunk_rows))
+
+    with open(file_path, "r", encoding=encoding, errors="ignore", newline="") as f:
+        lines = (line for line in f if line.strip())
+        header_line = next(lines, None)
+        if header_line is None:
+            return ColumnarLog(columns=[], data={}, engine=engine)
+
+        columns, units, time_columns = _parse_header(header_line, delimiter)
+        width = len(columns)
+
+        # Units row (MoTeC/AiM CSV exports) - checked once, before any data
+        first = next(lines, None)
+        if first is not None and detect_units_row and _apply_units_row(first, delimiter, columns, units):
+            first = None
+        if first is not None:
+            lines = itertools.chain([first], lines)
+
+        if engine == "numpy":
+            size_hint = os.fstat(f.fileno()).st_size
+            matrix = _read_numpy(lines, delimiter, width, missing, chunk_rows, size_hint)
+            row_count = matrix.shape[1]
+            data: Dict[str, Column] = {}
+            for index, name in enumerate(columns):
+                if name not in data:
+                    data[name] = matrix[index]  # Contiguous row of a column-major matrix
+        else:
+            buffers = _read_python(lines, delimiter, width, missing, chunk_rows)
+            row_count = len(buffers[0]) if buffers else 0
+            data = {}
+            for index, name in enumerate(columns):
+                if name not in data:
+                    data[name] = buffers[index]
+
+    return ColumnarLog(
+        columns=columns,
+        data=data,
+        units=units,
+        time_columns=time_columns,
+        row_count=row_count,
+        engine=engine,
+    )
+
+
+def _parse_header(header_line: str, delimiter: str) -> Tuple[List[str], Dict[str, str], List[str]]:
+    """Column names, units from name suffixes and time columns."""
+    columns = [name.strip() for name in next(_python_rows([header_line], delimiter))]
+    units: Dict[str, str] = {}
+    for name in columns:
+        unit = split_unit(name)[1]
+        if unit:
+            units[name] = unit
+    time_columns = [name for name in columns if name.lower() in TIME_COLUMN_NAMES]
+    return columns, units, time_columns
+
+
+def _apply_units_row(line: str, delimiter: str, columns: List[str], units: Dict[str, str]) -> bool:
+    """Record units from ``line`` if it is a units row."""
+    cells = next(_python_rows([line], delimiter), [])
+    if not _looks_like_units_row(cells):
+        return False
+    for name, unit in zip(columns, cells):
+        if unit.strip():
+            units[name] = unit.strip()
+    return True
+
+
+def read_header(
+    file_path: Union[str, Path],
+    delimiter: str = ",",
+    detect_units_row: bool = True,
+    encoding: str = "utf-8",
+) -> DelimitedHeader:
+    """Read only the header (and units row) of a delimited log."""
+    offset = 0
+    with open(file_path, "rb") as f:
+        header_line = None
+        for raw in f:
+            offset += len(raw)
+            line = raw.decode(encoding, errors="ignore")
+            if line.strip():
+                header_line = line
+                break
+        if header_line is None:
+            return DelimitedHeader(columns=[], data_offset=offset)
+
+        columns, units, time_columns = _parse_header(header_line, delimiter)
+        if detect_units_row:
+            for raw in f:
+                line = raw.decode(encoding, errors="ignore")
+                if line.strip():
+                    if _apply_units_row(line, delimiter, columns, units):
+                        offset += len(raw)
+                    break
+                offset += len(raw)
+    return DelimitedHeader(columns=columns, units=units, time_columns=time_columns, data_offset=offset)
+
+
+def iter_chunks(
+    file_path: Union[str, Path],
+    header: DelimitedHeader,
+    delimiter: str = ",",
+    missing: float = math.nan,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    encoding: str = "utf-8",
+) -> Iterator["np.ndarray"]:
+    """
+    Stream a delimited log as (rows, len(header.columns)) float64 blocks.
+
+    Reads about ``chunk_bytes`` of text per block, so memory is bounded by
+    the chunk size rather than the file size. With ``start``/``end``, only
+    lines that begin inside that byte range are returned; adjacent ranges
+    therefore cover every line exactly once.
+
+    Args:
+        file_path: Log file
+        header: From ``read_header``
+        delimiter: Field delimiter
+        missing: Value stored for empty, non-numeric or absent cells
+        chunk_bytes: Approximate text per block
+        start: First byte of the range (default: first data line)
+        end: End of the range, exclusive (default: end of file)
+        encoding: File encoding; undecodable bytes are ignored
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("NumPy is required for iter_chunks")
+    width = len(header.columns)
+    if not width:
+        return
+    chunk_bytes = max(1, int(chunk_bytes))
+
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if start is None or start <= header.data_offset:
+            position = header.data_offset
+            f.seek(position)
+        else:
+            # The line straddling ``start`` belongs to the previous range
+            f.seek(start - 1)
+            position = start - 1 + len(f.readline())
+
+        while position < end:
+            block = f.read(min(chunk_bytes, end - position))
+            if not block:
+                break
+            if not block.endswith(b"\n"):
+                block += f.readline()  # Finish the last line
+            position += len(block)
+            lines = block.decode(encoding, errors="ignore").splitlines(keepends=True)
+            if any(not line.strip() for line in lines):
+                lines = [line for line in lines if line.strip()]
+            if lines:
+                yield _parse_chunk_numpy(lines, delimiter, width, missing)
+
+
+def _read_numpy(
+    lines: Iterator[str],
+    delimiter: str,
+    width: int,
+    missing: float,
+    chunk_rows: int,
+    size_hint: int = 0,
+) -> "np.ndarray":
+    """
+    Parse all remaining lines into a (width, rows) float64 matrix.
+
+    Columns are stored as matrix rows so every channel is one contiguous
+    slice. Capacity is estimated from the file size and the first chunk's
+    bytes per line, so large files are normally allocated once.
+    """
+    matrix = None
+    rows = 0
+    while True:
+        chunk = list(itertools.islice(lines, chunk_rows))
+        if not chunk:
+            break
+        block = _parse_chunk_numpy(chunk, delimiter, width, missing)
+        needed = rows + block.shape[0]
+        if matrix is None:
+            bytes_per_line = max(1.0, sum(len(line) for line in chunk) / len(chunk))
+            estimate = int(size_hint / bytes_per_line * 1.05) if size_hint else 0
+            matrix = np.empty((width, max(needed, estimate)), dtype=np.float64)
+        elif needed > matrix.shape[1]:
+            # Estimate was short: grow geometrically so total copying stays linear
+            grown = np.empty((width, max(needed, int(matrix.shape[1] * 1.5))), dtype=np.float64)
+            grown[:, :rows] = matrix[:, :rows]
+            matrix = grown
+        matrix[:, rows:needed] = block.T
+        rows = needed
+
+    if matrix is None:
+        return np.empty((width, 0), dtype=np.float64)
+    if matrix.shape[1] > rows * 1.1:
+        return matrix[:, :rows].copy()  # Release a badly over-estimated allocation
+    return matrix[:, :rows]
+
+
+def _fill_empty_fields(text: str, delimiter: str, fill: str) -> str:
+    """Put ``fill`` in every empty field of newline-terminated lines."""
+    d = delimiter
+    text = text.replace(d + d, d + fill + d).replace(d + d, d + fill + d)  # Second pass: runs of empties
+    text = text.replace(d + "\r\n", d + fill + "\r\n").replace(d + "\n", d + fill + "\n")
+    text = text.replace("\n" + d, "\n" + fill + d)
+    if text.endswith(d):  # Last line without a newline
+        text += fill
+    return fill + text if text.startswith(d) else text
+
+
+def _parse_chunk_numpy(chunk: List[str], delimiter: str, width: int, missing: float) -> "np.ndarray":
+    """Parse one chunk with np.loadtxt, falling back to csv for odd rows."""
+    block = _loadtxt(chunk, delimiter, width)
+    if block is None:
+        # Common dirty case: empty cells for channels logged at a lower rate
+        filled = _fill_empty_fields("".join(chunk), delimiter, repr(float(missing)))
+        block = _loadtxt(filled.splitlines(), delimiter, width)
+    if block is not None:
+        return block
+
+    # Text cells, quoted empties or ragged rows: parse this chunk in Python
+    pad = [None] * width
+    values = []
+    for cells in _python_rows(chunk, delimiter):
+        if len(cells) < width:
+            cells = cells + pad[len(cells):]
+        values.append([_to_float(cell, missing) for cell in cells[:width]])
+    return np.array(values, dtype=np.float64).reshape(len(values), width)
+
+
+def _loadtxt(lines: List[str], delimiter: str, width: int) -> Optional["np.ndarray"]:
+    try:
+        block = np.loadtxt(
+            lines,
+            delimiter=delimiter,
+            dtype=np.float64,
+            comments=None,
+            quotechar='"',
+            ndmin=2,
+        )
+    except ValueError:
+        return None
+    if block.shape[1] == width:
+        return block
+    if block.shape[1] > width:
+        return block[:, :width]
+    return None
+
+
+def _read_python(lines: Iterator[str], delimiter: str, width: int, missing: float, chunk_rows: int) -> List[array]:
+    """Parse all remaining lines into one ``array('d')`` per column."""
+    buffers = [array("d") for _ in range(width)]
+    pad = [None] * width
+    while True:
+        chunk = list(itertools.islice(lines, chunk_rows))
+        if not chunk:
+            break
+        for cells in _python_rows(chunk, delimiter):
+            if len(cells) < width:
+                cells = cells + pad[len(cells):]
+            for buffer, cell in zip(buffers, cells):
+                buffer.append(_to_float(cell, missing))
+    return buffers
+
+
+__all__ = [
+    "ColumnarLog",
+    "DEFAULT_CHUNK_BYTES",
+    "DEFAULT_CHUNK_ROWS",
+    "DelimitedHeader",
+    "TIME_COLUMN_NAMES",
+    "iter_chunks",
+    "read_delimited",
+    "read_header",
+    "split_unit",
+]
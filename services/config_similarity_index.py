@@ -0,0 +1,186 @@
+"""
+Configuration Similarity Index
+
+In-memory index for finding the historical configurations closest to a
+given one across the whole snapshot history.
+
+Each snapshot is encoded column-major: one row per configuration key and
+one column per snapshot. A key holds either a number (kept as float64) or
+a categorical value (strings, lists, None, ...) stored as an integer code
+of its canonical JSON form. A query gathers the rows for its keys and
+scores every snapshot at once with array operations, using the same
+measure as ``ConfigVersionControl._calculate_similarity``: the mean over
+shared keys of the relative numeric difference (normalized by the query
+value) or 0/1 for categorical match/mismatch, as ``1 - mean``, floored at 0.
+"""
+
+from __future__ import annotations
+
+import json
+import numbers
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+ABSENT = -1  # Key not in the snapshot
+NUMERIC = -2  # Numeric value (see the values matrix)
+UNKNOWN = -3  # Query category never seen in any snapshot
+
+
+def _is_numeric(value: Any) -> bool:
+    return isinstance(value, (int, float)) or isinstance(value, numbers.Real)
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=repr)
+
+
+class ConfigSimilarityIndex:
+    """
+    Top-k similarity search over configuration snapshots.
+
+    Snapshots are appended in insertion order; on equal similarity the
+    later (newer) snapshot ranks first.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.ids: List[str] = []
+        self.synced_rowid = 0  # Last database rowid added (maintained by the owner)
+        self._rows: Dict[str, int] = {}
+        self._keys: Dict[str, int] = {}
+        self._categories: Dict[str, int] = {}
+        self._removed: Set[int] = set()  # Columns of removed snapshots (never returned)
+        self._values = np.full((8, max(1, capacity)), np.nan)
+        self._codes = np.full((8, max(1, capacity)), ABSENT, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.ids) - len(self._removed)
+
+    def add(self, snapshot_id: str, configuration: Dict[str, Any]) -> int:
+        """
+        Add a snapshot, or replace it if the ID is already indexed.
+
+        Returns:
+            Column of the snapshot in the index
+        """
+        self.add_many([(snapshot_id, configuration)])
+        return self._rows[snapshot_id]
+
+    def add_many(self, snapshots: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Add (snapshot_id, configuration) pairs in order, with one scatter into the matrices."""
+        keys, columns, codes, values = [], [], [], []
+        replaced = []
+        for snapshot_id, configuration in snapshots:
+            column = self._rows.get(snapshot_id)
+            if column is None:
+                column = self._rows[snapshot_id] = len(self.ids)
+                self.ids.append(snapshot_id)
+            else:
+                replaced.append(column)
+            for key, value in configuration.items():
+                row = self._keys.get(key)
+                if row is None:
+                    row = self._keys[key] = len(self._keys)
+                keys.append(row)
+                columns.append(column)
+                if _is_numeric(value):
+                    codes.append(NUMERIC)
+                    values.append(float(value))
+                else:
+                    codes.append(self._categories.setdefault(_canonical(value), len(self._categories)))
+                    values.append(np.nan)
+
+        self._reserve(len(self._keys), len(self.ids))
+        if replaced:
+            self._values[:, replaced] = np.nan
+            self._codes[:, replaced] = ABSENT
+        if keys:
+            self._values[keys, columns] = values
+            self._codes[keys, columns] = codes
+
+    def remove(self, snapshot_ids: Iterable[str]) -> None:
+        """Drop snapshots from search results (adding an ID again indexes it anew)."""
+        for snapshot_id in snapshot_ids:
+            column = self._rows.pop(snapshot_id, None)
+            if column is not None:
+                self._values[:, column] = np.nan
+                self._codes[:, column] = ABSENT
+                self._removed.add(column)
+
+    def _reserve(self, keys: int, columns: int) -> None:
+        rows, capacity = self._codes.shape
+        if keys <= rows and columns <= capacity:
+            return
+        shape = (
+            rows if keys <= rows else max(keys, rows * 2),
+            capacity if columns <= capacity else max(columns, capacity * 2),
+        )
+        values = np.full(shape, np.nan)
+        codes = np.full(shape, ABSENT, dtype=np.int32)
+        values[:rows, :capacity] = self._values
+        codes[:rows, :capacity] = self._codes
+        self._values, self._codes = values, codes
+
+    def similarities(self, configuration: Dict[str, Any]) -> np.ndarray:
+        """Similarity (0-1) of ``configuration`` to every indexed snapshot, in index order."""
+        n = len(self.ids)
+        rows, query_values, query_codes = [], [], []
+        for key, value in configuration.items():
+            row = self._keys.get(key)
+            if row is None:
+                continue
+            rows.append(row)
+            if _is_numeric(value):
+                query_values.append(float(value))
+                query_codes.append(NUMERIC)
+            else:
+                query_values.append(np.nan)
+                query_codes.append(self._categories.get(_canonical(value), UNKNOWN))
+        if not rows or not n:
+            return np.zeros(n)
+
+        codes = self._codes[rows, :n]
+        query_codes = np.asarray(query_codes, dtype=np.int32)
+        common = np.count_nonzero(codes != ABSENT, axis=0)
+        total = np.zeros(n)
+
+        numeric = query_codes == NUMERIC
+        if numeric.any():
+            q = np.asarray(query_values)[numeric]
+            scale = np.where(q != 0, np.abs(q), 1.0)
+            relative = self._values[np.asarray(rows)[numeric], :n]
+            relative -= q[:, None]
+            np.abs(relative, out=relative)
+            relative /= scale[:, None]
+            np.fmax(relative, 0.0, out=relative)  # NaN (absent or categorical) -> 0
+            total += relative.sum(axis=0)
+            total += np.count_nonzero(codes[numeric] >= 0, axis=0)  # Categorical vs numeric: mismatch
+        if not numeric.all():
+            categorical = codes[~numeric]
+            total += np.count_nonzero((categorical != ABSENT) & (categorical != query_codes[~numeric, None]), axis=0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            similarity = 1.0 - total / common
+        return np.where(similarity > 0, similarity, 0.0)  # No common keys (NaN) -> 0
+
+    def top_k(self, configuration: Dict[str, Any], k: int) -> List[Tuple[str, float]]:
+        """
+        The ``k`` most similar snapshots.
+
+        Returns:
+            (snapshot_id, similarity) pairs, most similar first
+        """
+        similarity = self.similarities(configuration)
+        if self._removed:
+            similarity[list(self._removed)] = -1.0  # Below any live snapshot
+        n = similarity.size
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        kth = np.partition(similarity, n - k)[n - k]
+        candidates = np.flatnonzero(similarity >= kth)
+        order = np.lexsort((-candidates, -similarity[candidates]))[:k]
+        return [(self.ids[i], float(similarity[i])) for i in candidates[order]]
+
+
+__all__ = ["ConfigSimilarityIndex"]
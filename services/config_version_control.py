@@ -9,11 +9,15 @@ import hashlib
 import json
 import logging
 import sqlite3
+import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
+
+from services.config_similarity_index import ConfigSimilarityIndex
 
 LOGGER = logging.getLogger(__name__)
 
@@ -237,6 +241,26 @@ class ConfigVersionControl:
             )
         except Exception:
             self.conn_pool = None
+        
+        # Similarity index per configuration type, loaded on first query
+        self._similarity_indexes: Dict[ChangeType, ConfigSimilarityIndex] = {}
+        self._index_lock = threading.Lock()
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Database connection from the pool (or a direct one)."""
+        if self.conn_pool:
+            conn = self.conn_pool.get_connection()
+            try:
+                yield conn
+            finally:
+                self.conn_pool.return_connection(conn)
+        else:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                yield conn
+            finally:
+                conn.close()
     
     def _save_change(self, change: ConfigChange) -> None:
         """Save change to database."""
@@ -333,26 +357,27 @@ class ConfigVersionControl:
         )
         
         # Save to database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO config_snapshots
-            (snapshot_id, timestamp, config_type, configuration, telemetry_baseline,
-             performance_metrics, description)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            snapshot.snapshot_id,
-            snapshot.timestamp,
-            snapshot.config_type.value,
-            json.dumps(snapshot.configuration),
-            json.dumps(snapshot.telemetry_baseline),
-            json.dumps(snapshot.performance_metrics),
-            snapshot.description,
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO config_snapshots
+                (snapshot_id, timestamp, config_type, configuration, telemetry_baseline,
+                 performance_metrics, description)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                snapshot.snapshot_id,
+                snapshot.timestamp,
+                snapshot.config_type.value,
+                json.dumps(snapshot.configuration),
+                json.dumps(snapshot.telemetry_baseline),
+                json.dumps(snapshot.performance_metrics),
+                snapshot.description,
+            ))
+            conn.commit()
+            
+            # Keep a loaded similarity index current
+            if config_type in self._similarity_indexes:
+                with self._index_lock:
+                    self._sync_similarity_index(conn, config_type)
         
         LOGGER.info("Created config snapshot: %s", snapshot_id)
         return snapshot
@@ -426,6 +451,9 @@ class ConfigVersionControl:
         """
         Find similar historical configurations.
         
+        Searches the whole snapshot history of the type through the
+        similarity index; equally similar snapshots rank newest first.
+        
         Args:
             current_config: Current configuration
             config_type: Configuration type
@@ -434,40 +462,60 @@ class ConfigVersionControl:
         Returns:
             List of similar snapshots
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM config_snapshots
-            WHERE config_type = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (config_type.value, limit * 5))  # Get more, then filter
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        snapshots = []
-        for row in rows:
-            snapshot = ConfigSnapshot(
-                snapshot_id=row[0],
-                timestamp=row[1],
-                config_type=ChangeType(row[2]),
-                configuration=json.loads(row[3]),
-                telemetry_baseline=json.loads(row[4]) if row[4] else {},
-                performance_metrics=json.loads(row[5]) if row[5] else {},
-                description=row[6] or "",
-            )
-            snapshots.append(snapshot)
-        
-        # Calculate similarity and return top matches
-        scored = []
-        for snapshot in snapshots:
-            similarity = self._calculate_similarity(current_config, snapshot.configuration)
-            scored.append((similarity, snapshot))
+        with self._connection() as conn, self._index_lock:
+            index = self._sync_similarity_index(conn, config_type)
+            while True:
+                ids = [snapshot_id for snapshot_id, _ in index.top_k(current_config, limit)]
+                if not ids:
+                    return []
+                rows = conn.execute(
+                    f"SELECT * FROM config_snapshots WHERE snapshot_id IN ({','.join('?' * len(ids))}) "
+                    "AND config_type = ?",
+                    ids + [config_type.value],
+                ).fetchall()
+                # IDs rewritten under another type (INSERT OR REPLACE) leave the index
+                stale = set(ids).difference(row[0] for row in rows)
+                if not stale:
+                    break
+                index.remove(stale)
+        
+        snapshots = {row[0]: self._row_to_snapshot(row) for row in rows}
+        return [snapshots[snapshot_id] for snapshot_id in ids if snapshot_id in snapshots]
+    
+    def _sync_similarity_index(self, conn: sqlite3.Connection, config_type: ChangeType) -> ConfigSimilarityIndex:
+        """
+        Bring the similarity index for a configuration type up to date.
         
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [snapshot for _, snapshot in scored[:limit]]
+        The first call loads the whole history; later calls only add rows
+        inserted (or replaced) since, including those written by other
+        instances sharing the database. Call with ``_index_lock`` held.
+        """
+        index = self._similarity_indexes.get(config_type)
+        if index is None:
+            index = self._similarity_indexes[config_type] = ConfigSimilarityIndex()
+        
+        rows = conn.execute("""
+            SELECT rowid, snapshot_id, configuration FROM config_snapshots
+            WHERE rowid > ? AND config_type = ?
+            ORDER BY rowid
+        """, (index.synced_rowid, config_type.value)).fetchall()
+        if rows:
+            index.add_many((row[1], json.loads(row[2]) if row[2] else {}) for row in rows)
+            index.synced_rowid = rows[-1][0]
+        return index
+    
+    @staticmethod
+    def _row_to_snapshot(row: tuple) -> ConfigSnapshot:
+        """Build a snapshot from a config_snapshots row."""
+        return ConfigSnapshot(
+            snapshot_id=row[0],
+            timestamp=row[1],
+            config_type=ChangeType(row[2]),
+            configuration=json.loads(row[3]),
+            telemetry_baseline=json.loads(row[4]) if row[4] else {},
+            performance_metrics=json.loads(row[5]) if row[5] else {},
+            description=row[6] or "",
+        )
     
     def _calculate_similarity(self, config1: Dict[str, Any], config2: Dict[str, Any]) -> float:
         """Calculate similarity between two configurations."""
@@ -1,19 +1,147 @@
+"""
+Geo Logger
+
+Persists GPS breadcrumbs for theft recovery and map replay.
+
+Fixes are buffered in memory and written by a background thread in one
+transaction per batch (when ``batch_size`` fixes are pending or every
+``flush_interval`` seconds). The database runs in WAL mode with
+``synchronous=FULL``, so each batch costs a single fsync of the WAL. A
+timestamp index serves time-range reads and a 3D R*Tree over
+(latitude, longitude, time), kept in sync by triggers, serves
+bounding-box queries. R*Tree coordinates are 32-bit floats rounded
+outwards, so its candidates are re-checked against the exact columns.
+
+Older history can be thinned with Douglas-Peucker simplification
+(``compact_before``) or dropped (``delete_before``); ``apply_retention``
+does both by age.
+"""
+
 from __future__ import annotations
 
+import logging
+import math
 import sqlite3
+import threading
+import time
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6371000.0
+MAX_PENDING_FIXES = 100_000  # Oldest buffered fixes are dropped past this while the disk fails
+
+_COLUMNS = "timestamp, latitude, longitude, speed_mps, heading"
+
+
+class GeoFix(NamedTuple):
+    """One stored GPS fix."""
+
+    timestamp: float
+    lat: float
+    lon: float
+    speed_mps: Optional[float]
+    heading: Optional[float]
+
+
+def simplify_track(
+    timestamps: Sequence[float],
+    lats: Sequence[float],
+    lons: Sequence[float],
+    tolerance_m: float,
+    max_gap_s: float = 60.0,
+) -> np.ndarray:
+    """
+    Douglas-Peucker simplification of a time-ordered track.
+
+    The track is split where consecutive fixes are more than ``max_gap_s``
+    apart (separate trips keep their own end points) and each part is
+    simplified in a local equirectangular projection, in meters.
+
+    Returns:
+        Boolean mask of the fixes to keep
+    """
+    t = np.asarray(timestamps, dtype=np.float64)
+    n = t.size
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+
+    lat = np.asarray(lats, dtype=np.float64)
+    lon = np.asarray(lons, dtype=np.float64)
+    scale = math.radians(1.0) * EARTH_RADIUS_M
+    x = (lon - lon[0]) * scale * math.cos(math.radians(float(lat.mean())))
+    y = (lat - lat[0]) * scale
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(t) > max_gap_s) + 1))
+    ends = np.concatenate((starts[1:] - 1, [n - 1]))
+    keep[starts] = True
+    keep[ends] = True
+
+    stack = [(int(s), int(e)) for s, e in zip(starts, ends) if e - s > 1]
+    while stack:
+        first, last = stack.pop()
+        px = x[first + 1:last]
+        py = y[first + 1:last]
+        dx = x[last] - x[first]
+        dy = y[last] - y[first]
+        length_sq = dx * dx + dy * dy
+        # Distance to the segment (not the infinite line) so closed loops work
+        if length_sq > 0.0:
+            u = np.clip(((px - x[first]) * dx + (py - y[first]) * dy) / length_sq, 0.0, 1.0)
+        else:
+            u = 0.0
+        dist_sq = (px - x[first] - u * dx) ** 2 + (py - y[first] - u * dy) ** 2
+        i = int(np.argmax(dist_sq))
+        if dist_sq[i] > tolerance_m * tolerance_m:
+            split = first + 1 + i
+            keep[split] = True
+            if split - first > 1:
+                stack.append((first, split))
+            if last - split > 1:
+                stack.append((split, last))
+    return keep
 
 
 class GeoLogger:
     """Persists GPS breadcrumbs for theft recovery and map replay."""
 
-    def __init__(self, db_path: str | Path = "geo_history.db") -> None:
+    def __init__(
+        self,
+        db_path: str | Path = "geo_history.db",
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """
+        Initialize geo logger.
+
+        Args:
+            db_path: SQLite database file
+            batch_size: Pending fixes that trigger a write
+            flush_interval: Longest time (seconds) a fix waits in memory
+        """
         self.db_path = Path(db_path)
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
         self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.spatial_index = False
+        self.batches_written = 0
+
+        self._db_lock = threading.RLock()
+        self._buffer_lock = threading.Lock()
+        self._buffer: List[Tuple] = []
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
         self._ensure_schema()
 
     def _ensure_schema(self) -> None:
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.execute("PRAGMA journal_size_limit=67108864")  # Truncate the WAL after large deletes
         self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS geo_log (
@@ -26,30 +154,290 @@ class GeoLogger:
             )
             """
         )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_geo_log_timestamp ON geo_log (timestamp)")
+        try:
+            self._ensure_rtree()
+            self.spatial_index = True
+        except sqlite3.OperationalError as e:
+            LOGGER.warning("SQLite R*Tree unavailable, bounding-box queries use the time index: %s", e)
         self.conn.commit()
 
-    def log(self, fix: dict) -> None:
+    def _ensure_rtree(self) -> None:
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'geo_rtree'"
+        ).fetchone()
+        if exists:
+            return
         self.conn.execute(
-            "INSERT INTO geo_log (timestamp, latitude, longitude, speed_mps, heading) VALUES (?, ?, ?, ?, ?)",
-            (
-                fix.get("timestamp"),
-                fix.get("lat"),
-                fix.get("lon"),
-                fix.get("speed_mps"),
-                fix.get("heading"),
-            ),
+            "CREATE VIRTUAL TABLE geo_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon, min_t, max_t)"
         )
-        self.conn.commit()
+        self.conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS geo_log_rtree_insert AFTER INSERT ON geo_log
+            WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL AND new.timestamp IS NOT NULL
+            BEGIN
+                INSERT INTO geo_rtree VALUES (
+                    new.id, new.latitude, new.latitude, new.longitude, new.longitude, new.timestamp, new.timestamp
+                );
+            END
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS geo_log_rtree_delete AFTER DELETE ON geo_log
+            BEGIN
+                DELETE FROM geo_rtree WHERE id = old.id;
+            END
+            """
+        )
+        # Index history written before the R*Tree existed
+        self.conn.execute(
+            """
+            INSERT INTO geo_rtree
+            SELECT id, latitude, latitude, longitude, longitude, timestamp, timestamp FROM geo_log
+            WHERE latitude IS NOT NULL AND longitude IS NOT NULL AND timestamp IS NOT NULL
+            """
+        )
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def log(self, fix: dict) -> None:
+        """Queue a fix (keys ``timestamp``, ``lat``, ``lon``, ``speed_mps``, ``heading``)."""
+        timestamp = fix.get("timestamp")
+        row = (
+            time.time() if timestamp is None else timestamp,
+            fix.get("lat"),
+            fix.get("lon"),
+            fix.get("speed_mps"),
+            fix.get("heading"),
+        )
+        with self._buffer_lock:
+            if self._closed:
+                raise RuntimeError("GeoLogger is closed")
+            self._buffer.append(row)
+            pending = len(self._buffer)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, daemon=True, name="GeoLogger-writer")
+                self._writer.start()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Write all pending fixes in one transaction.
+
+        Returns:
+            Number of fixes written
+        """
+        with self._db_lock:
+            with self._buffer_lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            try:
+                with self.conn:
+                    self.conn.executemany(f"INSERT INTO geo_log ({_COLUMNS}) VALUES (?, ?, ?, ?, ?)", rows)
+            except sqlite3.Error as e:
+                LOGGER.error("Failed to write %d GPS fixes: %s", len(rows), e)
+                with self._buffer_lock:
+                    self._buffer[:0] = rows
+                    if len(self._buffer) > MAX_PENDING_FIXES:
+                        del self._buffer[:len(self._buffer) - MAX_PENDING_FIXES]
+                return 0
+            self.batches_written += 1
+            return len(rows)
+
+    def _writer_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if not self._closed:
+                self.flush()
+
+    def close(self) -> None:
+        """Write pending fixes, stop the writer thread and close the database."""
+        with self._buffer_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wake.set()
+        if self._writer is not None:
+            self._writer.join(timeout=5.0)
+        with self._db_lock:
+            self.flush()
+            self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Queries (pending fixes are written first)
+    # ------------------------------------------------------------------
 
     def fetch_recent(self, limit: int = 500) -> List[Tuple[float, float]]:
-        cursor = self.conn.execute(
-            "SELECT latitude, longitude FROM geo_log ORDER BY id DESC LIMIT ?", (limit,)
+        self.flush()
+        with self._db_lock:
+            cursor = self.conn.execute(
+                "SELECT latitude, longitude FROM geo_log ORDER BY id DESC LIMIT ?", (limit,)
+            )
+            return [(row[0], row[1]) for row in cursor.fetchall()][::-1]
+
+    def fetch_range(self, t0: float, t1: float) -> List[GeoFix]:
+        """Fixes with ``t0 <= timestamp <= t1``, oldest first."""
+        self.flush()
+        with self._db_lock:
+            cursor = self.conn.execute(
+                f"SELECT {_COLUMNS} FROM geo_log WHERE timestamp BETWEEN ? AND ? ORDER BY timestamp, id",
+                (t0, t1),
+            )
+            return [GeoFix(*row) for row in cursor.fetchall()]
+
+    def query_bbox(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        t0: Optional[float] = None,
+        t1: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[GeoFix]:
+        """
+        Fixes inside a latitude/longitude box, optionally between ``t0`` and ``t1``.
+
+        Returns:
+            Matching fixes, oldest first
+        """
+        t0 = -math.inf if t0 is None else t0
+        t1 = math.inf if t1 is None else t1
+        exact = (
+            "g.latitude BETWEEN ? AND ? AND g.longitude BETWEEN ? AND ? AND g.timestamp BETWEEN ? AND ?"
         )
-        return [(row[0], row[1]) for row in cursor.fetchall()][::-1]
+        params: List[float] = [min_lat, max_lat, min_lon, max_lon, t0, t1]
+        if self.spatial_index:
+            sql = (
+                f"SELECT {_COLUMNS} FROM geo_rtree r CROSS JOIN geo_log g "
+                "WHERE g.id = r.id AND r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ? "
+                f"AND r.max_t >= ? AND r.min_t <= ? AND {exact}"
+            )
+            params = params + params
+        else:
+            sql = f"SELECT {_COLUMNS} FROM geo_log g WHERE {exact}"
+        sql += " ORDER BY g.timestamp, g.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
 
-    def vacuum(self) -> None:
-        self.conn.execute("VACUUM")
+        self.flush()
+        with self._db_lock:
+            return [GeoFix(*row) for row in self.conn.execute(sql, params).fetchall()]
+
+    def trajectory(self, t0: float, t1: float, tolerance_m: float = 5.0, max_gap_s: float = 60.0) -> List[GeoFix]:
+        """
+        Fixes between ``t0`` and ``t1`` simplified for map replay.
+
+        Args:
+            tolerance_m: Largest allowed deviation from the original track
+            max_gap_s: Gap that splits the track into separate trips
+        """
+        fixes = [f for f in self.fetch_range(t0, t1) if f.lat is not None and f.lon is not None]
+        if not fixes:
+            return []
+        keep = simplify_track(
+            [f.timestamp for f in fixes], [f.lat for f in fixes], [f.lon for f in fixes], tolerance_m, max_gap_s
+        )
+        return [fix for fix, kept in zip(fixes, keep) if kept]
+
+    def count(self) -> int:
+        self.flush()
+        with self._db_lock:
+            return self.conn.execute("SELECT COUNT(*) FROM geo_log").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+
+    def delete_before(self, cutoff: float) -> int:
+        """
+        Delete fixes older than ``cutoff``.
 
+        Returns:
+            Number of fixes deleted
+        """
+        self.flush()
+        with self._db_lock, self.conn:
+            return self.conn.execute("DELETE FROM geo_log WHERE timestamp < ?", (cutoff,)).rowcount
+
+    def compact_before(
+        self,
+        cutoff: float,
+        tolerance_m: float = 5.0,
+        max_gap_s: float = 60.0,
+        window_s: float = 3600.0,
+    ) -> int:
+        """
+        Thin fixes older than ``cutoff`` to their Douglas-Peucker simplification.
+
+        History is processed ``window_s`` at a time, one transaction per window.
+
+        Returns:
+            Number of fixes deleted
+        """
+        self.flush()
+        with self._db_lock:
+            first = self.conn.execute(
+                "SELECT MIN(timestamp) FROM geo_log WHERE timestamp < ?", (cutoff,)
+            ).fetchone()[0]
+            if first is None:
+                return 0
+
+            deleted = 0
+            start = first
+            while start < cutoff:
+                end = min(start + window_s, cutoff)
+                rows = self.conn.execute(
+                    "SELECT id, timestamp, latitude, longitude FROM geo_log "
+                    "WHERE timestamp >= ? AND timestamp < ? AND latitude IS NOT NULL AND longitude IS NOT NULL "
+                    "ORDER BY timestamp, id",
+                    (start, end),
+                ).fetchall()
+                if len(rows) > 2:
+                    ids, timestamps, lats, lons = zip(*rows)
+                    keep = simplify_track(timestamps, lats, lons, tolerance_m, max_gap_s)
+                    drop = [(row_id,) for row_id, kept in zip(ids, keep) if not kept]
+                    with self.conn:
+                        self.conn.executemany("DELETE FROM geo_log WHERE id = ?", drop)
+                    deleted += len(drop)
+                start = end
+            return deleted
+
+    def apply_retention(
+        self,
+        max_age_s: Optional[float] = None,
+        compact_after_s: Optional[float] = None,
+        tolerance_m: float = 5.0,
+        now: Optional[float] = None,
+    ) -> Dict[str, int]:
+        """
+        Drop fixes older than ``max_age_s`` and simplify those older than ``compact_after_s``.
+
+        Returns:
+            Counts of ``deleted`` and ``compacted`` fixes
+        """
+        now = time.time() if now is None else now
+        result = {"deleted": 0, "compacted": 0}
+        if max_age_s is not None:
+            result["deleted"] = self.delete_before(now - max_age_s)
+        if compact_after_s is not None:
+            result["compacted"] = self.compact_before(now - compact_after_s, tolerance_m)
+        if result["deleted"] or result["compacted"]:
+            with self._db_lock:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return result
+
+    def vacuum(self) -> None:
+        self.flush()
+        with self._db_lock:
+            self.conn.execute("VACUUM")
 
-__all__ = ["GeoLogger"]
 
+__all__ = ["GeoFix", "GeoLogger", "simplify_track"]
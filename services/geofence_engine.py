@@ -0,0 +1,277 @@
+"""
+Geofence Engine
+
+Circle and polygon geofences with enter/exit/dwell events.
+
+Fences are registered in a uniform latitude/longitude grid by their
+bounding box (widened by their hysteresis), so a fix only evaluates the
+fences whose box covers its cell, however many fences exist. Each fence
+keeps an inside/outside state: the vehicle enters when it is inside the
+boundary and exits only once it is more than ``hysteresis_meters``
+outside, so GPS jitter on the boundary produces a single event per
+crossing. A dwell event fires once per visit after ``dwell_seconds``
+inside. The first fix after a fence is added sets its state without an
+event.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE = math.radians(1.0) * EARTH_RADIUS_M
+
+DEFAULT_CELL_DEGREES = 0.01  # About 1.1 km of latitude
+MAX_CELLS_PER_FENCE = 4096  # Larger fences are checked on every fix instead
+
+
+@dataclass
+class Geofence:
+    """Geofence definition (a circle, or a polygon when ``vertices`` is set)."""
+    name: str
+    center_lat: float = 0.0
+    center_lon: float = 0.0
+    radius_meters: float = 0.0
+    enabled: bool = True
+    alert_on_exit: bool = True
+    alert_on_enter: bool = False
+    vertices: Optional[List[Tuple[float, float]]] = None  # (lat, lon) polygon corners
+    hysteresis_meters: float = 10.0
+    dwell_seconds: Optional[float] = None  # Dwell event after this long inside
+
+    @classmethod
+    def polygon(cls, name: str, vertices: Sequence[Tuple[float, float]], **kwargs) -> "Geofence":
+        """Polygon geofence; the center is set to the vertex mean."""
+        vertices = [(float(lat), float(lon)) for lat, lon in vertices]
+        if len(vertices) < 3:
+            raise ValueError("A polygon geofence needs at least 3 vertices")
+        return cls(
+            name=name,
+            center_lat=sum(lat for lat, _ in vertices) / len(vertices),
+            center_lon=sum(lon for _, lon in vertices) / len(vertices),
+            vertices=vertices,
+            **kwargs,
+        )
+
+    @property
+    def is_polygon(self) -> bool:
+        return bool(self.vertices)
+
+
+@dataclass
+class GeofenceEvent:
+    """Geofence state change."""
+    fence: str
+    event: str  # enter, exit, dwell
+    timestamp: float
+    location: Tuple[float, float]  # (lat, lon)
+
+
+@dataclass
+class _FenceState:
+    inside: bool
+    since: float
+    dwell_reported: bool = False
+
+
+class _FenceShape:
+    """Precomputed geometry: signed distance to the boundary in meters (negative inside)."""
+
+    def __init__(self, fence: Geofence) -> None:
+        self.fence = fence
+        margin = max(0.0, fence.hysteresis_meters)
+        if fence.is_polygon:
+            lats = np.array([lat for lat, _ in fence.vertices], dtype=np.float64)
+            lons = np.array([lon for _, lon in fence.vertices], dtype=np.float64)
+            self.lat0 = float(lats.mean())
+            self.lon0 = float(lons.mean())
+            self.lon_scale = METERS_PER_DEGREE * math.cos(math.radians(self.lat0))
+            self.x = (lons - self.lon0) * self.lon_scale
+            self.y = (lats - self.lat0) * METERS_PER_DEGREE
+            self.dx = np.roll(self.x, -1) - self.x
+            self.dy = np.roll(self.y, -1) - self.y
+            self.length_sq = np.maximum(self.dx * self.dx + self.dy * self.dy, 1e-12)
+            lat_margin = margin / METERS_PER_DEGREE
+            lon_margin = margin / max(self.lon_scale, 1e-9)
+            self.bbox = (
+                float(lats.min()) - lat_margin,
+                float(lons.min()) - lon_margin,
+                float(lats.max()) + lat_margin,
+                float(lons.max()) + lon_margin,
+            )
+        else:
+            reach = fence.radius_meters + margin
+            lat_reach = reach / METERS_PER_DEGREE
+            lon_reach = reach / max(METERS_PER_DEGREE * math.cos(math.radians(fence.center_lat)), 1e-9)
+            self.bbox = (
+                fence.center_lat - lat_reach,
+                fence.center_lon - lon_reach,
+                fence.center_lat + lat_reach,
+                fence.center_lon + lon_reach,
+            )
+
+    def near(self, lat: float, lon: float) -> bool:
+        """True if the point is inside the hysteresis-widened bounding box."""
+        min_lat, min_lon, max_lat, max_lon = self.bbox
+        return min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+
+    def signed_distance(self, lat: float, lon: float) -> float:
+        fence = self.fence
+        if not fence.is_polygon:
+            return haversine_m(lat, lon, fence.center_lat, fence.center_lon) - fence.radius_meters
+
+        px = (lon - self.lon0) * self.lon_scale
+        py = (lat - self.lat0) * METERS_PER_DEGREE
+        x, y = self.x, self.y
+        u = np.clip(((px - x) * self.dx + (py - y) * self.dy) / self.length_sq, 0.0, 1.0)
+        distance = float(np.sqrt(np.min((px - x - u * self.dx) ** 2 + (py - y - u * self.dy) ** 2)))
+
+        # Even-odd rule: count edges crossed by a ray towards +x
+        x_next = x + self.dx
+        y_next = y + self.dy
+        straddles = (y > py) != (y_next > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing_x = x + (py - y) * self.dx / self.dy
+        inside = np.count_nonzero(straddles & (px < crossing_x)) % 2 == 1
+        return -distance if inside else distance
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distance in meters between two WGS84 coordinates."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (math.sin(math.radians(lat2 - lat1) / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class GeofenceEngine:
+    """Grid-indexed geofences with per-fence state, hysteresis and dwell tracking."""
+
+    def __init__(self, cell_degrees: float = DEFAULT_CELL_DEGREES) -> None:
+        self.cell_degrees = cell_degrees
+        self.fences: Dict[str, Geofence] = {}
+        self._shapes: Dict[str, _FenceShape] = {}
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._fence_cells: Dict[str, List[Tuple[int, int]]] = {}
+        self._large: Set[str] = set()  # Fences too big for the grid
+        self._states: Dict[str, _FenceState] = {}
+        self._new: Set[str] = set()  # Added since the last fix
+        self._inside: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.fences)
+
+    def add(self, fence: Geofence) -> None:
+        """Add or replace a fence (its state is re-established on the next fix)."""
+        shape = _FenceShape(fence)
+        with self._lock:
+            self._unregister(fence.name)
+            self.fences[fence.name] = fence
+            self._shapes[fence.name] = shape
+            self._new.add(fence.name)
+            min_lat, min_lon, max_lat, max_lon = shape.bbox
+            row0, col0 = self._cell(min_lat, min_lon)
+            row1, col1 = self._cell(max_lat, max_lon)
+            if (row1 - row0 + 1) * (col1 - col0 + 1) > MAX_CELLS_PER_FENCE:
+                self._large.add(fence.name)
+                return
+            cells = [(row, col) for row in range(row0, row1 + 1) for col in range(col0, col1 + 1)]
+            for cell in cells:
+                self._cells.setdefault(cell, set()).add(fence.name)
+            self._fence_cells[fence.name] = cells
+
+    def remove(self, name: str) -> bool:
+        with self._lock:
+            if name not in self.fences:
+                return False
+            self._unregister(name)
+            return True
+
+    def is_inside(self, name: str) -> Optional[bool]:
+        """Current state of a fence (None if unknown or before its first fix)."""
+        if name not in self.fences or name in self._new:
+            return None
+        return name in self._inside
+
+    def candidates(self, lat: float, lon: float) -> Set[str]:
+        """Fences whose (hysteresis-widened) bounding box may contain the point."""
+        return self._cells.get(self._cell(lat, lon), set()) | self._large
+
+    def update(self, lat: float, lon: float, timestamp: Optional[float] = None) -> List[GeofenceEvent]:
+        """
+        Process a fix.
+
+        Returns:
+            Enter, exit and dwell events caused by this fix
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        events: List[GeofenceEvent] = []
+        with self._lock:
+            nearby = self.candidates(lat, lon)
+            # Fences away from the fix are outside beyond their hysteresis
+            distances = dict.fromkeys(self._inside, math.inf)
+            for name in nearby:
+                shape = self._shapes[name]
+                if shape.fence.enabled and shape.near(lat, lon):
+                    distances[name] = shape.signed_distance(lat, lon)
+            # New fences take their state from this fix without an event
+            for name in self._new:
+                if distances.get(name, math.inf) <= 0.0:
+                    self._states[name] = _FenceState(inside=True, since=timestamp)
+                    self._inside.add(name)
+            self._new.clear()
+
+            for name, distance in distances.items():
+                fence = self.fences[name]
+                if not fence.enabled:
+                    continue
+                state = self._states.get(name)
+                if state is None:
+                    state = self._states[name] = _FenceState(inside=False, since=timestamp)
+                if state.inside and distance > fence.hysteresis_meters:
+                    state.inside = False
+                    state.since = timestamp
+                    self._inside.discard(name)
+                    events.append(GeofenceEvent(name, "exit", timestamp, (lat, lon)))
+                elif not state.inside and distance <= 0.0:
+                    state.inside = True
+                    state.since = timestamp
+                    self._inside.add(name)
+                    state.dwell_reported = False
+                    events.append(GeofenceEvent(name, "enter", timestamp, (lat, lon)))
+                elif (
+                    state.inside
+                    and fence.dwell_seconds is not None
+                    and not state.dwell_reported
+                    and timestamp - state.since >= fence.dwell_seconds
+                ):
+                    state.dwell_reported = True
+                    events.append(GeofenceEvent(name, "dwell", timestamp, (lat, lon)))
+        return events
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lon / self.cell_degrees))
+
+    def _unregister(self, name: str) -> None:
+        for cell in self._fence_cells.pop(name, ()):
+            names = self._cells[cell]
+            names.discard(name)
+            if not names:
+                del self._cells[cell]
+        self._large.discard(name)
+        self._shapes.pop(name, None)
+        self._states.pop(name, None)
+        self._new.discard(name)
+        self._inside.discard(name)
+        self.fences.pop(name, None)
+
+
+__all__ = ["Geofence", "GeofenceEngine", "GeofenceEvent", "haversine_m"]
@@ -11,7 +11,7 @@ import math
 import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Sequence
 
 try:
     import numpy as np
@@ -98,6 +98,342 @@ class KalmanFilterOutput:
             self.timestamp = time.time()
 
 
+# Covariance terms kept by KalmanFilterCore: the 9 diagonal variances in state
+# order, then the position/velocity cross terms P[i, i + 3] for x, y and z.
+COVARIANCE_TERMS = 12
+_CROSS = 9
+
+
+def _expand_covariance(terms):
+    """Full 9x9 covariance from the 12 structural terms."""
+    P = np.zeros((9, 9), dtype=np.float64)
+    P[range(9), range(9)] = terms[:9]
+    for axis in range(3):
+        P[axis, axis + 3] = P[axis + 3, axis] = terms[_CROSS + axis]
+    return P
+
+
+class KalmanFilterCore:
+    """
+    Preallocated GPS/IMU filter core.
+    
+    Same model as the dense formulation (state [x, y, z, vx, vy, vz, heading,
+    pitch, roll], F = I with dt coupling each position to its velocity,
+    diagonal Q and R, GPS measuring position, horizontal velocity and
+    heading), but the covariance only ever has non-zeros on the diagonal and
+    at (i, i + 3), so it is kept as those 12 terms and every step is a few
+    scalar operations instead of building and multiplying 9x9 matrices.
+    
+    Works without NumPy; ``run`` (batch processing) needs it.
+    """
+    
+    def __init__(self, config: Optional[KalmanFilterConfig] = None) -> None:
+        config = config or KalmanFilterConfig()
+        self.process_noise_pos = config.process_noise_pos
+        self.process_noise_vel = config.process_noise_vel
+        self.process_noise_att = config.process_noise_att
+        self.gps_position_noise = config.gps_position_noise
+        self.gps_velocity_noise = config.gps_velocity_noise
+        self.gps_heading_noise = config.gps_heading_noise
+        self.x = [0.0] * 9
+        self.p = [0.0] * COVARIANCE_TERMS
+        self.reset()
+    
+    def reset(self, initial_variance: float = 1.0) -> None:
+        """Zero the state and set a diagonal initial covariance."""
+        self.x[:] = [0.0] * 9
+        self.p[:] = [initial_variance] * 9 + [0.0] * 3
+    
+    def set_state(self, values) -> None:
+        """Load a 9-element state vector."""
+        self.x[:] = [float(v) for v in values]
+    
+    def set_covariance(self, matrix) -> None:
+        """Load a 9x9 covariance (entries outside the model's structure are dropped)."""
+        self.p[:9] = [float(matrix[i][i]) for i in range(9)]
+        self.p[_CROSS:] = [0.5 * float(matrix[i][i + 3] + matrix[i + 3][i]) for i in range(3)]
+    
+    def covariance_matrix(self):
+        """Full 9x9 covariance (NumPy array, or nested lists without NumPy)."""
+        if NUMPY_AVAILABLE:
+            return _expand_covariance(self.p)
+        P = [[0.0] * 9 for _ in range(9)]
+        for i in range(9):
+            P[i][i] = self.p[i]
+        for axis in range(3):
+            P[axis][axis + 3] = P[axis + 3][axis] = self.p[_CROSS + axis]
+        return P
+    
+    def predict(
+        self,
+        dt: float,
+        accel: Tuple[float, float, float],
+        gyro: Tuple[float, float, float],
+    ) -> None:
+        """
+        Predict step: x = F x + B u, P = F P F^T + Q.
+        
+        Args:
+            dt: Time step (seconds)
+            accel: Acceleration (x, y, z) in m/s²
+            gyro: Angular rates (x, y, z) in rad/s
+        """
+        x, p = self.x, self.p
+        q_pos = self.process_noise_pos * dt
+        q_vel = self.process_noise_vel * dt
+        for axis in range(3):
+            velocity = x[axis + 3]
+            x[axis] += velocity * dt
+            x[axis + 3] = velocity + accel[axis] * dt
+            
+            cross, vel_var = p[_CROSS + axis], p[axis + 3]
+            p[axis] += dt * (2.0 * cross + dt * vel_var) + q_pos
+            p[_CROSS + axis] = cross + dt * vel_var
+            p[axis + 3] = vel_var + q_vel
+        
+        # Heading from yaw rate, pitch from pitch rate, roll from roll rate
+        x[6] += gyro[2] * dt
+        x[7] += gyro[1] * dt
+        x[8] += gyro[0] * dt
+        q_att = self.process_noise_att * dt
+        p[6] += q_att
+        p[7] += q_att
+        p[8] += q_att
+    
+    def update(self, x_pos: float, y_pos: float, z_pos: float, x_vel: float, y_vel: float, heading: float) -> bool:
+        """
+        GPS measurement update (local ENU meters, m/s, heading in radians).
+        
+        A NaN velocity component falls back to a position-only update on that
+        axis, and a NaN heading skips the heading update.
+        
+        Returns:
+            False if the innovation covariance was singular and the update skipped
+        """
+        x, p = self.x, self.p
+        r_pos = self.gps_position_noise ** 2
+        r_vel = self.gps_velocity_noise ** 2
+        
+        # Horizontal axes: position and velocity measured (2x2 update each)
+        for axis, position, velocity in ((0, x_pos, x_vel), (1, y_pos, y_vel)):
+            pos_var, cross, vel_var = p[axis], p[_CROSS + axis], p[axis + 3]
+            if velocity != velocity:  # NaN: position only, as on the vertical axis
+                s_pos = pos_var + r_pos
+                k_pos, k_vel = pos_var / s_pos, cross / s_pos
+                innov = position - x[axis]
+                x[axis] += k_pos * innov
+                x[axis + 3] += k_vel * innov
+                p[axis] = pos_var - k_pos * pos_var
+                p[_CROSS + axis] = cross - k_pos * cross
+                p[axis + 3] = vel_var - k_vel * cross
+                continue
+            s_pos, s_vel = pos_var + r_pos, vel_var + r_vel
+            det = s_pos * s_vel - cross * cross
+            if det <= 0.0:
+                LOGGER.warning("Singular matrix in Kalman gain calculation, skipping update")
+                return False
+            k00 = (pos_var * s_vel - cross * cross) / det
+            k01 = (cross * s_pos - pos_var * cross) / det
+            k10 = (cross * s_vel - vel_var * cross) / det
+            k11 = (vel_var * s_pos - cross * cross) / det
+            
+            innov_pos, innov_vel = position - x[axis], velocity - x[axis + 3]
+            x[axis] += k00 * innov_pos + k01 * innov_vel
+            x[axis + 3] += k10 * innov_pos + k11 * innov_vel
+            
+            # P = (I - K) P, symmetrized
+            p[axis] = pos_var - (k00 * pos_var + k01 * cross)
+            p[_CROSS + axis] = cross - 0.5 * (k00 * cross + k01 * vel_var + k10 * pos_var + k11 * cross)
+            p[axis + 3] = vel_var - (k10 * cross + k11 * vel_var)
+        
+        # Vertical: position only, the gain still corrects vz through the cross term
+        pos_var, cross = p[2], p[_CROSS + 2]
+        s_pos = pos_var + r_pos
+        k_pos, k_vel = pos_var / s_pos, cross / s_pos
+        innov = z_pos - x[2]
+        x[2] += k_pos * innov
+        x[5] += k_vel * innov
+        p[2] = pos_var - k_pos * pos_var
+        p[_CROSS + 2] = cross - k_pos * cross
+        p[5] -= k_vel * cross
+        
+        if heading == heading:
+            gain = p[6] / (p[6] + self.gps_heading_noise ** 2)
+            x[6] += gain * (heading - x[6])
+            p[6] -= gain * p[6]
+        return True
+    
+    def run(self, dt, accel, gyro, measurements) -> "KalmanTrack":
+        """
+        Filter a recorded batch of samples in one call.
+        
+        Each step predicts with that step's IMU sample (rows of NaN, or dt of
+        0, skip the prediction) and then applies that step's GPS measurement
+        if there is one. The core keeps the final state, so batches can be
+        chained.
+        
+        Args:
+            dt: Time step per sample, shape (n,)
+            accel: Acceleration in m/s², shape (n, 3)
+            gyro: Angular rates in rad/s, shape (n, 3)
+            measurements: GPS measurements [x, y, z, vx, vy, heading] per
+                sample in local meters / m/s / radians, shape (n, 6); rows
+                with NaN position have no fix, NaN velocity or heading
+                components are left out of that fix's update
+                
+        Returns:
+            KalmanTrack with filtered and predicted states and covariances
+        """
+        dt = np.asarray(dt, dtype=np.float64)
+        accel = np.asarray(accel, dtype=np.float64).reshape(-1, 3)
+        gyro = np.asarray(gyro, dtype=np.float64).reshape(-1, 3)
+        measurements = np.asarray(measurements, dtype=np.float64).reshape(-1, 6)
+        n = dt.size
+        if not accel.shape[0] == gyro.shape[0] == measurements.shape[0] == n:
+            raise ValueError("dt, accel, gyro and measurements must have the same number of samples")
+        
+        # Missing IMU samples: F = I, Q = 0 (dt of 0), which also keeps the smoother exact
+        step = np.where(np.isfinite(accel).all(axis=1) & np.isfinite(gyro).all(axis=1), dt, 0.0)
+        has_fix = np.isfinite(measurements[:, 0])
+        
+        # Preallocated output, one row write per phase: [state, covariance terms]
+        width = 9 + COVARIANCE_TERMS
+        filtered = np.empty((n, width))
+        predicted = np.empty((n, width))
+        
+        # Plain Python rows: per-element NumPy access costs more than the math
+        accel_rows = np.nan_to_num(accel).tolist()
+        gyro_rows = np.nan_to_num(gyro).tolist()
+        measurement_rows = measurements.tolist()
+        for k, (dt_k, fix) in enumerate(zip(step.tolist(), has_fix.tolist())):
+            if dt_k > 0.0:
+                self.predict(dt_k, accel_rows[k], gyro_rows[k])
+            predicted[k] = self.x + self.p
+            if fix:
+                self.update(*measurement_rows[k])
+            filtered[k] = self.x + self.p
+        
+        return KalmanTrack(
+            dt=step,
+            states=filtered[:, :9],
+            covariances=filtered[:, 9:],
+            predicted_states=predicted[:, :9],
+            predicted_covariances=predicted[:, 9:],
+        )
+
+
+@dataclass
+class KalmanTrack:
+    """
+    States and covariances from a batch run (one row per sample).
+    
+    Covariances are stored as the 12 KalmanFilterCore terms per row (see
+    ``covariance`` for the full matrix).
+    """
+    dt: Any  # Prediction step used per sample (0 where skipped)
+    states: Any  # (n, 9)
+    covariances: Any  # (n, 12)
+    predicted_states: Any  # (n, 9), before each sample's GPS update
+    predicted_covariances: Any  # (n, 12)
+    smoothed: bool = False
+    
+    def __len__(self) -> int:
+        return int(self.states.shape[0])
+    
+    def covariance(self, index: int):
+        """Full 9x9 covariance for one sample."""
+        return _expand_covariance(self.covariances[index])
+    
+    @property
+    def positions(self):
+        """(n, 3) x/y/z positions in meters."""
+        return self.states[:, 0:3]
+    
+    @property
+    def velocities(self):
+        """(n, 3) x/y/z velocities in m/s."""
+        return self.states[:, 3:6]
+
+
+def rts_smooth(track: KalmanTrack) -> KalmanTrack:
+    """
+    Rauch–Tung–Striebel smoother for a batch run.
+    
+    Runs backwards over a forward pass (KalmanFilterCore.run) so every
+    sample uses the measurements after it as well as before it. For
+    post-session analysis of recorded logs; not usable in real time.
+    
+    Returns:
+        KalmanTrack with smoothed states and covariances
+    """
+    n = len(track)
+    states = track.states.copy()
+    covariances = track.covariances.copy()
+    if n < 2:
+        return KalmanTrack(track.dt, states, covariances, track.predicted_states, track.predicted_covariances, smoothed=True)
+    
+    # Smoother gains C_k = P_k|k F^T P_k+1|k^-1, all at once (they only depend on the forward pass)
+    filtered = track.covariances[:-1]
+    predicted = track.predicted_covariances[1:]
+    dt = track.dt[1:, None]
+    pos_var, vel_var, cross = filtered[:, 0:3], filtered[:, 3:6], filtered[:, _CROSS:]
+    m00, m01 = pos_var + cross * dt, cross
+    m10, m11 = cross + vel_var * dt, vel_var
+    a, b, c = predicted[:, 0:3], predicted[:, 3:6], predicted[:, _CROSS:]
+    det = a * b - c * c
+    gains = np.stack((
+        (m00 * b - m01 * c) / det,
+        (m01 * a - m00 * c) / det,
+        (m10 * b - m11 * c) / det,
+        (m11 * a - m10 * c) / det,
+    ), axis=-1).reshape(n - 1, 12).tolist()  # c00, c01, c10, c11 per axis
+    attitude_gains = (filtered[:, 6:9] / predicted[:, 6:9]).tolist()
+    
+    state_rows = states.tolist()
+    covariance_rows = covariances.tolist()
+    predicted_states = track.predicted_states.tolist()
+    predicted_covariances = track.predicted_covariances.tolist()
+    for k in range(n - 2, -1, -1):
+        x, p = state_rows[k], covariance_rows[k]
+        x_next, p_next = state_rows[k + 1], covariance_rows[k + 1]
+        x_pred, p_pred = predicted_states[k + 1], predicted_covariances[k + 1]
+        gain = gains[k]
+        for axis in range(3):
+            c00, c01, c10, c11 = gain[4 * axis:4 * axis + 4]
+            d_pos = x_next[axis] - x_pred[axis]
+            d_vel = x_next[axis + 3] - x_pred[axis + 3]
+            x[axis] += c00 * d_pos + c01 * d_vel
+            x[axis + 3] += c10 * d_pos + c11 * d_vel
+            
+            # P_k += C (P_k+1 - P_k+1|k) C^T
+            e_pos = p_next[axis] - p_pred[axis]
+            e_cross = p_next[_CROSS + axis] - p_pred[_CROSS + axis]
+            e_vel = p_next[axis + 3] - p_pred[axis + 3]
+            p[axis] += c00 * (c00 * e_pos + c01 * e_cross) + c01 * (c00 * e_cross + c01 * e_vel)
+            p[_CROSS + axis] += c10 * (c00 * e_pos + c01 * e_cross) + c11 * (c00 * e_cross + c01 * e_vel)
+            p[axis + 3] += c10 * (c10 * e_pos + c11 * e_cross) + c11 * (c10 * e_cross + c11 * e_vel)
+        for i, c in enumerate(attitude_gains[k], start=6):
+            x[i] += c * (x_next[i] - x_pred[i])
+            p[i] += c * c * (p_next[i] - p_pred[i])
+    
+    return KalmanTrack(
+        dt=track.dt,
+        states=np.array(state_rows),
+        covariances=np.array(covariance_rows),
+        predicted_states=track.predicted_states,
+        predicted_covariances=track.predicted_covariances,
+        smoothed=True,
+    )
+
+
+def _core_attribute(name: str) -> property:
+    """Filter attribute stored on its KalmanFilterCore."""
+    return property(
+        lambda self: getattr(self._core, name),
+        lambda self, value: setattr(self._core, name, value),
+    )
+
+
 class KalmanFilter:
     """
     Kalman filter for GPS/IMU integration.
@@ -108,8 +444,20 @@ class KalmanFilter:
     - 30-second stationary initialization
     - Calibration procedure support
     - ADAS mode (separate filter for high-accuracy position)
+    - Batch processing and RTS smoothing of recorded logs (process_batch)
     """
     
+    # Noise parameters live on the core
+    process_noise_pos = _core_attribute("process_noise_pos")
+    process_noise_vel = _core_attribute("process_noise_vel")
+    process_noise_att = _core_attribute("process_noise_att")
+    gps_position_noise = _core_attribute("gps_position_noise")
+    gps_velocity_noise = _core_attribute("gps_velocity_noise")
+    gps_heading_noise = _core_attribute("gps_heading_noise")
+    
+    # GPS columns for process_batch
+    GPS_COLUMNS = ("latitude", "longitude", "altitude_m", "speed_mps", "heading")
+    
     def __init__(
         self,
         antenna_to_imu_offset: Tuple[float, float, float] = (0.0, 0.0, 0.0),  # X, Y, Z in meters
@@ -154,26 +502,8 @@ class KalmanFilter:
         self.initialization_duration = self.config.initialization_time_sec
         
         # State vector: [x, y, z, vx, vy, vz, heading, pitch, roll]
-        # Use numpy if available for proper matrix operations
-        if NUMPY_AVAILABLE:
-            self.state = np.zeros(9, dtype=np.float64)
-            self.covariance = np.eye(9, dtype=np.float64) * 1.0  # Initial uncertainty
-        else:
-            # Fallback to lists if numpy not available
-            self.state = [0.0] * 9
-            self.covariance = [[0.0] * 9 for _ in range(9)]
-            for i in range(9):
-                self.covariance[i][i] = 1.0
-        
-        # Process noise (from config)
-        self.process_noise_pos = self.config.process_noise_pos
-        self.process_noise_vel = self.config.process_noise_vel
-        self.process_noise_att = self.config.process_noise_att
-        
-        # Measurement noise (from config)
-        self.gps_position_noise = self.config.gps_position_noise
-        self.gps_velocity_noise = self.config.gps_velocity_noise
-        self.gps_heading_noise = self.config.gps_heading_noise
+        # Filter math, process noise and measurement noise (from config)
+        self._core = KalmanFilterCore(self.config)
         
         # IMU measurement noise (from config, for future use)
         self.imu_accel_noise = self.config.imu_accel_noise
@@ -188,6 +518,24 @@ class KalmanFilter:
         self.last_gps_fix: Optional[GPSFix] = None
         self.last_imu_reading: Optional[IMUReading] = None
         self.last_update_time: Optional[float] = None
+    
+    @property
+    def state(self):
+        """State vector [x, y, z, vx, vy, vz, heading, pitch, roll] (a copy)."""
+        return np.array(self._core.x, dtype=np.float64) if NUMPY_AVAILABLE else list(self._core.x)
+    
+    @state.setter
+    def state(self, values) -> None:
+        self._core.set_state(values)
+    
+    @property
+    def covariance(self):
+        """9x9 state covariance (a copy)."""
+        return self._core.covariance_matrix()
+    
+    @covariance.setter
+    def covariance(self, matrix) -> None:
+        self._core.set_covariance(matrix)
         
     def start_initialization(self) -> None:
         """
@@ -346,6 +694,9 @@ class KalmanFilter:
         - x_k|k-1 = F * x_k-1|k-1 + B * u_k
         - P_k|k-1 = F * P_k-1|k-1 * F^T + Q
         
+        IMU accelerations are integrated directly (assumed aligned with the
+        navigation frame).
+        
         Args:
             dt: Time delta since last update (seconds)
             imu: IMU reading with accelerometer and gyroscope data
@@ -354,91 +705,11 @@ class KalmanFilter:
             LOGGER.warning(f"Invalid time delta in prediction: {dt}s")
             return
         
-        if NUMPY_AVAILABLE:
-            # State transition matrix F (9x9)
-            # x' = x + vx*dt
-            # y' = y + vy*dt
-            # z' = z + vz*dt
-            # vx' = vx + ax*dt
-            # vy' = vy + ay*dt
-            # vz' = vz + az*dt
-            # heading' = heading + gz*dt
-            # pitch' = pitch + gy*dt
-            # roll' = roll + gx*dt
-            
-            F = np.eye(9, dtype=np.float64)
-            F[0, 3] = dt  # x depends on vx
-            F[1, 4] = dt  # y depends on vy
-            F[2, 5] = dt  # z depends on vz
-            
-            # Control input (IMU accelerations and angular rates)
-            # Convert IMU accelerations to body frame (assuming IMU is aligned)
-            ax = imu.accel_x
-            ay = imu.accel_y
-            az = imu.accel_z
-            gx = math.radians(imu.gyro_x)
-            gy = math.radians(imu.gyro_y)
-            gz = math.radians(imu.gyro_z)
-            
-            # Control input vector u = [ax, ay, az, gx, gy, gz]
-            # For now, we'll integrate directly into state (simplified)
-            # In a full implementation, we'd use rotation matrices to transform
-            # body-frame accelerations to navigation frame
-            
-            # Predict state: x_k|k-1 = F * x_k-1|k-1
-            self.state = F @ self.state
-            
-            # Add control input (acceleration integration)
-            self.state[3] += ax * dt  # vx
-            self.state[4] += ay * dt  # vy
-            self.state[5] += az * dt  # vz
-            
-            # Add angular rate integration
-            self.state[6] += gz * dt  # heading
-            self.state[7] += gy * dt  # pitch
-            self.state[8] += gx * dt  # roll
-            
-            # Process noise covariance matrix Q
-            Q = np.zeros((9, 9), dtype=np.float64)
-            Q[0, 0] = self.process_noise_pos * dt  # Position x
-            Q[1, 1] = self.process_noise_pos * dt  # Position y
-            Q[2, 2] = self.process_noise_pos * dt  # Position z
-            Q[3, 3] = self.process_noise_vel * dt  # Velocity x
-            Q[4, 4] = self.process_noise_vel * dt  # Velocity y
-            Q[5, 5] = self.process_noise_vel * dt  # Velocity z
-            Q[6, 6] = self.process_noise_att * dt  # Heading
-            Q[7, 7] = self.process_noise_att * dt  # Pitch
-            Q[8, 8] = self.process_noise_att * dt  # Roll
-            
-            # Predict covariance: P_k|k-1 = F * P_k-1|k-1 * F^T + Q
-            self.covariance = F @ self.covariance @ F.T + Q
-        else:
-            # Fallback implementation without numpy
-            # Update velocity from acceleration
-            self.state[3] += imu.accel_x * dt  # vx
-            self.state[4] += imu.accel_y * dt  # vy
-            self.state[5] += imu.accel_z * dt  # vz
-            
-            # Update position from velocity
-            self.state[0] += self.state[3] * dt  # x
-            self.state[1] += self.state[4] * dt  # y
-            self.state[2] += self.state[5] * dt  # z
-            
-            # Update attitude from gyroscope
-            self.state[6] += math.radians(imu.gyro_z) * dt  # heading
-            self.state[7] += math.radians(imu.gyro_y) * dt  # pitch
-            self.state[8] += math.radians(imu.gyro_x) * dt  # roll
-            
-            # Update covariance (simplified - diagonal only)
-            self.covariance[0][0] += self.process_noise_pos * dt
-            self.covariance[1][1] += self.process_noise_pos * dt
-            self.covariance[2][2] += self.process_noise_pos * dt
-            self.covariance[3][3] += self.process_noise_vel * dt
-            self.covariance[4][4] += self.process_noise_vel * dt
-            self.covariance[5][5] += self.process_noise_vel * dt
-            self.covariance[6][6] += self.process_noise_att * dt
-            self.covariance[7][7] += self.process_noise_att * dt
-            self.covariance[8][8] += self.process_noise_att * dt
+        self._core.predict(
+            dt,
+            (imu.accel_x, imu.accel_y, imu.accel_z),
+            (math.radians(imu.gyro_x), math.radians(imu.gyro_y), math.radians(imu.gyro_z)),
+        )
     
     def _update_gps(self, gps: GPSFix) -> None:
         """
@@ -463,6 +734,7 @@ class KalmanFilter:
             - GPS measurements are converted from WGS84 (lat/lon) to local ENU frame
             - Unmeasured states (vz, pitch, roll) are given high noise to ignore them
             - The filter automatically balances GPS accuracy with IMU smoothness
+        - See KalmanFilterCore.update for the structured (matrix-free) math
         """
         if self.origin_lat is None or self.origin_lon is None:
             return
@@ -472,118 +744,95 @@ class KalmanFilter:
             LOGGER.warning(f"Invalid GPS coordinates: lat={gps.latitude}, lon={gps.longitude}")
             return
         
-        # Convert GPS position to local coordinates (ENU frame)
-        lat_diff = gps.latitude - self.origin_lat
-        lon_diff = gps.longitude - self.origin_lon
-        
-        # Convert to meters (approximate, good for small distances)
-        y = lat_diff * 111320.0  # North (meters per degree latitude)
-        x = lon_diff * 111320.0 * math.cos(math.radians(self.origin_lat))  # East
-        z = (gps.altitude_m or 0.0) - (self.origin_alt or 0.0)  # Up
-        
-        # Apply antenna to IMU offset
-        x += self.antenna_to_imu_offset[0]
-        y += self.antenna_to_imu_offset[1]
-        z += self.antenna_to_imu_offset[2]
-        
-        # Apply IMU to reference offset
-        x += self.imu_to_reference_offset[0]
-        y += self.imu_to_reference_offset[1]
-        z += self.imu_to_reference_offset[2]
+        x, y, z = self._gps_to_local(gps.latitude, gps.longitude, gps.altitude_m or 0.0)
         
         # GPS velocity in ENU frame
         heading_rad = math.radians(gps.heading)
         speed_x = gps.speed_mps * math.sin(heading_rad)  # East velocity
         speed_y = gps.speed_mps * math.cos(heading_rad)  # North velocity
         
-        if NUMPY_AVAILABLE:
-            # Measurement vector z = [x, y, z, vx, vy, heading]
-            z_meas = np.array([
-                x, y, z,
-                speed_x, speed_y, 0.0,  # vz not measured by GPS
-                heading_rad, 0.0, 0.0  # pitch and roll not measured by GPS
-            ], dtype=np.float64)
-            
-            # Measurement matrix H (what we measure from state)
-            # We measure: position (x,y,z), velocity (vx,vy), heading
-            H = np.zeros((9, 9), dtype=np.float64)
-            H[0, 0] = 1.0  # x position
-            H[1, 1] = 1.0  # y position
-            H[2, 2] = 1.0  # z position
-            H[3, 3] = 1.0  # vx velocity
-            H[4, 4] = 1.0  # vy velocity
-            H[6, 6] = 1.0  # heading
-            
-            # Measurement noise covariance matrix R
-            R = np.zeros((9, 9), dtype=np.float64)
-            R[0, 0] = self.gps_position_noise ** 2  # x position noise
-            R[1, 1] = self.gps_position_noise ** 2  # y position noise
-            R[2, 2] = self.gps_position_noise ** 2  # z position noise
-            R[3, 3] = self.gps_velocity_noise ** 2  # vx velocity noise
-            R[4, 4] = self.gps_velocity_noise ** 2  # vy velocity noise
-            R[6, 6] = self.gps_heading_noise ** 2  # heading noise
-            # Unmeasured states have high noise (effectively ignored)
-            R[5, 5] = 1e6  # vz (not measured)
-            R[7, 7] = 1e6  # pitch (not measured)
-            R[8, 8] = 1e6  # roll (not measured)
-            
-            # Innovation (residual): y = z - H * x
-            y_innov = z_meas - (H @ self.state)
-            
-            # Innovation covariance: S = H * P * H^T + R
-            S = H @ self.covariance @ H.T + R
-            
-            # Kalman gain: K = P * H^T * S^-1
-            try:
-                K = self.covariance @ H.T @ np.linalg.inv(S)
-            except np.linalg.LinAlgError:
-                LOGGER.warning("Singular matrix in Kalman gain calculation, skipping update")
-                return
-            
-            # Update state: x = x + K * y
-            self.state = self.state + K @ y_innov
-            
-            # Update covariance: P = (I - K * H) * P
-            I = np.eye(9, dtype=np.float64)
-            self.covariance = (I - K @ H) @ self.covariance
-            
-            # Ensure covariance remains positive semi-definite
-            self.covariance = (self.covariance + self.covariance.T) / 2.0
-        else:
-            # Fallback implementation without numpy (simplified)
-            # Use weighted average with Kalman-like weighting
-            # Calculate innovation
-            innov_x = x - self.state[0]
-            innov_y = y - self.state[1]
-            innov_z = z - self.state[2]
-            innov_vx = speed_x - self.state[3]
-            innov_vy = speed_y - self.state[4]
-            innov_heading = heading_rad - self.state[6]
-            
-            # Calculate Kalman gain (simplified - diagonal only)
-            # K = P / (P + R)
-            k_x = self.covariance[0][0] / (self.covariance[0][0] + self.gps_position_noise ** 2)
-            k_y = self.covariance[1][1] / (self.covariance[1][1] + self.gps_position_noise ** 2)
-            k_z = self.covariance[2][2] / (self.covariance[2][2] + self.gps_position_noise ** 2)
-            k_vx = self.covariance[3][3] / (self.covariance[3][3] + self.gps_velocity_noise ** 2)
-            k_vy = self.covariance[4][4] / (self.covariance[4][4] + self.gps_velocity_noise ** 2)
-            k_heading = self.covariance[6][6] / (self.covariance[6][6] + self.gps_heading_noise ** 2)
-            
-            # Update state
-            self.state[0] += k_x * innov_x
-            self.state[1] += k_y * innov_y
-            self.state[2] += k_z * innov_z
-            self.state[3] += k_vx * innov_vx
-            self.state[4] += k_vy * innov_vy
-            self.state[6] += k_heading * innov_heading
+        self._core.update(x, y, z, speed_x, speed_y, heading_rad)
+    
+    def _gps_to_local(self, latitude, longitude, altitude):
+        """
+        Convert GPS position (scalars or arrays) to local ENU meters,
+        including the antenna and reference point offsets.
+        """
+        # Convert to meters (approximate, good for small distances)
+        y = (latitude - self.origin_lat) * 111320.0  # North (meters per degree latitude)
+        x = (longitude - self.origin_lon) * 111320.0 * math.cos(math.radians(self.origin_lat))  # East
+        z = altitude - (self.origin_alt or 0.0)  # Up
+        
+        # Apply antenna to IMU offset, then IMU to reference offset
+        x = x + self.antenna_to_imu_offset[0] + self.imu_to_reference_offset[0]
+        y = y + self.antenna_to_imu_offset[1] + self.imu_to_reference_offset[1]
+        z = z + self.antenna_to_imu_offset[2] + self.imu_to_reference_offset[2]
+        return x, y, z
+    
+    def process_batch(
+        self,
+        timestamps: Sequence[float],
+        accel: Any,
+        gyro: Any,
+        gps: Any,
+        smooth: bool = False,
+    ) -> KalmanTrack:
+        """
+        Filter a recorded log in one call (e.g. for post-session analysis).
+        
+        Unlike ``update``, there is no initialization or movement gating: every
+        sample with IMU data is predicted, as for an active filter. The origin
+        is set from the first valid fix if not already set, and the filter
+        keeps the final state.
+        
+        Args:
+            timestamps: Sample times in seconds, shape (n,)
+            accel: IMU acceleration (x, y, z) in m/s², shape (n, 3); NaN rows = no IMU sample
+            gyro: IMU angular rates (x, y, z) in deg/s, shape (n, 3)
+            gps: GPS columns as in GPS_COLUMNS (heading in degrees), shape (n, 5);
+                NaN rows = no fix at that sample; a NaN speed or heading in a
+                fix only drops the velocity (and heading) measurement
+            smooth: Also run the RTS smoother over the result
             
-            # Update covariance (simplified - diagonal only)
-            self.covariance[0][0] *= (1 - k_x)
-            self.covariance[1][1] *= (1 - k_y)
-            self.covariance[2][2] *= (1 - k_z)
-            self.covariance[3][3] *= (1 - k_vx)
-            self.covariance[4][4] *= (1 - k_vy)
-            self.covariance[6][6] *= (1 - k_heading)
+        Returns:
+            KalmanTrack (states in local ENU meters relative to the origin)
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("process_batch requires numpy")
+        
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        gps = np.asarray(gps, dtype=np.float64).reshape(-1, len(self.GPS_COLUMNS))
+        latitude, longitude, altitude, speed, heading = gps.T
+        
+        valid = (
+            np.isfinite(latitude) & np.isfinite(longitude)
+            & (np.abs(latitude) <= 90) & (np.abs(longitude) <= 180)
+        )
+        if self.origin_lat is None and valid.any():
+            first = int(np.argmax(valid))
+            self.origin_lat = float(latitude[first])
+            self.origin_lon = float(longitude[first])
+            self.origin_alt = float(altitude[first]) if np.isfinite(altitude[first]) else 0.0
+            LOGGER.info(f"Kalman filter origin set: lat={self.origin_lat:.6f}, lon={self.origin_lon:.6f}")
+        
+        measurements = np.full((timestamps.size, 6), np.nan)
+        if self.origin_lat is not None:
+            x, y, z = self._gps_to_local(latitude, longitude, np.nan_to_num(altitude))
+            heading_rad = np.radians(heading)
+            measurements[valid] = np.column_stack((
+                x, y, z,
+                speed * np.sin(heading_rad),
+                speed * np.cos(heading_rad),
+                heading_rad,
+            ))[valid]
+        
+        # Same time step handling as update(); steps too long to predict over are skipped
+        dt = np.diff(timestamps, prepend=timestamps[0] - self.config.default_dt) if timestamps.size else timestamps
+        dt = np.where(dt <= 0, self.config.default_dt, np.minimum(dt, self.config.max_dt))
+        dt = np.where(dt > 1.0, 0.0, dt)
+        
+        track = self._core.run(dt, accel, np.radians(np.asarray(gyro, dtype=np.float64)), measurements)
+        return rts_smooth(track) if smooth else track
     
     def _extract_output(self) -> KalmanFilterOutput:
         """
@@ -594,33 +843,11 @@ class KalmanFilter:
         """
         # Calculate position quality from covariance
         # Quality = 1 / (1 + position_uncertainty)
-        if NUMPY_AVAILABLE:
-            position_uncertainty = np.sqrt(self.covariance[0, 0] + self.covariance[1, 1])
-            position_quality = 1.0 / (1.0 + position_uncertainty)
-            
-            # Extract state values
-            x_pos = float(self.state[0])
-            y_pos = float(self.state[1])
-            z_pos = float(self.state[2])
-            x_vel = float(self.state[3])
-            y_vel = float(self.state[4])
-            z_vel = float(self.state[5])
-            heading_rad = float(self.state[6])
-            pitch_rad = float(self.state[7])
-            roll_rad = float(self.state[8])
-        else:
-            position_uncertainty = math.sqrt(self.covariance[0][0] + self.covariance[1][1])
-            position_quality = 1.0 / (1.0 + position_uncertainty)
-            
-            x_pos = self.state[0]
-            y_pos = self.state[1]
-            z_pos = self.state[2]
-            x_vel = self.state[3]
-            y_vel = self.state[4]
-            z_vel = self.state[5]
-            heading_rad = self.state[6]
-            pitch_rad = self.state[7]
-            roll_rad = self.state[8]
+        variances = self._core.p
+        position_uncertainty = math.sqrt(variances[0] + variances[1])
+        position_quality = 1.0 / (1.0 + position_uncertainty)
+        
+        x_pos, y_pos, z_pos, x_vel, y_vel, z_vel, heading_rad, pitch_rad, roll_rad = self._core.x
         
         # Normalize heading to 0-360 degrees
         heading_deg = math.degrees(heading_rad) % 360
@@ -656,4 +883,12 @@ class KalmanFilter:
         }
 
 
-__all__ = ["KalmanFilter", "KalmanFilterOutput", "KalmanFilterStatus", "KalmanFilterConfig"]
+__all__ = [
+    "KalmanFilter",
+    "KalmanFilterCore",
+    "KalmanFilterOutput",
+    "KalmanFilterStatus",
+    "KalmanFilterConfig",
+    "KalmanTrack",
+    "rts_smooth",
+]
@@ -1,16 +1,23 @@
 """
 Knowledge Base Manager
 Manages document ingestion, web scraping, and forum search for the AI advisor.
+
+Documents are chunked by a single shared chunker and stored in batches.
+Chunk IDs are content hashes, so re-ingesting an unchanged document adds
+nothing; whole directory trees are parsed in a process pool and tracked
+in a manifest so an interrupted ingestion resumes where it stopped.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import re
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Any, Tuple
 from urllib.parse import urljoin, urlparse
 import json
 
@@ -49,23 +56,99 @@ except ImportError:
     VECTOR_STORE_AVAILABLE = False
     VectorKnowledgeStore = None
 
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt", ".md", ".json")
+MANIFEST_NAME = ".kb_ingest_manifest.json"
+MANIFEST_SAVE_INTERVAL = 2.0  # Seconds of ingestion that an interruption can lose (chunks are re-checked by hash)
+
+# (doc_id, text, metadata) of a chunk ready to store
+ChunkRecord = Tuple[str, str, Dict[str, Any]]
+
+
+def split_into_chunks(text: str, max_chunk_size: int = 1000, overlap: int = 200) -> List[str]:
+    """
+    Split text into overlapping chunks.
+    
+    Chunks end at a sentence boundary, or failing that a word boundary,
+    inside the size window; each chunk after the first starts ``overlap``
+    characters before the previous one ended.
+    
+    Args:
+        text: Text to split
+        max_chunk_size: Maximum chunk size
+        overlap: Overlap between chunks
+        
+    Returns:
+        List of text chunks
+    """
+    if len(text) <= max_chunk_size:
+        return [text.strip()] if text.strip() else []
+    
+    chunks = []
+    start = 0
+    
+    while start < len(text):
+        end = start + max_chunk_size
+        
+        # Try to break at sentence boundary
+        if end < len(text):
+            # Look for sentence endings
+            for punct in ['. ', '.\n', '! ', '!\n', '? ', '?\n']:
+                last_punct = text.rfind(punct, start, end)
+                if last_punct > start:
+                    end = last_punct + len(punct)
+                    break
+            else:
+                # Fall back to word boundary
+                last_space = text.rfind(' ', start, end)
+                if last_space > start:
+                    end = last_space
+        
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        
+        # Move start with overlap (without overlap if the chunk was shorter than it)
+        start = end - overlap if end - overlap > start else end
+    
+    return chunks
+
+
+def chunk_id(file_path: str, chunk: str) -> str:
+    """Content-derived ID of a document chunk: unchanged chunks keep their ID."""
+    digest = hashlib.sha256(f"{file_path}\0{chunk}".encode("utf-8", errors="replace")).hexdigest()
+    return f"doc-{digest[:32]}"
+
+
+def _parse_worker(file_path: str) -> Tuple[str, List[str], Optional[str]]:
+    """Parse and chunk one file (runs in a worker process)."""
+    try:
+        return file_path, DocumentIngester().parse_file(Path(file_path)), None
+    except Exception as e:
+        return file_path, [], f"Failed to ingest {file_path}: {e}"
+
 
 class DocumentIngester:
     """Ingest documents into the knowledge base."""
     
-    def __init__(self, vector_store: Optional[VectorKnowledgeStore] = None):
+    def __init__(self, vector_store: Optional[VectorKnowledgeStore] = None, batch_size: int = 64):
         """
         Initialize document ingester.
         
         Args:
             vector_store: Vector knowledge store to add documents to
+            batch_size: Chunks embedded and stored per batch
         """
         self.vector_store = vector_store
+        self.batch_size = batch_size
     
     def ingest_file(self, file_path: str, metadata: Optional[Dict[str, Any]] = None) -> Tuple[int, List[str]]:
         """
         Ingest a file into the knowledge base.
         
+        Chunks already stored (same file and content) are skipped.
+        
         Args:
             file_path: Path to file (PDF, TXT, DOCX, etc.)
             metadata: Optional metadata to attach
@@ -81,46 +164,18 @@ class DocumentIngester:
         chunks_added = 0
         
         try:
-            # Determine file type and parse
             ext = file_path.suffix.lower()
-            
-            if ext == '.pdf':
-                chunks = self._parse_pdf(file_path)
-            elif ext == '.docx':
-                chunks = self._parse_docx(file_path)
-            elif ext in ['.txt', '.md']:
-                chunks = self._parse_text(file_path)
-            elif ext == '.json':
-                chunks = self._parse_json(file_path)
-            else:
+            if ext not in SUPPORTED_EXTENSIONS:
                 return 0, [f"Unsupported file type: {ext}"]
+            chunks = self.parse_file(file_path)
             
             # Add chunks to vector store
             if self.vector_store and chunks:
-                base_metadata = {
-                    "source": "document",
-                    "file_path": str(file_path),
-                    "file_name": file_path.name,
-                    "file_type": ext,
-                    "ingested_at": time.time()
-                }
-                
-                if metadata:
-                    base_metadata.update(metadata)
-                
-                for i, chunk in enumerate(chunks):
-                    try:
-                        chunk_metadata = base_metadata.copy()
-                        chunk_metadata["chunk_index"] = i
-                        chunk_metadata["total_chunks"] = len(chunks)
-                        
-                        self.vector_store.add_knowledge(
-                            text=chunk,
-                            metadata=chunk_metadata
-                        )
-                        chunks_added += 1
-                    except Exception as e:
-                        errors.append(f"Failed to add chunk {i}: {e}")
+                records = self._chunk_records(file_path, chunks, metadata)
+                for start in range(0, len(records), self.batch_size):
+                    added, _, batch_errors = self._store_records(records[start:start + self.batch_size])
+                    chunks_added += added
+                    errors.extend(batch_errors)
             
             LOGGER.info(f"Ingested {chunks_added} chunks from {file_path.name}")
             
@@ -130,6 +185,234 @@ class DocumentIngester:
         
         return chunks_added, errors
     
+    def ingest_directory(
+        self,
+        directory: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        recursive: bool = True,
+        workers: Optional[int] = None,
+        manifest_path: Optional[str] = None,
+        progress: Optional[Callable[[int, int, int], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Ingest every supported document under a directory.
+        
+        Files are parsed and chunked in a process pool and their chunks
+        stored in batches. A manifest records each file's size, mtime and
+        chunk IDs after its chunks are stored: unchanged files are skipped
+        without parsing (so an interrupted run resumes where it stopped),
+        changed files have their stale chunks removed, and chunks of
+        deleted files are dropped.
+        
+        Args:
+            directory: Directory to ingest
+            metadata: Optional metadata to attach to every chunk
+            recursive: Include subdirectories
+            workers: Parser processes (default: CPU count; 0 or 1 parses in-process)
+            manifest_path: Manifest file (default: .kb_ingest_manifest.json in the directory)
+            progress: Called as progress(files_done, files_total, chunks_added) after each batch
+            
+        Returns:
+            Result dictionary with file and chunk counts and errors
+        """
+        directory = Path(directory).resolve()
+        if not directory.is_dir():
+            return {"success": False, "files": 0, "chunks_added": 0, "errors": [f"Not a directory: {directory}"]}
+        if not self.vector_store:
+            return {"success": False, "files": 0, "chunks_added": 0, "errors": ["Vector store not available"]}
+        
+        start_time = time.time()
+        manifest_file = Path(manifest_path) if manifest_path else directory / MANIFEST_NAME
+        manifest = self._load_manifest(manifest_file)
+        pattern = "**/*" if recursive else "*"
+        files = sorted(
+            path for path in directory.glob(pattern)
+            if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS and path != manifest_file
+        )
+        result = {
+            "success": True,
+            "files": len(files),
+            "files_skipped": 0,
+            "chunks_added": 0,
+            "chunks_skipped": 0,
+            "chunks_removed": 0,
+            "errors": [],
+        }
+        
+        # Chunks of files that no longer exist
+        present = {str(path) for path in files}
+        for key in [k for k in manifest if k not in present and k.startswith(str(directory) + os.sep)]:
+            result["chunks_removed"] += self._delete_chunks(manifest.pop(key)["chunk_ids"])
+        
+        # Unchanged files whose chunks are all stored need no parsing
+        to_parse = []
+        for path in files:
+            entry = manifest.get(str(path))
+            stat = path.stat()
+            if (
+                entry
+                and entry["size"] == stat.st_size
+                and entry["mtime"] == stat.st_mtime
+                and len(self.vector_store.existing_ids(entry["chunk_ids"])) == len(set(entry["chunk_ids"]))
+            ):
+                result["files_skipped"] += 1
+            else:
+                to_parse.append(path)
+        
+        files_done = result["files_skipped"]
+        batch: List[ChunkRecord] = []
+        parsed: List[Tuple[Path, List[str]]] = []
+        last_save = time.time()
+        
+        def flush() -> None:
+            nonlocal files_done, last_save
+            added, skipped, errors = self._store_records(batch)
+            result["chunks_added"] += added
+            result["chunks_skipped"] += skipped
+            result["errors"].extend(errors)
+            if not errors:
+                for path, ids in parsed:
+                    previous = manifest.get(str(path), {}).get("chunk_ids", [])
+                    result["chunks_removed"] += self._delete_chunks(set(previous) - set(ids))
+                    stat = path.stat()
+                    manifest[str(path)] = {"size": stat.st_size, "mtime": stat.st_mtime, "chunk_ids": ids}
+                if time.time() - last_save >= MANIFEST_SAVE_INTERVAL:
+                    self._save_manifest(manifest_file, manifest)
+                    last_save = time.time()
+            files_done += len(parsed)
+            batch.clear()
+            parsed.clear()
+            LOGGER.info(f"Ingested {files_done}/{len(files)} files ({result['chunks_added']} chunks added)")
+            if progress:
+                progress(files_done, len(files), result["chunks_added"])
+        
+        for file_path, chunks, error in self._parse_files(to_parse, workers):
+            path = Path(file_path)
+            if error:
+                result["errors"].append(error)
+                files_done += 1
+                continue
+            records = self._chunk_records(path, chunks, metadata)
+            batch.extend(records)
+            parsed.append((path, [doc_id for doc_id, _, _ in records]))
+            if len(batch) >= self.batch_size:
+                flush()
+        if batch or parsed:
+            flush()
+        elif progress:
+            progress(files_done, len(files), result["chunks_added"])
+        self._save_manifest(manifest_file, manifest)
+        
+        result["success"] = not result["errors"]
+        result["elapsed"] = time.time() - start_time
+        return result
+    
+    def parse_file(self, file_path: Path) -> List[str]:
+        """
+        Parse a file into text chunks.
+        
+        Raises:
+            ValueError: If the file type is not supported
+        """
+        ext = file_path.suffix.lower()
+        if ext == '.pdf':
+            return self._parse_pdf(file_path)
+        elif ext == '.docx':
+            return self._parse_docx(file_path)
+        elif ext in ['.txt', '.md']:
+            return self._parse_text(file_path)
+        elif ext == '.json':
+            return self._parse_json(file_path)
+        raise ValueError(f"Unsupported file type: {ext}")
+    
+    @staticmethod
+    def _parse_files(paths: List[Path], workers: Optional[int]) -> Iterable[Tuple[str, List[str], Optional[str]]]:
+        """Parse files in a process pool (in-process for one worker or one file), in order."""
+        names = [str(path) for path in paths]
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        if workers > 1 and len(names) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(workers, len(names))) as pool:
+                    yield from pool.map(_parse_worker, names, chunksize=max(1, len(names) // (workers * 4)))
+                return
+            except (OSError, RuntimeError) as e:
+                LOGGER.warning(f"Parallel parsing unavailable ({e}), parsing in-process")
+        for name in names:
+            yield _parse_worker(name)
+    
+    @staticmethod
+    def _chunk_records(file_path: Path, chunks: List[str], metadata: Optional[Dict[str, Any]]) -> List[ChunkRecord]:
+        base_metadata = {
+            "source": "document",
+            "file_path": str(file_path),
+            "file_name": file_path.name,
+            "file_type": file_path.suffix.lower(),
+            "ingested_at": time.time()
+        }
+        
+        if metadata:
+            base_metadata.update(metadata)
+        
+        records = []
+        for i, chunk in enumerate(chunks):
+            chunk_metadata = base_metadata.copy()
+            chunk_metadata["chunk_index"] = i
+            chunk_metadata["total_chunks"] = len(chunks)
+            records.append((chunk_id(str(file_path), chunk), chunk, chunk_metadata))
+        return records
+    
+    def _store_records(self, records: List[ChunkRecord]) -> Tuple[int, int, List[str]]:
+        """
+        Embed and store chunks not already in the store, in one batch.
+        
+        Returns:
+            Tuple of (chunks_added, chunks_skipped, errors)
+        """
+        unique: Dict[str, ChunkRecord] = {}
+        for record in records:
+            unique.setdefault(record[0], record)
+        existing = self.vector_store.existing_ids(unique)
+        new = [record for doc_id, record in unique.items() if doc_id not in existing]
+        if new:
+            try:
+                self.vector_store.add_knowledge_batch(
+                    texts=[text for _, text, _ in new],
+                    metadata_list=[meta for _, _, meta in new],
+                    doc_ids=[doc_id for doc_id, _, _ in new]
+                )
+            except Exception as e:
+                LOGGER.error(f"Failed to store chunk batch: {e}")
+                return 0, len(existing), [f"Failed to add {len(new)} chunks: {e}"]
+        return len(new), len(records) - len(new), []
+    
+    def _delete_chunks(self, doc_ids: Iterable[str]) -> int:
+        removed = 0
+        for doc_id in self.vector_store.existing_ids(doc_ids):
+            self.vector_store.delete(doc_id)
+            removed += 1
+        return removed
+    
+    @staticmethod
+    def _load_manifest(manifest_file: Path) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            LOGGER.warning(f"Ignoring unreadable ingestion manifest {manifest_file}: {e}")
+            return {}
+    
+    @staticmethod
+    def _save_manifest(manifest_file: Path, manifest: Dict[str, Dict[str, Any]]) -> None:
+        tmp_file = manifest_file.with_name(manifest_file.name + ".tmp")
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(manifest))
+            os.replace(tmp_file, manifest_file)
+        except OSError as e:
+            LOGGER.warning(f"Failed to save ingestion manifest {manifest_file}: {e}")
+    
     def _parse_pdf(self, file_path: Path) -> List[str]:
         """Parse PDF file."""
         if not PDF_AVAILABLE:
@@ -148,7 +431,7 @@ class DocumentIngester:
                 
                 # Split into chunks (max 1000 chars each)
                 full_text = "\n\n".join(text_parts)
-                chunks = self._split_into_chunks(full_text, max_chunk_size=1000)
+                chunks = split_into_chunks(full_text, max_chunk_size=1000)
                 
         except Exception as e:
             LOGGER.error(f"PDF parsing failed: {e}")
@@ -181,7 +464,7 @@ class DocumentIngester:
                     text_parts.append("\n".join(table_text))
             
             full_text = "\n\n".join(text_parts)
-            chunks = self._split_into_chunks(full_text, max_chunk_size=1000)
+            chunks = split_into_chunks(full_text, max_chunk_size=1000)
             
         except Exception as e:
             LOGGER.error(f"DOCX parsing failed: {e}")
@@ -195,7 +478,7 @@ class DocumentIngester:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 text = f.read()
             
-            chunks = self._split_into_chunks(text, max_chunk_size=1000)
+            chunks = split_into_chunks(text, max_chunk_size=1000)
             
         except Exception as e:
             LOGGER.error(f"Text parsing failed: {e}")
@@ -219,59 +502,13 @@ class DocumentIngester:
                     text_parts.append(str(item))
             
             full_text = "\n".join(text_parts)
-            chunks = self._split_into_chunks(full_text, max_chunk_size=1000)
+            chunks = split_into_chunks(full_text, max_chunk_size=1000)
             
         except Exception as e:
             LOGGER.error(f"JSON parsing failed: {e}")
             raise
         
         return chunks
-    
-    def _split_into_chunks(self, text: str, max_chunk_size: int = 1000, overlap: int = 200) -> List[str]:
-        """
-        Split text into overlapping chunks.
-        
-        Args:
-            text: Text to split
-            max_chunk_size: Maximum chunk size
-            overlap: Overlap between chunks
-            
-        Returns:
-            List of text chunks
-        """
-        if len(text) <= max_chunk_size:
-            return [text]
-        
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + max_chunk_size
-            
-            # Try to break at sentence boundary
-            if end < len(text):
-                # Look for sentence endings
-                for punct in ['. ', '.\n', '! ', '!\n', '? ', '?\n']:
-                    last_punct = text.rfind(punct, start, end)
-                    if last_punct > start:
-                        end = last_punct + len(punct)
-                        break
-                else:
-                    # Fall back to word boundary
-                    last_space = text.rfind(' ', start, end)
-                    if last_space > start:
-                        end = last_space
-            
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-            
-            # Move start with overlap
-            start = end - overlap
-            if start < 0:
-                start = 0
-        
-        return chunks
 
 
 class WebScraper:
@@ -292,52 +529,6 @@ class WebScraper:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             })
     
-    def _split_into_chunks(self, text: str, max_chunk_size: int = 1000, overlap: int = 200) -> List[str]:
-        """
-        Split text into overlapping chunks.
-        
-        Args:
-            text: Text to split
-            max_chunk_size: Maximum chunk size
-            overlap: Overlap between chunks
-            
-        Returns:
-            List of text chunks
-        """
-        if len(text) <= max_chunk_size:
-            return [text]
-        
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + max_chunk_size
-            
-            # Try to break at sentence boundary
-            if end < len(text):
-                # Look for sentence endings
-                for punct in ['. ', '.\n', '! ', '!\n', '? ', '?\n']:
-                    last_punct = text.rfind(punct, start, end)
-                    if last_punct > start:
-                        end = last_punct + len(punct)
-                        break
-                else:
-                    # Fall back to word boundary
-                    last_space = text.rfind(' ', start, end)
-                    if last_space > start:
-                        end = last_space
-            
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-            
-            # Move start with overlap
-            start = end - overlap
-            if start < 0:
-                start = 0
-        
-        return chunks
-    
     def scrape_url(self, url: str, metadata: Optional[Dict[str, Any]] = None) -> Tuple[int, List[str]]:
         """
         Scrape a URL and add to knowledge base.
@@ -375,7 +566,7 @@ class WebScraper:
             chunks_text = '\n'.join(line for line in lines if line)
             
             # Split into chunks
-            chunks = self._split_into_chunks(chunks_text, max_chunk_size=1000)
+            chunks = split_into_chunks(chunks_text, max_chunk_size=1000)
             
             # Add to vector store
             if self.vector_store and chunks:
@@ -520,6 +711,30 @@ class KnowledgeBaseManager:
             "errors": errors
         }
     
+    def add_directory(
+        self,
+        directory: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None,
+        progress: Optional[Callable[[int, int, int], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Add every supported document under a directory to the knowledge base.
+        
+        Unchanged documents are skipped, so this can be re-run to pick up
+        new and edited files or to resume an interrupted ingestion.
+        
+        Args:
+            directory: Directory to ingest (recursively)
+            metadata: Optional metadata
+            workers: Parser processes (default: CPU count)
+            progress: Called as progress(files_done, files_total, chunks_added)
+            
+        Returns:
+            Result dictionary with file/chunk counts and errors
+        """
+        return self.document_ingester.ingest_directory(directory, metadata, workers=workers, progress=progress)
+    
     def add_website(self, url: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Scrape and add a website to the knowledge base.
@@ -2,6 +2,17 @@
 Lap Detection Service
 
 Automatically detects laps using GPS coordinates and start/finish line detection.
+
+Two detection modes are supported:
+
+* Radius mode (default): a lap starts/ends on the first fix inside
+  ``detection_radius`` of the start/finish point. Times are quantized to the
+  GPS rate and a fast pass between fixes can miss the circle.
+* Gate mode: start/finish and sector lines are segments (``TimingLine``).
+  Each pair of consecutive fixes is intersected with the gates and the
+  crossing time is interpolated between the two fixes, so lap times are
+  sub-sample accurate. ``split_session`` applies the same timing to a full
+  recorded session with NumPy in one pass.
 """
 
 from __future__ import annotations
@@ -10,10 +21,14 @@ import logging
 import math
 import time
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
 
 LOGGER = logging.getLogger(__name__)
 
+EARTH_RADIUS_M = 6371000.0
+
 
 @dataclass
 class Lap:
@@ -43,6 +58,120 @@ class TrackPoint:
     speed: float = 0.0  # mph
 
 
+@dataclass
+class TimingLine:
+    """
+    Start/finish or sector gate between two GPS end points.
+
+    A forward crossing has (lat1, lon1) on the driver's left. Crossings in the
+    opposite direction are ignored unless ``bidirectional`` is set.
+    """
+
+    lat1: float
+    lon1: float
+    lat2: float
+    lon2: float
+    name: str = ""
+    bidirectional: bool = False
+
+    @classmethod
+    def from_center(
+        cls,
+        lat: float,
+        lon: float,
+        heading: float,
+        width: float = 30.0,
+        name: str = "",
+    ) -> "TimingLine":
+        """
+        Build a gate across the track.
+
+        Args:
+            lat: Gate center latitude
+            lon: Gate center longitude
+            heading: Direction of travel through the gate (degrees from north)
+            width: Gate length (meters)
+            name: Optional label
+        """
+        heading_rad = math.radians(heading)
+        # Unit vector to the driver's left, in (east, north) meters
+        left_east, left_north = -math.cos(heading_rad), math.sin(heading_rad)
+        half = width / 2.0
+        dlat = math.degrees(half * left_north / EARTH_RADIUS_M)
+        dlon = math.degrees(half * left_east / (EARTH_RADIUS_M * math.cos(math.radians(lat))))
+        return cls(lat + dlat, lon + dlon, lat - dlat, lon - dlon, name=name)
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return (self.lat1 + self.lat2) / 2.0, (self.lon1 + self.lon2) / 2.0
+
+
+class _LocalProjection:
+    """Equirectangular projection to meters around a reference point (accurate over a circuit)."""
+
+    def __init__(self, lat0: float, lon0: float) -> None:
+        self.lat0 = lat0
+        self.lon0 = lon0
+        self.k_north = math.radians(1.0) * EARTH_RADIUS_M
+        self.k_east = self.k_north * math.cos(math.radians(lat0))
+
+    def project(self, lat, lon):
+        """Project scalars or NumPy arrays to (east, north) meters."""
+        return (lon - self.lon0) * self.k_east, (lat - self.lat0) * self.k_north
+
+    def gate(self, line: TimingLine) -> Tuple[float, float, float, float]:
+        ax, ay = self.project(line.lat1, line.lon1)
+        bx, by = self.project(line.lat2, line.lon2)
+        return ax, ay, bx, by
+
+
+def _crossing_fraction(u, v0, v1):
+    """
+    Fraction of the fix interval at which distance fraction ``u`` is reached.
+
+    Assumes constant acceleration between the two fixes when both speeds are
+    known (positive); otherwise constant speed (fraction == ``u``). Works on
+    floats and NumPy arrays.
+    """
+    root = np.sqrt(np.maximum(v0 * v0 + u * (v1 * v1 - v0 * v0), 0.0))
+    denominator = v0 + root
+    valid = (v0 > 0) & (v1 > 0) & (denominator > 0)
+    return np.where(valid, u * (v0 + v1) / np.where(valid, denominator, 1.0), u)
+
+
+def _gate_crossings(
+    x: np.ndarray,
+    y: np.ndarray,
+    gate: Tuple[float, float, float, float],
+    bidirectional: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find crossings of a projected gate by the fix polyline.
+
+    Returns:
+        (index of the fix before each crossing, distance fraction along that fix segment)
+    """
+    ax, ay, bx, by = gate
+    gx, gy = bx - ax, by - ay
+    side = gx * (y - ay) - gy * (x - ax)
+    before, after = side[:-1], side[1:]
+    crossed = (before < 0) & (after >= 0)
+    if bidirectional:
+        crossed |= (before >= 0) & (after < 0) & (before != 0)
+    index = np.flatnonzero(crossed)
+    if index.size == 0:
+        return index, np.empty(0)
+
+    s0, s1 = before[index], after[index]
+    u = s0 / (s0 - s1)
+    # Keep only crossings between the gate end points (not the infinite line)
+    px = x[index] + u * (x[index + 1] - x[index])
+    py = y[index] + u * (y[index + 1] - y[index])
+    along = ((px - ax) * gx + (py - ay) * gy) / (gx * gx + gy * gy)
+    inside = (along >= 0.0) & (along <= 1.0)
+    return index[inside], u[inside]
+
+
 class LapDetector:
     """Detects laps using GPS start/finish line crossing."""
 
@@ -53,6 +182,7 @@ class LapDetector:
         detection_radius: float = 50.0,  # meters
         min_lap_time: float = 30.0,  # seconds (minimum valid lap time)
         sector_count: int = 3,  # Number of sectors per lap
+        start_finish_line: Optional[TimingLine] = None,
     ) -> None:
         """
         Initialize lap detector.
@@ -63,6 +193,8 @@ class LapDetector:
             detection_radius: Radius for start/finish detection (meters)
             min_lap_time: Minimum valid lap time (seconds)
             sector_count: Number of sectors to track
+            start_finish_line: Gate for interpolated line-crossing timing
+                (replaces radius detection when set)
         """
         self.start_finish_lat = start_finish_lat
         self.start_finish_lon = start_finish_lon
@@ -78,6 +210,41 @@ class LapDetector:
         self.current_sector: int = 0
         self.sector_start_time: float = 0.0
 
+        # Gate mode
+        self.start_finish_line: Optional[TimingLine] = None
+        self.sector_lines: List[TimingLine] = []
+        self._projection: Optional[_LocalProjection] = None
+        self._gates: List[Tuple[float, float, float, float]] = []  # Projected start/finish + sector lines
+        self._previous_fix: Optional[Tuple[float, ...]] = None  # x, y, timestamp, speed, lat, lon
+        if start_finish_line is not None:
+            self.set_start_finish_line(start_finish_line)
+
+    def set_start_finish_line(self, line: TimingLine) -> None:
+        """Switch to gate mode with the given start/finish line."""
+        self.start_finish_line = line
+        self.start_finish_lat, self.start_finish_lon = line.center
+        self._projection = _LocalProjection(*line.center)
+        self._project_gates()
+        LOGGER.info("Start/finish line set (gate mode)")
+
+    def set_sector_lines(self, lines: Sequence[TimingLine]) -> None:
+        """
+        Set sector gates (gate mode), in the order they are crossed.
+
+        Sector times include the final sector (last gate to finish), so they
+        sum to the lap time.
+        """
+        self.sector_lines = list(lines)
+        self._project_gates()
+        LOGGER.info("Set %d sector lines", len(self.sector_lines))
+
+    def _project_gates(self) -> None:
+        if self._projection is None:
+            return
+        lines = [self.start_finish_line] + self.sector_lines
+        self._gates = [self._projection.gate(line) for line in lines]
+        self._previous_fix = None
+
     def update(self, lat: float, lon: float, speed: float = 0.0, timestamp: Optional[float] = None) -> Optional[Lap]:
         """
         Update with new GPS position and detect lap completion.
@@ -98,6 +265,9 @@ class LapDetector:
         point = TrackPoint(latitude=lat, longitude=lon, timestamp=timestamp, speed=speed)
         self.track_points.append(point)
 
+        if self.start_finish_line is not None:
+            return self._update_gates(lat, lon, speed, timestamp)
+
         # Check distance to start/finish line
         distance = self._haversine_distance(lat, lon, self.start_finish_lat, self.start_finish_lon)
 
@@ -161,6 +331,80 @@ class LapDetector:
 
         return None
 
+    def _update_gates(self, lat: float, lon: float, speed: float, timestamp: float) -> Optional[Lap]:
+        """Gate-mode update: interpolate line crossings between the previous fix and this one."""
+        x, y = self._projection.project(lat, lon)
+        previous = self._previous_fix
+        self._previous_fix = (x, y, timestamp, speed, lat, lon)
+
+        if self.current_lap and speed > self.current_lap.max_speed:
+            self.current_lap.max_speed = speed
+        if previous is None or timestamp <= previous[2]:
+            return None
+
+        xs = np.array((previous[0], x))
+        ys = np.array((previous[1], y))
+        dt = timestamp - previous[2]
+
+        # Next sector gate of the current lap
+        if self.current_lap and self.current_sector < len(self.sector_lines):
+            gate_index = self.current_sector + 1
+            crossing = self._segment_crossing(xs, ys, gate_index, previous[3], speed)
+            if crossing is not None:
+                crossing_time = previous[2] + crossing * dt
+                sector_time = crossing_time - self.sector_start_time
+                self.current_lap.sectors.append(sector_time)
+                self.current_sector += 1
+                self.sector_start_time = crossing_time
+                LOGGER.info("Sector %d completed: %.3f seconds", self.current_sector, sector_time)
+
+        crossing = self._segment_crossing(xs, ys, 0, previous[3], speed)
+        if crossing is None:
+            return None
+        crossing_time = previous[2] + crossing * dt
+        crossing_lat = previous[4] + crossing * (lat - previous[4])
+        crossing_lon = previous[5] + crossing * (lon - previous[5])
+
+        completed_lap = None
+        if self.current_lap is not None:
+            if crossing_time - self.current_lap.start_time < self.min_lap_time:
+                return None
+            lap = self.current_lap
+            lap.end_time = crossing_time
+            lap.end_lat = crossing_lat
+            lap.end_lon = crossing_lon
+            lap.duration = crossing_time - lap.start_time
+            if self.sector_lines and self.current_sector == len(self.sector_lines):
+                lap.sectors.append(crossing_time - self.sector_start_time)
+            self._calculate_lap_stats(lap)
+            self.completed_laps.append(lap)
+            completed_lap = lap
+            LOGGER.info("Lap %d completed: %.3f seconds", lap.lap_number, lap.duration)
+
+        # A crossing ends one lap and starts the next
+        self.current_lap = Lap(
+            lap_number=len(self.completed_laps) + 1,
+            start_time=crossing_time,
+            start_lat=crossing_lat,
+            start_lon=crossing_lon,
+            max_speed=speed,
+            avg_speed=speed,
+        )
+        self.current_sector = 0
+        self.sector_start_time = crossing_time
+        self.last_crossing_time = crossing_time
+        return completed_lap
+
+    def _segment_crossing(
+        self, xs: np.ndarray, ys: np.ndarray, gate_index: int, speed0: float, speed1: float
+    ) -> Optional[float]:
+        """Time fraction (0-1] of the fix interval at which a gate is crossed, if it is."""
+        lines = [self.start_finish_line] + self.sector_lines
+        index, u = _gate_crossings(xs, ys, self._gates[gate_index], lines[gate_index].bidirectional)
+        if index.size == 0:
+            return None
+        return float(_crossing_fraction(u[0], speed0, speed1))
+
     def set_sector_markers(self, markers: List[Tuple[float, float]]) -> None:
         """
         Set sector marker GPS coordinates.
@@ -179,6 +423,7 @@ class LapDetector:
         self.last_crossing_time = 0.0
         self.current_sector = 0
         self.sector_start_time = 0.0
+        self._previous_fix = None
         LOGGER.info("Lap detection session reset")
 
     def get_current_lap(self) -> Optional[Lap]:
@@ -250,5 +495,113 @@ class LapDetector:
         lap.distance = total_distance
 
 
-__all__ = ["Lap", "TrackPoint", "LapDetector"]
+def split_session(
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+    timestamps: Sequence[float],
+    start_finish_line: TimingLine,
+    sector_lines: Sequence[TimingLine] = (),
+    speeds: Optional[Sequence[float]] = None,
+    min_lap_time: float = 30.0,
+) -> List[Lap]:
+    """
+    Split a recorded session into laps and sectors in one vectorized pass.
+
+    Uses the same interpolated gate timing as ``LapDetector`` in gate mode,
+    so a replayed session gives the same lap times as it did live.
+
+    Args:
+        latitudes: Fix latitudes
+        longitudes: Fix longitudes
+        timestamps: Fix times (seconds, increasing)
+        start_finish_line: Start/finish gate
+        sector_lines: Sector gates in crossing order
+        speeds: Optional fix speeds (mph); enables constant-acceleration
+            interpolation and lap speed statistics
+        min_lap_time: Crossings sooner than this after the lap start are ignored
+
+    Returns:
+        Completed laps. A lap only gets sector times if every sector gate was
+        crossed in order.
+    """
+    lat = np.asarray(latitudes, dtype=np.float64)
+    lon = np.asarray(longitudes, dtype=np.float64)
+    t = np.asarray(timestamps, dtype=np.float64)
+    v = np.asarray(speeds, dtype=np.float64) if speeds is not None else np.zeros_like(t)
+    if t.size < 2:
+        return []
+
+    projection = _LocalProjection(*start_finish_line.center)
+    x, y = projection.project(lat, lon)
+
+    def crossing_times(line: TimingLine) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        index, u = _gate_crossings(x, y, projection.gate(line), line.bidirectional)
+        frac = _crossing_fraction(u, v[index], v[index + 1])
+        return t[index] + frac * (t[index + 1] - t[index]), index, frac
+
+    times, index, frac = crossing_times(start_finish_line)
+
+    # Enforce the minimum lap time (few crossings, so a plain loop is fine)
+    accepted: List[int] = []
+    for i, crossing in enumerate(times):
+        if not accepted or crossing - times[accepted[-1]] >= min_lap_time:
+            accepted.append(i)
+    if len(accepted) < 2:
+        return []
+    keep = np.asarray(accepted)
+    times, index, frac = times[keep], index[keep], frac[keep]
+    starts, ends = times[:-1], times[1:]
+
+    # Sector splits: first crossing of each gate after the previous split, within the lap
+    splits = [starts]
+    for line in sector_lines:
+        gate_times = crossing_times(line)[0]
+        position = np.searchsorted(gate_times, splits[-1], side="right")
+        found = np.full(starts.shape, np.nan)
+        in_range = position < gate_times.size
+        found[in_range] = gate_times[position[in_range]]
+        found[~(found < ends)] = np.nan
+        splits.append(found)
+    splits.append(ends)
+    sector_table = np.diff(np.vstack(splits), axis=0).T if sector_lines else None
+
+    # Distance along the path at each crossing
+    segment = _haversine_array(lat[:-1], lon[:-1], lat[1:], lon[1:])
+    travelled = np.concatenate(([0.0], np.cumsum(segment)))
+    crossing_distance = travelled[index] + frac * segment[index]
+    crossing_lat = lat[index] + frac * (lat[index + 1] - lat[index])
+    crossing_lon = lon[index] + frac * (lon[index + 1] - lon[index])
+
+    laps: List[Lap] = []
+    for n in range(starts.size):
+        lap_speeds = v[index[n] + 1:index[n + 1] + 1]
+        moving = lap_speeds[lap_speeds > 0]
+        sectors: List[float] = []
+        if sector_table is not None and not np.isnan(sector_table[n]).any():
+            sectors = sector_table[n].tolist()
+        laps.append(Lap(
+            lap_number=n + 1,
+            start_time=float(starts[n]),
+            end_time=float(ends[n]),
+            duration=float(ends[n] - starts[n]),
+            start_lat=float(crossing_lat[n]),
+            start_lon=float(crossing_lon[n]),
+            end_lat=float(crossing_lat[n + 1]),
+            end_lon=float(crossing_lon[n + 1]),
+            max_speed=float(lap_speeds.max()) if lap_speeds.size else 0.0,
+            avg_speed=float(moving.mean()) if moving.size else 0.0,
+            distance=float(crossing_distance[n + 1] - crossing_distance[n]),
+            sectors=sectors,
+        ))
+    return laps
+
+
+def _haversine_array(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Vectorized haversine distance in meters."""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+__all__ = ["Lap", "TrackPoint", "TimingLine", "LapDetector", "split_session"]
 
@@ -2,13 +2,15 @@
 Local LLM Adapter
 
 Provides interface for local LLM integration (Ollama, Llama.cpp, etc.)
-for offline AI responses without API costs.
+for offline AI responses without API costs. Responses are available
+complete (generate) or as a token stream (generate_stream).
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+from typing import Dict, Iterator, List, Optional, Any
 
 LOGGER = logging.getLogger(__name__)
 
@@ -30,16 +32,22 @@ except ImportError:
 
 # Try to import transformers (Hugging Face)
 try:
-    from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
+    from transformers import (
+        AutoModelForCausalLM, AutoTokenizer, StoppingCriteriaList, TextIteratorStreamer, pipeline
+    )
     import torch
     TRANSFORMERS_AVAILABLE = True
 except ImportError:
     TRANSFORMERS_AVAILABLE = False
     AutoModelForCausalLM = None  # type: ignore
     AutoTokenizer = None  # type: ignore
+    StoppingCriteriaList = None  # type: ignore
+    TextIteratorStreamer = None  # type: ignore
     pipeline = None  # type: ignore
     torch = None  # type: ignore
 
+LLAMA_CPP_STOP = ["\n\n", "User:", "Assistant:"]
+
 
 class LocalLLMAdapter:
     """
@@ -196,15 +204,60 @@ class LocalLLMAdapter:
         else:
             raise ValueError(f"Unknown backend: {self.backend}")
     
-    def _generate_ollama(
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 500,
+        temperature: float = 0.7,
+        context: Optional[List[Dict[str, str]]] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> Iterator[str]:
+        """
+        Generate response using local LLM, yielding text as it is produced.
+        
+        Generation stops early when ``cancel`` is set or when the caller
+        closes the iterator; the backend request is released either way.
+        
+        Args:
+            prompt: User prompt/question
+            system_prompt: System prompt/instructions
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0-1)
+            context: Conversation context (list of {role, content} dicts, Ollama only)
+            cancel: Optional event that stops generation when set
+        
+        Yields:
+            Generated text fragments (tokens), in order
+        """
+        if not self.available:
+            raise RuntimeError(f"Local LLM backend not available: {self.backend}")
+        
+        if self.backend == "ollama":
+            stream = self._stream_ollama(prompt, system_prompt, max_tokens, temperature, context)
+        elif self.backend == "llama_cpp":
+            stream = self._stream_llama_cpp(prompt, system_prompt, max_tokens, temperature)
+        elif self.backend == "transformers":
+            stream = self._stream_transformers(prompt, system_prompt, max_tokens, temperature, cancel)
+        else:
+            raise ValueError(f"Unknown backend: {self.backend}")
+        
+        try:
+            for token in stream:
+                if cancel is not None and cancel.is_set():
+                    LOGGER.debug("Local LLM generation cancelled")
+                    break
+                if token:
+                    yield token
+        finally:
+            stream.close()
+    
+    def _ollama_messages(
         self,
         prompt: str,
         system_prompt: Optional[str],
-        max_tokens: int,
-        temperature: float,
         context: Optional[List[Dict[str, str]]]
-    ) -> str:
-        """Generate using Ollama."""
+    ) -> List[Dict[str, str]]:
         messages = []
         
         if system_prompt:
@@ -214,6 +267,18 @@ class LocalLLMAdapter:
             messages.extend(context)
         
         messages.append({"role": "user", "content": prompt})
+        return messages
+    
+    def _generate_ollama(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        context: Optional[List[Dict[str, str]]]
+    ) -> str:
+        """Generate using Ollama."""
+        messages = self._ollama_messages(prompt, system_prompt, context)
         
         try:
             response = ollama.chat(
@@ -229,6 +294,35 @@ class LocalLLMAdapter:
             LOGGER.error("Ollama generation failed: %s", e)
             raise
     
+    def _stream_ollama(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        context: Optional[List[Dict[str, str]]]
+    ) -> Iterator[str]:
+        """Stream using Ollama."""
+        chunks = ollama.chat(
+            model=self.model_name,
+            messages=self._ollama_messages(prompt, system_prompt, context),
+            options={
+                "temperature": temperature,
+                "num_predict": max_tokens,
+            },
+            stream=True,
+        )
+        try:
+            for chunk in chunks:
+                yield chunk["message"]["content"]
+        except Exception as e:
+            LOGGER.error("Ollama generation failed: %s", e)
+            raise
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()  # Drops the HTTP response when stopped early
+    
     def _generate_llama_cpp(
         self,
         prompt: str,
@@ -246,13 +340,43 @@ class LocalLLMAdapter:
                 full_prompt,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                stop=["\n\n", "User:", "Assistant:"],
+                stop=LLAMA_CPP_STOP,
             )
             return response["choices"][0]["text"].strip()
         except Exception as e:
             LOGGER.error("llama.cpp generation failed: %s", e)
             raise
     
+    def _stream_llama_cpp(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float
+    ) -> Iterator[str]:
+        """Stream using llama.cpp (tokens are produced as the generator is advanced)."""
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+        
+        chunks = self.model(
+            full_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stop=LLAMA_CPP_STOP,
+            stream=True,
+        )
+        try:
+            for chunk in chunks:
+                yield chunk["choices"][0]["text"]
+        except Exception as e:
+            LOGGER.error("llama.cpp generation failed: %s", e)
+            raise
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
+    
     def _generate_transformers(
         self,
         prompt: str,
@@ -281,6 +405,45 @@ class LocalLLMAdapter:
             LOGGER.error("Transformers generation failed: %s", e)
             raise
     
+    def _stream_transformers(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        cancel: Optional[threading.Event]
+    ) -> Iterator[str]:
+        """Stream using Transformers (generation runs in a worker thread)."""
+        full_prompt = prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\n{prompt}"
+        
+        stop = threading.Event()
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        inputs = self.tokenizer(full_prompt, return_tensors="pt").to(self.model.device)
+        # Checked after every generated token
+        stopping = StoppingCriteriaList([
+            lambda input_ids, scores, **kwargs: stop.is_set() or (cancel is not None and cancel.is_set())
+        ])
+        worker = threading.Thread(
+            target=self.model.generate,
+            kwargs=dict(
+                inputs,
+                streamer=streamer,
+                max_new_tokens=max_tokens,
+                temperature=temperature,
+                do_sample=True,
+                stopping_criteria=stopping,
+            ),
+            daemon=True,
+        )
+        worker.start()
+        try:
+            for text in streamer:
+                yield text
+        finally:
+            stop.set()
+    
     def is_available(self) -> bool:
         """Check if local LLM is available."""
         return self.available
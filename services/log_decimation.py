@@ -0,0 +1,283 @@
+"""
+Log Decimation Pyramid
+
+Level-of-detail min/max pyramids for plotting long logs. Each level groups
+``FACTOR`` buckets of the level below and keeps the minimum and maximum value
+of the group together with the time at which each occurred, so a min/max band
+over the visible buckets preserves every peak and trough of the raw data while
+never exceeding about one bucket per pixel. Missing (NaN) samples are skipped;
+a bucket is NaN only when all of its samples are, and plots break the line
+there (``finite_runs``).
+
+Pyramids are built once per log with NumPy and cached on disk beside the log
+file (``<log>.lod.npz``), keyed on the log's size and modification time.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from services.universal_log_parser import LogData
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_SUFFIX = ".lod.npz"
+CACHE_FORMAT_VERSION = 2  # 2: NaN samples no longer blank their buckets
+
+
+@dataclass
+class PyramidLevel:
+    """One level of a channel pyramid; arrays are indexed by bucket."""
+
+    bucket_size: int  # Raw samples per bucket
+    start_time: np.ndarray  # Time of the first raw sample in the bucket
+    min_time: np.ndarray
+    min_value: np.ndarray
+    max_time: np.ndarray
+    max_value: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start_time)
+
+
+class ChannelPyramid:
+    """
+    Min/max decimation pyramid for one channel.
+
+    Level 0 holds the raw samples (min == max). Level ``k`` buckets
+    ``FACTOR ** k`` raw samples. Levels stop once a level has no more than
+    ``min_buckets`` buckets.
+    """
+
+    FACTOR = 4
+
+    def __init__(self, levels: List[PyramidLevel]):
+        if not levels:
+            raise ValueError("A pyramid needs at least one level")
+        self.levels = levels
+
+    @classmethod
+    def build(cls, times: Sequence[float], values: Sequence[float], min_buckets: int = 256) -> "ChannelPyramid":
+        """
+        Build a pyramid from raw samples.
+
+        Args:
+            times: Ascending sample times
+            values: Sample values (same length as ``times``)
+            min_buckets: Stop adding levels once a level is this small
+        """
+        t = np.ascontiguousarray(times, dtype=np.float64)
+        v = np.ascontiguousarray(values, dtype=np.float64)
+        n = min(len(t), len(v))
+        t, v = t[:n], v[:n]
+
+        levels = [PyramidLevel(1, t, t, v, t, v)]
+        while len(levels[-1]) > min_buckets:
+            levels.append(cls._reduce(levels[-1], cls.FACTOR))
+        return cls(levels)
+
+    @staticmethod
+    def _reduce(level: PyramidLevel, factor: int) -> PyramidLevel:
+        """Group ``factor`` buckets of ``level`` into one."""
+        n = len(level)
+        n_out = -(-n // factor)
+        pad = n_out * factor - n
+
+        def grouped(arr: np.ndarray) -> np.ndarray:
+            if pad:
+                arr = np.concatenate((arr, np.repeat(arr[-1:], pad)))
+            return arr.reshape(n_out, factor)
+
+        rows = np.arange(n_out)
+        mins = grouped(level.min_value)
+        maxs = grouped(level.max_value)
+        # NaN-skipping argmin/argmax; an all-NaN group picks index 0 and stays NaN
+        arg_min = np.argmin(np.where(np.isnan(mins), np.inf, mins), axis=1)
+        arg_max = np.argmax(np.where(np.isnan(maxs), -np.inf, maxs), axis=1)
+        return PyramidLevel(
+            bucket_size=level.bucket_size * factor,
+            start_time=level.start_time[::factor].copy(),
+            min_time=grouped(level.min_time)[rows, arg_min],
+            min_value=mins[rows, arg_min],
+            max_time=grouped(level.max_time)[rows, arg_max],
+            max_value=maxs[rows, arg_max],
+        )
+
+    @property
+    def sample_count(self) -> int:
+        return len(self.levels[0])
+
+    def select_level(self, x_min: float, x_max: float, pixel_width: int) -> int:
+        """
+        Pick the finest level with no more buckets in view than pixels.
+
+        Raw samples (level 0) are used whenever they already fit.
+        """
+        pixel_width = max(1, int(pixel_width))
+        for index, level in enumerate(self.levels):
+            lo, hi = np.searchsorted(level.start_time, (x_min, x_max))
+            if hi - lo <= pixel_width:
+                return index
+        return len(self.levels) - 1
+
+    def envelope(self, x_min: float, x_max: float, pixel_width: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Min/max band for a view range, in data coordinates.
+
+        Returns:
+            (x, lower, upper) arrays, one entry per bucket in view. At the raw
+            level ``lower`` and ``upper`` are the same array object.
+        """
+        level = self.levels[self.select_level(x_min, x_max, pixel_width)]
+        lo = max(int(np.searchsorted(level.start_time, x_min, side="right")) - 1, 0)
+        hi = min(int(np.searchsorted(level.start_time, x_max, side="right")) + 1, len(level))
+        if level.bucket_size == 1:
+            values = level.min_value[lo:hi]
+            return level.start_time[lo:hi], values, values
+        return level.start_time[lo:hi], level.min_value[lo:hi], level.max_value[lo:hi]
+
+    def value_range(self) -> Tuple[float, float]:
+        """Overall (min, max) of the channel."""
+        top = self.levels[-1]
+        if not len(top):
+            return 0.0, 0.0
+        return float(np.nanmin(top.min_value)), float(np.nanmax(top.max_value))
+
+
+class LogPyramid:
+    """Pyramids for every channel of one log, with an on-disk cache."""
+
+    def __init__(self, channels: Dict[str, ChannelPyramid]):
+        self.channels = channels
+
+    def get(self, channel: str) -> Optional[ChannelPyramid]:
+        return self.channels.get(channel)
+
+    @classmethod
+    def from_log_data(cls, log_data: "LogData", min_buckets: int = 256) -> "LogPyramid":
+        """Build pyramids for all channels of a parsed log."""
+        times = np.asarray(log_data.time, dtype=np.float64)
+        channels = {}
+        for name, values in log_data.data.items():
+            if len(values) and len(times):
+                channels[name] = ChannelPyramid.build(times, values, min_buckets=min_buckets)
+        return cls(channels)
+
+    @classmethod
+    def load_or_build(cls, log_path: Path, log_data: "LogData", min_buckets: int = 256) -> "LogPyramid":
+        """
+        Load the cached pyramid beside ``log_path`` or build and cache it.
+
+        A cache is reused only when the log's size and mtime still match.
+        Cache write failures (read-only media, etc.) are logged and ignored.
+        """
+        log_path = Path(log_path)
+        cache_path = cache_path_for(log_path)
+        stamp = _file_stamp(log_path)
+
+        if stamp is not None and cache_path.exists():
+            try:
+                pyramid = cls.load(cache_path, expected_stamp=stamp)
+                if pyramid is not None:
+                    return pyramid
+            except Exception as e:
+                LOGGER.warning("Ignoring unreadable LOD cache %s: %s", cache_path, e)
+
+        pyramid = cls.from_log_data(log_data, min_buckets=min_buckets)
+        if stamp is not None:
+            try:
+                pyramid.save(cache_path, stamp)
+            except OSError as e:
+                LOGGER.warning("Could not write LOD cache %s: %s", cache_path, e)
+        return pyramid
+
+    def save(self, cache_path: Path, stamp: Optional[Dict[str, float]] = None) -> None:
+        """Write all levels of all channels to one .npz file."""
+        names = list(self.channels)
+        arrays: Dict[str, np.ndarray] = {}
+        layout = []
+        for ci, name in enumerate(names):
+            levels = self.channels[name].levels
+            layout.append([lvl.bucket_size for lvl in levels])
+            for li, lvl in enumerate(levels):
+                prefix = f"c{ci}_l{li}_"
+                arrays[prefix + "start"] = lvl.start_time
+                if lvl.bucket_size > 1:
+                    arrays[prefix + "tmin"] = lvl.min_time
+                    arrays[prefix + "vmin"] = lvl.min_value
+                    arrays[prefix + "tmax"] = lvl.max_time
+                    arrays[prefix + "vmax"] = lvl.max_value
+                else:
+                    arrays[prefix + "vmin"] = lvl.min_value
+        header = {"version": CACHE_FORMAT_VERSION, "channels": names, "layout": layout, "stamp": stamp}
+        arrays["header"] = np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8)
+
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        tmp_path.replace(cache_path)
+
+    @classmethod
+    def load(cls, cache_path: Path, expected_stamp: Optional[Dict[str, float]] = None) -> Optional["LogPyramid"]:
+        """Load a cache file; returns None if it is stale or from another format version."""
+        with np.load(cache_path, allow_pickle=False) as npz:
+            header = json.loads(npz["header"].tobytes().decode("utf-8"))
+            if header.get("version") != CACHE_FORMAT_VERSION:
+                return None
+            if expected_stamp is not None and header.get("stamp") != expected_stamp:
+                return None
+            channels = {}
+            for ci, name in enumerate(header["channels"]):
+                levels = []
+                for li, bucket_size in enumerate(header["layout"][ci]):
+                    prefix = f"c{ci}_l{li}_"
+                    start = npz[prefix + "start"]
+                    if bucket_size > 1:
+                        levels.append(PyramidLevel(
+                            bucket_size, start,
+                            npz[prefix + "tmin"], npz[prefix + "vmin"],
+                            npz[prefix + "tmax"], npz[prefix + "vmax"],
+                        ))
+                    else:
+                        values = npz[prefix + "vmin"]
+                        levels.append(PyramidLevel(1, start, start, values, start, values))
+                channels[name] = ChannelPyramid(levels)
+        return cls(channels)
+
+
+def cache_path_for(log_path: Path) -> Path:
+    """Cache file location for a log."""
+    log_path = Path(log_path)
+    return log_path.with_name(log_path.name + CACHE_SUFFIX)
+
+
+def finite_runs(*arrays: np.ndarray) -> List[slice]:
+    """Slices of consecutive entries finite in every array, so lines and bands break at gaps."""
+    finite = np.logical_and.reduce([np.isfinite(a) for a in arrays])
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], finite.astype(np.int8), [0]))))
+    return [slice(int(start), int(stop)) for start, stop in zip(edges[::2], edges[1::2])]
+
+
+def _file_stamp(path: Path) -> Optional[Dict[str, float]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return {"size": st.st_size, "mtime": st.st_mtime}
+
+
+__all__ = [
+    "CACHE_SUFFIX",
+    "ChannelPyramid",
+    "LogPyramid",
+    "PyramidLevel",
+    "cache_path_for",
+    "finite_runs",
+]
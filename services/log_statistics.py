@@ -0,0 +1,332 @@
+"""
+Log Statistics
+
+Single-pass, bounded-memory statistics for delimited data logs of any size.
+
+The log is streamed in chunks (``columnar_log_reader.iter_chunks``). Each
+channel keeps a constant-size summary updated per chunk: count, min, max,
+mean and variance (Welford/Chan merge), a t-digest for percentiles and the
+time spent above an optional threshold. Every summary can be merged with
+the one for the following part of the file, so byte ranges of one log can
+be analyzed in separate processes and combined in order.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .columnar_log_reader import DEFAULT_CHUNK_BYTES, DelimitedHeader, iter_chunks, read_header
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_COMPRESSION = 400.0
+PERCENTILES = (5, 50, 95, 99)
+
+
+class TDigest:
+    """
+    Mergeable t-digest (k1 scale function) for streaming percentiles.
+
+    Values are added in batches: the batch and the current centroids are
+    sorted together and re-grouped so that every centroid covers at most
+    about one unit of the scale function, which keeps centroids small near
+    the tails and the digest at roughly ``compression / 2`` centroids.
+    """
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION) -> None:
+        self.compression = float(compression)
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray) -> None:
+        """Add finite values."""
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._absorb(values, np.ones(values.size))
+
+    def merge(self, other: "TDigest") -> None:
+        """Add another digest's centroids."""
+        if not other.weights.size:
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._absorb(other.means, other.weights)
+
+    def _absorb(self, means: np.ndarray, weights: np.ndarray) -> None:
+        means = np.concatenate((self.means, means))
+        weights = np.concatenate((self.weights, weights))
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2.0) / cumulative[-1]
+        k = np.floor(self.compression / (2.0 * math.pi) * np.arcsin(np.clip(2.0 * q - 1.0, -1.0, 1.0)))
+        starts = np.flatnonzero(np.diff(k)) + 1
+        starts = np.concatenate(([0], starts))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q: float) -> float:
+        """Estimated value at quantile ``q`` (0-1); NaN if empty."""
+        if not self.weights.size:
+            return math.nan
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2.0
+        ranks = np.concatenate(([0.0], centers, [total]))
+        values = np.concatenate(([self.min], self.means, [self.max]))
+        return float(np.interp(min(max(q, 0.0), 1.0) * total, ranks, values))
+
+
+class ChannelStats:
+    """Constant-size running statistics for one channel."""
+
+    def __init__(self, threshold: Optional[float] = None, compression: float = DEFAULT_COMPRESSION) -> None:
+        self.threshold = threshold
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+        self.samples_above = 0
+        self.time_above = 0.0
+        self.digest = TDigest(compression)
+
+    def update(self, values: np.ndarray, hold: Optional[np.ndarray] = None) -> None:
+        """
+        Add one chunk of samples (NaN = not logged in that row).
+
+        Args:
+            values: Channel values for the chunk
+            hold: Seconds each row's value is held (time to the next row), or None
+        """
+        finite = np.isfinite(values)
+        if not finite.all():
+            if hold is not None:
+                hold = hold[finite]
+            values = values[finite]
+        n = int(values.size)
+        if not n:
+            return
+
+        chunk_mean = float(values.mean())
+        deviation = values - chunk_mean
+        self._combine(n, chunk_mean, float(np.dot(deviation, deviation)), float(values.min()), float(values.max()))
+        self.digest.update(values)
+
+        if self.threshold is not None:
+            above = values > self.threshold
+            self.samples_above += int(np.count_nonzero(above))
+            if hold is not None:
+                self.time_above += float(hold[above].sum())
+
+    def merge(self, other: "ChannelStats") -> None:
+        """Add the statistics of another part of the log."""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+            self.digest.merge(other.digest)
+        self.samples_above += other.samples_above
+        self.time_above += other.time_above
+
+    def _combine(self, n: int, mean: float, m2: float, low: float, high: float) -> None:
+        # Chan et al. parallel form of Welford's update
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    @property
+    def variance(self) -> float:
+        """Population variance."""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def percentile(self, p: float) -> float:
+        """Estimated ``p``-th percentile (0-100)."""
+        return self.digest.quantile(p / 100.0)
+
+
+@dataclass
+class LogStatistics:
+    """Statistics for a log, or for a contiguous part of one."""
+
+    columns: List[str]
+    time_column: Optional[str] = None
+    row_count: int = 0
+    first_time: Optional[float] = None
+    last_time: Optional[float] = None
+    channels: Dict[str, ChannelStats] = field(default_factory=dict)
+    # Time of the first/last row and channels above threshold on the last
+    # row, so hold time across part boundaries is counted when merging
+    head_time: float = math.nan
+    tail_time: float = math.nan
+    tail_above: List[str] = field(default_factory=list)
+
+    @classmethod
+    def for_header(
+        cls,
+        header: DelimitedHeader,
+        thresholds: Optional[Dict[str, float]] = None,
+        compression: float = DEFAULT_COMPRESSION,
+    ) -> "LogStatistics":
+        """Empty statistics for a log's channels (time columns excluded)."""
+        lookup = {name.lower(): value for name, value in (thresholds or {}).items()}
+        channels: Dict[str, ChannelStats] = {}
+        for name in header.columns:
+            if name not in channels and name not in header.time_columns:
+                channels[name] = ChannelStats(lookup.get(name.lower()), compression)
+        return cls(columns=list(header.columns), time_column=header.time_column, channels=channels)
+
+    @property
+    def duration_s(self) -> Optional[float]:
+        if self.first_time is None or self.last_time is None or self.last_time < self.first_time:
+            return None
+        return float(self.last_time - self.first_time)
+
+    def add_block(self, block: np.ndarray) -> None:
+        """Add the next (rows, columns) block of the log."""
+        if not block.shape[0]:
+            return
+        part = LogStatistics(self.columns, self.time_column, channels={
+            name: ChannelStats(stats.threshold, stats.digest.compression) for name, stats in self.channels.items()
+        })
+        part._fill(block)
+        self.merge(part)
+
+    def _fill(self, block: np.ndarray) -> None:
+        index = {name: i for i, name in reversed(list(enumerate(self.columns)))}  # First occurrence wins
+        hold = None
+        if self.time_column is not None:
+            times = block[:, index[self.time_column]]
+            finite = np.flatnonzero(np.isfinite(times))
+            if finite.size:
+                self.first_time = float(times[finite[0]])
+                self.last_time = float(times[finite[-1]])
+            self.head_time, self.tail_time = float(times[0]), float(times[-1])
+            hold = np.diff(times)
+            hold = np.append(np.where(np.isfinite(hold) & (hold > 0), hold, 0.0), 0.0)  # Last row: see merge
+
+        self.row_count = int(block.shape[0])
+        self.tail_above = []
+        for name, stats in self.channels.items():
+            values = block[:, index[name]]
+            stats.update(values, hold)
+            if stats.threshold is not None and values[-1] > stats.threshold:
+                self.tail_above.append(name)
+
+    def merge(self, other: "LogStatistics") -> None:
+        """Append the statistics of the part of the log that follows this one."""
+        if not other.row_count:
+            return
+        if not self.row_count:
+            self.head_time = other.head_time
+        else:
+            # The last row of this part is held until the first row of the next
+            gap = other.head_time - self.tail_time
+            if math.isfinite(gap) and gap > 0:
+                for name in self.tail_above:
+                    self.channels[name].time_above += gap
+
+        for name, stats in other.channels.items():
+            self.channels[name].merge(stats)
+        if self.first_time is None:
+            self.first_time = other.first_time
+        if other.last_time is not None:
+            self.last_time = other.last_time
+        self.row_count += other.row_count
+        self.tail_time = other.tail_time
+        self.tail_above = list(other.tail_above)
+
+
+def _analyze_range(
+    file_path: str,
+    header: DelimitedHeader,
+    delimiter: str,
+    thresholds: Optional[Dict[str, float]],
+    chunk_bytes: int,
+    compression: float,
+    byte_range: Tuple[Optional[int], Optional[int]],
+) -> LogStatistics:
+    stats = LogStatistics.for_header(header, thresholds, compression)
+    start, end = byte_range
+    for block in iter_chunks(file_path, header, delimiter, chunk_bytes=chunk_bytes, start=start, end=end):
+        stats.add_block(block)
+    return stats
+
+
+def split_ranges(header: DelimitedHeader, file_size: int, parts: int) -> List[Tuple[int, int]]:
+    """Split a log's data into ``parts`` contiguous byte ranges."""
+    start = header.data_offset
+    parts = max(1, min(parts, file_size - start))
+    bounds = np.linspace(start, file_size, parts + 1).astype(np.int64).tolist()
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def analyze_delimited_log(
+    file_path: Union[str, Path],
+    delimiter: str = ",",
+    thresholds: Optional[Dict[str, float]] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    workers: int = 1,
+    compression: float = DEFAULT_COMPRESSION,
+) -> LogStatistics:
+    """
+    Statistics for a delimited log in one pass and bounded memory.
+
+    Args:
+        file_path: CSV/TSV log (header on the first non-blank line)
+        delimiter: Field delimiter
+        thresholds: Channel name (case-insensitive) -> threshold for time-above
+        chunk_bytes: Text parsed per chunk (peak memory is a small multiple of this per process)
+        workers: Processes to split the file across (1 = in this process)
+        compression: t-digest compression (higher = more accurate percentiles)
+
+    Returns:
+        LogStatistics for the whole file
+    """
+    file_path = str(file_path)
+    header = read_header(file_path, delimiter)
+    args = (file_path, header, delimiter, thresholds, chunk_bytes, compression)
+    file_size = os.path.getsize(file_path)
+    if workers <= 1 or file_size - header.data_offset < 2 * chunk_bytes:
+        return _analyze_range(*args, (None, None))
+
+    ranges = split_ranges(header, file_size, workers * 2)
+    stats = LogStatistics.for_header(header, thresholds, compression)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_analyze_range, *zip(*[args + (r,) for r in ranges])):
+            stats.merge(part)
+    return stats
+
+
+__all__ = [
+    "ChannelStats",
+    "DEFAULT_COMPRESSION",
+    "LogStatistics",
+    "PERCENTILES",
+    "TDigest",
+    "analyze_delimited_log",
+    "split_ranges",
+]
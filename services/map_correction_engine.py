@@ -0,0 +1,456 @@
+"""
+Map Correction Engine
+
+Batch VE/ignition correction over whole logs. Every sample of a parsed log is
+binned into the RPM x load axes of a tuning map, transients are filtered out,
+and per-cell lambda error and knock statistics are reduced with
+``np.digitize``/``np.bincount`` so that millions of samples are processed in a
+few array passes instead of one Python call per snapshot.
+
+Output is a :class:`CellCorrectionTable` holding, per cell:
+- hit count and a hit-count based confidence (0-1)
+- weighted mean lambda ratio (measured / target) and its spread
+- suggested VE multiplier
+- knock rate, peak knock and a suggested ignition pull
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from services.tune_map_database import TuningMap
+    from services.universal_log_parser import LogData
+
+LOGGER = logging.getLogger(__name__)
+
+STOICH_AFR_GASOLINE = 14.7
+
+# Candidate channel names per signal, checked case-insensitively in order.
+CHANNEL_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "rpm": ("Engine_RPM", "RPM", "Engine Speed", "EngineSpeed", "rpm"),
+    "load": ("MAP", "MAP_kPa", "Manifold Pressure", "Boost_Pressure", "Boost", "Load", "Engine Load", "TPS_Load"),
+    "lambda": ("Lambda", "Lambda1", "Lambda 1", "WB Lambda", "O2_Lambda"),
+    "afr": ("AFR", "AFR1", "Air Fuel Ratio", "WB AFR", "O2_AFR"),
+    "target_lambda": ("Lambda_Target", "Target Lambda", "Lambda Target"),
+    "target_afr": ("AFR_Target", "Target AFR", "AFR Target"),
+    "throttle": ("Throttle_Position", "TPS", "Throttle", "Throttle %", "throttle"),
+    "coolant": ("Coolant_Temp", "CTS", "ECT", "Coolant Temp", "Coolant"),
+    "knock": ("Knock_Count", "Knock", "Knock Retard", "Knock_Retard", "KnockLevel"),
+    "accel_enrich": ("Accel_Enrichment", "Accel Enrichment", "AE", "Accel_Enrich"),
+}
+
+
+@dataclass
+class CorrectionFilters:
+    """Sample rejection rules applied before binning."""
+
+    min_coolant_temp: float = 70.0  # Below this the engine is still on warm-up enrichment
+    max_throttle_rate: float = 60.0  # %/s - faster throttle movement is a transient
+    transient_settle_s: float = 0.5  # Samples this soon after a transient are rejected too
+    min_lambda: float = 0.55  # Outside this range the sensor is invalid or in fuel cut
+    max_lambda: float = 1.5
+    min_throttle: float = 1.0  # Closed throttle (overrun / decel fuel cut)
+    reject_accel_enrichment: bool = True
+
+
+@dataclass
+class CellCorrectionTable:
+    """Per-cell correction result for one map."""
+
+    rpm_axis: np.ndarray
+    load_axis: np.ndarray
+    hit_count: np.ndarray  # (n_rpm, n_load) samples accepted per cell
+    weight_sum: np.ndarray
+    lambda_ratio: np.ndarray  # Weighted mean measured/target lambda (1.0 where no data)
+    lambda_ratio_std: np.ndarray
+    ve_correction: np.ndarray  # Multiplier to apply to the VE/fuel table
+    knock_rate: np.ndarray  # Fraction of cell samples with knock activity
+    knock_max: np.ndarray
+    timing_correction: np.ndarray  # Suggested ignition change (degrees, <= 0)
+    confidence: np.ndarray  # 0-1, from hit count
+    samples_total: int = 0
+    samples_used: int = 0
+    rejected: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.hit_count.shape
+
+    def apply_to_table(self, table: Sequence[Sequence[float]], min_confidence: float = 0.5) -> List[List[float]]:
+        """
+        Apply VE corrections to a fuel/VE table with the same axes.
+
+        Cells below ``min_confidence`` are left unchanged.
+
+        Args:
+            table: 2D table indexed [rpm][load]
+            min_confidence: Minimum confidence for a cell to be corrected
+
+        Returns:
+            Corrected table as nested lists
+        """
+        values = np.asarray(table, dtype=np.float64)
+        if values.shape != self.shape:
+            raise ValueError(f"Table shape {values.shape} does not match correction shape {self.shape}")
+        factor = np.where(self.confidence >= min_confidence, self.ve_correction, 1.0)
+        return (values * factor).tolist()
+
+    def apply_timing_to_table(self, table: Sequence[Sequence[float]], min_confidence: float = 0.5) -> List[List[float]]:
+        """Apply suggested ignition pulls to a timing table with the same axes."""
+        values = np.asarray(table, dtype=np.float64)
+        if values.shape != self.shape:
+            raise ValueError(f"Table shape {values.shape} does not match correction shape {self.shape}")
+        delta = np.where(self.confidence >= min_confidence, self.timing_correction, 0.0)
+        return (values + delta).tolist()
+
+    def to_dict(self) -> Dict[str, object]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "rpm_axis": self.rpm_axis.tolist(),
+            "load_axis": self.load_axis.tolist(),
+            "hit_count": self.hit_count.tolist(),
+            "lambda_ratio": self.lambda_ratio.tolist(),
+            "lambda_ratio_std": self.lambda_ratio_std.tolist(),
+            "ve_correction": self.ve_correction.tolist(),
+            "knock_rate": self.knock_rate.tolist(),
+            "knock_max": self.knock_max.tolist(),
+            "timing_correction": self.timing_correction.tolist(),
+            "confidence": self.confidence.tolist(),
+            "samples_total": self.samples_total,
+            "samples_used": self.samples_used,
+            "rejected": dict(self.rejected),
+        }
+
+
+class MapCorrectionEngine:
+    """
+    Vectorized cell-binned correction engine.
+
+    Samples are assigned to the nearest breakpoint on each axis (cell edges sit
+    halfway between breakpoints). Within a cell each sample is weighted by its
+    proximity to the cell centre so that readings on a cell boundary count for
+    less than readings sitting on the breakpoint.
+    """
+
+    def __init__(
+        self,
+        rpm_axis: Sequence[float],
+        load_axis: Sequence[float],
+        target_lambda: object = 1.0,
+        filters: Optional[CorrectionFilters] = None,
+        channel_map: Optional[Dict[str, str]] = None,
+        min_hits: int = 20,
+        max_correction: float = 0.15,
+        knock_rate_full_pull: float = 0.2,
+        max_timing_pull: float = 4.0,
+    ) -> None:
+        """
+        Initialize correction engine.
+
+        Args:
+            rpm_axis: RPM breakpoints (ascending)
+            load_axis: Load breakpoints (ascending, same unit as the log's load channel)
+            target_lambda: Scalar target or (n_rpm, n_load) target table
+            filters: Transient/warm-up rejection rules
+            channel_map: Explicit signal -> log channel overrides (keys as in CHANNEL_ALIASES)
+            min_hits: Hit count at which a cell reaches ~63% confidence
+            max_correction: Maximum VE change per pass (0.15 = +/-15%)
+            knock_rate_full_pull: Knock rate at which the full timing pull is suggested
+            max_timing_pull: Largest suggested ignition pull (degrees)
+        """
+        self.rpm_axis = np.asarray(rpm_axis, dtype=np.float64)
+        self.load_axis = np.asarray(load_axis, dtype=np.float64)
+        if self.rpm_axis.ndim != 1 or self.load_axis.ndim != 1 or len(self.rpm_axis) < 2 or len(self.load_axis) < 2:
+            raise ValueError("rpm_axis and load_axis need at least two breakpoints each")
+        if np.any(np.diff(self.rpm_axis) <= 0) or np.any(np.diff(self.load_axis) <= 0):
+            raise ValueError("Axes must be strictly ascending")
+
+        target = np.asarray(target_lambda, dtype=np.float64)
+        if target.ndim == 0:
+            target = np.full((len(self.rpm_axis), len(self.load_axis)), float(target))
+        if target.shape != (len(self.rpm_axis), len(self.load_axis)):
+            raise ValueError("target_lambda table shape must match (len(rpm_axis), len(load_axis))")
+        self.target_lambda = target
+
+        self.filters = filters or CorrectionFilters()
+        self.channel_map = dict(channel_map or {})
+        self.min_hits = max(1, int(min_hits))
+        self.max_correction = max_correction
+        self.knock_rate_full_pull = knock_rate_full_pull
+        self.max_timing_pull = max_timing_pull
+
+        self._rpm_edges = (self.rpm_axis[:-1] + self.rpm_axis[1:]) / 2.0
+        self._load_edges = (self.load_axis[:-1] + self.load_axis[1:]) / 2.0
+        self._rpm_half_width = self._half_widths(self.rpm_axis)
+        self._load_half_width = self._half_widths(self.load_axis)
+
+    @classmethod
+    def from_tuning_map(cls, tuning_map: "TuningMap", **kwargs) -> "MapCorrectionEngine":
+        """
+        Build an engine from a ``TuningMap`` whose data holds its axes.
+
+        Expects ``data["rpm_axis"]`` and ``data["load_axis"]``; an optional
+        ``data["lambda_target_table"]`` or scalar ``data["lambda_target"]`` /
+        ``data["afr_target"]`` supplies the target.
+        """
+        data = tuning_map.data or {}
+        if "rpm_axis" not in data or "load_axis" not in data:
+            raise ValueError(f"Map '{tuning_map.name}' has no rpm_axis/load_axis")
+        if "target_lambda" not in kwargs:
+            if "lambda_target_table" in data:
+                kwargs["target_lambda"] = data["lambda_target_table"]
+            elif "lambda_target" in data:
+                kwargs["target_lambda"] = data["lambda_target"]
+            elif "afr_target" in data:
+                kwargs["target_lambda"] = float(data["afr_target"]) / STOICH_AFR_GASOLINE
+        return cls(data["rpm_axis"], data["load_axis"], **kwargs)
+
+    def analyze_log(self, log_data: "LogData") -> CellCorrectionTable:
+        """
+        Analyze a log parsed by ``UniversalLogParser``.
+
+        Args:
+            log_data: Parsed log
+
+        Returns:
+            Cell correction table
+        """
+        channels = log_data.data
+        rpm = self._require(channels, "rpm")
+        load = self._require(channels, "load")
+
+        lam = self._optional(channels, "lambda")
+        if lam is None:
+            afr = self._optional(channels, "afr")
+            if afr is None:
+                raise ValueError("Log has no lambda or AFR channel")
+            lam = afr / STOICH_AFR_GASOLINE
+
+        target = self._optional(channels, "target_lambda")
+        if target is None:
+            target_afr = self._optional(channels, "target_afr")
+            if target_afr is not None:
+                target = target_afr / STOICH_AFR_GASOLINE
+
+        n = len(rpm)
+        time_axis: Optional[np.ndarray] = None
+        if log_data.time is not None and len(log_data.time) == n:
+            time_axis = np.asarray(log_data.time, dtype=np.float64)
+        elif log_data.metadata.sample_rate:
+            time_axis = np.arange(n, dtype=np.float64) / float(log_data.metadata.sample_rate)
+
+        return self.analyze_arrays(
+            rpm=rpm,
+            load=load,
+            lambda_measured=lam,
+            time=time_axis,
+            target_lambda=target,
+            throttle=self._optional(channels, "throttle"),
+            coolant_temp=self._optional(channels, "coolant"),
+            knock=self._optional(channels, "knock"),
+            accel_enrichment=self._optional(channels, "accel_enrich"),
+        )
+
+    def analyze_arrays(
+        self,
+        rpm: Sequence[float],
+        load: Sequence[float],
+        lambda_measured: Sequence[float],
+        time: Optional[Sequence[float]] = None,
+        target_lambda: Optional[Sequence[float]] = None,
+        throttle: Optional[Sequence[float]] = None,
+        coolant_temp: Optional[Sequence[float]] = None,
+        knock: Optional[Sequence[float]] = None,
+        accel_enrichment: Optional[Sequence[float]] = None,
+    ) -> CellCorrectionTable:
+        """
+        Bin raw channel arrays into the map and compute corrections.
+
+        All arrays must have the same length. ``target_lambda`` given here is a
+        per-sample logged target and overrides the engine's target table.
+        """
+        rpm = np.asarray(rpm, dtype=np.float64)
+        load = np.asarray(load, dtype=np.float64)
+        lam = np.asarray(lambda_measured, dtype=np.float64)
+        n = len(rpm)
+        if len(load) != n or len(lam) != n:
+            raise ValueError("rpm, load and lambda arrays must have the same length")
+
+        valid, rejected = self._sample_mask(n, rpm, load, lam, time, throttle, coolant_temp, accel_enrichment)
+
+        r_idx = np.digitize(rpm, self._rpm_edges)
+        l_idx = np.digitize(load, self._load_edges)
+        n_rpm, n_load = len(self.rpm_axis), len(self.load_axis)
+        n_cells = n_rpm * n_load
+
+        # Proximity weight: 1 on the breakpoint, falling to 0.25 at the cell edge
+        r_off = np.abs(rpm - self.rpm_axis[r_idx]) / self._rpm_half_width[r_idx]
+        l_off = np.abs(load - self.load_axis[l_idx]) / self._load_half_width[l_idx]
+        weight = (1.0 - 0.5 * np.clip(r_off, 0.0, 1.0)) * (1.0 - 0.5 * np.clip(l_off, 0.0, 1.0))
+
+        flat = (r_idx * n_load + l_idx)[valid]
+        w = weight[valid]
+
+        if target_lambda is not None:
+            target = np.asarray(target_lambda, dtype=np.float64)[valid]
+            target = np.where(target > 0, target, self.target_lambda.ravel()[flat])
+        else:
+            target = self.target_lambda.ravel()[flat]
+        ratio = lam[valid] / target
+
+        hits = np.bincount(flat, minlength=n_cells)
+        w_sum = np.bincount(flat, weights=w, minlength=n_cells)
+        w_ratio = np.bincount(flat, weights=w * ratio, minlength=n_cells)
+        w_ratio_sq = np.bincount(flat, weights=w * ratio * ratio, minlength=n_cells)
+
+        has_data = w_sum > 0
+        safe_w = np.where(has_data, w_sum, 1.0)
+        mean_ratio = np.where(has_data, w_ratio / safe_w, 1.0)
+        var_ratio = np.where(has_data, w_ratio_sq / safe_w - mean_ratio * mean_ratio, 0.0)
+        std_ratio = np.sqrt(np.clip(var_ratio, 0.0, None))
+
+        confidence = 1.0 - np.exp(-hits / float(self.min_hits))
+        # Lean (ratio > 1) needs more fuel: VE multiplier follows the ratio, capped per pass
+        ve_correction = np.clip(mean_ratio, 1.0 - self.max_correction, 1.0 + self.max_correction)
+        ve_correction = np.where(has_data, ve_correction, 1.0)
+
+        if knock is not None:
+            knock_arr = np.nan_to_num(np.asarray(knock, dtype=np.float64)[valid])
+            knock_hits = np.bincount(flat, weights=(knock_arr > 0).astype(np.float64), minlength=n_cells)
+            knock_rate = np.where(hits > 0, knock_hits / np.maximum(hits, 1), 0.0)
+            knock_max = np.zeros(n_cells)
+            np.maximum.at(knock_max, flat, knock_arr)
+        else:
+            knock_rate = np.zeros(n_cells)
+            knock_max = np.zeros(n_cells)
+        pull_fraction = np.clip(knock_rate / self.knock_rate_full_pull, 0.0, 1.0)
+        timing_correction = -np.round(pull_fraction * self.max_timing_pull * 2.0) / 2.0  # 0.5 degree steps
+
+        shape = (n_rpm, n_load)
+        table = CellCorrectionTable(
+            rpm_axis=self.rpm_axis.copy(),
+            load_axis=self.load_axis.copy(),
+            hit_count=hits.reshape(shape),
+            weight_sum=w_sum.reshape(shape),
+            lambda_ratio=mean_ratio.reshape(shape),
+            lambda_ratio_std=std_ratio.reshape(shape),
+            ve_correction=ve_correction.reshape(shape),
+            knock_rate=knock_rate.reshape(shape),
+            knock_max=knock_max.reshape(shape),
+            timing_correction=timing_correction.reshape(shape) + 0.0,  # normalise -0.0
+            confidence=confidence.reshape(shape),
+            samples_total=n,
+            samples_used=int(valid.sum()),
+            rejected=rejected,
+        )
+        LOGGER.info(
+            "Map correction: %d/%d samples used across %d cells",
+            table.samples_used, n, int(np.count_nonzero(hits)),
+        )
+        return table
+
+    def _sample_mask(
+        self,
+        n: int,
+        rpm: np.ndarray,
+        load: np.ndarray,
+        lam: np.ndarray,
+        time: Optional[Sequence[float]],
+        throttle: Optional[Sequence[float]],
+        coolant_temp: Optional[Sequence[float]],
+        accel_enrichment: Optional[Sequence[float]],
+    ) -> Tuple[np.ndarray, Dict[str, int]]:
+        """Build the accepted-sample mask and per-reason reject counts."""
+        f = self.filters
+        rejected: Dict[str, int] = {}
+
+        finite = np.isfinite(rpm) & np.isfinite(load) & np.isfinite(lam)
+        valid = finite.copy()
+        rejected["invalid"] = int(n - finite.sum())
+
+        lambda_ok = (lam >= f.min_lambda) & (lam <= f.max_lambda)
+        rejected["lambda_range"] = int((valid & ~lambda_ok).sum())
+        valid &= lambda_ok
+
+        if coolant_temp is not None:
+            warm = np.asarray(coolant_temp, dtype=np.float64) >= f.min_coolant_temp
+            rejected["warm_up"] = int((valid & ~warm).sum())
+            valid &= warm
+
+        if accel_enrichment is not None and f.reject_accel_enrichment:
+            no_ae = np.nan_to_num(np.asarray(accel_enrichment, dtype=np.float64)) <= 0
+            rejected["accel_enrichment"] = int((valid & ~no_ae).sum())
+            valid &= no_ae
+
+        if throttle is not None:
+            tps = np.asarray(throttle, dtype=np.float64)
+            open_throttle = tps >= f.min_throttle
+            rejected["closed_throttle"] = int((valid & ~open_throttle).sum())
+            valid &= open_throttle
+
+            if time is not None and n > 1:
+                t = np.asarray(time, dtype=np.float64)
+                transient = self._transient_mask(t, tps)
+                rejected["transient"] = int((valid & transient).sum())
+                valid &= ~transient
+
+        return valid, rejected
+
+    def _transient_mask(self, t: np.ndarray, tps: np.ndarray) -> np.ndarray:
+        """Flag samples during, and for ``transient_settle_s`` after, fast throttle movement."""
+        f = self.filters
+        dt = np.diff(t)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.abs(np.diff(tps)) / np.where(dt > 0, dt, np.nan)
+        fast = np.concatenate(([False], np.nan_to_num(rate, nan=0.0) > f.max_throttle_rate))
+        if not fast.any():
+            return fast
+        # Time of the most recent transient at or before each sample
+        last_transient = np.where(fast, t, -np.inf)
+        np.maximum.accumulate(last_transient, out=last_transient)
+        return (t - last_transient) <= f.transient_settle_s
+
+    def _resolve(self, channels: Dict[str, Sequence[float]], signal: str) -> Optional[str]:
+        """Find the log channel name for a signal."""
+        override = self.channel_map.get(signal)
+        if override:
+            return override if override in channels else None
+        lookup = {name.lower(): name for name in channels}
+        for alias in CHANNEL_ALIASES.get(signal, ()):
+            name = lookup.get(alias.lower())
+            if name is not None:
+                return name
+        return None
+
+    def _optional(self, channels: Dict[str, Sequence[float]], signal: str) -> Optional[np.ndarray]:
+        name = self._resolve(channels, signal)
+        if name is None or not len(channels[name]):
+            return None
+        return np.asarray(channels[name], dtype=np.float64)
+
+    def _require(self, channels: Dict[str, Sequence[float]], signal: str) -> np.ndarray:
+        values = self._optional(channels, signal)
+        if values is None:
+            raise ValueError(f"Log has no {signal} channel (tried {CHANNEL_ALIASES.get(signal)})")
+        return values
+
+    @staticmethod
+    def _half_widths(axis: np.ndarray) -> np.ndarray:
+        """Distance from each breakpoint to its nearest cell edge."""
+        gaps = np.diff(axis) / 2.0
+        left = np.concatenate(([gaps[0]], gaps))
+        right = np.concatenate((gaps, [gaps[-1]]))
+        return np.minimum(left, right)
+
+
+__all__ = [
+    "CHANNEL_ALIASES",
+    "CellCorrectionTable",
+    "CorrectionFilters",
+    "MapCorrectionEngine",
+]
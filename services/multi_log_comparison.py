@@ -9,8 +9,12 @@ import logging
 import time
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
+from services.log_decimation import LogPyramid
 from services.universal_log_parser import LogData, UniversalLogParser
 
 LOGGER = logging.getLogger(__name__)
@@ -34,6 +38,7 @@ class LogFile:
     visible: bool = True
     alignment_offset: float = 0.0  # Offset for alignment
     notes: str = ""
+    pyramid: Optional[LogPyramid] = None  # Decimation pyramid, built on first plot
 
 
 @dataclass
@@ -189,7 +194,9 @@ class MultiLogComparison:
                     times = log.log_data.time
                     
                     # Find peak
-                    peak_idx = values.index(max(values))
+                    if len(values) == 0:
+                        continue
+                    peak_idx = int(np.argmax(values))
                     peak_time = times[peak_idx]
                     
                     if baseline_time is None:
@@ -245,6 +252,51 @@ class MultiLogComparison:
         
         return result
     
+    def get_pyramid(self, log: LogFile) -> LogPyramid:
+        """Get (building or loading from the disk cache if needed) a log's decimation pyramid."""
+        if log.pyramid is None:
+            log.pyramid = LogPyramid.load_or_build(Path(log.file_path), log.log_data)
+        return log.pyramid
+    
+    def get_decimated_data(
+        self,
+        channel: str,
+        x_min: float,
+        x_max: float,
+        pixel_width: int,
+    ) -> Dict[str, Tuple[Any, Any, Any]]:
+        """
+        Get plot-ready data for a channel, decimated to the view.
+        
+        Unlike get_aligned_data(), the result size depends on pixel_width,
+        not on the log length.
+        
+        Args:
+            channel: Channel name
+            x_min: Visible range start (aligned time)
+            x_max: Visible range end (aligned time)
+            pixel_width: Width of the plot area in pixels
+        
+        Returns:
+            Dictionary of log_name -> (x, lower, upper) arrays in aligned time.
+            lower is upper when the view shows raw samples.
+        """
+        result = {}
+        
+        for log in self.logs:
+            if not log.visible or channel not in log.log_data.data:
+                continue
+            
+            channel_pyramid = self.get_pyramid(log).get(channel)
+            if channel_pyramid is None:
+                continue
+            
+            offset = log.alignment_offset
+            xs, lower, upper = channel_pyramid.envelope(x_min - offset, x_max - offset, pixel_width)
+            result[log.name] = (xs + offset, lower, upper)
+        
+        return result
+    
     def set_cursor_position(self, position: float, channel: Optional[str] = None) -> None:
         """Set cursor position (synchronized across all logs)."""
         self.cursor.position = position
@@ -271,10 +323,10 @@ class MultiLogComparison:
             
             # Find closest time point
             times = log.log_data.time
-            if not times:
+            if len(times) == 0:
                 continue
             
-            closest_idx = min(range(len(times)), key=lambda i: abs(times[i] - aligned_time))
+            closest_idx = int(np.argmin(np.abs(np.asarray(times, dtype=np.float64) - aligned_time)))
             
             # Get all channel values at this point
             for channel_name, channel_data in log.log_data.data.items():
@@ -0,0 +1,251 @@
+"""
+OTA Delta Patches
+
+Binary deltas between two installation trees, so an OTA update only
+downloads what changed since the installed version.
+
+Files are split with content-defined chunking (see services.chunk_store)
+using small chunks, and every chunk of the base tree is indexed by
+SHA-256. A changed or new file is encoded as operations that copy a range
+of any base file (so moved files cost nothing) or insert literal bytes
+stored in the patch. Unchanged files are not listed; removed files are.
+The patch is a zip holding ``delta_manifest.json`` and the literal data.
+
+Applying a patch checks the SHA-256 of every base file it reads and of
+every file it writes, so a corrupted patch or an unexpected base tree
+raises DeltaError.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from services.chunk_store import chunk_boundaries
+
+DELTA_FORMAT = "ota-delta-1"
+DELTA_MANIFEST = "delta_manifest.json"
+DELTA_DATA = "delta_data.bin"
+
+# Chunk sizes (min, average, max): small, so an edit to a source file only resends about a kilobyte
+DELTA_CHUNK_SIZES = (256, 1024, 8192)
+
+SKIPPED_DIRECTORIES = frozenset({"__pycache__"})  # Skipped at any depth
+
+
+class DeltaError(Exception):
+    """Delta patch is invalid or does not match the base tree."""
+
+
+def tree_files(root: Path, skip: Iterable[str] = ()) -> Dict[str, Path]:
+    """
+    Files of a tree by POSIX relative path.
+
+    Args:
+        root: Tree root
+        skip: Top-level names to leave out
+    """
+    root = Path(root)
+    skip = set(skip)
+    files: Dict[str, Path] = {}
+    for directory, dirnames, filenames in os.walk(root):
+        at_top = Path(directory) == root
+        dirnames[:] = sorted(
+            d for d in dirnames if d not in SKIPPED_DIRECTORIES and not (at_top and d in skip)
+        )
+        for name in sorted(filenames):
+            if at_top and name in skip:
+                continue
+            path = Path(directory) / name
+            files[path.relative_to(root).as_posix()] = path
+    return files
+
+
+def _chunks(data: bytes) -> Iterable[Tuple[int, int]]:
+    start = 0
+    for end in chunk_boundaries(data, *DELTA_CHUNK_SIZES):
+        yield start, end
+        start = end
+
+
+def create_delta(
+    base_dir: Path,
+    target_dir: Path,
+    output: Path,
+    base_version: str,
+    version: str,
+    skip: Iterable[str] = (),
+) -> Dict[str, int]:
+    """
+    Write a patch that turns the base tree into the target tree.
+
+    Args:
+        base_dir: Installed (old) tree
+        target_dir: New tree
+        output: Patch file to write
+        base_version: Version of the base tree
+        version: Version of the target tree
+        skip: Top-level names to leave out of both trees
+
+    Returns:
+        Counts of changed and deleted files, copied and literal bytes
+    """
+    base_files = tree_files(base_dir, skip)
+    target_files = tree_files(target_dir, skip)
+
+    base_hashes: Dict[str, str] = {}
+    index: Dict[bytes, Tuple[str, int, int]] = {}  # Chunk digest -> (base file, offset, length)
+    for rel, path in base_files.items():
+        data = path.read_bytes()
+        base_hashes[rel] = hashlib.sha256(data).hexdigest()
+        for start, end in _chunks(data):
+            index.setdefault(hashlib.sha256(data[start:end]).digest(), (rel, start, end - start))
+
+    literal = bytearray()
+    files: Dict[str, Dict] = {}
+    referenced = set()
+    copied = 0
+    for rel, path in target_files.items():
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if base_hashes.get(rel) == digest:
+            continue
+        ops: List[List] = []
+        for start, end in _chunks(data):
+            hit = index.get(hashlib.sha256(data[start:end]).digest())
+            if hit is not None:
+                source, offset, length = hit
+                referenced.add(source)
+                copied += length
+                last = ops[-1] if ops else None
+                if last and last[0] == "copy" and last[1] == source and last[2] + last[3] == offset:
+                    last[3] += length
+                else:
+                    ops.append(["copy", source, offset, length])
+            else:
+                last = ops[-1] if ops else None
+                if last and last[0] == "insert" and last[1] + last[2] == len(literal):
+                    last[2] += end - start
+                else:
+                    ops.append(["insert", len(literal), end - start])
+                literal += data[start:end]
+        files[rel] = {"sha256": digest, "size": len(data), "mode": path.stat().st_mode & 0o777, "ops": ops}
+
+    deleted = sorted(set(base_files) - set(target_files))
+    manifest = {
+        "format": DELTA_FORMAT,
+        "base_version": base_version,
+        "version": version,
+        "base_files": {rel: base_hashes[rel] for rel in sorted(referenced)},
+        "files": files,
+        "deleted": deleted,
+    }
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(DELTA_MANIFEST, json.dumps(manifest))
+        archive.writestr(DELTA_DATA, bytes(literal))
+    return {"files": len(files), "deleted": len(deleted), "copied_bytes": copied, "literal_bytes": len(literal)}
+
+
+def is_delta_package(path: Path) -> bool:
+    """True if the update package is a delta patch."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return DELTA_MANIFEST in archive.namelist()
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def read_delta_manifest(path: Path) -> Dict:
+    with zipfile.ZipFile(path) as archive:
+        return json.loads(archive.read(DELTA_MANIFEST))
+
+
+def apply_delta(patch: Path, base_dir: Path, output_dir: Path) -> List[str]:
+    """
+    Apply a patch to a copy of the base tree.
+
+    Changed files are written to ``output_dir`` (each through a temporary
+    file) and deleted files removed from it; other files in it are left
+    as they are, so it should already mirror ``base_dir``. The two may be
+    the same directory only if nothing else reads it meanwhile.
+
+    Returns:
+        Relative paths written
+    """
+    base_dir = Path(base_dir)
+    output_dir = Path(output_dir)
+    try:
+        with zipfile.ZipFile(patch) as archive:
+            manifest = json.loads(archive.read(DELTA_MANIFEST))
+            literal = archive.read(DELTA_DATA)
+    except (KeyError, ValueError, zipfile.BadZipFile, zlib.error) as e:
+        raise DeltaError(f"Unreadable delta patch: {e}") from e
+    if manifest.get("format") != DELTA_FORMAT:
+        raise DeltaError(f"Unsupported delta format: {manifest.get('format')}")
+
+    # Read every source first: the output may replace base files of the same name
+    sources: Dict[str, bytes] = {}
+    for rel, digest in manifest["base_files"].items():
+        path = _inside(base_dir, rel)
+        try:
+            data = path.read_bytes()
+        except OSError as e:
+            raise DeltaError(f"Base file missing: {rel}") from e
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise DeltaError(f"Base file does not match the patch: {rel}")
+        sources[rel] = data
+
+    outputs: List[Tuple[str, bytes, int]] = []
+    for rel, entry in manifest["files"].items():
+        parts = []
+        for op in entry["ops"]:
+            if op[0] == "copy":
+                _, source, offset, length = op
+                if source not in sources:
+                    raise DeltaError(f"Patch copies from an unlisted base file: {source}")
+                parts.append(sources[source][offset:offset + length])
+            elif op[0] == "insert":
+                _, offset, length = op
+                parts.append(literal[offset:offset + length])
+            else:
+                raise DeltaError(f"Unknown delta operation: {op[0]}")
+        data = b"".join(parts)
+        if len(data) != entry["size"] or hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            raise DeltaError(f"Patched file does not match its checksum: {rel}")
+        outputs.append((rel, data, entry.get("mode", 0o644)))
+
+    for rel, data, mode in outputs:
+        path = _inside(output_dir, rel)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".ota-tmp")
+        temp_path.write_bytes(data)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    for rel in manifest["deleted"]:
+        path = _inside(output_dir, rel)
+        if path.is_file():
+            path.unlink()
+    return [rel for rel, _, _ in outputs]
+
+
+def _inside(root: Path, rel: str) -> Path:
+    path = (root / rel).resolve()
+    if not str(path).startswith(str(root.resolve()) + os.sep):
+        raise DeltaError(f"Path outside the tree: {rel}")
+    return path
+
+
+__all__ = [
+    "DELTA_FORMAT",
+    "DeltaError",
+    "apply_delta",
+    "create_delta",
+    "is_delta_package",
+    "read_delta_manifest",
+    "tree_files",
+]
@@ -1,6 +1,18 @@
 """
 Over-the-Air (OTA) Update Service
 Enables remote software updates without physical access.
+
+Downloads are ranged and resume where a dropped connection left off.
+When the server offers a delta patch against the installed version (see
+services.ota_delta) only the patch is downloaded. Updates are installed
+into the inactive one of two slot directories (A/B): the slot is first
+synced with the active tree, then the package or patch is applied, the
+slot is made active with an atomic switch, and a health check runs; if it
+fails the previous slot is switched back. Launchers (the systemd unit
+written by scripts/pi5_install.sh) run ``slots/current``, which links to
+the install directory itself until the first A/B install. Only the
+application paths in APP_PATHS are copied from the install directory;
+logs, data, caches and virtual environments stay where they are.
 """
 
 from __future__ import annotations
@@ -10,6 +22,7 @@ import json
 import logging
 import os
 import shutil
+import py_compile
 import subprocess
 import sys
 import time
@@ -19,6 +32,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Callable
 
+from services.ota_delta import DeltaError, apply_delta, is_delta_package, tree_files
+
 try:
     import requests
     REQUESTS_AVAILABLE = True
@@ -28,6 +43,20 @@ except ImportError:
 
 LOGGER = logging.getLogger(__name__)
 
+SLOT_NAMES = ("a", "b")
+SLOT_STATE_FILE = "slots.json"
+# Top-level entries of the install directory that make up the application (copied into slots)
+APP_PATHS = (
+    "ai", "ai_engine", "algorithms", "api", "calibration", "can_interface", "config",
+    "controllers", "core", "interfaces", "logging_utils", "ml", "services", "ui",
+    "__init__.py", "config.py", "demo.py", "main.py", "requirements.txt",
+)
+ENTRY_MODULE = "demo"  # Imported by the default health check (the systemd unit runs demo.py)
+HEALTH_CHECK_TIMEOUT = 120.0  # Seconds allowed for the entry module import
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PROGRESS_NOTIFY_INTERVAL = 0.25  # Seconds between download progress callbacks
+
 
 class UpdateStatus(Enum):
     """Update status."""
@@ -55,6 +84,9 @@ class UpdateInfo:
     critical: bool = False  # Critical security update
     delta_update: bool = False  # Delta update vs full update
     base_version: Optional[str] = None  # For delta updates
+    delta_url: Optional[str] = None  # Delta patch against base_version
+    delta_size: int = 0
+    delta_checksum: str = ""
 
 
 @dataclass
@@ -74,10 +106,10 @@ class OTAUpdateService:
     
     Handles:
     - Checking for updates
-    - Downloading update packages
+    - Resumable downloads of full packages or delta patches
     - Verifying integrity
-    - Installing updates
-    - Rollback on failure
+    - Installing updates into A/B slots
+    - Rollback when installation or the health check fails
     """
     
     def __init__(
@@ -88,6 +120,11 @@ class OTAUpdateService:
         backup_directory: Optional[Path] = None,
         auto_check: bool = True,
         check_interval: int = 3600,  # 1 hour
+        slots_directory: Optional[Path] = None,
+        health_check: Optional[Callable[[Path], bool]] = None,
+        download_retries: int = 5,
+        retry_delay: float = 2.0,
+        entry_module: Optional[str] = ENTRY_MODULE,
     ):
         """
         Initialize OTA update service.
@@ -99,12 +136,26 @@ class OTAUpdateService:
             backup_directory: Directory for backups (default: install_dir/backups)
             auto_check: Automatically check for updates
             check_interval: Interval between auto-checks (seconds)
+            slots_directory: Directory of the A/B slots (default: install_dir/slots)
+            health_check: Called with the newly active slot after switching; False rolls back
+                (default: the Python files the update wrote compile and the entry module imports)
+            download_retries: Consecutive failed attempts before a download gives up
+            retry_delay: Base delay between download attempts (seconds, grows linearly)
+            entry_module: Module the default health check imports from the slot (None: skip)
         """
         self.update_server_url = update_server_url.rstrip('/')
         self.app_version = app_version
         self.install_directory = install_directory or Path(__file__).parent.parent
         self.backup_directory = backup_directory or (self.install_directory / "backups" / "ota")
         self.backup_directory.mkdir(parents=True, exist_ok=True)
+        self.slots_directory = slots_directory or (self.install_directory / "slots")
+        self.health_check = health_check or self._default_health_check
+        self.download_retries = download_retries
+        self.retry_delay = retry_delay
+        self.entry_module = entry_module
+        self.installed_files: List[str] = []  # Relative paths written by the last install
+        self.current_update_file: Optional[Path] = None
+        self._last_progress_notify = 0.0
         
         self.auto_check = auto_check
         self.check_interval = check_interval
@@ -169,6 +220,7 @@ class OTAUpdateService:
                 "current_version": self.app_version,
                 "platform": sys.platform,
                 "architecture": self._get_architecture(),
+                "supports_delta": True,
             }
             
             response = requests.get(url, params=params, timeout=10)
@@ -189,6 +241,9 @@ class OTAUpdateService:
                     critical=data.get("critical", False),
                     delta_update=data.get("delta_update", False),
                     base_version=data.get("base_version"),
+                    delta_url=data.get("delta_url"),
+                    delta_size=data.get("delta_size", 0),
+                    delta_checksum=data.get("delta_checksum", ""),
                 )
                 
                 # Check if version is newer
@@ -217,12 +272,17 @@ class OTAUpdateService:
             self._notify_progress()
             return None
     
-    def download_update(self, update_info: Optional[UpdateInfo] = None) -> bool:
+    def download_update(self, update_info: Optional[UpdateInfo] = None, prefer_delta: bool = True) -> bool:
         """
         Download update package.
         
+        The delta patch is downloaded instead of the full package when one is
+        offered against the installed version. An interrupted download resumes
+        from the partial file, also across calls.
+        
         Args:
             update_info: Update info (uses current_update if None)
+            prefer_delta: Use the delta patch if one applies
         
         Returns:
             True if download successful
@@ -238,42 +298,33 @@ class OTAUpdateService:
             LOGGER.error("No update info available")
             return False
         
+        use_delta = bool(prefer_delta and update_info.delta_url and update_info.base_version == self.app_version)
+        if use_delta:
+            url, size, checksum = update_info.delta_url, update_info.delta_size, update_info.delta_checksum
+            name = f"update_{update_info.base_version}_to_{update_info.version}.delta.zip"
+        else:
+            url, size, checksum = update_info.download_url, update_info.file_size, update_info.checksum
+            name = f"update_{update_info.version}.zip"
+        
         self.update_progress.status = UpdateStatus.DOWNLOADING
-        self.update_progress.total_bytes = update_info.file_size
+        self.update_progress.current_step = "Downloading delta patch" if use_delta else "Downloading update"
+        self.update_progress.total_bytes = size
         self.update_progress.downloaded_bytes = 0
+        self.update_progress.progress_percent = 0.0
         self._notify_progress()
         
         try:
             # Create download directory
             download_dir = self.install_directory / "downloads" / "ota"
             download_dir.mkdir(parents=True, exist_ok=True)
-            download_file = download_dir / f"update_{update_info.version}.zip"
-            
-            # Download with progress tracking
-            response = requests.get(update_info.download_url, stream=True, timeout=60)
-            response.raise_for_status()
-            
-            with open(download_file, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        self.update_progress.downloaded_bytes += len(chunk)
-                        if update_info.file_size > 0:
-                            self.update_progress.progress_percent = (
-                                self.update_progress.downloaded_bytes / update_info.file_size * 100
-                            )
-                        self._notify_progress()
-            
-            # Verify file size
-            if download_file.stat().st_size != update_info.file_size:
-                LOGGER.error("Downloaded file size mismatch")
-                download_file.unlink()
-                return False
-            
-            # Verify checksum
-            if not self._verify_checksum(download_file, update_info.checksum):
-                LOGGER.error("Checksum verification failed")
-                download_file.unlink()
+            download_file = download_dir / name
+            
+            if checksum and download_file.exists() and self._verify_checksum(download_file, checksum):
+                LOGGER.info("Update already downloaded: %s", download_file)
+            elif not self._download_file(url, download_file, size, checksum):
+                self.update_progress.status = UpdateStatus.FAILED
+                self.update_progress.error_message = "Downloaded file failed verification"
+                self._notify_progress()
                 return False
             
             # Store update file path
@@ -294,13 +345,87 @@ class OTAUpdateService:
             self._notify_progress()
             return False
     
+    def _download_file(self, url: str, destination: Path, expected_size: int, checksum: str) -> bool:
+        """
+        Ranged download into ``destination.part``, resumed after dropped connections.
+        
+        Gives up after ``download_retries`` consecutive attempts without progress.
+        
+        Returns:
+            True if the complete file passed the size and checksum checks
+        """
+        partial = destination.with_name(destination.name + ".part")
+        failures = 0
+        while True:
+            offset = partial.stat().st_size if partial.exists() else 0
+            if expected_size and offset > expected_size:
+                partial.unlink()
+                offset = 0
+            if expected_size and offset == expected_size:
+                break
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            received = 0
+            try:
+                with requests.get(url, stream=True, timeout=60, headers=headers) as response:
+                    if response.status_code == 416 and offset:
+                        break  # Nothing left to send: the partial file is complete
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        offset = 0  # Range ignored: start over
+                    self.update_progress.downloaded_bytes = offset
+                    with open(partial, "ab" if offset else "wb") as f:
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            if chunk:
+                                f.write(chunk)
+                                received += len(chunk)
+                                self.update_progress.downloaded_bytes += len(chunk)
+                                if expected_size > 0:
+                                    self.update_progress.progress_percent = (
+                                        self.update_progress.downloaded_bytes / expected_size * 100
+                                    )
+                                self._notify_progress(throttle=True)
+                if not expected_size or partial.stat().st_size >= expected_size:
+                    break
+                raise requests.ConnectionError("Connection closed before the end of the file")
+            except requests.RequestException as e:
+                response = getattr(e, "response", None)
+                if response is not None and 400 <= response.status_code < 500:
+                    raise
+                failures = 0 if received else failures + 1
+                if failures >= self.download_retries:
+                    raise
+                LOGGER.warning("Download interrupted at %d bytes (%s), resuming", 
+                               offset + received, e)
+                time.sleep(self.retry_delay * max(1, failures))
+        self._notify_progress()
+        
+        # Verify file size
+        if expected_size and partial.stat().st_size != expected_size:
+            LOGGER.error("Downloaded file size mismatch")
+            partial.unlink()
+            return False
+        
+        # Verify checksum
+        if not self._verify_checksum(partial, checksum):
+            LOGGER.error("Checksum verification failed")
+            partial.unlink()
+            return False
+        
+        os.replace(partial, destination)
+        return True
+    
     def install_update(
         self,
         update_info: Optional[UpdateInfo] = None,
         require_approval: bool = True,
     ) -> bool:
         """
-        Install downloaded update.
+        Install downloaded update into the inactive slot and switch to it.
+        
+        The active slot is not modified. If the health check fails after the
+        switch, the previous slot is switched back. If a delta patch does not
+        apply (corrupted, or the installed files differ from its base), the
+        full package is downloaded and installed instead.
         
         Args:
             update_info: Update info (uses current_update if None)
@@ -316,89 +441,137 @@ class OTAUpdateService:
             LOGGER.error("No update info available")
             return False
         
-        if not hasattr(self, 'current_update_file') or not self.current_update_file.exists():
+        if self.current_update_file is None or not self.current_update_file.exists():
             LOGGER.error("Update file not found")
             return False
         
-        # Create backup before installing
-        backup_path = self._create_backup()
-        if not backup_path:
-            LOGGER.error("Failed to create backup")
-            return False
+        state = self._load_slot_state()
+        previous = state.get("active")
+        source = self.active_directory
+        target = SLOT_NAMES[1] if previous == SLOT_NAMES[0] else SLOT_NAMES[0]
+        target_dir = self.slots_directory / target
+        extract_dir = self.install_directory / "downloads" / "ota" / f"extract_{update_info.version}"
+        delta = is_delta_package(self.current_update_file)
         
         self.update_progress.status = UpdateStatus.INSTALLING
         self.update_progress.progress_percent = 0.0
-        self.update_progress.current_step = "Extracting update package"
+        self.update_progress.current_step = f"Preparing slot {target.upper()}"
         self._notify_progress()
         
         try:
-            # Extract update package
-            extract_dir = self.install_directory / "downloads" / "ota" / f"extract_{update_info.version}"
-            extract_dir.mkdir(parents=True, exist_ok=True)
-            
-            with zipfile.ZipFile(self.current_update_file, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
+            # Make the inactive slot a copy of the active tree (only changed files are copied)
+            self._sync_tree(source, target_dir)
             
             self.update_progress.progress_percent = 30.0
-            self.update_progress.current_step = "Installing files"
+            self.update_progress.current_step = "Applying delta patch" if delta else "Installing files"
             self._notify_progress()
             
-            # Install files (copy to install directory)
-            self._install_files(extract_dir, update_info)
+            shutil.rmtree(extract_dir, ignore_errors=True)
+            extract_dir.mkdir(parents=True, exist_ok=True)
+            with zipfile.ZipFile(self.current_update_file, 'r') as zip_ref:
+                if delta:
+                    if "post_install.sh" in zip_ref.namelist():
+                        zip_ref.extract("post_install.sh", extract_dir)
+                else:
+                    zip_ref.extractall(extract_dir)
+            if delta:
+                self.installed_files = apply_delta(self.current_update_file, source, target_dir)
+            else:
+                self.installed_files = self._install_files(extract_dir, target_dir)
             
-            self.update_progress.progress_percent = 80.0
+            self.update_progress.progress_percent = 70.0
             self.update_progress.current_step = "Running post-install scripts"
             self._notify_progress()
             
             # Run post-install scripts if any
-            self._run_post_install_scripts(extract_dir)
-            
-            self.update_progress.progress_percent = 100.0
-            self.update_progress.status = UpdateStatus.COMPLETE
-            self.update_progress.current_step = "Update complete"
-            self._notify_progress()
-            
-            # Record in history
-            self.update_history.append({
-                "version": update_info.version,
-                "installed_at": time.time(),
-                "backup_path": str(backup_path),
-            })
-            self._save_update_history()
-            
-            # Cleanup
+            self._run_post_install_scripts(extract_dir, target_dir)
+        except DeltaError as e:
             shutil.rmtree(extract_dir, ignore_errors=True)
-            
-            LOGGER.info("Update installed successfully: %s", update_info.version)
-            return True
-            
+            LOGGER.error("Delta patch could not be applied: %s", e)
+            if update_info.download_url and update_info.download_url != update_info.delta_url:
+                LOGGER.info("Falling back to the full update package")
+                if self.download_update(update_info, prefer_delta=False):
+                    return self.install_update(update_info, require_approval)
+            self._fail(f"Delta patch could not be applied: {e}")
+            return False
         except Exception as e:
+            # The active slot is untouched; the inactive one is re-synced on the next attempt
+            shutil.rmtree(extract_dir, ignore_errors=True)
             LOGGER.error("Update installation failed: %s", e, exc_info=True)
-            self.update_progress.status = UpdateStatus.FAILED
-            self.update_progress.error_message = str(e)
+            self._fail(str(e))
+            return False
+        shutil.rmtree(extract_dir, ignore_errors=True)
+        
+        self.update_progress.progress_percent = 85.0
+        self.update_progress.current_step = f"Switching to slot {target.upper()}"
+        self._notify_progress()
+        previous_version = self.app_version
+        self._switch_slot(target, update_info.version)
+        
+        self.update_progress.current_step = "Running health check"
+        self._notify_progress()
+        try:
+            healthy = bool(self.health_check(target_dir))
+        except Exception as e:
+            LOGGER.error("Health check raised: %s", e)
+            healthy = False
+        if not healthy:
+            LOGGER.error("Health check failed for %s, rolling back", update_info.version)
+            self.update_progress.status = UpdateStatus.ROLLBACK
+            self.update_progress.current_step = "Health check failed, rolling back"
             self._notify_progress()
-            
-            # Attempt rollback
-            self.rollback_update(backup_path)
+            self._switch_slot(previous, previous_version, record_previous=False)
+            self._fail(f"Health check failed for {update_info.version}; rolled back to {previous_version}")
             return False
+        
+        self.update_progress.progress_percent = 100.0
+        self.update_progress.status = UpdateStatus.COMPLETE
+        self.update_progress.current_step = "Update complete"
+        self._notify_progress()
+        
+        # Record in history
+        self.update_history.append({
+            "version": update_info.version,
+            "installed_at": time.time(),
+            "slot": target,
+            "previous_slot": previous,
+            "previous_version": previous_version,
+            "delta": delta,
+        })
+        self._save_update_history()
+        
+        LOGGER.info("Update installed successfully: %s (slot %s)", update_info.version, target.upper())
+        return True
     
     def rollback_update(self, backup_path: Optional[Path] = None) -> bool:
         """
         Rollback to previous version.
         
+        Without a backup path this switches back to the previous slot; a
+        backup path restores a backup made by earlier versions of this service.
+        
         Args:
-            backup_path: Path to backup (uses latest if None)
+            backup_path: Path to backup (uses the previous slot if None)
         
         Returns:
             True if rollback successful
         """
         if backup_path is None:
-            # Find latest backup
-            backups = sorted(self.backup_directory.glob("backup_*"), reverse=True)
-            if not backups:
-                LOGGER.error("No backups found for rollback")
+            state = self._load_slot_state()
+            if "previous" not in state:
+                LOGGER.error("No previous slot to roll back to")
                 return False
-            backup_path = backups[0]
+            previous = state.get("previous")
+            version = state.get("versions", {}).get(previous or "install", self.app_version)
+            self.update_progress.status = UpdateStatus.ROLLBACK
+            self.update_progress.current_step = "Rolling back to previous version"
+            self._notify_progress()
+            self._switch_slot(previous, version, record_previous=False)
+            self.update_progress.status = UpdateStatus.COMPLETE
+            self.update_progress.current_step = "Rollback complete"
+            self._notify_progress()
+            LOGGER.info("Rolled back to %s", version)
+            return True
         
         if not backup_path.exists():
             LOGGER.error("Backup path does not exist: %s", backup_path)
@@ -432,47 +605,139 @@ class OTAUpdateService:
             self._notify_progress()
             return False
     
-    def _create_backup(self) -> Optional[Path]:
-        """Create backup of current installation."""
+    @property
+    def active_directory(self) -> Path:
+        """Directory of the running version (the install directory until the first A/B install)."""
+        active = self._load_slot_state().get("active")
+        return self.slots_directory / active if active else self.install_directory
+    
+    def _load_slot_state(self) -> Dict[str, Any]:
         try:
-            timestamp = int(time.time())
-            backup_name = f"backup_{self.app_version}_{timestamp}"
-            backup_path = self.backup_directory / backup_name
-            
-            # Create backup as zip
-            backup_zip = backup_path.with_suffix('.zip')
-            
-            with zipfile.ZipFile(backup_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Backup important files/directories
-                important_paths = [
-                    'services',
-                    'ui',
-                    'core',
-                    'interfaces',
-                    'config.py',
-                    'requirements.txt',
-                ]
-                
-                for path_name in important_paths:
-                    path = self.install_directory / path_name
-                    if path.exists():
-                        if path.is_file():
-                            zipf.write(path, path_name)
-                        else:
-                            for file_path in path.rglob('*'):
-                                if file_path.is_file():
-                                    arcname = file_path.relative_to(self.install_directory)
-                                    zipf.write(file_path, arcname)
-            
-            LOGGER.info("Backup created: %s", backup_zip)
-            return backup_zip
-            
+            with open(self.slots_directory / SLOT_STATE_FILE, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
         except Exception as e:
-            LOGGER.error("Failed to create backup: %s", e)
-            return None
+            LOGGER.warning("Failed to load slot state: %s", e)
+            return {}
     
-    def _install_files(self, extract_dir: Path, update_info: UpdateInfo) -> None:
-        """Install files from update package."""
+    def _switch_slot(self, slot: Optional[str], version: str, record_previous: bool = True) -> None:
+        """
+        Atomically make a slot (None: the install directory) the active one.
+        
+        Args:
+            slot: Slot name
+            version: Version in the slot
+            record_previous: Keep the slot switched away from as the rollback target
+        """
+        state = self._load_slot_state()
+        versions = state.get("versions", {})
+        current = state.get("active")
+        versions[current or "install"] = self.app_version
+        versions[slot or "install"] = version
+        new_state: Dict[str, Any] = {"active": slot, "versions": versions, "switched_at": time.time()}
+        if record_previous:
+            new_state["previous"] = current
+        
+        self.slots_directory.mkdir(parents=True, exist_ok=True)
+        state_file = self.slots_directory / SLOT_STATE_FILE
+        temp_file = state_file.with_name(state_file.name + ".tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(new_state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, state_file)
+        
+        # Convenience link for launchers, replaced atomically as well
+        link = self.slots_directory / "current"
+        temp_link = self.slots_directory / "current.tmp"
+        try:
+            if temp_link.is_symlink() or temp_link.exists():
+                temp_link.unlink()
+            os.symlink(slot if slot else os.path.relpath(self.install_directory, self.slots_directory), temp_link)
+            os.replace(temp_link, link)
+        except OSError as e:
+            LOGGER.debug("Could not update %s: %s", link, e)
+        
+        self.app_version = version
+        LOGGER.info("Active slot: %s (%s)", slot.upper() if slot else "install directory", version)
+    
+    def _sync_tree(self, source: Path, destination: Path) -> None:
+        """Make destination a copy of source, copying only files whose size or mtime differ."""
+        source_files = self._app_files(source)
+        destination.mkdir(parents=True, exist_ok=True)
+        for rel, path in tree_files(destination).items():
+            if rel not in source_files:
+                path.unlink()
+        for rel, path in source_files.items():
+            target = destination / rel
+            source_stat = path.stat()
+            try:
+                target_stat = target.stat()
+                if (target_stat.st_size == source_stat.st_size
+                        and target_stat.st_mtime_ns == source_stat.st_mtime_ns):
+                    continue
+            except FileNotFoundError:
+                pass
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target)
+    
+    def _app_files(self, root: Path) -> Dict[str, Path]:
+        """Application files of a tree (of the install directory: only APP_PATHS)."""
+        if root != self.install_directory:
+            return tree_files(root)
+        files: Dict[str, Path] = {}
+        for name in APP_PATHS:
+            path = root / name
+            if path.is_file():
+                files[name] = path
+            elif path.is_dir():
+                files.update((f"{name}/{rel}", file) for rel, file in tree_files(path).items())
+        return files
+    
+    def _default_health_check(self, slot_dir: Path) -> bool:
+        """The Python files the update wrote compile and the entry module imports from the slot."""
+        for rel in self.installed_files:
+            if rel.endswith(".py"):
+                try:
+                    py_compile.compile(str(slot_dir / rel), doraise=True)
+                except py_compile.PyCompileError as e:
+                    LOGGER.error("Updated file does not compile: %s", e.msg)
+                    return False
+        if not self.entry_module:
+            return True
+        
+        # In a fresh interpreter, from the install directory like the launcher
+        try:
+            result = subprocess.run(
+                [sys.executable, "-c", "import importlib, sys; sys.path.insert(0, sys.argv[1]); "
+                 "importlib.import_module(sys.argv[2])", str(slot_dir), self.entry_module],
+                cwd=self.install_directory,
+                capture_output=True,
+                text=True,
+                timeout=HEALTH_CHECK_TIMEOUT,
+            )
+        except subprocess.TimeoutExpired:
+            LOGGER.error("Importing %s timed out", self.entry_module)
+            return False
+        if result.returncode != 0:
+            LOGGER.error("Importing %s failed: %s", self.entry_module, result.stderr.strip()[-2000:])
+            return False
+        return True
+    
+    def _fail(self, message: str) -> None:
+        self.update_progress.status = UpdateStatus.FAILED
+        self.update_progress.error_message = message
+        self._notify_progress()
+    
+    def _install_files(self, extract_dir: Path, destination: Path) -> List[str]:
+        """
+        Install files from update package.
+        
+        Returns:
+            Relative paths written
+        """
+        written: List[str] = []
         # Look for manifest or install instructions
         manifest_file = extract_dir / "update_manifest.json"
         
@@ -483,25 +748,37 @@ class OTAUpdateService:
             # Install files according to manifest
             for file_info in manifest.get("files", []):
                 src = extract_dir / file_info["source"]
-                dst = self.install_directory / file_info["destination"]
+                dst = destination / file_info["destination"]
                 
                 if src.exists():
                     dst.parent.mkdir(parents=True, exist_ok=True)
                     if src.is_file():
                         shutil.copy2(src, dst)
+                        written.append(Path(file_info["destination"]).as_posix())
                     else:
                         shutil.copytree(src, dst, dirs_exist_ok=True)
+                        written.extend(f"{Path(file_info['destination']).as_posix()}/{rel}" for rel in tree_files(src))
+            
+            # Files removed in this version (the slot starts as a copy of the active tree)
+            root = destination.resolve()
+            for relative in manifest.get("delete", []):
+                dst = (destination / relative).resolve()
+                if str(dst).startswith(str(root) + os.sep) and dst.is_file():
+                    dst.unlink()
         else:
             # Default: copy all files to install directory
             for item in extract_dir.iterdir():
                 if item.name not in ['update_manifest.json', 'post_install.sh']:
-                    dst = self.install_directory / item.name
+                    dst = destination / item.name
                     if item.is_file():
                         shutil.copy2(item, dst)
+                        written.append(item.name)
                     else:
                         shutil.copytree(item, dst, dirs_exist_ok=True)
+                        written.extend(f"{item.name}/{rel}" for rel in tree_files(item))
+        return written
     
-    def _run_post_install_scripts(self, extract_dir: Path) -> None:
+    def _run_post_install_scripts(self, extract_dir: Path, cwd: Path) -> None:
         """Run post-install scripts if any."""
         script_file = extract_dir / "post_install.sh"
         if script_file.exists() and script_file.is_file():
@@ -511,7 +788,7 @@ class OTAUpdateService:
                 # Run script
                 result = subprocess.run(
                     [str(script_file)],
-                    cwd=self.install_directory,
+                    cwd=cwd,
                     capture_output=True,
                     text=True,
                     timeout=300,
@@ -570,8 +847,12 @@ class OTAUpdateService:
         """Set callback for progress updates."""
         self.progress_callback = callback
     
-    def _notify_progress(self) -> None:
-        """Notify progress callback."""
+    def _notify_progress(self, throttle: bool = False) -> None:
+        """Notify progress callback (with throttle, at most every PROGRESS_NOTIFY_INTERVAL)."""
+        now = time.monotonic()
+        if throttle and now - self._last_progress_notify < PROGRESS_NOTIFY_INTERVAL:
+            return
+        self._last_progress_notify = now
         if self.progress_callback:
             try:
                 self.progress_callback(self.update_progress)
@@ -1,9 +1,25 @@
+"""
+Performance Tracker
+
+Dragy-style acceleration metrics plus the GPS track and speed/distance
+history of the current session.
+
+Time series live in preallocated NumPy ring buffers. Each row is written
+twice (at ``i`` and ``i + capacity``) so the newest ``capacity`` rows are
+always one contiguous slice: snapshots hand out read-only views of that
+slice instead of copying the track, and ``track_since``/``history_since``
+return only the rows added after a given version. Snapshot cost therefore
+does not depend on track length.
+"""
+
 from __future__ import annotations
 
 import math
 import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
 
 MPS_TO_MPH = 2.23694
 
@@ -20,13 +36,123 @@ def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return r * c
 
 
+class RingSeries:
+    """Fixed-capacity ring of float64 rows with zero-copy, oldest-to-newest views."""
+
+    def __init__(self, capacity: int, width: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = int(capacity)
+        self.width = int(width)
+        self._rows = np.zeros((2 * self.capacity, self.width), dtype=np.float64)
+        self._head = 0  # Next write slot in [0, capacity)
+        self.count = 0  # Valid rows (<= capacity)
+        self.version = 0  # Rows ever appended; stamps views and deltas
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, *values: float) -> None:
+        head = self._head
+        self._rows[head] = values
+        self._rows[head + self.capacity] = values
+        self._head = (head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.version += 1
+
+    def clear(self) -> None:
+        """Forget all rows (storage is kept; versions keep increasing)."""
+        self._head = 0
+        self.count = 0
+        self.version += 1
+
+    def view(self, last: Optional[int] = None) -> np.ndarray:
+        """
+        Read-only (rows, width) view, oldest first.
+
+        The view is valid until the ring wraps onto its oldest row; copy it
+        (``np.array(view)``) to keep it across updates.
+        """
+        count = self.count if last is None else max(0, min(last, self.count))
+        end = self._head + self.capacity
+        view = self._rows[end - count:end]
+        view.flags.writeable = False
+        return view
+
+    def since(self, version: int) -> Tuple[np.ndarray, int]:
+        """
+        Rows appended after ``version``, and the current version.
+
+        If the caller fell behind by more than the capacity (or the ring was
+        cleared), every retained row is returned.
+        """
+        added = self.version - version
+        if added < 0 or added > self.count:
+            return self.view(), self.version
+        return self.view(added), self.version
+
+    def latest(self) -> Optional[np.ndarray]:
+        if not self.count:
+            return None
+        return self.view(1)[0]
+
+
+class TrackView(Sequence):
+    """
+    Read-only sequence of (lat, lon) tuples backed by a ring-buffer view.
+
+    Iterating or indexing produces tuples, so it can be used wherever a list
+    of points was; ``array`` gives the underlying (n, 2) NumPy view.
+    """
+
+    __slots__ = ("array", "version")
+
+    def __init__(self, array: np.ndarray, version: int = 0) -> None:
+        self.array = array
+        self.version = version
+
+    def __len__(self) -> int:
+        return int(self.array.shape[0])
+
+    @overload
+    def __getitem__(self, index: int) -> Tuple[float, float]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TrackView": ...
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return TrackView(self.array[index], self.version)
+        lat, lon = self.array[index].tolist()
+        return lat, lon
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        return iter([(lat, lon) for lat, lon in self.array.tolist()])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TrackView):
+            return np.array_equal(self.array, other.array)
+        if isinstance(other, (list, tuple)):
+            return list(self) == [tuple(point) for point in other]
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TrackView({len(self)} points, version={self.version})"
+
+    def copy(self) -> List[Tuple[float, float]]:
+        """Detached list of points."""
+        return list(self)
+
+
 @dataclass
 class PerformanceSnapshot:
     metrics: Dict[str, Optional[float]]
     best_metrics: Dict[str, Optional[float]]
     total_distance_m: float
-    track_points: List[Tuple[float, float]]
+    track_points: Sequence[Tuple[float, float]]  # TrackView over the live ring buffer
     last_update: float
+    track_version: int = 0  # Pass to PerformanceTracker.track_since() for new points only
 
 
 class PerformanceTracker:
@@ -40,7 +166,16 @@ class PerformanceTracker:
         "1/2 mile": 804.672,  # 1/2 mile in meters
     }
 
-    def __init__(self) -> None:
+    HISTORY_COLUMNS = ("timestamp", "speed_mph", "distance_m")
+
+    def __init__(self, track_capacity: int = 2000, history_capacity: int = 2000) -> None:
+        """
+        Args:
+            track_capacity: GPS points kept for the track
+            history_capacity: Speed/distance samples kept
+        """
+        self._track = RingSeries(track_capacity, 2)
+        self._history = RingSeries(history_capacity, len(self.HISTORY_COLUMNS))
         self.reset_session()
         self.best_metrics: Dict[str, Optional[float]] = {
             f"0-{target} mph": None for target in self.SPEED_TARGETS
@@ -57,7 +192,13 @@ class PerformanceTracker:
         self.last_timestamp: Optional[float] = None
         self._last_motion_timestamp: Optional[float] = None
         self.distance_m: float = 0.0
-        self.track: List[Tuple[float, float]] = []
+        self._track.clear()
+        self._history.clear()
+
+    @property
+    def track(self) -> TrackView:
+        """Current GPS track, oldest first (read-only view)."""
+        return TrackView(self._track.view(), self._track.version)
 
     def _record_metric(self, name: str, value: float) -> None:
         previous = self.best_metrics.get(name)
@@ -93,6 +234,7 @@ class PerformanceTracker:
 
         self.last_speed_mph = speed_value
         self.last_timestamp = timestamp
+        self._history.append(timestamp, speed_value, self.distance_m)
         if speed_value > 1.0:
             self._last_motion_timestamp = timestamp
         elif (
@@ -103,9 +245,25 @@ class PerformanceTracker:
             self.reset_session()
 
     def update_gps(self, lat: float, lon: float) -> None:
-        self.track.append((lat, lon))
-        if len(self.track) > 2000:
-            self.track.pop(0)
+        self._track.append(lat, lon)
+
+    def track_since(self, version: int) -> Tuple[np.ndarray, int]:
+        """
+        GPS points added after ``version`` as a read-only (n, 2) view.
+
+        Returns the new points and the version to pass next time. A caller
+        that fell behind by more than the track capacity, or across a
+        session reset, gets the whole track.
+        """
+        return self._track.since(version)
+
+    def speed_history(self) -> np.ndarray:
+        """Read-only (n, 3) view of HISTORY_COLUMNS rows, oldest first."""
+        return self._history.view()
+
+    def history_since(self, version: int) -> Tuple[np.ndarray, int]:
+        """Speed/distance rows added after ``version`` (see ``track_since``)."""
+        return self._history.since(version)
 
     def ingest_fix(self, fix: Dict[str, float]) -> PerformanceSnapshot:
         """Convenience helper to feed a GPS fix dict (lat/lon/speed/timestamp)."""
@@ -123,10 +281,11 @@ class PerformanceTracker:
             metrics=dict(self.event_times),
             best_metrics=dict(self.best_metrics),
             total_distance_m=self.distance_m,
-            track_points=list(self.track),
+            track_points=self.track,
             last_update=self.last_timestamp or time.time(),
+            track_version=self._track.version,
         )
 
 
-__all__ = ["PerformanceTracker", "PerformanceSnapshot"]
+__all__ = ["PerformanceTracker", "PerformanceSnapshot", "RingSeries", "TrackView"]
 
@@ -0,0 +1,179 @@
+"""
+Search Cache
+
+Persistent cache of web search results, kept in SQLite so research
+fetched while connected survives restarts and is available offline.
+
+Entries are keyed by the normalized query (case, whitespace, surrounding
+punctuation and quotes do not matter) and remember how many results were
+requested, so a lookup for fewer results is served from a larger entry.
+An entry is fresh for ``ttl_seconds``; after that it is only returned
+when stale results are explicitly allowed (e.g. while offline) and is
+dropped once older than ``max_stale_seconds``. The cache is bounded by
+entry count and stored bytes, evicting the least recently used entries.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+LOGGER = logging.getLogger(__name__)
+
+_SPACE_RE = re.compile(r"\s+")
+_EDGE_RE = re.compile(r"^[\s\"'`?!.,;:]+|[\s\"'`?!.,;:]+$")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace and strip surrounding punctuation and quotes."""
+    return _EDGE_RE.sub("", _SPACE_RE.sub(" ", query.lower()))
+
+
+class CachedSearch(NamedTuple):
+    """Results read from the cache."""
+
+    query: str
+    results: List[Dict[str, Any]]
+    fetched: float
+    stale: bool
+
+
+class SearchCache:
+    """SQLite-backed LRU + TTL cache of search results."""
+
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        ttl_seconds: float = 3600.0,
+        max_stale_seconds: float = 30 * 86400.0,
+        max_entries: int = 2000,
+        max_bytes: int = 20 * 1024 * 1024,
+    ) -> None:
+        """
+        Initialize search cache.
+
+        Args:
+            db_path: SQLite database file (in-memory if None)
+            ttl_seconds: Age after which an entry is stale
+            max_stale_seconds: Age after which a stale entry is dropped
+            max_entries: Entries kept before the least recently used are evicted
+            max_bytes: Stored result bytes kept before the least recently used are evicted
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max(max_stale_seconds, ttl_seconds)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats: Dict[str, int] = {"hits": 0, "stale_hits": 0, "misses": 0, "evicted": 0}
+        if db_path is None:
+            target = ":memory:"
+        else:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            target = str(db_path)
+        self.conn = sqlite3.connect(target, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    max_results INTEGER NOT NULL,
+                    results TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    fetched REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )
+                """
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache(accessed)")
+            self.conn.execute("DELETE FROM search_cache WHERE fetched < ?", (time.time() - self.max_stale_seconds,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+
+    def get(self, query: str, max_results: int = 5, allow_stale: bool = False) -> Optional[CachedSearch]:
+        """
+        Cached results for the query.
+
+        Args:
+            query: Search query
+            max_results: Results wanted; entries fetched with fewer are ignored
+            allow_stale: Also return entries older than the TTL
+        """
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT query, max_results, results, fetched FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < max_results:
+                self.stats["misses"] += 1
+                return None
+            stored_query, _, results, fetched = row
+            age = now - fetched
+            if age > self.max_stale_seconds:
+                with self.conn:
+                    self.conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self.stats["misses"] += 1
+                return None
+            stale = age > self.ttl_seconds
+            if stale and not allow_stale:
+                self.stats["misses"] += 1
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE search_cache SET accessed = ? WHERE key = ?", (now, key))
+            self.stats["stale_hits" if stale else "hits"] += 1
+        return CachedSearch(stored_query, json.loads(results)[:max_results], fetched, stale)
+
+    def is_fresh(self, query: str, max_results: int = 5) -> bool:
+        """True if a fresh entry covers the query (does not count as an access)."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT max_results, fetched FROM search_cache WHERE key = ?", (normalize_query(query),)
+            ).fetchone()
+        return row is not None and row[0] >= max_results and time.time() - row[1] <= self.ttl_seconds
+
+    def put(self, query: str, results: List[Dict[str, Any]], max_results: int = 5) -> None:
+        """Store results for the query, evicting least recently used entries past the bounds."""
+        payload = json.dumps(results)
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, query, max_results, results, size, fetched, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_query(query), query, max_results, payload, len(payload), now, now),
+            )
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM search_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def _evict(self) -> None:
+        count, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache").fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        evict = []
+        for key, entry_size in self.conn.execute("SELECT key, size FROM search_cache ORDER BY accessed"):
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            evict.append((key,))
+            count -= 1
+            size -= entry_size
+        self.conn.executemany("DELETE FROM search_cache WHERE key = ?", evict)
+        self.stats["evicted"] += len(evict)
+
+
+__all__ = ["CachedSearch", "SearchCache", "normalize_query"]
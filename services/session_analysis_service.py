@@ -13,18 +13,36 @@ insights that the Chat Advisor can turn into natural‑language answers such as:
 - "You had lean AFR spikes on the main straight around 5200–5800 RPM."
 - "Coolant temperature peaked at 106 °C near the end of the session."
 - "Boost peaked at 23.5 psi, which is above your configured target."
+
+Logs are analyzed in a single streaming pass (see ``log_statistics``), so
+memory use does not grow with the log size.
 """
 
-import csv
 import logging
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
+from .columnar_log_reader import DEFAULT_CHUNK_BYTES
 from .data_logger import DataLogger
+from .log_statistics import PERCENTILES, analyze_delimited_log
 
 LOGGER = logging.getLogger(__name__)
 
+# Time-above-threshold channels (case-insensitive names), matching the
+# anomaly heuristics below
+DEFAULT_THRESHOLDS: Dict[str, float] = {
+    "afr": 14.7 * 1.08,
+    "coolanttemp": 105.0,
+    "coolant_temp": 105.0,
+    "clt": 105.0,
+    "enginecoolanttemp": 105.0,
+    "egt": 900.0,
+    "egt1": 900.0,
+    "egt2": 900.0,
+    "exhausttemp": 900.0,
+}
+
 
 @dataclass
 class SessionAnomaly:
@@ -44,6 +62,12 @@ class ChannelSummary:
     min: float
     max: float
     avg: float
+    count: int = 0
+    std: float = 0.0  # Population standard deviation
+    percentiles: Dict[str, float] = field(default_factory=dict)  # "p50" -> value (estimated)
+    threshold: Optional[float] = None
+    samples_above: int = 0
+    time_above_s: Optional[float] = None  # None without a time column or threshold
 
 
 @dataclass
@@ -80,8 +104,25 @@ class SessionAnalysisService:
     and anomalies that the Chat Advisor can talk about.
     """
 
-    def __init__(self, log_dir: str | Path = "logs") -> None:
+    def __init__(
+        self,
+        log_dir: str | Path = "logs",
+        thresholds: Optional[Dict[str, float]] = None,
+        workers: int = 1,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    ) -> None:
+        """
+        Args:
+            log_dir: Log directory
+            thresholds: Channel name -> threshold for time-above-threshold
+                (default: DEFAULT_THRESHOLDS)
+            workers: Processes used to analyze large logs
+            chunk_bytes: Log text parsed per chunk (bounds memory use)
+        """
         self.log_dir = Path(log_dir)
+        self.thresholds = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+        self.workers = workers
+        self.chunk_bytes = chunk_bytes
 
     # ------------------------------------------------------------------ #
     # Public API
@@ -128,11 +169,14 @@ class SessionAnalysisService:
 
         LOGGER.info("SessionAnalysisService: analyzing log file %s", file_path)
 
-        with file_path.open("r", newline="") as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
+        stats = analyze_delimited_log(
+            file_path,
+            thresholds=self.thresholds,
+            chunk_bytes=self.chunk_bytes,
+            workers=self.workers,
+        )
 
-        if not rows:
+        if not stats.row_count:
             LOGGER.info("SessionAnalysisService: log file is empty: %s", file_path)
             return SessionAnalysisReport(
                 log_file=str(file_path),
@@ -142,54 +186,34 @@ class SessionAnalysisService:
                 anomalies=[],
             )
 
-        # Basic numeric stats per channel
-        numeric_stats: Dict[str, Tuple[float, float, float, int]] = {}
-        first_ts = None
-        last_ts = None
-
-        for row in rows:
-            for key, value in row.items():
-                if key.lower() in {"timestamp", "time", "t"}:
-                    # Try to track duration if a timestamp column exists
-                    try:
-                        ts = float(value)
-                    except (TypeError, ValueError):
-                        continue
-                    if first_ts is None:
-                        first_ts = ts
-                    last_ts = ts
-                    continue
-
-                try:
-                    v = float(value)
-                except (TypeError, ValueError):
-                    continue
-
-                if key not in numeric_stats:
-                    numeric_stats[key] = (v, v, v, 1)  # min, max, sum, count
-                else:
-                    cur_min, cur_max, cur_sum, cur_count = numeric_stats[key]
-                    numeric_stats[key] = (
-                        min(cur_min, v),
-                        max(cur_max, v),
-                        cur_sum + v,
-                        cur_count + 1,
-                    )
-
+        # Channels with at least one numeric value, in column order
+        has_time = stats.time_column is not None
         channel_summaries: List[ChannelSummary] = []
-        for name, (vmin, vmax, vsum, cnt) in numeric_stats.items():
-            avg = vsum / max(cnt, 1)
-            channel_summaries.append(ChannelSummary(name=name, min=vmin, max=vmax, avg=avg))
+        for name, channel in stats.channels.items():
+            if not channel.count:
+                continue
+            channel_summaries.append(
+                ChannelSummary(
+                    name=name,
+                    min=channel.min,
+                    max=channel.max,
+                    avg=channel.mean,
+                    count=channel.count,
+                    std=channel.std,
+                    percentiles={f"p{p}": channel.percentile(p) for p in PERCENTILES},
+                    threshold=channel.threshold,
+                    samples_above=channel.samples_above,
+                    time_above_s=channel.time_above if has_time and channel.threshold is not None else None,
+                )
+            )
 
-        duration_s: Optional[float] = None
-        if first_ts is not None and last_ts is not None and last_ts >= first_ts:
-            duration_s = float(last_ts - first_ts)
+        duration_s = stats.duration_s
 
         anomalies = self._detect_anomalies(channel_summaries)
 
         return SessionAnalysisReport(
             log_file=str(file_path),
-            sample_count=len(rows),
+            sample_count=stats.row_count,
             duration_s=duration_s,
             channel_summaries=channel_summaries,
             anomalies=anomalies,
@@ -225,7 +249,11 @@ class SessionAnalysisService:
                         type="afr_lean",
                         severity="warning",
                         message="AFR peaked leaner than ~8% over stoich.",
-                        details={"afr_max": afr_summary.max, "afr_avg": afr_summary.avg},
+                        details={
+                            "afr_max": afr_summary.max,
+                            "afr_avg": afr_summary.avg,
+                            "time_above_s": afr_summary.time_above_s,
+                        },
                     )
                 )
             if afr_summary.min < 11.0:
@@ -246,7 +274,7 @@ class SessionAnalysisService:
                     type="coolant_overtemp",
                     severity="warning",
                     message="Coolant temperature exceeded ~105 °C.",
-                    details={"coolant_max_c": clt_summary.max},
+                    details={"coolant_max_c": clt_summary.max, "time_above_s": clt_summary.time_above_s},
                 )
             )
 
@@ -258,7 +286,7 @@ class SessionAnalysisService:
                     type="egt_high",
                     severity="warning",
                     message="Exhaust gas temperature exceeded ~900 °C.",
-                    details={"egt_max_c": egt_summary.max},
+                    details={"egt_max_c": egt_summary.max, "time_above_s": egt_summary.time_above_s},
                 )
             )
 
@@ -296,6 +324,7 @@ class SessionAnalysisService:
 
 
 __all__ = [
+    "DEFAULT_THRESHOLDS",
     "SessionAnalysisService",
     "SessionAnalysisReport",
     "SessionAnomaly",
@@ -2,17 +2,25 @@
 Session Management Service
 
 Manages named sessions with metadata, comparison tools, and export/import.
+
+Sessions are stored in an SQLite catalog (``sessions.db``, WAL mode). Each
+session is one row: the full metadata as JSON plus indexed columns for start
+time, track, vehicle and best lap, so updating a session rewrites one row and
+filtered listings are index lookups regardless of archive size. A legacy
+``sessions.json`` is imported once and renamed to ``sessions.json.migrated``.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import sqlite3
+import threading
 import time
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 LOGGER = logging.getLogger(__name__)
 
@@ -44,6 +52,28 @@ class SessionMetadata:
     custom_metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+_SESSION_FIELDS = {f.name for f in fields(SessionMetadata)}
+
+# Keys in vehicle_config that identify the vehicle, in order of preference
+VEHICLE_KEYS = ("vehicle_id", "vehicle", "vehicle_name", "name", "model")
+
+
+def _session_from_dict(data: Dict[str, Any]) -> SessionMetadata:
+    """Build SessionMetadata, ignoring keys from newer/older versions."""
+    return SessionMetadata(**{k: v for k, v in data.items() if k in _SESSION_FIELDS})
+
+
+def _vehicle_key(session: SessionMetadata) -> Optional[str]:
+    config = session.vehicle_config
+    if not isinstance(config, dict):
+        return None
+    for key in VEHICLE_KEYS:
+        value = config.get(key)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
 @dataclass
 class SessionComparison:
     """Comparison between two sessions."""
@@ -59,6 +89,12 @@ class SessionComparison:
 class SessionManager:
     """Manages named sessions with metadata, comparison, and export/import."""
 
+    ORDER_COLUMNS = {
+        "start_time": "start_time DESC",
+        "best_lap_time": "best_lap_time IS NULL, best_lap_time ASC",
+        "name": "name COLLATE NOCASE ASC",
+    }
+
     def __init__(self, sessions_dir: str | Path = "sessions") -> None:
         """
         Initialize session manager.
@@ -68,13 +104,21 @@ class SessionManager:
         """
         self.sessions_dir = Path(sessions_dir)
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
-        self.metadata_file = self.sessions_dir / "sessions.json"
+        self.metadata_file = self.sessions_dir / "sessions.json"  # Legacy format, migrated on first start
+        self.catalog_file = self.sessions_dir / "sessions.db"
 
-        self.sessions: Dict[str, SessionMetadata] = {}
         self.current_session: Optional[SessionMetadata] = None
+        self._lock = threading.RLock()
+
+        self._conn = sqlite3.connect(str(self.catalog_file), check_same_thread=False, timeout=10.0)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._create_tables()
 
-        # Load existing sessions
-        self._load_sessions()
+        # Import the old JSON archive once
+        self._migrate_json()
 
     def create_session(
         self,
@@ -103,7 +147,7 @@ class SessionManager:
         Returns:
             Created session metadata
         """
-        session_id = f"session_{int(time.time())}"
+        session_id = self._new_session_id()
         session = SessionMetadata(
             session_id=session_id,
             name=name,
@@ -117,9 +161,8 @@ class SessionManager:
             tags=tags or [],
         )
 
-        self.sessions[session_id] = session
         self.current_session = session
-        self._save_sessions()
+        self.save_session(session)
 
         LOGGER.info("Created session: %s (ID: %s)", name, session_id)
         return session
@@ -137,7 +180,7 @@ class SessionManager:
         if session_id is None:
             session = self.current_session
         else:
-            session = self.sessions.get(session_id)
+            session = self.get_session(session_id)
 
         if not session:
             LOGGER.warning("Session not found: %s", session_id)
@@ -146,10 +189,10 @@ class SessionManager:
         session.end_time = time.time()
         session.duration = session.end_time - session.start_time
 
-        self._save_sessions()
+        self.save_session(session)
         LOGGER.info("Ended session: %s (duration: %.2f seconds)", session.name, session.duration)
 
-        if session == self.current_session:
+        if self.current_session is not None and session.session_id == self.current_session.session_id:
             self.current_session = None
 
         return session
@@ -169,7 +212,7 @@ class SessionManager:
         Returns:
             Updated session metadata
         """
-        session = self.sessions.get(session_id)
+        session = self.get_session(session_id)
         if not session:
             LOGGER.warning("Session not found: %s", session_id)
             return None
@@ -178,12 +221,84 @@ class SessionManager:
             if hasattr(session, key):
                 setattr(session, key, value)
 
-        self._save_sessions()
+        self.save_session(session)
         return session
 
+    def save_session(self, session: SessionMetadata) -> None:
+        """Insert or update one session in the catalog."""
+        self.save_sessions([session])
+
+    def save_sessions(self, sessions: Iterable[SessionMetadata]) -> int:
+        """
+        Insert or update several sessions in one transaction.
+
+        Returns:
+            Number of sessions written
+        """
+        rows = []
+        tag_rows = []
+        ids = []
+        for session in sessions:
+            rows.append(self._row_for(session))
+            ids.append((session.session_id,))
+            tag_rows.extend((session.session_id, tag) for tag in dict.fromkeys(session.tags or []))
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO sessions (session_id, name, start_time, end_time, track_name, vehicle,
+                                      best_lap_time, lap_count, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET
+                    name = excluded.name,
+                    start_time = excluded.start_time,
+                    end_time = excluded.end_time,
+                    track_name = excluded.track_name,
+                    vehicle = excluded.vehicle,
+                    best_lap_time = excluded.best_lap_time,
+                    lap_count = excluded.lap_count,
+                    data = excluded.data
+                """,
+                rows,
+            )
+            self._conn.executemany("DELETE FROM session_tags WHERE session_id = ?", ids)
+            self._conn.executemany("INSERT INTO session_tags (session_id, tag) VALUES (?, ?)", tag_rows)
+        return len(rows)
+
     def get_session(self, session_id: str) -> Optional[SessionMetadata]:
         """Get session by ID."""
-        return self.sessions.get(session_id)
+        if self.current_session is not None and self.current_session.session_id == session_id:
+            return self.current_session
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return _session_from_dict(json.loads(row["data"])) if row else None
+
+    def session_count(self) -> int:
+        """Number of sessions in the catalog."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def list_tracks(self) -> List[str]:
+        """Distinct track names, sorted."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT track_name FROM sessions WHERE track_name IS NOT NULL ORDER BY track_name"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def list_vehicles(self) -> List[str]:
+        """Distinct vehicle identifiers (from vehicle_config), sorted."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT vehicle FROM sessions WHERE vehicle IS NOT NULL ORDER BY vehicle"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def best_sessions(self, track_name: Optional[str] = None, limit: int = 10) -> List[SessionMetadata]:
+        """Sessions with the fastest best lap, optionally at one track."""
+        return self.list_sessions(track_name=track_name, order_by="best_lap_time", limit=limit, has_lap=True)
 
     def get_current_session(self) -> Optional[SessionMetadata]:
         """Get current active session."""
@@ -195,6 +310,11 @@ class SessionManager:
         tags: Optional[List[str]] = None,
         start_date: Optional[float] = None,
         end_date: Optional[float] = None,
+        vehicle: Optional[str] = None,
+        has_lap: bool = False,
+        order_by: str = "start_time",
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> List[SessionMetadata]:
         """
         List sessions with optional filters.
@@ -204,27 +324,59 @@ class SessionManager:
             tags: Filter by tags (any match)
             start_date: Filter by start date (timestamp)
             end_date: Filter by end date (timestamp)
+            vehicle: Filter by vehicle identifier (see VEHICLE_KEYS)
+            has_lap: Only sessions with a best lap time
+            order_by: "start_time" (newest first), "best_lap_time" (fastest first) or "name"
+            limit: Maximum number of sessions to return
+            offset: Number of matching sessions to skip
 
         Returns:
             List of matching sessions
         """
-        sessions = list(self.sessions.values())
+        if order_by not in self.ORDER_COLUMNS:
+            raise ValueError(f"Unsupported order_by: {order_by}")
 
+        clauses = []
+        params: List[Any] = []
         if track_name:
-            sessions = [s for s in sessions if s.track_name == track_name]
-
+            clauses.append("track_name = ?")
+            params.append(track_name)
+        if vehicle:
+            clauses.append("vehicle = ?")
+            params.append(vehicle)
+        if start_date is not None:
+            clauses.append("start_time >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            clauses.append("start_time <= ?")
+            params.append(end_date)
+        if has_lap:
+            clauses.append("best_lap_time IS NOT NULL")
         if tags:
-            sessions = [s for s in sessions if any(tag in s.tags for tag in tags)]
-
-        if start_date:
-            sessions = [s for s in sessions if s.start_time >= start_date]
-
-        if end_date:
-            sessions = [s for s in sessions if s.start_time <= end_date]
-
-        # Sort by start time (newest first)
-        sessions.sort(key=lambda s: s.start_time, reverse=True)
-
+            clauses.append(
+                "session_id IN (SELECT session_id FROM session_tags WHERE tag IN (%s))" % ",".join("?" * len(tags))
+            )
+            params.extend(tags)
+
+        sql = "SELECT data FROM sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        order = self.ORDER_COLUMNS[order_by]
+        if order_by == "best_lap_time" and has_lap:
+            order = "best_lap_time ASC"  # No NULLs to push last, so the index can serve the sort
+        sql += f" ORDER BY {order}, session_id"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else int(limit), int(offset)])
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        sessions = [_session_from_dict(json.loads(row["data"])) for row in rows]
+
+        # Hand back the live object for the active session
+        if self.current_session is not None:
+            current_id = self.current_session.session_id
+            sessions = [self.current_session if s.session_id == current_id else s for s in sessions]
         return sessions
 
     def compare_sessions(self, session_id1: str, session_id2: str) -> Optional[SessionComparison]:
@@ -238,8 +390,8 @@ class SessionManager:
         Returns:
             Session comparison
         """
-        session1 = self.sessions.get(session_id1)
-        session2 = self.sessions.get(session_id2)
+        session1 = self.get_session(session_id1)
+        session2 = self.get_session(session_id2)
 
         if not session1 or not session2:
             LOGGER.warning("One or both sessions not found")
@@ -281,7 +433,7 @@ class SessionManager:
         Returns:
             Path to exported file
         """
-        session = self.sessions.get(session_id)
+        session = self.get_session(session_id)
         if not session:
             raise ValueError(f"Session not found: {session_id}")
 
@@ -319,14 +471,13 @@ class SessionManager:
             data = json.load(f)
 
         session_data = data.get("session", data)
-        session = SessionMetadata(**session_data)
+        session = _session_from_dict(session_data)
 
         # Use existing ID or generate new one
-        if session.session_id in self.sessions:
-            session.session_id = f"session_{int(time.time())}"
+        if self._session_exists(session.session_id):
+            session.session_id = self._new_session_id()
 
-        self.sessions[session.session_id] = session
-        self._save_sessions()
+        self.save_session(session)
 
         LOGGER.info("Imported session: %s (ID: %s)", session.name, session.session_id)
         return session
@@ -341,44 +492,118 @@ class SessionManager:
         Returns:
             True if deleted successfully
         """
-        if session_id not in self.sessions:
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount
+            self._conn.execute("DELETE FROM session_tags WHERE session_id = ?", (session_id,))
+        if not deleted:
             return False
 
-        del self.sessions[session_id]
-        self._save_sessions()
+        if self.current_session is not None and self.current_session.session_id == session_id:
+            self.current_session = None
 
         LOGGER.info("Deleted session: %s", session_id)
         return True
 
-    def _load_sessions(self) -> None:
-        """Load sessions from disk."""
+    def close(self) -> None:
+        """Close the catalog connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _create_tables(self) -> None:
+        """Create catalog tables and indexes."""
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    start_time REAL NOT NULL,
+                    end_time REAL,
+                    track_name TEXT,
+                    vehicle TEXT,
+                    best_lap_time REAL,
+                    lap_count INTEGER DEFAULT 0,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions(start_time);
+                CREATE INDEX IF NOT EXISTS idx_sessions_track ON sessions(track_name, start_time);
+                CREATE INDEX IF NOT EXISTS idx_sessions_vehicle ON sessions(vehicle, start_time);
+                CREATE INDEX IF NOT EXISTS idx_sessions_best_lap ON sessions(track_name, best_lap_time);
+
+                CREATE TABLE IF NOT EXISTS session_tags (
+                    session_id TEXT NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (tag, session_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_session_tags_session ON session_tags(session_id);
+
+                CREATE TABLE IF NOT EXISTS catalog_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                """
+            )
+
+    @staticmethod
+    def _row_for(session: SessionMetadata) -> Tuple[Any, ...]:
+        return (
+            session.session_id,
+            session.name,
+            session.start_time,
+            session.end_time,
+            session.track_name,
+            _vehicle_key(session),
+            session.best_lap_time,
+            session.lap_count,
+            json.dumps(asdict(session), default=str),
+        )
+
+    def _session_exists(self, session_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone() is not None
+
+    def _new_session_id(self) -> str:
+        """Timestamp-based ID, suffixed if another session started in the same second."""
+        base = f"session_{int(time.time())}"
+        session_id = base
+        suffix = 1
+        while self._session_exists(session_id):
+            session_id = f"{base}_{suffix}"
+            suffix += 1
+        return session_id
+
+    def _migrate_json(self) -> None:
+        """Import the legacy sessions.json once, then rename it."""
         if not self.metadata_file.exists():
             return
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT value FROM catalog_meta WHERE key = 'json_migrated'"
+            ).fetchone()
+        if done:
+            return
 
         try:
             with open(self.metadata_file, "r", encoding="utf-8") as f:
                 data = json.load(f)
-
-            for session_data in data.get("sessions", []):
-                session = SessionMetadata(**session_data)
-                self.sessions[session.session_id] = session
-
-            LOGGER.info("Loaded %d sessions", len(self.sessions))
+            sessions = [_session_from_dict(item) for item in data.get("sessions", [])]
         except Exception as e:
             LOGGER.error("Error loading sessions: %s", e)
+            return
 
-    def _save_sessions(self) -> None:
-        """Save sessions to disk."""
+        count = self.save_sessions(sessions)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES ('json_migrated', ?)",
+                (datetime.now().isoformat(),),
+            )
         try:
-            data = {
-                "sessions": [asdict(session) for session in self.sessions.values()],
-                "last_updated": datetime.now().isoformat(),
-            }
-
-            with open(self.metadata_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, default=str)
-        except Exception as e:
-            LOGGER.error("Error saving sessions: %s", e)
+            self.metadata_file.replace(self.metadata_file.with_name(self.metadata_file.name + ".migrated"))
+        except OSError as e:
+            LOGGER.warning("Could not rename migrated %s: %s", self.metadata_file, e)
+        LOGGER.info("Migrated %d sessions from %s", count, self.metadata_file)
 
 
 __all__ = ["SessionManager", "SessionMetadata", "SessionComparison"]
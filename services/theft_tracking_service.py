@@ -23,6 +23,7 @@ from typing import Dict, List, Optional, Callable, Tuple
 
 from interfaces.gps_interface import GPSInterface, GPSFix
 from services.geo_logger import GeoLogger
+from services.geofence_engine import Geofence, GeofenceEngine
 from services.fleet_management import FleetVehicle
 from services.connection_manager import (
     ConnectionManager,
@@ -49,18 +50,6 @@ class ConnectionType(str, Enum):
     LOCAL_ONLY = "local_only"
 
 
-@dataclass
-class Geofence:
-    """Geofence definition."""
-    name: str
-    center_lat: float
-    center_lon: float
-    radius_meters: float
-    enabled: bool = True
-    alert_on_exit: bool = True
-    alert_on_enter: bool = False
-
-
 @dataclass
 class LocationUpdate:
     """Location update record."""
@@ -77,7 +66,7 @@ class LocationUpdate:
 @dataclass
 class TheftAlert:
     """Theft alert."""
-    alert_type: str  # geofence_violation, unauthorized_movement, tamper, power_loss
+    alert_type: str  # geofence_violation, geofence_enter, geofence_dwell, unauthorized_movement, tamper, power_loss
     timestamp: float
     location: Tuple[float, float]  # (lat, lon)
     message: str
@@ -143,8 +132,9 @@ class TheftTrackingService:
         self.location_history: List[LocationUpdate] = []
         self.max_history = 1000
         
-        # Geofences
-        self.geofences: Dict[str, Geofence] = {}
+        # Geofences (state and spatial index live in the engine)
+        self.geofence_engine = GeofenceEngine()
+        self.geofences: Dict[str, Geofence] = self.geofence_engine.fences
         self.last_known_location: Optional[Tuple[float, float]] = None
         
         # Alerts
@@ -213,6 +203,7 @@ class TheftTrackingService:
         
         if self.tracking_thread:
             self.tracking_thread.join(timeout=5.0)
+        self.geo_logger.flush()
         
         LOGGER.info("Theft tracking stopped for vehicle: %s", self.vehicle_id)
     
@@ -269,7 +260,7 @@ class TheftTrackingService:
         
         # Check geofences
         if self.enable_geofencing:
-            self._check_geofences(fix.latitude, fix.longitude)
+            self._check_geofences(fix.latitude, fix.longitude, fix.timestamp)
         
         # Check unauthorized movement
         if self.unauthorized_movement_enabled:
@@ -282,37 +273,34 @@ class TheftTrackingService:
         # Update last known location
         self.last_known_location = (fix.latitude, fix.longitude)
     
-    def _check_geofences(self, lat: float, lon: float) -> None:
-        """Check if location violates any geofences."""
-        import math
-        
-        for name, geofence in self.geofences.items():
-            if not geofence.enabled:
+    def _check_geofences(self, lat: float, lon: float, timestamp: Optional[float] = None) -> None:
+        """Alert on geofence exits, entries and dwells (once per transition)."""
+        for event in self.geofence_engine.update(lat, lon, timestamp):
+            geofence = self.geofences.get(event.fence)
+            if geofence is None:
                 continue
             
-            # Calculate distance from center
-            distance = self._calculate_distance(
-                lat, lon,
-                geofence.center_lat, geofence.center_lon
-            )
-            
-            # Check if outside geofence
-            if distance > geofence.radius_meters:
-                if geofence.alert_on_exit:
-                    self._create_alert(
-                        "geofence_violation",
-                        (lat, lon),
-                        f"Vehicle left geofence: {name}",
-                        "high"
-                    )
-            else:
-                if geofence.alert_on_enter:
-                    self._create_alert(
-                        "geofence_enter",
-                        (lat, lon),
-                        f"Vehicle entered geofence: {name}",
-                        "medium"
-                    )
+            if event.event == "exit" and geofence.alert_on_exit:
+                self._create_alert(
+                    "geofence_violation",
+                    (lat, lon),
+                    f"Vehicle left geofence: {event.fence}",
+                    "high"
+                )
+            elif event.event == "enter" and geofence.alert_on_enter:
+                self._create_alert(
+                    "geofence_enter",
+                    (lat, lon),
+                    f"Vehicle entered geofence: {event.fence}",
+                    "medium"
+                )
+            elif event.event == "dwell":
+                self._create_alert(
+                    "geofence_dwell",
+                    (lat, lon),
+                    f"Vehicle stayed in geofence {event.fence} for {geofence.dwell_seconds:.0f} s",
+                    "medium"
+                )
     
     def _check_unauthorized_movement(self, lat: float, lon: float) -> None:
         """Check for unauthorized movement when vehicle should be parked."""
@@ -432,14 +420,13 @@ class TheftTrackingService:
                 )
     
     def add_geofence(self, geofence: Geofence) -> None:
-        """Add geofence."""
-        self.geofences[geofence.name] = geofence
+        """Add or replace geofence (circle or polygon)."""
+        self.geofence_engine.add(geofence)
         LOGGER.info("Added geofence: %s", geofence.name)
     
     def remove_geofence(self, name: str) -> None:
         """Remove geofence."""
-        if name in self.geofences:
-            del self.geofences[name]
+        if self.geofence_engine.remove(name):
             LOGGER.info("Removed geofence: %s", name)
     
     def mark_parked(self, lat: float, lon: float) -> None:
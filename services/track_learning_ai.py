@@ -3,6 +3,12 @@ Track Learning AI
 
 AI learns every track you drive and provides optimal racing line,
 braking points, and acceleration zones. This is INSANE value!
+
+Each learned line gets a grid spatial index (``TrackSpatialIndex``), built
+lazily and rebuilt when the line is relearned, so coaching lookups do not
+scan the whole line. Tracks are identified geometrically: an unknown trace
+is matched against every profile by bounding box, then by mean distance
+to the learned line, so new, noisy or partial laps are recognised.
 """
 
 from __future__ import annotations
@@ -12,6 +18,8 @@ import time
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
+from services.track_spatial_index import TrackMatch, TrackSpatialIndex, trace_bounds
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -51,11 +59,16 @@ class TrackLearningAI:
     This learns every track you drive and becomes your personal track coach.
     """
 
+    # Track identification thresholds (meters)
+    IDENTIFY_MAX_DISTANCE = 15.0  # Mean trace-to-line distance for a match
+    IDENTIFY_BOUNDS_MARGIN = 50.0  # Slack on the bounding-box prefilter
+
     def __init__(self) -> None:
         """Initialize track learning AI."""
         self.track_profiles: Dict[str, TrackProfile] = {}
         self.current_track: Optional[TrackProfile] = None
         self.lap_data: List[Dict] = []
+        self._indexes: Dict[str, Tuple[List[TrackPoint], int, TrackSpatialIndex]] = {}
 
     def learn_from_lap(
         self,
@@ -76,7 +89,13 @@ class TrackLearningAI:
         Returns:
             Updated track profile
         """
-        track_id = self._generate_track_id(gps_trace)
+        # Reuse the profile of a track already driven, even if this lap differs
+        track_id = self.identify_track(gps_trace)
+        if track_id is None:
+            track_id = self._generate_track_id(gps_trace)
+            if track_id in self.track_profiles:
+                # Coarse ID collides with a different layout
+                track_id = f"{track_id}_{len(self.track_profiles)}"
 
         if track_id not in self.track_profiles:
             self.track_profiles[track_id] = TrackProfile(
@@ -89,8 +108,8 @@ class TrackLearningAI:
         profile = self.track_profiles[track_id]
         profile.learned_from_laps += 1
 
-        # Update optimal lap time if this is faster
-        if lap_time < profile.optimal_lap_time:
+        # Learn the line from the first lap, relearn from any faster lap
+        if not profile.track_points or lap_time < profile.optimal_lap_time:
             profile.optimal_lap_time = lap_time
             # Relearn from this faster lap
             self._learn_optimal_line(gps_trace, telemetry_trace, profile)
@@ -130,6 +149,7 @@ class TrackLearningAI:
 
     def _learn_optimal_line(self, gps_trace: List[Dict], telemetry_trace: List[Dict], profile: TrackProfile) -> None:
         """Learn optimal racing line from GPS and telemetry."""
+        self._indexes.pop(profile.track_id, None)
         profile.track_points.clear()
         profile.braking_points.clear()
         profile.acceleration_zones.clear()
@@ -176,6 +196,10 @@ class TrackLearningAI:
 
             profile.track_points.append(point)
 
+        index = self._get_index(profile)
+        if index is not None:
+            profile.total_distance = index.length
+
     def _merge_lap_data(
         self, gps_trace: List[Dict], telemetry_trace: List[Dict], profile: TrackProfile
     ) -> None:
@@ -223,18 +247,10 @@ class TrackLearningAI:
         if not profile:
             return []
 
-        # Find nearest track point
-        nearest_point = None
-        min_distance = float("inf")
-
-        for point in profile.track_points:
-            distance = ((point.latitude - current_position[0]) ** 2 + (point.longitude - current_position[1]) ** 2) ** 0.5
-            if distance < min_distance:
-                min_distance = distance
-                nearest_point = point
-
-        if not nearest_point:
+        index = self._get_index(profile)
+        if index is None:
             return []
+        nearest_point = profile.track_points[index.nearest_index(*current_position)[0]]
 
         tips = []
 
@@ -246,20 +262,67 @@ class TrackLearningAI:
 
         return tips
 
+    def get_track_position(self, current_position: Tuple[float, float], track_id: str) -> Optional[TrackMatch]:
+        """
+        Locate a position on a learned track.
+
+        Args:
+            current_position: Current (lat, lon)
+            track_id: Track ID
+
+        Returns:
+            TrackMatch with nearest point, lateral offset and along-track
+            distance (meters), or None if the track has no learned line
+        """
+        profile = self.track_profiles.get(track_id)
+        index = self._get_index(profile) if profile else None
+        if index is None:
+            return None
+        return index.locate(*current_position)
+
     def identify_track(self, gps_trace: List[Dict[str, float]]) -> Optional[str]:
         """
         Identify which track you're on based on GPS trace.
 
+        The trace may be a full lap, a partial lap or a noisy one. Profiles
+        whose bounds do not contain the trace are skipped; the rest are
+        scored by mean distance from the trace to their learned line.
+
         Args:
             gps_trace: GPS coordinates
 
         Returns:
             Track ID if recognized, None otherwise
         """
-        track_id = self._generate_track_id(gps_trace)
-        if track_id in self.track_profiles:
-            return track_id
-        return None
+        if not gps_trace:
+            return None
+
+        latitudes = [p.get("latitude", 0) for p in gps_trace]
+        longitudes = [p.get("longitude", 0) for p in gps_trace]
+        bounds = trace_bounds(latitudes, longitudes)
+
+        best_id, best_distance = None, self.IDENTIFY_MAX_DISTANCE
+        for candidate_id, profile in self.track_profiles.items():
+            index = self._get_index(profile)
+            if index is None or not index.contains_bounds(bounds, self.IDENTIFY_BOUNDS_MARGIN):
+                continue
+            distance = index.shape_distance(latitudes, longitudes)
+            if distance <= best_distance:
+                best_id, best_distance = candidate_id, distance
+        return best_id
+
+    def _get_index(self, profile: TrackProfile) -> Optional[TrackSpatialIndex]:
+        """Spatial index for a profile's line, rebuilt if the line changed."""
+        points = profile.track_points
+        if not points:
+            self._indexes.pop(profile.track_id, None)
+            return None
+        cached = self._indexes.get(profile.track_id)
+        if cached and cached[0] is points and cached[1] == len(points):
+            return cached[2]
+        index = TrackSpatialIndex([p.latitude for p in points], [p.longitude for p in points])
+        self._indexes[profile.track_id] = (points, len(points), index)
+        return index
 
 
 __all__ = ["TrackLearningAI", "TrackProfile", "TrackPoint"]
@@ -0,0 +1,207 @@
+"""
+Track Spatial Index
+
+Uniform-grid index over a track polyline (e.g. a learned racing line) in
+local metric coordinates. Nearest-point, lateral offset and along-track
+distance queries only look at the few grid cells around the query instead
+of scanning every point, so lookups stay in the tens of microseconds for
+tracks with tens of thousands of points.
+
+Also provides the geometric helpers used for track identification: trace
+resampling by arc length, bounding boxes and a directed shape distance
+(mean distance from a trace to the indexed line), which works for partial
+and noisy laps.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+
+# Rings of cells searched before falling back to a vectorized full scan
+_MAX_RINGS = 6
+
+
+@dataclass
+class TrackMatch:
+    """Position of a query point relative to the indexed track."""
+
+    index: int  # Nearest track point
+    distance: float  # Lateral distance to the track polyline (meters)
+    along_track: float  # Distance from the first track point along the line (meters)
+
+
+def trace_bounds(latitudes: Sequence[float], longitudes: Sequence[float]) -> Tuple[float, float, float, float]:
+    """Bounding box as (lat_min, lon_min, lat_max, lon_max)."""
+    lat = np.asarray(latitudes, dtype=np.float64)
+    lon = np.asarray(longitudes, dtype=np.float64)
+    return float(lat.min()), float(lon.min()), float(lat.max()), float(lon.max())
+
+
+def resample_trace(
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+    count: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Resample a trace to ``count`` points evenly spaced by distance travelled."""
+    lat = np.asarray(latitudes, dtype=np.float64)
+    lon = np.asarray(longitudes, dtype=np.float64)
+    if lat.size < 2:
+        return lat, lon
+    k_north = math.radians(1.0) * EARTH_RADIUS_M
+    k_east = k_north * math.cos(math.radians(float(lat.mean())))
+    step = np.hypot(np.diff(lat) * k_north, np.diff(lon) * k_east)
+    travelled = np.concatenate(([0.0], np.cumsum(step)))
+    if travelled[-1] <= 0:
+        return lat[:1], lon[:1]
+    targets = np.linspace(0.0, travelled[-1], count)
+    return np.interp(targets, travelled, lat), np.interp(targets, travelled, lon)
+
+
+class TrackSpatialIndex:
+    """Grid index over a track polyline."""
+
+    def __init__(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        cell_size: Optional[float] = None,
+    ) -> None:
+        """
+        Build the index.
+
+        Args:
+            latitudes: Track point latitudes, in driving order
+            longitudes: Track point longitudes, in driving order
+            cell_size: Grid cell size in meters (default: from point spacing)
+        """
+        lat = np.asarray(latitudes, dtype=np.float64)
+        lon = np.asarray(longitudes, dtype=np.float64)
+        if lat.size == 0:
+            raise ValueError("Cannot index an empty track")
+
+        self.lat0 = float(lat.mean())
+        self.lon0 = float(lon.mean())
+        self.k_north = math.radians(1.0) * EARTH_RADIUS_M
+        self.k_east = self.k_north * math.cos(math.radians(self.lat0))
+        self.x, self.y = self.project(lat, lon)
+        self.bounds = trace_bounds(lat, lon)
+
+        step = np.hypot(np.diff(self.x), np.diff(self.y))
+        self.cumulative = np.concatenate(([0.0], np.cumsum(step)))
+        self.length = float(self.cumulative[-1])
+
+        if cell_size is None:
+            spacing = float(np.median(step)) if step.size else 1.0
+            cell_size = max(5.0, 8.0 * spacing)
+        self.cell_size = float(cell_size)
+
+        # Group point indices by cell
+        ix = np.floor(self.x / self.cell_size).astype(np.int64)
+        iy = np.floor(self.y / self.cell_size).astype(np.int64)
+        order = np.lexsort((iy, ix))
+        keys = np.stack((ix[order], iy[order]), axis=1)
+        starts = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+        self._cells: Dict[Tuple[int, int], np.ndarray] = {}
+        for chunk in np.split(order, starts):
+            self._cells[(int(ix[chunk[0]]), int(iy[chunk[0]]))] = chunk
+
+    def __len__(self) -> int:
+        return int(self.x.size)
+
+    def project(self, lat, lon):
+        """Project scalars or arrays to local (east, north) meters."""
+        return (np.asarray(lon) - self.lon0) * self.k_east, (np.asarray(lat) - self.lat0) * self.k_north
+
+    def nearest_index(self, lat: float, lon: float) -> Tuple[int, float]:
+        """Nearest track point and its distance (meters)."""
+        x, y = self.project(lat, lon)
+        x, y = float(x), float(y)
+        cx = math.floor(x / self.cell_size)
+        cy = math.floor(y / self.cell_size)
+
+        best_index, best_sq = -1, math.inf
+        for ring in range(_MAX_RINGS + 1):
+            candidates = [
+                self._cells[key]
+                for key in self._ring_keys(cx, cy, ring)
+                if key in self._cells
+            ]
+            if candidates:
+                points = np.concatenate(candidates) if len(candidates) > 1 else candidates[0]
+                sq = (self.x[points] - x) ** 2 + (self.y[points] - y) ** 2
+                i = int(np.argmin(sq))
+                if sq[i] < best_sq:
+                    best_index, best_sq = int(points[i]), float(sq[i])
+            # Anything outside this ring is at least ring * cell_size away
+            if best_index >= 0 and math.sqrt(best_sq) <= ring * self.cell_size:
+                return best_index, math.sqrt(best_sq)
+
+        # Far from the track: vectorized full scan
+        sq = (self.x - x) ** 2 + (self.y - y) ** 2
+        i = int(np.argmin(sq))
+        return i, math.sqrt(float(sq[i]))
+
+    @staticmethod
+    def _ring_keys(cx: int, cy: int, ring: int):
+        if ring == 0:
+            yield cx, cy
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
+
+    def locate(self, lat: float, lon: float) -> TrackMatch:
+        """Lateral distance and along-track distance of a position."""
+        index, distance = self.nearest_index(lat, lon)
+        x, y = self.project(lat, lon)
+        along = float(self.cumulative[index])
+
+        # Refine onto the adjacent segments
+        for start in (index - 1, index):
+            if start < 0 or start + 1 >= len(self):
+                continue
+            ax, ay = self.x[start], self.y[start]
+            dx, dy = self.x[start + 1] - ax, self.y[start + 1] - ay
+            seg_sq = dx * dx + dy * dy
+            if seg_sq <= 0:
+                continue
+            t = min(1.0, max(0.0, float(((x - ax) * dx + (y - ay) * dy) / seg_sq)))
+            d = math.hypot(float(ax + t * dx - x), float(ay + t * dy - y))
+            if d < distance:
+                distance = d
+                along = float(self.cumulative[start] + t * math.sqrt(seg_sq))
+        return TrackMatch(index=index, distance=distance, along_track=along)
+
+    def contains_bounds(self, bounds: Tuple[float, float, float, float], margin: float) -> bool:
+        """True if a bounding box lies within this track's bounds grown by ``margin`` meters."""
+        dlat = math.degrees(margin / EARTH_RADIUS_M)
+        dlon = dlat / max(math.cos(math.radians(self.lat0)), 1e-6)
+        lat_min, lon_min, lat_max, lon_max = self.bounds
+        return (
+            bounds[0] >= lat_min - dlat and bounds[2] <= lat_max + dlat
+            and bounds[1] >= lon_min - dlon and bounds[3] <= lon_max + dlon
+        )
+
+    def shape_distance(self, latitudes: Sequence[float], longitudes: Sequence[float], samples: int = 64) -> float:
+        """
+        Mean lateral distance (meters) from a trace to the indexed track.
+
+        Directed from the trace to the track, so a partial lap on the track
+        scores as well as a full one.
+        """
+        lat, lon = resample_trace(latitudes, longitudes, samples)
+        if lat.size == 0:
+            return math.inf
+        return float(np.mean([self.locate(a, b).distance for a, b in zip(lat.tolist(), lon.tolist())]))
+
+
+__all__ = ["TrackMatch", "TrackSpatialIndex", "resample_trace", "trace_bounds"]
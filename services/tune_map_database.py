@@ -11,6 +11,11 @@ Features:
 - All tuning map types (fuel, ignition, boost, etc.)
 - Map sharing and community contributions
 - Safety validation and warnings
+
+Tune files stay the source of truth. Searchable metadata (vehicle, ECU
+type, tune type, gains, hardware, tags) is kept in a SQLite index next to
+them, refreshed from file size/mtime, so startup and search never parse map
+tables; a tune's maps are read from its file on ``get_tune``.
 """
 
 from __future__ import annotations
@@ -18,8 +23,10 @@ from __future__ import annotations
 import json
 import logging
 import hashlib
+import os
+import sqlite3
 import time
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, replace
 from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
@@ -142,9 +149,13 @@ class TuneMap:
     installation_notes: str = ""
     dyno_results: Optional[Dict[str, Any]] = None
     
+    # False for search results, which carry metadata only (no map tables)
+    maps_loaded: bool = field(default=True, repr=False, compare=False)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         data = asdict(self)
+        data.pop('maps_loaded')
         data['tune_type'] = self.tune_type.value
         data['vehicle'] = asdict(self.vehicle)
         data['maps'] = []
@@ -215,6 +226,9 @@ class TuneMap:
         )
 
 
+INDEX_SCHEMA_VERSION = 1
+
+
 class TuneMapDatabase:
     """
     Comprehensive tune/map database manager.
@@ -243,18 +257,37 @@ class TuneMapDatabase:
         self.shared_dir = self.storage_path / "shared"
         self.shared_dir.mkdir(exist_ok=True)
         
-        # In-memory index for fast lookup
-        self.tunes_index: Dict[str, TuneMap] = {}
+        # Metadata index (SQLite) plus in-memory lookups by vehicle and ECU
+        self.index_path = self.storage_path / "tune_index.db"
         self.vehicle_index: Dict[str, List[str]] = {}  # vehicle_id -> [tune_ids]
         self.ecu_index: Dict[str, List[str]] = {}  # ecu_type -> [tune_ids]
+        self._tunes_dir_mtime_ns: Optional[int] = None
+        self._init_index()
         
         # Load existing tunes
         self._load_database()
         
         # Initialize with example base maps if empty
-        if not self.tunes_index:
+        if not self.tune_count():
             self._initialize_default_tunes()
     
+    @property
+    def tunes_index(self) -> Dict[str, TuneMap]:
+        """All tunes by ID, metadata only (use get_tune for maps)."""
+        return {tune.tune_id: tune for tune in self.search_tunes()}
+    
+    def tune_count(self) -> int:
+        """Number of indexed tunes."""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM tunes").fetchone()[0]
+        finally:
+            conn.close()
+    
+    def refresh(self) -> None:
+        """Re-check every tune file and re-index those added, changed or removed."""
+        self._sync_index()
+    
     def add_tune(self, tune: TuneMap) -> bool:
         """
         Add a tune to the database.
@@ -281,11 +314,26 @@ class TuneMapDatabase:
             tune_file = tune_file.resolve()
             if not str(tune_file).startswith(str(self.tunes_dir.resolve())):
                 raise ValueError(f"Path traversal attempt detected: {tune.tune_id}")
+            
+            # A search result has no maps; keep the ones on disk
+            if not tune.maps_loaded:
+                stored = self.get_tune(tune.tune_id)
+                tune.maps = stored.maps if stored else []
+                tune.maps_loaded = True
+            
+            dir_mtime_ns = self._tunes_dir_stat()
             with open(tune_file, 'w', encoding='utf-8') as f:
                 json.dump(tune.to_dict(), f, indent=2)
             
-            # Update indexes
-            self.tunes_index[tune.tune_id] = tune
+            # Update indexes (a new file changes the directory; skip re-scanning for it)
+            conn = self._connect()
+            try:
+                with conn:
+                    self._index_tune(conn, tune_file.name, os.stat(tune_file), tune)
+            finally:
+                conn.close()
+            if self._tunes_dir_mtime_ns == dir_mtime_ns:
+                self._tunes_dir_mtime_ns = self._tunes_dir_stat()
             self._update_indexes(tune)
             
             LOGGER.info("Added tune: %s (ID: %s)", tune.name, tune.tune_id)
@@ -295,8 +343,24 @@ class TuneMapDatabase:
             return False
     
     def get_tune(self, tune_id: str) -> Optional[TuneMap]:
-        """Get tune by ID."""
-        return self.tunes_index.get(tune_id)
+        """Get tune by ID, including its maps."""
+        self._refresh_if_changed()
+        for attempt in range(2):
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT file FROM tunes WHERE tune_id = ?", (tune_id,)).fetchone()
+            finally:
+                conn.close()
+            if row is None:
+                return None
+            
+            tune = self._read_tune_file(self.tunes_dir / row[0])
+            if tune is not None and tune.tune_id == tune_id:
+                return tune
+            # File changed or removed since it was indexed
+            if attempt == 0:
+                self._sync_index()
+        return None
     
     def search_tunes(
         self,
@@ -312,6 +376,9 @@ class TuneMapDatabase:
         """
         Search tunes by criteria.
         
+        Results come from the metadata index and have no maps loaded
+        (``maps_loaded`` is False); use get_tune for the complete tune.
+        
         Args:
             make: Vehicle make
             model: Vehicle model
@@ -325,40 +392,52 @@ class TuneMapDatabase:
         Returns:
             List of matching tunes
         """
-        results = []
-        
-        for tune in self.tunes_index.values():
-            # Vehicle matching
-            if make and tune.vehicle.make.lower() != make.lower():
-                continue
-            if model and tune.vehicle.model.lower() != model.lower():
-                continue
-            if year and tune.vehicle.year != year:
-                continue
-            if engine_code and tune.vehicle.engine_code:
-                if tune.vehicle.engine_code.lower() != engine_code.lower():
-                    continue
-            
-            # ECU type
-            if ecu_type and tune.ecu_type.lower() != ecu_type.lower():
-                continue
-            
-            # Tune type
-            if tune_type and tune.tune_type != tune_type:
-                continue
-            
-            # Tag
-            if tag and tag.lower() not in [t.lower() for t in tune.tags]:
-                continue
-            
-            # Performance gain
-            if min_hp_gain and tune.performance_gains:
-                if not tune.performance_gains.hp_gain or tune.performance_gains.hp_gain < min_hp_gain:
-                    continue
-            
-            results.append(tune)
-        
-        return results
+        self._refresh_if_changed()
+        query = "SELECT summary FROM tunes t WHERE 1=1"
+        params: List[Any] = []
+        
+        # Vehicle matching
+        if make:
+            query += " AND lower_text(t.make) = ?"
+            params.append(make.lower())
+        if model:
+            query += " AND lower_text(t.model) = ?"
+            params.append(model.lower())
+        if year:
+            query += " AND t.year = ?"
+            params.append(year)
+        if engine_code:
+            # Tunes without an engine code match any
+            query += " AND (t.engine_code IS NULL OR t.engine_code = '' OR lower_text(t.engine_code) = ?)"
+            params.append(engine_code.lower())
+        
+        # ECU type
+        if ecu_type:
+            query += " AND lower_text(t.ecu_type) = ?"
+            params.append(ecu_type.lower())
+        
+        # Tune type
+        if tune_type:
+            query += " AND t.tune_type = ?"
+            params.append(tune_type.value)
+        
+        # Tag
+        if tag:
+            query += " AND EXISTS (SELECT 1 FROM tune_tags g WHERE g.tune_id = t.tune_id AND g.tag = ?)"
+            params.append(tag.lower())
+        
+        # Performance gain (tunes without gains information are kept)
+        if min_hp_gain:
+            query += " AND (NOT t.has_gains OR (t.hp_gain IS NOT NULL AND t.hp_gain != 0 AND t.hp_gain >= ?))"
+            params.append(min_hp_gain)
+        
+        query += " ORDER BY t.rowid"
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        return [self._summary_to_tune(row[0]) for row in rows]
     
     def get_base_maps(self, vehicle: VehicleIdentifier, ecu_type: str) -> List[TuneMap]:
         """
@@ -611,18 +690,167 @@ class TuneMapDatabase:
             self.ecu_index[tune.ecu_type].append(tune.tune_id)
     
     def _load_database(self) -> None:
-        """Load all tunes from disk."""
-        for tune_file in self.tunes_dir.glob("*.json"):
-            try:
-                with open(tune_file, 'r') as f:
-                    data = json.load(f)
-                tune = TuneMap.from_dict(data)
-                self.tunes_index[tune.tune_id] = tune
-                self._update_indexes(tune)
-            except Exception as e:
-                LOGGER.error("Failed to load tune %s: %s", tune_file, e)
-        
-        LOGGER.info("Loaded %d tunes from database", len(self.tunes_index))
+        """Bring the metadata index up to date with the tune files."""
+        self._sync_index()
+        LOGGER.info("Loaded %d tunes from database", self.tune_count())
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Connection to the metadata index."""
+        conn = sqlite3.connect(self.index_path)
+        conn.create_function("lower_text", 1, lambda text: text.lower() if text else text, deterministic=True)
+        return conn
+    
+    def _init_index(self) -> None:
+        """Create (or recreate, on a schema change) the metadata index."""
+        conn = self._connect()
+        try:
+            with conn:
+                if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_SCHEMA_VERSION:
+                    for table in ("tune_files", "tunes", "tune_tags"):
+                        conn.execute(f"DROP TABLE IF EXISTS {table}")
+                
+                # One row per file, including unreadable ones (tune_id NULL)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS tune_files (
+                        file TEXT PRIMARY KEY,
+                        mtime_ns INTEGER,
+                        size INTEGER,
+                        tune_id TEXT
+                    )
+                """)
+                
+                # Searchable metadata; summary is the tune's JSON without maps
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS tunes (
+                        tune_id TEXT PRIMARY KEY,
+                        file TEXT,
+                        make TEXT,
+                        model TEXT,
+                        year INTEGER,
+                        engine_code TEXT,
+                        ecu_type TEXT,
+                        tune_type TEXT,
+                        has_gains INTEGER,
+                        hp_gain INTEGER,
+                        summary TEXT
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS tune_tags (
+                        tune_id TEXT,
+                        tag TEXT
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_tunes_file ON tunes(file)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_tune_tags_tag ON tune_tags(tag)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_tune_tags_tune ON tune_tags(tune_id)")
+                conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+        finally:
+            conn.close()
+    
+    def _tunes_dir_stat(self) -> Optional[int]:
+        try:
+            return os.stat(self.tunes_dir).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _refresh_if_changed(self) -> None:
+        """Re-index if files were added, removed or renamed since the last scan."""
+        if self._tunes_dir_stat() != self._tunes_dir_mtime_ns:
+            self._sync_index()
+    
+    def _sync_index(self) -> None:
+        """Index new and changed tune files (by size/mtime) and drop removed ones."""
+        self._tunes_dir_mtime_ns = self._tunes_dir_stat()  # Before scanning, so later changes are seen
+        current = {}
+        with os.scandir(self.tunes_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    current[entry.name] = entry.stat()
+        
+        conn = self._connect()
+        try:
+            with conn:
+                known = {row[0]: (row[1], row[2]) for row in conn.execute("SELECT file, mtime_ns, size FROM tune_files")}
+                for name in known.keys() - current.keys():
+                    conn.execute("DELETE FROM tune_tags WHERE tune_id IN (SELECT tune_id FROM tunes WHERE file = ?)", (name,))
+                    conn.execute("DELETE FROM tunes WHERE file = ?", (name,))
+                    conn.execute("DELETE FROM tune_files WHERE file = ?", (name,))
+                
+                changed = sorted(name for name, st in current.items() if known.get(name) != (st.st_mtime_ns, st.st_size))
+                for name in changed:
+                    self._index_tune(conn, name, current[name], self._read_tune_file(self.tunes_dir / name))
+            
+            # Vehicle and ECU lookups
+            self.vehicle_index.clear()
+            self.ecu_index.clear()
+            for tune_id, make, model, year, ecu_type in conn.execute(
+                "SELECT tune_id, make, model, year, ecu_type FROM tunes ORDER BY rowid"
+            ):
+                self.vehicle_index.setdefault(f"{make}_{model}_{year}", []).append(tune_id)
+                self.ecu_index.setdefault(ecu_type, []).append(tune_id)
+        finally:
+            conn.close()
+        
+        if changed:
+            LOGGER.info("Indexed %d new or changed tune files", len(changed))
+    
+    def _index_tune(self, conn: sqlite3.Connection, file_name: str, stat: os.stat_result, tune: Optional[TuneMap]) -> None:
+        """Record a tune file (and its metadata, if readable) in the index."""
+        conn.execute("""
+            INSERT INTO tune_files (file, mtime_ns, size, tune_id) VALUES (?, ?, ?, ?)
+            ON CONFLICT(file) DO UPDATE SET mtime_ns = excluded.mtime_ns, size = excluded.size, tune_id = excluded.tune_id
+        """, (file_name, stat.st_mtime_ns, stat.st_size, tune.tune_id if tune else None))
+        if tune is None:
+            conn.execute("DELETE FROM tune_tags WHERE tune_id IN (SELECT tune_id FROM tunes WHERE file = ?)", (file_name,))
+            conn.execute("DELETE FROM tunes WHERE file = ?", (file_name,))
+            return
+        
+        summary = replace(tune, maps=[]).to_dict()  # asdict() would deep-copy every map table
+        del summary['maps']
+        gains = tune.performance_gains
+        conn.execute("""
+            INSERT INTO tunes (tune_id, file, make, model, year, engine_code, ecu_type, tune_type,
+                               has_gains, hp_gain, summary)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(tune_id) DO UPDATE SET
+                file = excluded.file, make = excluded.make, model = excluded.model, year = excluded.year,
+                engine_code = excluded.engine_code, ecu_type = excluded.ecu_type, tune_type = excluded.tune_type,
+                has_gains = excluded.has_gains, hp_gain = excluded.hp_gain, summary = excluded.summary
+        """, (
+            tune.tune_id,
+            file_name,
+            tune.vehicle.make,
+            tune.vehicle.model,
+            tune.vehicle.year,
+            tune.vehicle.engine_code,
+            tune.ecu_type,
+            tune.tune_type.value,
+            gains is not None,
+            gains.hp_gain if gains else None,
+            json.dumps(summary),
+        ))
+        conn.execute("DELETE FROM tune_tags WHERE tune_id = ?", (tune.tune_id,))
+        conn.executemany(
+            "INSERT INTO tune_tags (tune_id, tag) VALUES (?, ?)",
+            [(tune.tune_id, tag.lower()) for tag in set(tune.tags)],
+        )
+    
+    def _read_tune_file(self, tune_file: Path) -> Optional[TuneMap]:
+        """Parse a complete tune file; None (logged) if missing or invalid."""
+        try:
+            with open(tune_file, 'r') as f:
+                data = json.load(f)
+            return TuneMap.from_dict(data)
+        except Exception as e:
+            LOGGER.error("Failed to load tune %s: %s", tune_file, e)
+            return None
+    
+    @staticmethod
+    def _summary_to_tune(summary: str) -> TuneMap:
+        tune = TuneMap.from_dict(json.loads(summary))
+        tune.maps_loaded = False
+        return tune
     
     def _initialize_default_tunes(self) -> None:
         """Initialize with example base maps."""
@@ -12,7 +12,6 @@ Automatically detects and reads various log file formats:
 
 from __future__ import annotations
 
-import csv
 import json
 import logging
 import re
@@ -20,7 +19,7 @@ import struct
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 try:
     import numpy as np
@@ -29,6 +28,8 @@ except ImportError:
     NUMPY_AVAILABLE = False
     np = None  # type: ignore
 
+from services.columnar_log_reader import read_delimited
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -69,8 +70,8 @@ class LogMetadata:
 class LogData:
     """Parsed log data."""
     metadata: LogMetadata
-    data: Dict[str, List[float]]  # Channel name -> values
-    time: List[float]  # Time axis
+    data: Dict[str, Sequence[float]]  # Channel name -> values (float64 arrays for CSV/TSV)
+    time: Sequence[float]  # Time axis
     distance: Optional[List[float]] = None  # Distance axis (if available)
 
 
@@ -335,87 +336,47 @@ class UniversalLogParser:
     
     def _parse_csv_generic(self, file_path: Path) -> LogData:
         """Parse generic CSV log file."""
-        data = {}
-        time = []
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                reader = csv.DictReader(f)
-                
-                # Get channels from header
-                channels = reader.fieldnames or []
-                
-                # Initialize data dict
-                for channel in channels:
-                    data[channel] = []
-                
-                # Parse rows
-                for row in reader:
-                    for channel in channels:
-                        val = row.get(channel, '0')
-                        try:
-                            if channel.lower() in ['time', 'timestamp', 't']:
-                                time.append(float(val))
-                            else:
-                                data[channel].append(float(val))
-                        except (ValueError, TypeError):
-                            if channel.lower() in ['time', 'timestamp', 't']:
-                                time.append(0.0)
-                            else:
-                                data[channel].append(0.0)
-            
-            metadata = LogMetadata(
-                format=LogFormat.CSV_GENERIC,
-                channels=list(channels),
-                sample_rate=self._calculate_sample_rate(time) if time else None,
-            )
-            
-            return LogData(metadata=metadata, data=data, time=time)
-            
-        except Exception as e:
-            LOGGER.error("Failed to parse CSV log: %s", e)
-            raise
+        return self._parse_delimited(file_path, ",", LogFormat.CSV_GENERIC)
     
     def _parse_tsv_generic(self, file_path: Path) -> LogData:
         """Parse generic TSV log file."""
-        data = {}
-        time = []
+        return self._parse_delimited(file_path, "\t", LogFormat.TSV_GENERIC)
+    
+    def _parse_delimited(self, file_path: Path, delimiter: str, log_format: LogFormat) -> LogData:
+        """
+        Parse a delimited log into contiguous float64 columns.
         
+        Non-numeric and missing cells read as 0.0. Time columns
+        (time/timestamp/t) become the time axis; the first one wins.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                reader = csv.DictReader(f, delimiter='\t')
-                
-                channels = reader.fieldnames or []
-                
-                for channel in channels:
-                    data[channel] = []
-                
-                for row in reader:
-                    for channel in channels:
-                        val = row.get(channel, '0')
-                        try:
-                            if channel.lower() in ['time', 'timestamp', 't']:
-                                time.append(float(val))
-                            else:
-                                data[channel].append(float(val))
-                        except (ValueError, TypeError):
-                            if channel.lower() in ['time', 'timestamp', 't']:
-                                time.append(0.0)
-                            else:
-                                data[channel].append(0.0)
+            table = read_delimited(file_path, delimiter=delimiter, missing=0.0)
+            
+            time_column = table.time_column
+            time = table.data[time_column] if time_column else self._empty_column()
+            data = {
+                name: values
+                for name, values in table.data.items()
+                if name not in table.time_columns
+            }
             
             metadata = LogMetadata(
-                format=LogFormat.TSV_GENERIC,
-                channels=list(channels),
-                sample_rate=self._calculate_sample_rate(time) if time else None,
+                format=log_format,
+                channels=list(table.columns),
+                units=table.units,
+                sample_rate=self._calculate_sample_rate(time) if len(time) else None,
             )
             
             return LogData(metadata=metadata, data=data, time=time)
             
         except Exception as e:
-            LOGGER.error("Failed to parse TSV log: %s", e)
+            LOGGER.error("Failed to parse %s log: %s", "TSV" if delimiter == "\t" else "CSV", e)
             raise
     
+    @staticmethod
+    def _empty_column():
+        return np.empty(0, dtype=np.float64) if NUMPY_AVAILABLE else []
+    
     def _parse_json(self, file_path: Path) -> LogData:
         """Parse JSON log file."""
         try:
@@ -473,9 +434,9 @@ class UniversalLogParser:
         """Parse RaceLogic log file."""
         return self._parse_csv_generic(file_path)
     
-    def _calculate_sample_rate(self, time: List[float]) -> Optional[float]:
+    def _calculate_sample_rate(self, time: Sequence[float]) -> Optional[float]:
         """Calculate sample rate from time data."""
-        if not time or len(time) < 2:
+        if len(time) < 2:
             return None
         
         if NUMPY_AVAILABLE:
@@ -8,8 +8,9 @@ from __future__ import annotations
 import logging
 import os
 import uuid
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple
 
 LOGGER = logging.getLogger(__name__)
 
@@ -82,9 +83,17 @@ class VectorKnowledgeStore:
         self.documents: List[str] = []
         self.metadata_list: List[Dict[str, Any]] = []
         self.embeddings: List[List[float]] = []
+        self.doc_ids: List[str] = []
+        self._doc_id_set: Set[str] = set()
         self.tfidf_vectorizer = None
         self.tfidf_matrix = None
         
+        # Bumped on every change; caches of search results and answers are keyed on it
+        self.version = 0
+        self.query_cache_size = 256
+        self._query_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._search_cache: "OrderedDict[Tuple, List[Dict[str, Any]]]" = OrderedDict()
+        
         self._initialize()
     
     def _initialize(self):
@@ -179,6 +188,7 @@ class VectorKnowledgeStore:
                     metadatas=[metadata],
                     ids=[doc_id]
                 )
+                self._changed()
                 
                 LOGGER.debug(f"Added knowledge to Chroma: {metadata.get('topic', 'Unknown')}")
                 return doc_id
@@ -190,6 +200,8 @@ class VectorKnowledgeStore:
         # Fallback: in-memory storage
         self.documents.append(text)
         self.metadata_list.append(metadata)
+        self.doc_ids.append(doc_id)
+        self._doc_id_set.add(doc_id)
         
         if self.encoder:
             embedding = self.encoder.encode(text).tolist()
@@ -197,6 +209,7 @@ class VectorKnowledgeStore:
         else:
             # Placeholder for TF-IDF (will be computed on search)
             self.embeddings.append([])
+        self._changed()
         
         LOGGER.debug(f"Added knowledge to fallback store: {metadata.get('topic', 'Unknown')}")
         return doc_id
@@ -257,6 +270,7 @@ class VectorKnowledgeStore:
                     metadatas=metadatas,
                     ids=doc_ids
                 )
+                self._changed()
                 
                 LOGGER.info(f"Added {len(texts)} knowledge entries to Chroma in batch")
                 return doc_ids
@@ -265,17 +279,42 @@ class VectorKnowledgeStore:
                 LOGGER.error(f"Failed to add batch to Chroma: {e}")
                 # Fall through to fallback
         
-        # Fallback: add individually
+        # Fallback: in-memory storage, encoded in one call
+        embeddings = self.encoder.encode(texts).tolist() if self.encoder else [[] for _ in texts]
         for i, text in enumerate(texts):
-            self.add_knowledge(
-                text=text,
-                metadata=metadata_list[i],
-                doc_id=doc_ids[i]
-            )
+            metadata = metadata_list[i].copy()
+            if "text" not in metadata:
+                metadata["text"] = text[:200]
+            self.documents.append(text)
+            self.metadata_list.append(metadata)
+            self.doc_ids.append(doc_ids[i])
+            self._doc_id_set.add(doc_ids[i])
+            self.embeddings.append(embeddings[i])
+        self._changed()
         
         LOGGER.info(f"Added {len(texts)} knowledge entries to fallback store")
         return doc_ids
     
+    def existing_ids(self, doc_ids: Iterable[str]) -> Set[str]:
+        """
+        Which of the given document IDs are already stored.
+        
+        Args:
+            doc_ids: Document IDs to look up
+            
+        Returns:
+            Set of the IDs present in the store
+        """
+        doc_ids = list(doc_ids)
+        if not doc_ids:
+            return set()
+        if self.use_chroma and self.collection:
+            try:
+                return set(self.collection.get(ids=doc_ids, include=[])["ids"])
+            except Exception as e:
+                LOGGER.error(f"Failed to look up IDs in Chroma: {e}")
+        return self._doc_id_set.intersection(doc_ids)
+    
     def search(
         self,
         query: str,
@@ -298,10 +337,30 @@ class VectorKnowledgeStore:
         if not query or not query.strip():
             return []
         
+        # Results are memoized until the store changes
+        filter_key = repr(sorted(filter_metadata.items())) if filter_metadata else None
+        cache_key = (query, n_results, min_similarity, filter_key, self.version)
+        results = self._search_cache.get(cache_key)
+        if results is None:
+            results = self._search(query, n_results, min_similarity, filter_metadata)
+            self._search_cache[cache_key] = results
+            while len(self._search_cache) > self.query_cache_size:
+                self._search_cache.popitem(last=False)
+        else:
+            self._search_cache.move_to_end(cache_key)
+        return [dict(result) for result in results]
+    
+    def _search(
+        self,
+        query: str,
+        n_results: int,
+        min_similarity: float,
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
         if self.use_chroma and self.encoder:
             try:
                 # Generate query embedding
-                query_embedding = self.encoder.encode(query).tolist()
+                query_embedding = self.embed_query(query)
                 
                 # Build where clause for filtering
                 where = None
@@ -350,7 +409,7 @@ class VectorKnowledgeStore:
         
         if self.encoder:
             # Use sentence transformer embeddings
-            query_embedding = self.encoder.encode(query).tolist()
+            query_embedding = self.embed_query(query)
             
             similarities = []
             for emb in self.embeddings:
@@ -380,14 +439,14 @@ class VectorKnowledgeStore:
                 similarities.append(similarity)
         
         # Get top results
-        results_with_scores = list(zip(self.documents, self.metadata_list, similarities))
-        results_with_scores.sort(key=lambda x: x[2], reverse=True)
+        results_with_scores = list(zip(self.doc_ids, self.documents, self.metadata_list, similarities))
+        results_with_scores.sort(key=lambda x: x[3], reverse=True)
         
         formatted_results = []
-        for text, metadata, similarity in results_with_scores[:n_results]:
+        for doc_id, text, metadata, similarity in results_with_scores[:n_results]:
             if similarity >= min_similarity:
                 formatted_results.append({
-                    "id": str(uuid.uuid4()),
+                    "id": doc_id,
                     "text": text,
                     "metadata": metadata,
                     "similarity": float(similarity)
@@ -395,6 +454,26 @@ class VectorKnowledgeStore:
         
         return formatted_results
     
+    def embed_query(self, query: str) -> Optional[List[float]]:
+        """
+        Embedding of a query (memoized), or None without a sentence encoder.
+        """
+        if not self.encoder:
+            return None
+        embedding = self._query_embeddings.get(query)
+        if embedding is None:
+            embedding = self.encoder.encode(query).tolist()
+            self._query_embeddings[query] = embedding
+            while len(self._query_embeddings) > self.query_cache_size:
+                self._query_embeddings.popitem(last=False)
+        else:
+            self._query_embeddings.move_to_end(query)
+        return embedding
+    
+    def _changed(self) -> None:
+        self.version += 1
+        self._search_cache.clear()
+    
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity between two vectors."""
         import math
@@ -432,7 +511,10 @@ class VectorKnowledgeStore:
         self.documents.clear()
         self.metadata_list.clear()
         self.embeddings.clear()
+        self.doc_ids.clear()
+        self._doc_id_set.clear()
         self.tfidf_matrix = None
+        self._changed()
         
         LOGGER.info("Vector knowledge store cleared")
     
@@ -441,12 +523,19 @@ class VectorKnowledgeStore:
         if self.use_chroma and self.collection:
             try:
                 self.collection.delete(ids=[doc_id])
+                self._changed()
                 return
             except Exception as e:
                 LOGGER.error(f"Failed to delete from Chroma: {e}")
         
         # Fallback: find and remove
-        # Note: This is inefficient, but fallback only
-        LOGGER.warning("Delete not fully supported in fallback mode")
+        if doc_id not in self._doc_id_set:
+            return
+        index = self.doc_ids.index(doc_id)
+        for values in (self.documents, self.metadata_list, self.embeddings, self.doc_ids):
+            del values[index]
+        self._doc_id_set.discard(doc_id)
+        self.tfidf_matrix = None
+        self._changed()
 
 
@@ -11,6 +11,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 try:
     import cv2
     CV_AVAILABLE = True
@@ -93,7 +95,7 @@ class VideoDataIntegrator:
             out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
             
             frame_count = 0
-            log_times = log_data.time
+            log_times = np.asarray(log_data.time, dtype=np.float64)
             
             while True:
                 ret, frame = cap.read()
@@ -104,11 +106,8 @@ class VideoDataIntegrator:
                 video_time = frame_count / fps
                 
                 # Find closest log data point
-                if log_times:
-                    closest_idx = min(
-                        range(len(log_times)),
-                        key=lambda i: abs(log_times[i] - video_time)
-                    )
+                if len(log_times):
+                    closest_idx = int(np.argmin(np.abs(log_times - video_time)))
                     
                     # Overlay data
                     frame = self._draw_overlay(
@@ -237,7 +236,7 @@ class VideoDataIntegrator:
             
             cap.release()
             
-            log_duration = log_data.time[-1] - log_data.time[0] if log_data.time else 0
+            log_duration = float(log_data.time[-1] - log_data.time[0]) if len(log_data.time) else 0
             
             return {
                 "video_fps": fps,
@@ -21,7 +21,7 @@ import time
 from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Deque, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+from typing import Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from dataclasses import field
@@ -213,6 +213,107 @@ class DynoCurve:
     run_timestamp: float = field(default_factory=time.time)  # When this run was created
 
 
+class DynoBatch(Sequence):
+    """
+    Columnar dyno results from ``VirtualDyno.calculate_horsepower_batch``.
+
+    Every quantity is a NumPy column (``batch["horsepower_crank"]``). Indexing
+    or iterating with integers yields ``DynoReading`` objects, built on first
+    access and cached, so the batch can be used wherever a list of readings
+    was. Optional inputs that were not supplied read back as None.
+    """
+
+    COLUMNS = (
+        "timestamp",
+        "rpm",
+        "speed_mph",
+        "speed_mps",
+        "acceleration_mps2",
+        "horsepower_wheel",
+        "horsepower_crank",
+        "torque_ftlb",  # NaN where it cannot be calculated
+        "confidence",
+        "gear_ratio",  # Inferred gear ratio, NaN if unknown
+        "gear",  # Inferred gear number (1-based), 0 if unknown
+        "afr",
+        "boost_psi",
+        "ignition_timing",
+    )
+    OPTIONAL_COLUMNS = ("rpm", "afr", "boost_psi", "ignition_timing")
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        method: DynoMethod,
+        conditions: EnvironmentalConditions,
+        present: Sequence[str] = (),
+    ) -> None:
+        self.columns = columns
+        self.method = method
+        self.conditions = conditions  # Shared by every reading in the batch
+        self.present = frozenset(present)  # Optional columns that were supplied
+        self._readings: Dict[int, DynoReading] = {}
+
+    def __len__(self) -> int:
+        return int(self.columns["timestamp"].shape[0])
+
+    def __getitem__(self, index):
+        if isinstance(index, str):
+            return self.columns[index]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("DynoBatch index out of range")
+        reading = self._readings.get(index)
+        if reading is None:
+            reading = self._build_reading(index)
+            self._readings[index] = reading
+        return reading
+
+    def __iter__(self) -> Iterator[DynoReading]:
+        return (self[i] for i in range(len(self)))
+
+    def _optional(self, name: str, index: int) -> Optional[float]:
+        return float(self.columns[name][index]) if name in self.present else None
+
+    def _build_reading(self, index: int) -> DynoReading:
+        col = self.columns
+        torque = float(col["torque_ftlb"][index])
+        return DynoReading(
+            timestamp=float(col["timestamp"][index]),
+            rpm=self._optional("rpm", index),
+            speed_mph=float(col["speed_mph"][index]),
+            speed_mps=float(col["speed_mps"][index]),
+            acceleration_mps2=float(col["acceleration_mps2"][index]),
+            horsepower_wheel=float(col["horsepower_wheel"][index]),
+            horsepower_crank=float(col["horsepower_crank"][index]),
+            torque_ftlb=torque if torque and not math.isnan(torque) else None,
+            method=self.method,
+            confidence=float(col["confidence"][index]),
+            conditions=self.conditions,
+            afr=self._optional("afr", index),
+            boost_psi=self._optional("boost_psi", index),
+            ignition_timing=self._optional("ignition_timing", index),
+        )
+
+    def to_records(self) -> np.ndarray:
+        """All columns as one NumPy structured array."""
+        dtype = [(name, np.int64 if name == "gear" else np.float64) for name in self.COLUMNS]
+        records = np.empty(len(self), dtype=dtype)
+        for name in self.COLUMNS:
+            records[name] = self.columns[name]
+        return records
+
+    def to_dataframe(self):
+        """All columns as a pandas DataFrame."""
+        import pandas as pd
+
+        return pd.DataFrame({name: self.columns[name] for name in self.COLUMNS})
+
+
 class VirtualDyno:
     """
     Virtual Dyno - Calculate horsepower from real-time telemetry.
@@ -389,7 +490,7 @@ class VirtualDyno:
         Returns:
             DynoReading with calculated horsepower
         """
-        timestamp = timestamp or time.time()
+        timestamp = timestamp if timestamp is not None else time.time()
         speed_mps = speed_mph * MPH_TO_MPS
 
         # Store in buffers for smoothing
@@ -804,6 +905,252 @@ class VirtualDyno:
         LOGGER.info(f"Exported {len(runs)} runs to {filename}")
         return filename
 
+    def calculate_horsepower_batch(
+        self,
+        time_s: Union[np.ndarray, List[float]],
+        speed_mph: Union[np.ndarray, List[float]],
+        acceleration_mps2: Union[np.ndarray, List[float]],
+        rpm: Optional[Union[np.ndarray, List[float]]] = None,
+        afr: Optional[Union[np.ndarray, List[float]]] = None,
+        boost_psi: Optional[Union[np.ndarray, List[float]]] = None,
+        ignition_timing: Optional[Union[np.ndarray, List[float]]] = None,
+        record: bool = True,
+    ) -> DynoBatch:
+        """
+        Columnar equivalent of calling ``calculate_horsepower`` once per sample.
+
+        The force balance, SAE/DIN correction, confidence, method blending and
+        gear inference are computed as array operations. The smoothing and
+        wheel-inertia terms continue from the dyno's buffers, so results match
+        the scalar path sample for sample.
+
+        Args:
+            time_s: Sample timestamps (seconds)
+            speed_mph: Speed per sample (mph)
+            acceleration_mps2: Raw acceleration per sample (m/s²)
+            rpm: Engine RPM per sample (optional)
+            afr: Air-fuel ratio per sample (optional)
+            boost_psi: Boost per sample (optional)
+            ignition_timing: Ignition timing per sample (optional)
+            record: Add the samples to the current curve and smoothing buffers,
+                as the scalar path does; False leaves the dyno state untouched
+
+        Returns:
+            DynoBatch with one row per sample
+        """
+        specs = self.vehicle_specs
+        t = np.asarray(time_s, dtype=np.float64)
+        speed_mph = np.asarray(speed_mph, dtype=np.float64)
+        raw_accel = np.asarray(acceleration_mps2, dtype=np.float64)
+        n = t.shape[0]
+        if speed_mph.shape[0] != n or raw_accel.shape[0] != n:
+            raise ValueError("time_s, speed_mph and acceleration_mps2 must have the same length")
+
+        optional = {}
+        for name, values in (("rpm", rpm), ("afr", afr), ("boost_psi", boost_psi), ("ignition_timing", ignition_timing)):
+            if values is None:
+                continue
+            values = np.asarray(values, dtype=np.float64)
+            if values.shape[0] != n:
+                raise ValueError(f"{name} must have the same length as time_s")
+            optional[name] = values
+        has_rpm = "rpm" in optional
+        rpm_values = optional.get("rpm", np.zeros(n))
+        speed_mps = speed_mph * MPH_TO_MPS
+
+        # Smoothing: mean (and std, for confidence) of the last <= 10 raw values,
+        # continuing from accel_buffer exactly like the deque in the scalar path
+        window = self.accel_buffer.maxlen or 10
+        history = np.asarray(self.accel_buffer, dtype=np.float64)
+        extended = np.concatenate((history, raw_accel))
+        accel = raw_accel.copy()
+        accel_var = np.full(n, np.inf)
+        first = min(n, max(0, window - 1 - history.size))  # First sample with a full buffer
+        if first < n:
+            # Shifted-slice sums over the full windows (one pass per window slot)
+            start = history.size + first + 1 - window
+            count = n - first
+            total = extended[start:start + count].copy()
+            for k in range(1, window):
+                total += extended[start + k:start + k + count]
+            mean = total / window
+            square_sum = np.zeros(count)
+            for k in range(window):
+                deviation = extended[start + k:start + k + count] - mean
+                square_sum += deviation * deviation
+            accel[first:] = mean
+            accel_var[first:] = square_sum / window
+        for i in range(first):
+            filled = history.size + i + 1
+            buffer = extended[:filled]
+            if filled >= 3:
+                accel[i] = np.mean(buffer)
+            if filled >= 5:
+                accel_var[i] = np.var(buffer)
+
+        # Force balance (acceleration method)
+        total_weight_kg = specs.total_weight_kg()
+        drag_coefficient = 0.5 * self.current_conditions.air_density_kg_m3() * specs.drag_coefficient * specs.frontal_area_m2
+        f_drag = drag_coefficient * (speed_mps ** 2)
+        f_roll = specs.rolling_resistance_coef * total_weight_kg * GRAVITY
+
+        # Wheel inertia from the previous sample (or the last buffered one)
+        previous_speed = np.empty(n)
+        previous_time = np.empty(n)
+        previous_speed[1:] = speed_mps[:-1]
+        previous_time[1:] = t[:-1]
+        has_previous = np.ones(n, dtype=bool)
+        if self.speed_buffer:
+            previous_time[0], previous_speed[0] = self.speed_buffer[-1]
+        else:
+            has_previous[0] = False
+            previous_time[0], previous_speed[0] = t[0], speed_mps[0]
+        dt = t - previous_time
+        effective_radius = specs.effective_radius_m()
+        use_inertia = has_previous & (rpm_values > 0) & (speed_mps > 0) & (dt > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            angular_accel = ((speed_mps - previous_speed) / dt) / effective_radius
+            f_inertia = np.where(use_inertia, (specs.wheel_inertia_kg_m2 * angular_accel) / effective_radius, 0.0)
+
+        f_tractive = total_weight_kg * accel + f_drag + f_roll + f_inertia
+        hp_accel = f_tractive * speed_mps * WATTS_TO_HP
+        if specs.use_sae_correction:
+            hp_accel = hp_accel * specs.sae_correction_factor
+        hp_accel = np.maximum(hp_accel, 0.0)
+
+        # Confidence (same increments, same order as _calculate_confidence)
+        confidence_accel = np.full(n, 0.5)
+        confidence_accel += np.where(speed_mps > 5.0, 0.2, 0.0)
+        confidence_accel += np.where(speed_mps > 13.4, 0.15, 0.0)
+        confidence_accel += np.where(speed_mps > 26.8, 0.1, 0.0)
+        abs_accel = np.abs(accel)
+        confidence_accel += np.where(abs_accel > 0.5, 0.15, np.where(abs_accel < 0.1, -0.2, 0.0))
+        confidence_accel += np.where(accel_var < 0.25, 0.1, 0.0)  # std < 0.5
+        confidence_accel = np.clip(confidence_accel, 0.0, 1.0)
+
+        # RPM/speed estimate, blended with the acceleration method
+        if has_rpm:
+            usable = (speed_mps >= 0.1) & (rpm_values >= 100)
+            hp_rpm = np.maximum(np.where(usable, rpm_values * speed_mps / 10000.0, 0.0), 0.0)
+            use_rpm = hp_rpm > 0
+        else:
+            hp_rpm = np.zeros(n)
+            use_rpm = np.zeros(n, dtype=bool)
+        use_accel = hp_accel > 0
+        weight_accel = np.where(use_accel, confidence_accel, 0.0)
+        weight_rpm = np.where(use_rpm, 0.6, 0.0)
+        total_confidence = weight_accel + weight_rpm
+        methods_used = use_accel.astype(np.int64) + use_rpm
+        with np.errstate(divide="ignore", invalid="ignore"):
+            blended = (np.where(use_accel, hp_accel * confidence_accel, 0.0) + np.where(use_rpm, hp_rpm * 0.6, 0.0)) / total_confidence
+            blended_confidence = total_confidence / methods_used
+        weighted = total_confidence > 0
+        hp_wheel = np.where(methods_used == 0, 100.0, np.where(weighted, blended, np.where(use_accel, hp_accel, hp_rpm)))
+        confidence = np.where(methods_used == 0, 0.1, np.where(weighted, blended_confidence, 0.5))
+
+        # Calibration, SAE/DIN correction and crank estimate
+        hp_calibrated = hp_wheel * self.calibration_factor
+        correction_factor = 1.0
+        if specs.correction_standard == "sae_j1349" and specs.use_sae_correction:
+            correction_factor = specs.sae_correction_factor
+        elif specs.correction_standard == "din_70020":
+            correction_factor = specs.din_correction_factor
+        hp_corrected = hp_calibrated * correction_factor
+        hp_crank = hp_corrected / (1.0 - specs.drivetrain_loss)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            torque = np.where(rpm_values > 0, (hp_crank * 5252.0) / rpm_values, np.nan)
+
+        gear_ratio, gear = self._infer_gears(rpm_values, speed_mps)
+        columns = {
+            "timestamp": t,
+            "rpm": rpm_values if has_rpm else np.full(n, np.nan),
+            "speed_mph": speed_mph,
+            "speed_mps": speed_mps,
+            "acceleration_mps2": accel,
+            "horsepower_wheel": hp_corrected,
+            "horsepower_crank": hp_crank,
+            "torque_ftlb": torque,
+            "confidence": confidence,
+            "gear_ratio": gear_ratio,
+            "gear": gear,
+        }
+        for name in ("afr", "boost_psi", "ignition_timing"):
+            columns[name] = optional.get(name, np.full(n, np.nan))
+        conditions = EnvironmentalConditions(
+            temperature_c=self.current_conditions.temperature_c,
+            altitude_m=self.current_conditions.altitude_m,
+            humidity_percent=self.current_conditions.humidity_percent,
+            barometric_pressure_kpa=self.current_conditions.barometric_pressure_kpa,
+        )
+        method = DynoMethod.SPEED_DELTA if has_rpm else DynoMethod.ACCELERATION_BASED
+        batch = DynoBatch(columns, method, conditions, present=optional.keys())
+
+        if record and n:
+            self._record_batch(batch, t, speed_mps, raw_accel, hp_calibrated)
+        return batch
+
+    def _infer_gears(self, rpm: np.ndarray, speed_mps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized VehicleSpecs.calculate_gear_ratio; also returns the 1-based gear (0 if unknown)."""
+        specs = self.vehicle_specs
+        known = (rpm > 0) & (speed_mps > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            total_ratio = ((rpm / 60.0) * 2 * math.pi) / (speed_mps / specs.effective_radius_m())
+        gear = np.zeros(rpm.shape[0], dtype=np.int64)
+        if specs.gear_ratios:
+            # Closest gear (first one on ties), one pass per gear
+            best = np.full(rpm.shape[0], np.inf)
+            gear_ratio = np.full(rpm.shape[0], np.nan)
+            for number, ratio in enumerate(specs.gear_ratios, start=1):
+                error = np.abs(ratio * specs.final_drive_ratio - total_ratio)
+                closer = known & (error < best)
+                best[closer] = error[closer]
+                gear_ratio[closer] = ratio
+                gear[closer] = number
+        elif specs.final_drive_ratio > 0:
+            gear_ratio = np.where(known, total_ratio / specs.final_drive_ratio, np.nan)
+        else:
+            gear_ratio = np.full(rpm.shape[0], np.nan)
+        return gear_ratio, gear
+
+    def _record_batch(
+        self,
+        batch: DynoBatch,
+        t: np.ndarray,
+        speed_mps: np.ndarray,
+        raw_accel: np.ndarray,
+        hp_calibrated: np.ndarray,
+    ) -> None:
+        """Apply a batch to the current curve and smoothing buffers, as the scalar path would."""
+        curve = self.current_curve
+        curve.readings.extend(batch)
+        hp_crank = batch["horsepower_crank"]
+        rpm = batch["rpm"] if "rpm" in batch.present else np.zeros(len(batch))
+
+        # Peak updates happen whenever a sample beats the running maximum
+        running = np.maximum.accumulate(np.concatenate(([curve.peak_hp_crank], hp_crank)))[:-1]
+        improved = np.flatnonzero(hp_crank > running)
+        if improved.size:
+            best = improved[-1]
+            curve.peak_hp_crank = float(hp_crank[best])
+            curve.peak_hp_wheel = float(hp_calibrated[best])
+            with_rpm = improved[rpm[improved] > 0]
+            if with_rpm.size:
+                curve.peak_hp_rpm = float(rpm[with_rpm[-1]])
+
+        torque = batch["torque_ftlb"]
+        running = np.fmax.accumulate(np.concatenate(([curve.peak_torque_ftlb], torque)))[:-1]
+        improved = np.flatnonzero(torque > running)
+        if improved.size:
+            best = improved[-1]
+            curve.peak_torque_ftlb = float(torque[best])
+            curve.peak_torque_rpm = float(rpm[best])
+
+        tail = slice(-self.speed_buffer.maxlen, None)
+        self.speed_buffer.extend(zip(t[tail].tolist(), speed_mps[tail].tolist()))
+        self.accel_buffer.extend(raw_accel[-self.accel_buffer.maxlen:].tolist())
+        if "rpm" in batch.present:
+            self.rpm_buffer.extend(zip(t[tail].tolist(), rpm[tail].tolist()))
+
     def calculate_horsepower_from_timeseries(
         self,
         time_s: Union[np.ndarray, List[float]],
@@ -815,24 +1162,27 @@ class VirtualDyno:
         afr: Optional[Union[np.ndarray, List[float]]] = None,
         boost_psi: Optional[Union[np.ndarray, List[float]]] = None,
         ignition_timing: Optional[Union[np.ndarray, List[float]]] = None,
-    ) -> List[DynoReading]:
+        record: bool = True,
+    ) -> DynoBatch:
         """
         Calculate horsepower from time series data (batch processing).
         
         This method uses improved algorithms:
-        - np.gradient() for accurate acceleration calculation (central differences)
+        - np.gradient() against the timestamps for acceleration (second-order
+          central differences, correct for non-uniform sample spacing)
         - Savitzky-Golay filter for superior noise reduction
-        - More accurate than point-by-point calculation
+        - Columnar power calculation (calculate_horsepower_batch)
         
         Args:
-            time_s: Time data in seconds (must be evenly spaced or close)
+            time_s: Time data in seconds (need not be evenly spaced)
             speed_mps: Vehicle speed in m/s (array)
             rpm: Engine RPM (optional array, improves accuracy)
             smooth_window: Window size for Savitzky-Golay filter (must be odd, default 11)
             smooth_poly: Polynomial order for smoothing filter (default 3)
+            record: Add the readings to the current curve (see calculate_horsepower_batch)
             
         Returns:
-            List of DynoReading objects for each time point
+            DynoBatch (a sequence of DynoReading objects, one per time point)
         """
         # Convert to numpy arrays
         time_s = np.asarray(time_s)
@@ -844,9 +1194,11 @@ class VirtualDyno:
         if len(time_s) < 2:
             raise ValueError("Need at least 2 data points for calculation")
         
-        # Compute acceleration using central differences (more accurate than simple diff)
-        dt = np.gradient(time_s)
-        accel_mps2 = np.gradient(speed_mps, dt)
+        # Central differences against the sample times (handles uneven spacing)
+        time_s = time_s.astype(np.float64)
+        if np.any(np.diff(time_s) <= 0):
+            raise ValueError("time_s must be strictly increasing")
+        accel_mps2 = np.gradient(speed_mps.astype(np.float64), time_s)
         
         # Apply smoothing based on smoothing_level (1-10) or use legacy smooth_window
         if smoothing_level is not None:
@@ -885,57 +1237,29 @@ class VirtualDyno:
             except ImportError:
                 pass  # No smoothing if enhancements not available
         
-        # Convert RPM and secondary parameters if provided
-        rpm_array = None
-        if rpm is not None:
-            rpm_array = np.asarray(rpm)
-            if len(rpm_array) != len(time_s):
-                LOGGER.warning("RPM array length doesn't match time, ignoring RPM")
-                rpm_array = None
-        
-        afr_array = None
-        if afr is not None:
-            afr_array = np.asarray(afr)
-            if len(afr_array) != len(time_s):
-                LOGGER.warning("AFR array length doesn't match time, ignoring AFR")
-                afr_array = None
-        
-        boost_array = None
-        if boost_psi is not None:
-            boost_array = np.asarray(boost_psi)
-            if len(boost_array) != len(time_s):
-                LOGGER.warning("Boost array length doesn't match time, ignoring Boost")
-                boost_array = None
-        
-        timing_array = None
-        if ignition_timing is not None:
-            timing_array = np.asarray(ignition_timing)
-            if len(timing_array) != len(time_s):
-                LOGGER.warning("Ignition timing array length doesn't match time, ignoring Timing")
-                timing_array = None
-        
-        # Calculate HP for each point
-        readings = []
-        for i in range(len(time_s)):
-            speed_mph = speed_mps[i] * MPS_TO_MPH
-            rpm_val = float(rpm_array[i]) if rpm_array is not None else None
-            afr_val = float(afr_array[i]) if afr_array is not None else None
-            boost_val = float(boost_array[i]) if boost_array is not None else None
-            timing_val = float(timing_array[i]) if timing_array is not None else None
-            
-            # Use the improved single-point calculation
-            reading = self.calculate_horsepower(
-                speed_mph=speed_mph,
-                acceleration_mps2=float(accel_mps2[i]),
-                rpm=rpm_val,
-                timestamp=time_s[i],
-                afr=afr_val,
-                boost_psi=boost_val,
-                ignition_timing=timing_val,
-            )
-            readings.append(reading)
-        
-        return readings
+        # Secondary channels of the wrong length are ignored, as before
+        channels = {}
+        for name, label, values in (
+            ("rpm", "RPM", rpm),
+            ("afr", "AFR", afr),
+            ("boost_psi", "Boost", boost_psi),
+            ("ignition_timing", "Ignition timing", ignition_timing),
+        ):
+            if values is None:
+                continue
+            values = np.asarray(values)
+            if len(values) != len(time_s):
+                LOGGER.warning("%s array length doesn't match time, ignoring %s", label, label)
+                continue
+            channels[name] = values
+
+        return self.calculate_horsepower_batch(
+            time_s,
+            speed_mps * MPS_TO_MPH,
+            accel_mps2,
+            record=record,
+            **channels,
+        )
     
     def estimate_accuracy(self) -> float:
         """
@@ -1058,6 +1382,7 @@ class VirtualDyno:
 
 __all__ = [
     "VirtualDyno",
+    "DynoBatch",
     "VehicleSpecs",
     "EnvironmentalConditions",
     "DynoReading",
@@ -3,15 +3,25 @@ Web Search Service for AI Advisor
 
 Provides internet research capabilities when internet connection is available.
 Falls back gracefully when offline.
+
+Results are kept in a persistent search cache (see services.search_cache),
+so research fetched while connected is still available after a restart
+and, marked stale, while offline. Anticipated topics can be queued with
+``prefetch`` to fill the cache in the background while connected.
 """
 
 from __future__ import annotations
 
 import logging
 import socket
+import threading
 import time
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from services.search_cache import CachedSearch, SearchCache, normalize_query
 
 LOGGER = logging.getLogger(__name__)
 
@@ -44,6 +54,9 @@ except ImportError:
     GOOGLE_API_AVAILABLE = False
     GoogleSearchService = None  # type: ignore
 
+DEFAULT_CACHE_PATH = Path.home() / ".aituner" / "web_search_cache.db"
+CONNECTIVITY_RECHECK_SECONDS = 30.0  # Offline: how often is_available() probes the network again
+
 
 @dataclass
 class SearchResult:
@@ -62,6 +75,8 @@ class ResearchResult:
     summary: Optional[str] = None
     sources: List[str] = None  # type: ignore
     timestamp: float = None  # type: ignore
+    from_cache: bool = False
+    stale: bool = False  # Served from cache past its TTL (e.g. while offline)
     
     def __post_init__(self):
         if self.sources is None:
@@ -77,23 +92,37 @@ class WebSearchService:
     Features:
     - Internet connectivity checking
     - Multiple search engine support (DuckDuckGo, Google)
-    - Result caching
-    - Graceful offline fallback
+    - Persistent LRU + TTL result cache
+    - Graceful offline fallback to cached (stale) results
+    - Background prefetch of anticipated topics
     """
     
-    def __init__(self, enable_search: bool = True, prefer_google: bool = True):
+    def __init__(
+        self,
+        enable_search: bool = True,
+        prefer_google: bool = True,
+        cache_path: Optional[Union[str, Path]] = None,
+        cache_ttl: float = 3600.0,
+        max_stale_age: float = 30 * 86400.0,
+        max_cache_entries: int = 2000,
+    ):
         """
         Initialize web search service.
         
         Args:
             enable_search: Enable web search (can be disabled for offline mode)
             prefer_google: Prefer Google API over DuckDuckGo (if available)
+            cache_path: Search cache database (default ~/.aituner/web_search_cache.db, ":memory:" to not persist)
+            cache_ttl: Seconds a cached result is fresh
+            max_stale_age: Seconds a cached result is kept for offline use
+            max_cache_entries: Cached queries kept before the least recently used are evicted
         """
         self.enable_search = enable_search
         self.prefer_google = prefer_google
         self.has_internet = False
         self.search_available = False
         self.google_search = None
+        self._last_internet_check = 0.0
         
         # Initialize Google Search if available
         if GOOGLE_API_AVAILABLE and prefer_google:
@@ -106,14 +135,27 @@ class WebSearchService:
         
         self._check_availability()
         
-        # Result cache (simple in-memory cache)
-        self._cache: Dict[str, ResearchResult] = {}
-        self._cache_ttl = 3600  # 1 hour cache TTL
+        # Persistent result cache
+        self._cache = SearchCache(
+            cache_path or DEFAULT_CACHE_PATH,
+            ttl_seconds=cache_ttl,
+            max_stale_seconds=max_stale_age,
+            max_entries=max_cache_entries,
+        )
+        
+        # Prefetch queue, drained by a background thread while connected
+        self._prefetch_queue: Deque[Tuple[str, int]] = deque()
+        self._prefetch_keys: Set[str] = set()
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_wake = threading.Event()
+        self._prefetch_stop = threading.Event()
+        self._prefetch_thread: Optional[threading.Thread] = None
     
     def _check_availability(self) -> None:
         """Check if internet and search are available."""
         # Check internet connectivity
         self.has_internet = self._check_internet()
+        self._last_internet_check = time.monotonic()
         
         # Check search engine availability
         if self.has_internet:
@@ -145,8 +187,9 @@ class WebSearchService:
     
     def is_available(self) -> bool:
         """Check if web search is currently available."""
-        # Re-check connectivity periodically
-        if not self.has_internet:
+        # Re-check connectivity periodically (not on every call: each probe can block for seconds)
+        if not self.has_internet and time.monotonic() - self._last_internet_check >= CONNECTIVITY_RECHECK_SECONDS:
+            self._last_internet_check = time.monotonic()
             self.has_internet = self._check_internet()
             if self.has_internet:
                 self._check_availability()
@@ -157,40 +200,139 @@ class WebSearchService:
         """
         Perform web search.
         
+        Fresh cached results are returned without searching. When the search
+        is unavailable or fails, cached results past their TTL are returned
+        with ``stale`` set.
+        
         Args:
             query: Search query
             max_results: Maximum number of results to return
             
         Returns:
-            ResearchResult with search results, or None if unavailable
+            ResearchResult with search results, or None if unavailable and not cached
         """
-        if not self.is_available():
-            LOGGER.debug("Web search not available for query: %s", query)
-            return None
+        cached = self._cache.get(query, max_results, allow_stale=True)
+        if cached and not cached.stale:
+            LOGGER.debug("Using cached search results for: %s", query)
+            return self._from_cache(query, cached)
         
-        # Check cache
-        cache_key = f"{query}:{max_results}"
-        if cache_key in self._cache:
-            cached = self._cache[cache_key]
-            # Check if cache is still valid
-            if time.time() - cached.timestamp < self._cache_ttl:
-                LOGGER.debug("Using cached search results for: %s", query)
-                return cached
+        if self.is_available():
+            results = self._fetch(query, max_results)
+            if results:
+                return ResearchResult(query=query, results=results)
+        
+        if cached:
+            LOGGER.debug("Web search not available, using stale cached results for: %s", query)
+            return self._from_cache(query, cached)
         
+        LOGGER.debug("Web search not available for query: %s", query)
+        return None
+    
+    def _fetch(self, query: str, max_results: int) -> List[SearchResult]:
+        """Search and cache the results; a failure marks the connection as down until the next re-check."""
         try:
             results = self._perform_search(query, max_results)
-            if results:
-                research_result = ResearchResult(
-                    query=query,
-                    results=results,
-                )
-                # Cache the result
-                self._cache[cache_key] = research_result
-                return research_result
         except Exception as e:
             LOGGER.warning("Web search failed for query '%s': %s", query, e)
+            self.has_internet = False
+            self._last_internet_check = time.monotonic()
+            return []
+        if results:
+            self._cache.put(query, [asdict(r) for r in results], max_results)
+        return results
+    
+    @staticmethod
+    def _from_cache(query: str, cached: CachedSearch) -> ResearchResult:
+        return ResearchResult(
+            query=query,
+            results=[SearchResult(**r) for r in cached.results],
+            timestamp=cached.fetched,
+            from_cache=True,
+            stale=cached.stale,
+        )
+    
+    def prefetch(self, queries: Iterable[str], max_results: int = 5, background: bool = True) -> int:
+        """
+        Queue queries to be fetched into the cache while connected.
         
-        return None
+        Queries already queued or freshly cached are skipped.
+        
+        Args:
+            queries: Anticipated search queries
+            max_results: Results to fetch per query
+            background: Drain the queue in a background thread (otherwise call run_prefetch)
+            
+        Returns:
+            Number of queries queued
+        """
+        queued = 0
+        with self._prefetch_lock:
+            for query in queries:
+                key = normalize_query(query)
+                if not key or key in self._prefetch_keys or self._cache.is_fresh(query, max_results):
+                    continue
+                self._prefetch_queue.append((query, max_results))
+                self._prefetch_keys.add(key)
+                queued += 1
+            if queued and background and self._prefetch_thread is None:
+                self._prefetch_stop.clear()
+                self._prefetch_thread = threading.Thread(target=self._prefetch_loop, name="web-search-prefetch", daemon=True)
+                self._prefetch_thread.start()
+        if queued:
+            self._prefetch_wake.set()
+        return queued
+    
+    def pending_prefetch(self) -> int:
+        """Number of queued prefetch queries."""
+        return len(self._prefetch_queue)
+    
+    def run_prefetch(self, limit: Optional[int] = None) -> int:
+        """
+        Fetch queued prefetch queries while search is available.
+        
+        Args:
+            limit: Maximum number of queries to fetch
+            
+        Returns:
+            Number of queries fetched into the cache
+        """
+        fetched = 0
+        while (limit is None or fetched < limit) and not self._prefetch_stop.is_set():
+            if not self.is_available():
+                break
+            with self._prefetch_lock:
+                if not self._prefetch_queue:
+                    break
+                query, max_results = self._prefetch_queue.popleft()
+            if not self._cache.is_fresh(query, max_results):
+                if self._fetch(query, max_results):
+                    fetched += 1
+                elif not self.has_internet:
+                    # Connection dropped: keep the query for the next connected period
+                    with self._prefetch_lock:
+                        self._prefetch_queue.appendleft((query, max_results))
+                    break
+            with self._prefetch_lock:
+                self._prefetch_keys.discard(normalize_query(query))
+        if fetched:
+            LOGGER.info("Prefetched %d search queries (%d pending)", fetched, len(self._prefetch_queue))
+        return fetched
+    
+    def _prefetch_loop(self) -> None:
+        while not self._prefetch_stop.is_set():
+            self._prefetch_wake.wait(CONNECTIVITY_RECHECK_SECONDS)
+            self._prefetch_wake.clear()
+            if self._prefetch_queue:
+                self.run_prefetch()
+    
+    def close(self) -> None:
+        """Stop the prefetch thread and close the search cache."""
+        self._prefetch_stop.set()
+        self._prefetch_wake.set()
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join(timeout=5.0)
+            self._prefetch_thread = None
+        self._cache.close()
     
     def _perform_search(self, query: str, max_results: int) -> List[SearchResult]:
         """Perform actual web search using available search engine."""
@@ -263,9 +405,6 @@ class WebSearchService:
         Returns:
             ResearchResult with research findings
         """
-        if not self.is_available():
-            return None
-        
         # Build search query with context
         if context:
             query = f"{topic} {context} racing tuning automotive"
@@ -285,9 +424,6 @@ class WebSearchService:
         Returns:
             ResearchResult with specifications
         """
-        if not self.is_available():
-            return None
-        
         # Detect if this is a vehicle-specific query
         vehicle_keywords = ["dodge", "ford", "chevrolet", "chevy", "honda", "toyota", "nissan", 
                           "hellcat", "demon", "corvette", "camaro", "mustang", "charger", "challenger",
@@ -311,7 +447,8 @@ class WebSearchService:
             query = f"{item} {item_type} specifications technical details"
         
         # Use Google API for specification lookups (better quality)
-        if self.google_search and self.google_search.is_available:
+        if (self.google_search and self.google_search.is_available
+                and not self._cache.is_fresh(query, 5) and self.is_available()):
             try:
                 google_results = self.google_search.search(query, max_results=5)
                 if google_results:
@@ -323,6 +460,7 @@ class WebSearchService:
                             source=r.source
                         ) for r in google_results
                     ]
+                    self._cache.put(query, [asdict(r) for r in search_results], 5)
                     return ResearchResult(query=query, results=search_results)
             except Exception as e:
                 LOGGER.debug("Google API lookup failed, falling back: %s", e)
@@ -339,9 +477,6 @@ class WebSearchService:
         Returns:
             ResearchResult with troubleshooting information
         """
-        if not self.is_available():
-            return None
-        
         query = f"{issue} troubleshooting fix solution ECU tuning"
         return self.search(query, max_results=5)
     
@@ -0,0 +1,169 @@
+"""
+Advanced Tuning Engine Tests
+
+Tests batch candidate scoring, prediction memoization and background model
+retraining, plus a scoring latency bound.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.advanced_tuning_engine import (
+    ML_AVAILABLE,
+    AdvancedTuningEngine,
+    OptimizationTarget,
+    TuningAction,
+    TuningResult,
+)
+
+
+class _CountingModel:
+    """Linear stand-in model that records how many predict() calls it gets."""
+
+    def __init__(self, coef):
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        return np.asarray(X) @ self.coef
+
+
+class _IdentityScaler:
+    def transform(self, X):
+        return np.asarray(X, dtype=np.float64)
+
+
+def _telemetry():
+    return {
+        "RPM": 5200, "Load": 85, "Boost_Pressure": 18, "Lambda": 1.08,
+        "Ignition_Timing": 16, "Coolant_Temp": 88, "IAT": 30, "Knock_Count": 0, "EGT": 850,
+    }
+
+
+def _candidates(n):
+    params = ["fuel", "timing", "boost", "lambda_target"]
+    return [
+        TuningAction(
+            parameter=params[i % 4],
+            current_value=10.0 + i,
+            new_value=10.0 + i + (i % 7) * 0.1,
+            delta=(i % 7) * 0.1,
+            confidence=0.5 + (i % 5) * 0.1,
+        )
+        for i in range(n)
+    ]
+
+
+def _install_stub_models(engine):
+    rng = np.random.default_rng(3)
+    models = [_CountingModel(rng.normal(size=16)) for _ in range(3)]
+    engine._install_models(_IdentityScaler(), *models)
+    return models
+
+
+class TestAdvancedTuningEngine:
+    """Test vectorized scoring and retraining."""
+
+    def test_batch_matches_single_row_features(self):
+        engine = AdvancedTuningEngine()
+        state = engine._create_state_from_telemetry(_telemetry())
+        actions = _candidates(12)
+        X = engine._feature_matrix(state, actions)
+        expected = np.array([engine._extract_features(state, a) for a in actions])
+        np.testing.assert_allclose(X, expected)
+
+    def test_one_predict_call_per_model(self):
+        engine = AdvancedTuningEngine()
+        models = _install_stub_models(engine)
+        state = engine._create_state_from_telemetry(_telemetry())
+
+        ranked = engine.score_candidates(state, _candidates(100))
+
+        assert [m.calls for m in models] == [1, 1, 1]
+        scores = [score for score, _ in ranked]
+        assert scores == sorted(scores, reverse=True)
+        assert all(0.0 <= a.safety_score <= 1.0 for _, a in ranked)
+
+    def test_scores_match_scalar_path(self):
+        engine = AdvancedTuningEngine(target=OptimizationTarget.PERFORMANCE)
+        state = engine._create_state_from_telemetry(_telemetry())
+        ranked = engine.score_candidates(state, _candidates(20))
+        for score, action in ranked:
+            expected = engine._calculate_multi_objective_score(
+                action.expected_hp_gain, action.expected_efficiency_gain, action.safety_score, action
+            )
+            assert score == pytest.approx(expected)
+
+    def test_predictions_memoized_per_feature_row(self):
+        engine = AdvancedTuningEngine()
+        models = _install_stub_models(engine)
+        state = engine._create_state_from_telemetry(_telemetry())
+
+        engine.score_candidates(state, _candidates(40))
+        engine.score_candidates(state, _candidates(40))
+        assert models[0].calls == 1
+        assert engine.cache_hits == 40
+
+        # A new snapshot invalidates the memo
+        models = _install_stub_models(engine)
+        engine.score_candidates(state, _candidates(40))
+        assert models[0].calls == 1
+
+    def test_memo_keyed_on_every_model_input(self):
+        engine = AdvancedTuningEngine()
+        models = _install_stub_models(engine)
+        safe = engine._create_state_from_telemetry(_telemetry())
+        knocking = engine._create_state_from_telemetry(dict(_telemetry(), Knock_Count=10, EGT=1400))
+        actions = _candidates(8)
+
+        engine.score_candidates(safe, actions)
+        _, _, cached = engine._predict_outcomes_batch(knocking, actions)
+        expected = np.clip(models[2].predict(engine._feature_matrix(knocking, actions)), 0.0, 1.0)
+        np.testing.assert_allclose(cached, expected)
+        assert engine.cache_hits == 0
+
+    @pytest.mark.skipif(not ML_AVAILABLE, reason="scikit-learn not installed")
+    def test_background_retrain_swaps_snapshot(self):
+        engine = AdvancedTuningEngine()
+        state = engine._create_state_from_telemetry(_telemetry())
+        for i, action in enumerate(_candidates(60)):
+            engine.action_history.append(TuningResult(
+                action=action,
+                before_state=state,
+                after_state=state,
+                actual_hp_change=float(i % 5),
+                actual_efficiency_change=float(i % 3),
+                success=i % 4 != 0,
+            ))
+
+        assert engine._models is None
+        engine.request_retrain()
+        assert engine.wait_for_retrain(timeout=60)
+        engine.shutdown()
+
+        stats = engine.get_statistics()
+        assert stats["models_trained"]
+        assert stats["model_version"] == 1
+        ranked = engine.score_candidates(state, _candidates(10))
+        assert len(ranked) == 10
+
+    @pytest.mark.parametrize("n_candidates", [10, 100, 1000])
+    def test_scoring_latency_benchmark(self, n_candidates):
+        engine = AdvancedTuningEngine()
+        _install_stub_models(engine)
+        state = engine._create_state_from_telemetry(_telemetry())
+        actions = _candidates(n_candidates)
+
+        start = time.perf_counter()
+        engine.score_candidates(state, actions)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        assert elapsed_ms < 10.0 + n_candidates * 0.05
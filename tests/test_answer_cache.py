@@ -0,0 +1,127 @@
+"""
+Answer Cache Tests
+
+Tests exact and paraphrase hits, invalidation by knowledge version and
+telemetry fingerprint, LRU eviction, and the advisor/vector store
+integration (repeated questions skip generation; new knowledge does not
+serve stale answers).
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.answer_cache import AnswerCache, hashed_embedding, normalize_question
+
+
+class TestAnswerCache:
+    """Test cache tiers and invalidation."""
+
+    def test_exact_and_paraphrase_hits(self):
+        cache = AnswerCache()
+        cache.put("What is boost creep?", "answer", version=1)
+
+        assert normalize_question("  WHAT is boost   creep?? ") == "what is boost creep"
+        assert cache.get("what is boost creep", version=1) == "answer"
+        assert cache.get("explain boost creep", version=1) == "answer"
+        assert cache.get("can you tell me what boost creep is", version=1) == "answer"
+        assert cache.get("what is knock retard", version=1) is None
+        assert cache.stats == {"exact_hits": 1, "semantic_hits": 2, "misses": 1, "invalidated": 0}
+
+    def test_similarity_of_unrelated_questions_is_low(self):
+        a = hashed_embedding("how do I tune launch control")
+        b = hashed_embedding("how do I tune launch control on a WRX")
+        c = hashed_embedding("how do I tune traction control")
+        assert float(a @ b) < 0.9
+        assert float(a @ c) < 0.9
+
+    def test_version_and_fingerprint_invalidate(self):
+        cache = AnswerCache()
+        cache.put("what is boost creep", "v1", version=1, fingerprint=("boost 20",))
+        assert cache.get("what is boost creep", version=1, fingerprint=("boost 25",)) is None
+        assert len(cache) == 0
+
+        cache.put("what is boost creep", "v1", version=1)
+        assert cache.get("explain boost creep", version=2) is None
+        assert cache.get("what is boost creep", version=2) is None
+        assert cache.stats["invalidated"] == 2
+
+    def test_lru_eviction(self):
+        cache = AnswerCache(max_entries=2, similarity_threshold=1.1)  # Exact tier only
+        cache.put("question one here", 1, version=0)
+        cache.put("question two here", 2, version=0)
+        assert cache.get("question one here", version=0) == 1
+        cache.put("question three here", 3, version=0)
+        assert cache.get("question two here", version=0) is None
+        assert cache.get("question one here", version=0) == 1
+
+
+class TestAdvisorIntegration:
+    """Test the cache wired into RAGAIAdvisor and VectorKnowledgeStore."""
+
+    @pytest.fixture
+    def advisor(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        import services.auto_knowledge_ingestion_service as ingestion
+        monkeypatch.setattr(ingestion, "start_auto_ingestion", lambda *a, **k: False)
+        from services.ai_advisor_rag import RAGAIAdvisor
+        from services.vector_knowledge_store import VectorKnowledgeStore
+
+        store = VectorKnowledgeStore(persist_directory=tempfile.mkdtemp(dir=tmp_path))
+        store.add_knowledge("Boost creep is boost rising past target because the wastegate cannot bypass enough flow.",
+                            {"topic": "boost creep"})
+        advisor = RAGAIAdvisor(use_local_llm=False, enable_web_search=False, vector_store=store)
+        advisor.auto_populator = None
+        calls = []
+
+        def stub_llm(question, context, question_analysis=None):
+            calls.append(question)
+            return f"Generated answer {len(calls)}"
+
+        advisor.llm_available = True
+        advisor._generate_llm_response = stub_llm
+        return advisor, store, calls
+
+    def test_repeat_served_from_cache_until_knowledge_changes(self, advisor):
+        advisor, store, calls = advisor
+        first = advisor.answer("What is boost creep?")
+        second = advisor.answer("explain boost creep")
+        assert len(calls) == 1
+        assert second.answer == first.answer
+        assert second.sources == first.sources and second.sources is not first.sources
+        assert len(advisor.conversation_history) == 4
+
+        store.add_knowledge("Boost creep is often fixed with a larger wastegate port.", {"topic": "boost creep fix"})
+        advisor.answer("what is boost creep")
+        assert len(calls) == 2
+
+    def test_telemetry_change_misses(self, advisor):
+        advisor, _, calls = advisor
+        advisor.answer("is my boost pressure too high", telemetry={"Boost_Pressure": 18.0})
+        advisor.answer("is my boost pressure too high", telemetry={"Boost_Pressure": 18.0})
+        advisor.answer("is my boost pressure too high", telemetry={"Boost_Pressure": 24.0})
+        assert len(calls) == 2
+
+    def test_follow_up_questions_not_cached(self, advisor):
+        advisor, _, calls = advisor
+        advisor.answer("Why is that happening?")
+        advisor.answer("What is boost creep?")
+        advisor.answer("Why is this happening")
+        advisor.answer("why is it happening again")
+        advisor.answer("and what about the wastegate")
+        advisor.answer("and what about the wastegate")
+        assert len(calls) == 6
+
+    def test_search_memoized_by_version(self, advisor):
+        _, store, _ = advisor
+        version = store.version
+        first = store.search("boost creep", n_results=3)
+        first[0]["text"] = "mutated"
+        assert store.search("boost creep", n_results=3)[0]["text"] != "mutated"
+        store.add_knowledge("Wastegate duty cycle controls boost.", {"topic": "wastegate"})
+        assert store.version > version
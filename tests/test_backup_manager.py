@@ -0,0 +1,149 @@
+"""
+Backup Manager Tests
+
+Tests content-defined chunking, deduplicated backups, verified reverts,
+reference-counted chunk removal and reading backups from earlier versions.
+"""
+
+import gzip
+import hashlib
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.backup_manager import BackupEntry, BackupManager, BackupSettings, BackupType
+from services.chunk_store import DEFAULT_MAX_CHUNK, DEFAULT_MIN_CHUNK, chunk_boundaries
+
+
+def _calibration(size=1024 * 1024, seed=0):
+    """Binary calibration-like image: smooth 16-bit tables, noise and 0xFF fill."""
+    rng = np.random.default_rng(seed)
+    tables = (np.cumsum(rng.integers(-3, 4, size // 4)) + 20000).astype("<u2").tobytes()
+    noise = rng.integers(0, 256, size // 4, dtype=np.uint8).tobytes()
+    return bytearray((tables + noise + b"\xff" * size)[:size])
+
+
+@pytest.fixture
+def manager(tmp_path):
+    settings = BackupSettings(max_backups_per_file=1000, backup_interval_seconds=0.0)
+    return BackupManager(backup_dir=str(tmp_path / "backups"), settings=settings)
+
+
+class TestChunking:
+    """Test content-defined chunk boundaries."""
+
+    def test_boundaries_follow_content(self):
+        data = bytes(_calibration())
+        ends = chunk_boundaries(data)
+        sizes = np.diff([0] + ends)
+        assert ends[-1] == len(data)
+        assert sizes[:-1].min() >= DEFAULT_MIN_CHUNK and sizes.max() <= DEFAULT_MAX_CHUNK
+
+        # An insertion near the start only moves the boundaries around it
+        shifted = chunk_boundaries(data[:1000] + b"inserted" + data[1000:])
+        assert len(set(e + 8 for e in ends) & set(shifted)) >= len(ends) - 2
+        assert chunk_boundaries(b"") == [] and chunk_boundaries(b"abc") == [3]
+
+
+class TestDeduplicatedBackups:
+    """Test backup storage and restore."""
+
+    def test_small_edits_share_chunks_and_restore_exactly(self, manager, tmp_path):
+        path = tmp_path / "tune.bin"
+        data = _calibration()
+        rng = np.random.default_rng(1)
+        versions, entries = [], []
+        for i in range(40):
+            offset = int(rng.integers(0, len(data) - 4))
+            data[offset:offset + 4] = rng.integers(0, 256, 4, dtype=np.uint8).tobytes()
+            path.write_bytes(data)
+            entry = manager.create_backup(str(path), BackupType.ECU_CALIBRATION, force=True)
+            versions.append(bytes(data))
+            entries.append(entry)
+        assert len({e.backup_id for e in entries}) == 40
+
+        stats = manager.get_backup_statistics()
+        assert stats["logical_size_bytes"] == 40 * len(data)
+        assert stats["total_size_bytes"] < 0.1 * stats["logical_size_bytes"]
+
+        for entry, expected in zip(entries[::7], versions[::7]):
+            assert manager.revert_to_backup(entry, create_backup=False)
+            assert path.read_bytes() == expected
+
+        # Unchanged content is not stored again
+        path.write_bytes(versions[-1])
+        assert manager.create_backup(str(path), BackupType.ECU_CALIBRATION, force=True) is entries[-1]
+
+    def test_revert_rejects_corrupt_backup(self, manager, tmp_path):
+        path = tmp_path / "tune.bin"
+        path.write_bytes(bytes(_calibration(256 * 1024)))
+        entry = manager.create_backup(str(path), BackupType.ECU_TUNING, force=True)
+        path.write_bytes(b"current")
+
+        chunk = next(p for p in manager.chunk_store.chunks_dir.glob("*/*"))
+        chunk.write_bytes(chunk.read_bytes()[:-1] + b"\x00")
+        assert manager.revert_to_backup(entry, create_backup=False) is False
+        assert path.read_bytes() == b"current"
+
+    def test_deleting_backups_releases_unshared_chunks(self, manager, tmp_path):
+        store = manager.chunk_store
+        path = tmp_path / "tune.bin"
+        base = _calibration(512 * 1024)
+        path.write_bytes(base)
+        first = manager.create_backup(str(path), BackupType.ECU_TUNING, force=True)
+        path.write_bytes(base[:200_000] + b"edit" + base[200_004:])
+        second = manager.create_backup(str(path), BackupType.ECU_TUNING, force=True)
+        both = store.disk_usage()["chunk_count"]
+
+        assert manager.delete_backup(first)
+        remaining = store.disk_usage()["chunk_count"]
+        assert 0 < remaining < both
+        assert manager.revert_to_backup(second, create_backup=False)
+        assert path.read_bytes() == base[:200_000] + b"edit" + base[200_004:]
+
+        # Leftover chunk without a manifest is collected; old entries are removed by age
+        (store.chunks_dir / "ab").mkdir(exist_ok=True)
+        (store.chunks_dir / "ab" / ("ab" + "0" * 62)).write_bytes(b"rorphan")
+        second.timestamp = time.time() - 400 * 24 * 3600
+        assert manager.cleanup_old_backups() == 1
+        assert store.disk_usage() == {"chunk_count": 0, "chunk_bytes": 0, "manifest_bytes": 0}
+
+    def test_delete_after_restart_keeps_shared_chunks(self, manager, tmp_path):
+        path = tmp_path / "tune.bin"
+        base = _calibration(512 * 1024)
+        path.write_bytes(base)
+        first = manager.create_backup(str(path), BackupType.ECU_TUNING, force=True)
+        edited = base[:200_000] + b"edit" + base[200_004:]
+        path.write_bytes(edited)
+        second = manager.create_backup(str(path), BackupType.ECU_TUNING, force=True)
+
+        # A new instance (app restart) counts chunk references from the manifests on disk
+        restarted = BackupManager(backup_dir=str(manager.backup_dir), settings=manager.settings)
+        assert restarted.delete_backup(first)
+        path.write_bytes(b"current")
+        assert restarted.revert_to_backup(second, create_backup=False)
+        assert path.read_bytes() == edited
+
+    def test_reads_backups_from_earlier_versions(self, manager, tmp_path):
+        path = tmp_path / "config.json"
+        content = b'{"boost": 18}'
+        old_copy = manager.backup_dir / "configuration" / "config_1_abcd.json.gz"
+        old_copy.write_bytes(gzip.compress(content))
+        entry = BackupEntry(
+            backup_id="1_abcd",
+            backup_type=BackupType.CONFIGURATION,
+            file_path=str(path),
+            backup_path=str(old_copy),
+            timestamp=time.time(),
+            file_size=len(content),
+            file_hash=hashlib.sha256(content).hexdigest(),
+        )
+        assert manager.revert_to_backup(entry, create_backup=False)
+        assert path.read_bytes() == content
+        assert manager.delete_backup(entry) and not old_copy.exists()
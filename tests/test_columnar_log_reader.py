@@ -0,0 +1,130 @@
+"""
+Columnar Log Reader Tests
+
+Tests the chunked CSV/TSV reader and the log parsers built on it.
+"""
+
+import csv
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data_logs.ingestor import DataLogAutoParser
+from services.columnar_log_reader import read_delimited, split_unit
+from services.universal_log_parser import LogFormat, UniversalLogParser
+
+DIRTY_CSV = (
+    "Time,RPM (rpm),Boost,Note\n"
+    "0,1000,5,x\n"
+    "0.1,1100,,y\n"
+    '0.2,"1200",6\n'
+    "\n"
+    "0.3,1300,7,z,extra\n"
+)
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def _legacy_records(path):
+    """The previous _CSVLogParser.parse record building."""
+    records = []
+    for row in csv.DictReader(path.read_text().splitlines()):
+        cleaned = {}
+        for key, value in row.items():
+            if value is None or key is None:
+                continue
+            try:
+                cleaned[key.strip()] = float(value)
+            except (TypeError, ValueError):
+                continue
+        if cleaned:
+            records.append(cleaned)
+    return records
+
+
+class TestReadDelimited:
+    """Test the reader on clean and dirty input."""
+
+    @pytest.mark.parametrize("chunk_rows", [1, 2, 50_000])
+    def test_engines_agree_on_dirty_input(self, tmp_path, chunk_rows):
+        path = _write(tmp_path, "dirty.csv", DIRTY_CSV)
+        fast = read_delimited(path, chunk_rows=chunk_rows, engine="numpy")
+        slow = read_delimited(path, chunk_rows=chunk_rows, engine="python")
+
+        assert fast.columns == slow.columns == ["Time", "RPM (rpm)", "Boost", "Note"]
+        assert fast.row_count == slow.row_count == 4
+        for name in fast.columns:
+            np.testing.assert_array_equal(fast.data[name], np.asarray(slow.data[name]))
+        assert math.isnan(fast.data["Boost"][1])
+        assert fast.data["RPM (rpm)"].tolist() == [1000, 1100, 1200, 1300]
+        assert fast.units == {"RPM (rpm)": "rpm"}
+        assert fast.time_column == "Time"
+
+    def test_columns_are_contiguous_float64(self, tmp_path):
+        rows = "\n".join(f"{i * 0.01},{i},{i * 2}" for i in range(1000))
+        table = read_delimited(_write(tmp_path, "clean.csv", "Time,A,B\n" + rows + "\n"), chunk_rows=128)
+        for values in table.data.values():
+            assert values.dtype == np.float64
+            assert values.flags.c_contiguous
+        assert table.data["B"][-1] == 1998
+
+    def test_units_row_and_tsv(self, tmp_path):
+        path = _write(tmp_path, "motec.tsv", "Time\tEngine Speed\tOil Temp\ns\trpm\tC\n0\t1000\t80\n0.5\t1200\t\n")
+        table = read_delimited(path, delimiter="\t", missing=0.0)
+        assert table.units == {"Time": "s", "Engine Speed": "rpm", "Oil Temp": "C"}
+        assert table.data["Oil Temp"].tolist() == [80.0, 0.0]
+
+    def test_split_unit(self):
+        assert split_unit("Oil Temp [degF]") == ("Oil Temp", "degF")
+        assert split_unit("RPM") == ("RPM", None)
+
+    def test_large_file_throughput(self, tmp_path):
+        path = tmp_path / "big.csv"
+        t = np.arange(200_000) * 0.01
+        matrix = np.column_stack([t] + [np.sin(t * k) * 1000 for k in range(1, 12)])
+        np.savetxt(path, matrix, delimiter=",", fmt="%.3f", header=",".join(f"c{i}" for i in range(12)), comments="")
+
+        start = time.perf_counter()
+        table = read_delimited(path)
+        elapsed = time.perf_counter() - start
+
+        assert table.row_count == 200_000
+        np.testing.assert_allclose(table.data["c3"], np.round(matrix[:, 3], 3))
+        assert elapsed < 5.0
+
+
+class TestParsers:
+    """Parsers built on the columnar reader keep their previous output."""
+
+    def test_universal_parser_returns_arrays(self, tmp_path):
+        path = _write(tmp_path, "dirty.csv", DIRTY_CSV)
+        log = UniversalLogParser().parse_file(path, LogFormat.CSV_GENERIC)
+
+        assert isinstance(log.time, np.ndarray)
+        assert log.time.tolist() == [0.0, 0.1, 0.2, 0.3]
+        assert "Time" not in log.data
+        assert log.data["Boost"].tolist() == [5.0, 0.0, 6.0, 7.0]  # Missing reads as 0.0
+        assert log.metadata.channels == ["Time", "RPM (rpm)", "Boost", "Note"]
+        assert log.metadata.units["RPM (rpm)"] == "rpm"
+        assert log.metadata.sample_rate == pytest.approx(10.0)
+
+    def test_ingestor_records_match_legacy(self, tmp_path):
+        path = _write(tmp_path, "holley.csv", DIRTY_CSV.replace("\n\n", "\nnote,,,\n"))
+        session = DataLogAutoParser().parse(path)
+
+        assert session.records == _legacy_records(path)
+        assert len(session.records) == 4  # Text-only row dropped
+        assert session.records[-1]["Boost"] == 7.0
+        assert session.metadata["records"] == "4"
+        assert session.columns["RPM (rpm)"].dtype == np.float64
@@ -0,0 +1,115 @@
+"""
+Config Version Control Tests
+
+Tests the configuration similarity index against the pairwise similarity
+measure and similar-configuration search over the whole snapshot history.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.config_similarity_index import ConfigSimilarityIndex
+from services.config_version_control import ChangeType, ConfigVersionControl
+
+
+def _random_config(rng):
+    """Mixed numeric/categorical configuration with optional keys."""
+    config = {}
+    for i in range(12):
+        if rng.random() < 0.25:
+            continue
+        kind = i % 4
+        if kind == 0:
+            config[f"k{i}"] = rng.choice([0, 0.0, 1, rng.uniform(-50, 50)])
+        elif kind == 1:
+            config[f"k{i}"] = rng.choice(["on", "off", None, True])
+        elif kind == 2:
+            config[f"k{i}"] = rng.choice([[1, 2], [1, 2, 3], {"a": 1}, 7])
+        else:
+            config[f"k{i}"] = rng.randint(0, 3)
+    return config
+
+
+@pytest.fixture
+def vc(tmp_path):
+    return ConfigVersionControl(db_path=str(tmp_path / "config_history.db"))
+
+
+class TestConfigSimilarityIndex:
+    """Test the vectorized similarity measure."""
+
+    def test_matches_pairwise_similarity(self, vc):
+        rng = random.Random(0)
+        snapshots = [_random_config(rng) for _ in range(300)] + [{}]
+        index = ConfigSimilarityIndex(capacity=4)  # Exercise growth
+        index.add_many((str(i), config) for i, config in enumerate(snapshots))
+
+        for query in [_random_config(rng) for _ in range(40)] + [{}, {"unknown": 1}, {"k1": "never seen"}]:
+            expected = [vc._calculate_similarity(query, config) for config in snapshots]
+            assert index.similarities(query).tolist() == pytest.approx(expected, abs=1e-12)
+
+    def test_top_k_ties_rank_newest_first(self):
+        index = ConfigSimilarityIndex()
+        index.add_many([("a", {"boost": 10}), ("b", {"boost": 15}), ("c", {"boost": 10}), ("d", {"other": 1})])
+        assert index.top_k({"boost": 10}, 3) == [("c", 1.0), ("a", 1.0), ("b", 0.5)]
+        assert index.top_k({"boost": 10}, 10)[-1] == ("d", 0.0)
+
+        index.add("a", {"boost": 30})  # Replaced in place
+        assert len(index) == 4
+        assert index.top_k({"boost": 30}, 1) == [("a", 1.0)]
+
+        index.remove(["c", "missing"])
+        assert len(index) == 3
+        assert [i for i, _ in index.top_k({"boost": 10}, 10)] == ["b", "d", "a"]
+        index.add("c", {"boost": 10})
+        assert index.top_k({"boost": 10}, 1) == [("c", 1.0)]
+
+
+class TestSimilarConfigurations:
+    """Test the search through ConfigVersionControl."""
+
+    def test_finds_matches_beyond_recent_window(self, vc):
+        target = {"boost_psi": 18.0, "timing": 24.0, "map": "race"}
+        vc.create_snapshot(ChangeType.ECU_TUNING, target, description="old best")
+        for i in range(200):
+            vc.create_snapshot(ChangeType.ECU_TUNING, {"boost_psi": 5.0 + i * 0.01, "timing": 10.0, "map": "street", "n": i})
+        vc.create_snapshot(ChangeType.SENSOR, target)
+
+        result = vc.get_similar_configurations(target, ChangeType.ECU_TUNING, limit=3)
+        assert len(result) == 3
+        assert result[0].description == "old best" and result[0].configuration == target
+        assert all(s.config_type is ChangeType.ECU_TUNING for s in result)
+
+    def test_index_follows_new_snapshots(self, vc, tmp_path):
+        vc.create_snapshot(ChangeType.ECU_TUNING, {"boost_psi": 10.0})
+        assert vc.get_similar_configurations({"boost_psi": 22.0}, ChangeType.ECU_TUNING, limit=1)[0].configuration == {"boost_psi": 10.0}
+
+        vc.create_snapshot(ChangeType.ECU_TUNING, {"boost_psi": 22.0})
+        assert vc.get_similar_configurations({"boost_psi": 22.0}, ChangeType.ECU_TUNING, limit=1)[0].configuration == {"boost_psi": 22.0}
+
+        # Written through another instance sharing the database
+        ConfigVersionControl(db_path=str(tmp_path / "config_history.db")).create_snapshot(
+            ChangeType.ECU_TUNING, {"boost_psi": 30.0}
+        )
+        result = vc.get_similar_configurations({"boost_psi": 30.0}, ChangeType.ECU_TUNING, limit=5)
+        assert [s.configuration["boost_psi"] for s in result] == [30.0, 22.0, 10.0]
+        assert vc.get_similar_configurations({"boost_psi": 30.0}, ChangeType.CAMERA) == []
+
+    def test_snapshot_rewritten_under_another_type(self, vc, monkeypatch):
+        config = {"boost_psi": 18.0}
+        vc.create_snapshot(ChangeType.ECU_TUNING, {"boost_psi": 12.0})
+        monkeypatch.setattr("services.config_version_control.time.time", lambda: 1700000000.0)
+        vc.create_snapshot(ChangeType.ECU_TUNING, config)
+        assert vc.get_similar_configurations(config, ChangeType.ECU_TUNING, limit=1)[0].configuration == config
+
+        # Same snapshot ID (same millisecond and configuration), replaced under another type
+        vc.create_snapshot(ChangeType.SENSOR, config)
+        result = vc.get_similar_configurations(config, ChangeType.ECU_TUNING, limit=2)
+        assert [s.configuration for s in result] == [{"boost_psi": 12.0}]
+        assert vc.get_similar_configurations(config, ChangeType.SENSOR)[0].config_type is ChangeType.SENSOR
@@ -0,0 +1,285 @@
+"""
+Frame Capture Tests
+
+Tests the camera capture loop against a simulated camera that exposes
+frames on a fixed schedule at 30/60/120 fps: exposure timestamps from
+driver and grab times, their jitter, latency calibration, the preallocated frame pool (no
+steady-state allocation), drop/miss accounting and delivery to
+polling-only consumers. Timestamp accuracy is checked on the camera's
+virtual clock, so host scheduling delay does not affect it.
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import interfaces.camera_interface as camera_module
+from interfaces.camera_interface import CameraConfig, CameraInterface, CameraType
+from interfaces.frame_capture import FrameCapture
+
+LATENCY = 0.004  # Simulated exposure-to-host latency
+DECODE_TIME = 0.002  # Virtual time retrieve() takes
+
+
+class FakeVideoCapture:
+    """VideoCapture stand-in whose grab() blocks until the next frame is exposed."""
+
+    def __init__(self, fps=60, shape=(48, 64, 3), driver_timestamps=True, skip_every=0, virtual_clock=False):
+        self.period = 1.0 / fps
+        self.shape = shape
+        self.driver_timestamps = driver_timestamps
+        self.skip_every = skip_every
+        self.start = time.monotonic() + 0.01
+        self.index = -1
+        self.retrieve_allocations = 0
+        self.opened = True
+        self.virtual_clock = virtual_clock
+        self.now = 0.0
+
+    def clock(self):
+        """Virtual monotonic clock: grab() returns exactly when the frame is ready."""
+        return self.now
+
+    def exposure(self, index):
+        return self.start + index * self.period
+
+    def isOpened(self):
+        return self.opened
+
+    def grab(self):
+        self.index += 1
+        if self.skip_every and self.index % self.skip_every == self.skip_every - 1:
+            self.index += 1  # Sensor frame lost before reaching the host
+        ready = self.exposure(self.index) + LATENCY
+        remaining = ready - time.monotonic()
+        if remaining > 0.001:
+            time.sleep(remaining - 0.001)
+        while time.monotonic() < ready:
+            pass
+        self.now = ready
+        return self.opened
+
+    def retrieve(self, image=None):
+        self.now += DECODE_TIME
+        if image is None or image.shape != self.shape:
+            image = np.zeros(self.shape, dtype=np.uint8)
+            self.retrieve_allocations += 1
+        image[0, 0, 0] = self.index & 0xFF
+        image[0, 0, 1] = (self.index >> 8) & 0xFF
+        return True, image
+
+    def get(self, prop):
+        if prop == 0 and self.driver_timestamps:
+            return self.exposure(self.index) * 1000.0
+        return 0.0
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        self.opened = False
+
+
+def frame_index(image):
+    return int(image[0, 0, 0]) | (int(image[0, 0, 1]) << 8)
+
+
+def run_capture(capture, frames, timeout=10.0):
+    capture.start()
+    deadline = time.monotonic() + timeout
+    while capture.frame_count < frames and time.monotonic() < deadline:
+        time.sleep(0.005)
+    capture.stop()
+
+
+@pytest.mark.parametrize("fps", [30, 60, 120])
+def test_driver_timestamps_give_exposure_time(fps):
+    source = FakeVideoCapture(fps=fps, virtual_clock=True)
+    samples = []
+
+    def on_frame(frame):
+        exposure = source.exposure(frame_index(frame.image))
+        samples.append((frame.monotonic - exposure, frame.timestamp - exposure))
+
+    capture = FrameCapture(
+        source, "front", fps=fps, callback=on_frame, telemetry_clock=source.clock, clock=source.clock
+    )
+    run_capture(capture, frames=max(12, fps // 3))
+
+    grab_delay = np.array([s[0] for s in samples])
+    timestamp_error = np.array([s[1] for s in samples])
+    assert grab_delay == pytest.approx(LATENCY, abs=1e-9)
+    assert np.abs(timestamp_error).max() < 1e-9
+
+    stats = capture.stats()
+    assert stats.fps == pytest.approx(fps, rel=1e-6)
+    assert stats.jitter_ms < 1e-6
+    assert stats.latency_ms == pytest.approx(LATENCY * 1000, abs=1e-6)
+    assert stats.frames_missed == 0
+
+
+@pytest.mark.parametrize("fps", [30, 60, 120])
+def test_grab_time_stamps_without_driver_timestamps(fps):
+    source = FakeVideoCapture(fps=fps, driver_timestamps=False, virtual_clock=True)
+    errors = []
+    capture = FrameCapture(
+        source,
+        "front",
+        fps=fps,
+        callback=lambda frame: errors.append(frame.timestamp - source.exposure(frame_index(frame.image))),
+        telemetry_clock=source.clock,
+        latency=LATENCY,
+        clock=source.clock,
+    )
+    run_capture(capture, frames=max(12, fps // 3))
+
+    # Stamped when grab() returns, before decoding (which would add DECODE_TIME)
+    assert np.abs(errors).max() < 1e-9
+    assert capture.stats().fps == pytest.approx(fps, rel=1e-6)
+
+
+def test_steady_state_capture_allocates_no_frames():
+    source = FakeVideoCapture(fps=120, shape=(480, 640, 3))
+    capture = FrameCapture(source, "front", fps=120, pool_size=6, queue_depth=2)
+    seen = set()
+
+    def consume(count):
+        received = 0
+        while received < count:
+            frame = capture.get_frame(timeout=1.0)
+            assert frame is not None
+            seen.add(id(frame.image))
+            frame.release()
+            received += 1
+
+    capture.start()
+    try:
+        consume(20)
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        consume(60)
+        growth = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+    finally:
+        capture.stop()
+
+    frame_bytes = 480 * 640 * 3
+    assert growth < frame_bytes // 4
+    assert source.retrieve_allocations == 1  # Only the first frame, to learn the shape
+    assert capture.stats().buffer_allocations == 6
+    assert seen <= {id(frame.image) for frame in capture._pool}
+
+
+def test_polling_only_consumer_receives_frames():
+    source = FakeVideoCapture(fps=60)
+    capture = FrameCapture(source, "rear", fps=60)
+    capture.start()
+    try:
+        numbers = []
+        deadline = time.monotonic() + 0.5
+        while time.monotonic() < deadline:
+            frame = capture.get_frame(timeout=0.1)
+            if frame is not None:
+                with frame:
+                    numbers.append(frame.frame_number)
+    finally:
+        capture.stop()
+
+    assert len(numbers) >= 20
+    assert numbers == sorted(numbers)
+    assert capture.stats().frames_dropped == 0
+
+
+def test_unread_frames_are_dropped_and_unreleased_frames_reclaimed():
+    source = FakeVideoCapture(fps=120)
+    capture = FrameCapture(source, "front", fps=120, pool_size=6, queue_depth=3)
+    capture.start()
+    try:
+        held = [capture.get_frame(timeout=1.0) for _ in range(3)]  # Borrowed, never released
+        while capture.frame_count < 40:
+            time.sleep(0.01)
+    finally:
+        capture.stop()
+
+    stats = capture.stats()
+    assert stats.pool_reclaims >= 1
+    assert stats.frames_dropped >= 20
+    queued = [capture.get_frame(timeout=0.1) for _ in range(3)]
+    assert [f.frame_number for f in queued] == sorted(f.frame_number for f in queued)
+    assert queued[-1].frame_number == stats.frames_captured
+    assert all(f is not None for f in held)
+
+
+def test_borrowed_frames_release_in_any_order():
+    source = FakeVideoCapture(fps=120)
+    capture = FrameCapture(source, "front", fps=120, pool_size=6, queue_depth=3)
+    capture.start()
+    try:
+        first = capture.get_frame(timeout=1.0)
+        second = capture.get_frame(timeout=1.0)
+        second.release()
+        first.release()
+        assert not capture._borrowed
+        assert capture.stats().pool_reclaims == 0
+    finally:
+        capture.stop()
+
+
+def test_skipped_sensor_frames_are_counted():
+    source = FakeVideoCapture(fps=120, skip_every=5)
+    capture = FrameCapture(source, "front", fps=120)
+    run_capture(capture, frames=40)
+
+    stats = capture.stats()
+    assert stats.frames_missed == pytest.approx(stats.frames_captured / 4, abs=2)
+    assert stats.jitter_ms < 1.0  # Gaps are not counted as jitter
+
+
+def test_latency_calibration_from_telemetry_events():
+    source = FakeVideoCapture(fps=60, driver_timestamps=False, virtual_clock=True)
+    capture = FrameCapture(source, "front", fps=60, telemetry_clock=source.clock, clock=source.clock)
+    capture.start()
+    try:
+        for _ in range(5):
+            with capture.get_frame(timeout=1.0) as frame:
+                event_time = source.exposure(frame_index(frame.image))  # e.g. an LED flash logged by telemetry
+                latency = capture.calibrate_latency(event_time, frame)
+        assert latency == pytest.approx(LATENCY, abs=1e-9)
+
+        errors = []
+        while len(errors) < 10:
+            with capture.get_frame(timeout=1.0) as frame:
+                if frame.monotonic > capture.last_grab - 0.001:  # Stamped after the calibration
+                    errors.append(frame.timestamp - source.exposure(frame_index(frame.image)))
+        assert np.abs(errors).max() < 1e-9
+    finally:
+        capture.stop()
+
+
+def test_camera_interface_serves_polling_consumers(monkeypatch):
+    source = FakeVideoCapture(fps=60)
+    fake_cv2 = SimpleNamespace(
+        VideoCapture=lambda *args: source,
+        CAP_PROP_FRAME_WIDTH=3, CAP_PROP_FRAME_HEIGHT=4, CAP_PROP_FPS=5, CAP_PROP_AUTOFOCUS=39,
+        CAP_PROP_AUTO_EXPOSURE=21, CAP_PROP_BUFFERSIZE=38,
+    )
+    monkeypatch.setattr(camera_module, "cv2", fake_cv2)
+    camera = CameraInterface(CameraConfig("Front", CameraType.USB, "0", fps=60))
+    assert camera.start()
+    try:
+        frame = camera.get_frame(timeout=1.0)
+        assert frame is not None and frame.camera_name == "Front"
+        frame.release()
+        assert camera.is_healthy()
+        assert camera.stats().frames_captured >= 1
+    finally:
+        camera.stop()
+    assert not camera.is_healthy(timeout=0.0)
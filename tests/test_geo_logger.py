@@ -0,0 +1,131 @@
+"""
+Geo Logger Tests
+
+Tests batched writes, bounding-box and time queries, Douglas-Peucker
+trajectory simplification and retention.
+"""
+
+import math
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.geo_logger import GeoLogger, simplify_track
+
+T0 = 1_700_000_000.0
+
+
+def _fix(t, lat, lon):
+    return {"timestamp": t, "lat": lat, "lon": lon, "speed_mps": 10.0, "heading": 90.0}
+
+
+@pytest.fixture
+def logger(tmp_path):
+    geo = GeoLogger(tmp_path / "geo.db", batch_size=100, flush_interval=60.0)
+    yield geo
+    geo.close()
+
+
+class TestWrites:
+    """Test buffered group commits."""
+
+    def test_fixes_are_committed_in_batches(self, logger, tmp_path):
+        assert logger.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        for i in range(250):
+            logger.log(_fix(T0 + i * 0.02, 45.0, -122.0 + i * 1e-5))
+        logger.flush()
+        assert logger.batches_written <= 3
+
+        # Queries see pending fixes; close writes the rest
+        logger.log(_fix(T0 + 10, 45.1, -122.1))
+        assert logger.fetch_recent(2) == [(45.0, -122.0 + 249 * 1e-5), (45.1, -122.1)]
+        logger.log(_fix(T0 + 11, 45.2, -122.2))
+        logger.close()
+        with sqlite3.connect(tmp_path / "geo.db") as conn:
+            assert conn.execute("SELECT COUNT(*) FROM geo_log").fetchone()[0] == 252
+
+    def test_existing_history_is_indexed(self, tmp_path):
+        path = tmp_path / "old.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "CREATE TABLE geo_log (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL, "
+                "latitude REAL, longitude REAL, speed_mps REAL, heading REAL)"
+            )
+            conn.execute("INSERT INTO geo_log (timestamp, latitude, longitude) VALUES (?, 45.5, -122.5)", (T0,))
+        geo = GeoLogger(path)
+        assert [f.lat for f in geo.query_bbox(45, -123, 46, -122)] == [45.5]
+        geo.close()
+
+
+class TestQueries:
+    """Test spatial-temporal queries."""
+
+    def test_bbox_between_times_matches_a_scan(self, logger):
+        rng = np.random.default_rng(0)
+        lats = 45.0 + rng.random(2000) * 0.1
+        lons = -122.0 + rng.random(2000) * 0.1
+        for i, (lat, lon) in enumerate(zip(lats, lons)):
+            logger.log(_fix(T0 + i, float(lat), float(lon)))
+
+        box = (45.02, -121.97, 45.05, -121.93)
+        result = logger.query_bbox(*box, t0=T0 + 300, t1=T0 + 1500)
+        expected = [
+            i for i in range(2000)
+            if box[0] <= lats[i] <= box[2] and box[1] <= lons[i] <= box[3] and 300 <= i <= 1500
+        ]
+        assert [round(f.timestamp - T0) for f in result] == expected
+        assert len(logger.query_bbox(*box)) > len(result)
+        assert len(logger.query_bbox(*box, limit=3)) == 3
+        assert logger.spatial_index
+
+    def test_trajectory_is_simplified_within_tolerance(self, logger):
+        # A straight leg, a 90 degree turn, then a second trip after a gap
+        for i in range(100):
+            logger.log(_fix(T0 + i, 45.0, -122.0 + i * 1e-5))
+        for i in range(100):
+            logger.log(_fix(T0 + 100 + i, 45.0 + (i + 1) * 1e-5, -122.0 + 99e-5))
+        for i in range(10):
+            logger.log(_fix(T0 + 1000 + i, 46.0, -121.0 + i * 1e-5))
+
+        track = logger.trajectory(T0, T0 + 2000, tolerance_m=1.0)
+        assert [round(f.timestamp - T0) for f in track] == [0, 99, 199, 1000, 1009]
+
+    def test_simplification_bounds_deviation(self):
+        t = np.arange(500.0)
+        lat = 45.0 + np.sin(t / 40.0) * 1e-3
+        lon = -122.0 + t * 2e-5
+        keep = simplify_track(t, lat, lon, tolerance_m=2.0)
+        assert 2 < keep.sum() < 100
+
+        # Every dropped fix is within tolerance of the kept polyline
+        scale = math.radians(1.0) * 6371000.0
+        x = (lon - lon[0]) * scale * math.cos(math.radians(45.0))
+        y = (lat - lat[0]) * scale
+        kept = np.flatnonzero(keep)
+        for first, last in zip(kept[:-1], kept[1:]):
+            dx, dy = x[last] - x[first], y[last] - y[first]
+            px, py = x[first:last] - x[first], y[first:last] - y[first]
+            assert np.all(np.abs(px * dy - py * dx) / math.hypot(dx, dy) <= 2.0 + 1e-9)
+        assert simplify_track([], [], [], 1.0).size == 0
+
+
+class TestRetention:
+    """Test deletion and compaction of old history."""
+
+    def test_retention_deletes_and_compacts(self, logger):
+        for i in range(3000):
+            logger.log(_fix(T0 + i, 45.0, -122.0 + i * 1e-5))
+
+        result = logger.apply_retention(max_age_s=2500, compact_after_s=1000, now=T0 + 3000)
+        assert result["deleted"] == 500
+        assert logger.fetch_range(T0, T0 + 499) == []
+        # The straight 500..1999 stretch is reduced to its end points; recent fixes are kept
+        assert logger.count() == 1000 + 2
+        assert logger.query_bbox(44, -123, 46, -121, t0=T0 + 500, t1=T0 + 1999)[-1].timestamp == T0 + 1999
+        assert logger.compact_before(T0 + 2000) == 0
@@ -0,0 +1,103 @@
+"""
+Geofence Engine Tests
+
+Tests circle and polygon containment, the grid index against a brute-force
+check, and that a noisy replay produces exactly one event per boundary
+crossing.
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.geofence_engine import METERS_PER_DEGREE, Geofence, GeofenceEngine, _FenceShape
+
+LAT0, LON0 = 45.5, -122.6
+LON_M = METERS_PER_DEGREE * math.cos(math.radians(LAT0))
+
+
+def _at(x_m, y_m):
+    """(lat, lon) at an offset in meters from the origin."""
+    return LAT0 + y_m / METERS_PER_DEGREE, LON0 + x_m / LON_M
+
+
+def _square(name, half_m, **kwargs):
+    return Geofence.polygon(name, [_at(-half_m, -half_m), _at(half_m, -half_m), _at(half_m, half_m), _at(-half_m, half_m)], **kwargs)
+
+
+class TestShapes:
+    """Test signed distances."""
+
+    def test_circle_and_polygon_distance(self):
+        circle = _FenceShape(Geofence("circle", LAT0, LON0, 100.0))
+        assert abs(circle.signed_distance(*_at(0, 60)) + 40.0) < 0.1
+        assert abs(circle.signed_distance(*_at(150, 0)) - 50.0) < 0.1
+
+        # L-shaped polygon: the notch is outside
+        l_shape = _FenceShape(Geofence.polygon("l", [_at(0, 0), _at(200, 0), _at(200, 100), _at(100, 100), _at(100, 200), _at(0, 200)]))
+        assert abs(l_shape.signed_distance(*_at(50, 150)) + 50.0) < 0.1
+        assert abs(l_shape.signed_distance(*_at(150, 150)) - 50.0) < 0.1
+        assert abs(l_shape.signed_distance(*_at(150, 90)) + 10.0) < 0.1
+
+
+class TestEngine:
+    """Test indexed evaluation and state transitions."""
+
+    def test_index_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        engine = GeofenceEngine()
+        fences = []
+        for i in range(2000):
+            x, y = rng.uniform(-20_000, 20_000, 2)
+            if i % 2:
+                fence = Geofence(f"c{i}", *_at(x, y), radius_meters=float(rng.uniform(20, 2000)))
+            else:
+                half = float(rng.uniform(20, 1500))
+                fence = Geofence.polygon(f"p{i}", [_at(x - half, y - half), _at(x + half, y - half), _at(x, y + half)])
+            engine.add(fence)
+            fences.append(fence)
+        engine.add(Geofence("region", LAT0, LON0, 500_000.0))  # Too big for the grid
+        fences.append(engine.fences["region"])
+
+        shapes = [_FenceShape(f) for f in fences]
+        for x, y in rng.uniform(-20_000, 20_000, (100, 2)):
+            lat, lon = _at(x, y)
+            nearby = engine.candidates(lat, lon)
+            expected = {s.fence.name for s in shapes if s.signed_distance(lat, lon) <= s.fence.hysteresis_meters}
+            assert expected <= nearby
+            assert len(nearby) < 100
+
+    def test_replay_has_one_event_per_crossing(self):
+        engine = GeofenceEngine()
+        engine.add(Geofence("home", LAT0, LON0, 200.0, hysteresis_meters=15.0, dwell_seconds=60.0))
+        engine.add(_square("yard", 100.0, hysteresis_meters=15.0))
+        engine.add(Geofence("far", 46.5, -121.0, 200.0))
+
+        # Drive out and back along the x axis three times with 5 m GPS noise
+        rng = np.random.default_rng(1)
+        track = np.concatenate([np.linspace(0, 400, 200), np.linspace(400, 0, 200)] * 3)
+        events = []
+        for t, x in enumerate(track):
+            noise_x, noise_y = rng.normal(0.0, 5.0, 2)
+            events += engine.update(*_at(x + noise_x, noise_y), timestamp=float(t))
+
+        # Starting inside both: no event for the first fix, dwell once, then exit/enter per crossing
+        by_fence = {name: [e.event for e in events if e.fence == name] for name in ("home", "yard")}
+        assert by_fence["home"] == ["dwell", "exit", "enter", "dwell", "exit", "enter", "dwell", "exit", "enter", "dwell"]
+        assert by_fence["yard"] == ["exit", "enter"] * 3
+        assert not any(e.fence == "far" for e in events)
+        assert engine.is_inside("home") and engine.is_inside("yard") and engine.is_inside("far") is False
+
+    def test_remove_and_disable(self):
+        engine = GeofenceEngine()
+        engine.add(Geofence("a", LAT0, LON0, 100.0))
+        engine.add(Geofence("b", LAT0, LON0, 100.0, enabled=False))
+        engine.update(*_at(0, 0), timestamp=0.0)
+        assert engine.remove("a") and not engine.remove("a")
+        assert engine.update(*_at(1000, 0), timestamp=1.0) == []
+        assert len(engine) == 1
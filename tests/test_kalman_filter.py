@@ -9,7 +9,15 @@ import time
 import unittest
 from unittest.mock import Mock
 
-from services.kalman_filter import KalmanFilter, KalmanFilterStatus, KalmanFilterOutput
+import numpy as np
+
+from services.kalman_filter import (
+    KalmanFilter,
+    KalmanFilterConfig,
+    KalmanFilterOutput,
+    KalmanFilterStatus,
+    rts_smooth,
+)
 from interfaces.gps_interface import GPSFix
 from interfaces.imu_interface import IMUReading, IMUStatus
 
@@ -216,6 +224,143 @@ class TestKalmanFilter(unittest.TestCase):
         self.assertEqual(self.kf.origin_lon, -75.654321)
 
 
+class DenseKalmanFilter:
+    """The previous 9x9 matrix formulation, as a reference."""
+    
+    def __init__(self, config):
+        self.config = config
+        self.state = np.zeros(9)
+        self.covariance = np.eye(9)
+    
+    def predict(self, dt, accel, gyro):
+        c = self.config
+        F = np.eye(9)
+        F[0, 3] = F[1, 4] = F[2, 5] = dt
+        self.state = F @ self.state
+        self.state[3:6] += np.asarray(accel) * dt
+        self.state[6:9] += np.asarray(gyro)[::-1] * dt
+        Q = np.diag([c.process_noise_pos] * 3 + [c.process_noise_vel] * 3 + [c.process_noise_att] * 3) * dt
+        self.covariance = F @ self.covariance @ F.T + Q
+    
+    def update(self, measurement):
+        c = self.config
+        x, y, z, vx, vy, heading = measurement
+        z_meas = np.array([x, y, z, vx, vy, 0.0, heading, 0.0, 0.0])
+        H = np.diag([1.0, 1, 1, 1, 1, 0, 1, 0, 0])
+        R = np.diag([c.gps_position_noise ** 2] * 3 + [c.gps_velocity_noise ** 2] * 2 + [1e6, c.gps_heading_noise ** 2, 1e6, 1e6])
+        S = H @ self.covariance @ H.T + R
+        K = self.covariance @ H.T @ np.linalg.inv(S)
+        self.state = self.state + K @ (z_meas - H @ self.state)
+        self.covariance = (np.eye(9) - K @ H) @ self.covariance
+        self.covariance = (self.covariance + self.covariance.T) / 2.0
+
+
+def _circle_log(samples, seed=0, gps_every=10, gps_noise=2.0):
+    """100 Hz IMU + 10 Hz GPS log of a 15 m/s circle around (40, -75)."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(samples) * 0.01
+    rate = 15.0 / 80.0
+    theta = rate * t
+    east, north = 80.0 * np.sin(theta), 80.0 * (1 - np.cos(theta))
+    accel = np.column_stack((-15.0 * rate * np.sin(theta), 15.0 * rate * np.cos(theta), np.zeros(samples)))
+    accel += rng.normal(0, 0.05, accel.shape)
+    
+    fixes = np.arange(0, samples, gps_every)
+    gps = np.full((samples, 5), np.nan)
+    gps[fixes, 0] = 40.0 + (north[fixes] + rng.normal(0, gps_noise, fixes.size)) / 111320.0
+    gps[fixes, 1] = -75.0 + (east[fixes] + rng.normal(0, gps_noise, fixes.size)) / (111320.0 * math.cos(math.radians(40.0)))
+    gps[fixes, 2] = 0.0
+    gps[fixes, 3] = 15.0
+    gps[fixes, 4] = np.degrees(theta[fixes]) % 360
+    return t, accel, np.zeros((samples, 3)), gps, east, north
+
+
+class TestKalmanFilterCore(unittest.TestCase):
+    """Test the structured filter core, batch processing and smoother."""
+    
+    def _filter(self):
+        kf = KalmanFilter()
+        kf.origin_lat, kf.origin_lon, kf.origin_alt = 40.0, -75.0, 0.0
+        return kf
+    
+    def test_matches_dense_filter(self):
+        rng = np.random.default_rng(0)
+        kf = self._filter()
+        dense = DenseKalmanFilter(KalmanFilterConfig())
+        for step in range(2000):
+            dt = float(rng.uniform(0.005, 0.02))
+            accel, gyro = rng.normal(0, 1, 3), rng.normal(0, 5, 3)
+            kf._predict(dt, IMUReading(*accel, *gyro, timestamp=1.0))
+            dense.predict(dt, accel, np.radians(gyro))
+            if step % 10 == 0:
+                fix = GPSFix(
+                    latitude=40.0 + rng.normal(0, 1e-4),
+                    longitude=-75.0 + rng.normal(0, 1e-4),
+                    speed_mps=float(rng.uniform(0, 30)),
+                    heading=float(rng.uniform(0, 360)),
+                    timestamp=1.0,
+                    altitude_m=float(rng.normal(0, 3)),
+                )
+                kf._update_gps(fix)
+                x, y, z = kf._gps_to_local(fix.latitude, fix.longitude, fix.altitude_m)
+                heading = math.radians(fix.heading)
+                dense.update((x, y, z, fix.speed_mps * math.sin(heading), fix.speed_mps * math.cos(heading), heading))
+        np.testing.assert_allclose(kf.state, dense.state, atol=1e-9)
+        np.testing.assert_allclose(kf.covariance, dense.covariance, atol=1e-9)
+    
+    def test_batch_matches_step_updates(self):
+        t, accel, gyro, gps, _, _ = _circle_log(500)
+        track = self._filter().process_batch(t, accel, gyro, gps)
+        
+        kf = self._filter()
+        for k in range(t.size):
+            kf._predict(0.01, IMUReading(*accel[k], *gyro[k], timestamp=1.0))
+            if np.isfinite(gps[k, 0]):
+                kf._update_gps(GPSFix(*gps[k, [0, 1, 3, 4]], timestamp=1.0, altitude_m=gps[k, 2]))
+            np.testing.assert_allclose(track.states[k], kf.state, atol=1e-9)
+        np.testing.assert_allclose(track.covariance(-1), kf.covariance, atol=1e-12)
+    
+    def test_smoother_reduces_position_error(self):
+        t, accel, gyro, gps, east, north = _circle_log(6000, seed=4)
+        track = self._filter().process_batch(t, accel, gyro, gps)
+        smoothed = rts_smooth(track)
+        
+        def rms_error(result):
+            error = (result.positions[500:, 0] - east[500:]) ** 2 + (result.positions[500:, 1] - north[500:]) ** 2
+            return math.sqrt(float(np.mean(error)))
+        
+        self.assertTrue(smoothed.smoothed)
+        self.assertLess(rms_error(smoothed), 0.85 * rms_error(track))
+        self.assertTrue(np.all(smoothed.covariances[:, 0] <= track.covariances[:, 0] + 1e-12))
+    
+    def test_nan_speed_or_heading_only_drops_velocity(self):
+        t, accel, gyro, gps, east, north = _circle_log(500)
+        clean = self._filter().process_batch(t, accel, gyro, gps, smooth=True)
+        gps[100, 3] = np.nan  # Fix with no speed
+        gps[200, 4] = np.nan  # Fix with no heading
+        track = self._filter().process_batch(t, accel, gyro, gps, smooth=True)
+        
+        self.assertTrue(np.all(np.isfinite(track.states)))
+        self.assertTrue(np.all(np.isfinite(track.covariances)))
+        np.testing.assert_allclose(track.positions[-1], clean.positions[-1], atol=0.5)
+    
+    def test_step_cost(self):
+        kf = self._filter()
+        dense = DenseKalmanFilter(KalmanFilterConfig())
+        imu = IMUReading(0.1, 0.2, 9.8, 1.0, 2.0, 3.0, timestamp=1.0)
+        fix = GPSFix(40.0001, -75.0001, 10.0, 45.0, timestamp=1.0, altitude_m=1.0)
+        
+        def seconds(step):
+            start = time.perf_counter()
+            for _ in range(2000):
+                step()
+            return time.perf_counter() - start
+        
+        dense_time = seconds(lambda: (dense.predict(0.01, (0.1, 0.2, 9.8), (0.02, 0.03, 0.05)), dense.update((1, 2, 3, 4, 5, 0.3))))
+        core_time = seconds(lambda: (kf._predict(0.01, imu), kf._update_gps(fix)))
+        self.assertLess(core_time * 4, dense_time)
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,97 @@
+"""
+Knowledge Ingestion Tests
+
+Tests the shared chunker, batched directory ingestion with content-hash
+skipping, change/delete handling and resuming from the manifest.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.knowledge_base_manager import MANIFEST_NAME, DocumentIngester, split_into_chunks
+from services.vector_knowledge_store import VectorKnowledgeStore
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "engine").mkdir(parents=True)
+    (docs / "manual.txt").write_text(" ".join(f"Sentence {i} about boost control." for i in range(400)))
+    (docs / "engine" / "table.json").write_text(json.dumps({f"cell_{i}": f"value {i}" for i in range(300)}))
+    (docs / "engine" / "notes.md").write_text("Short note on knock.")
+    (docs / "image.png").write_bytes(b"not a document")
+    return docs
+
+
+@pytest.fixture
+def store(tmp_path):
+    return VectorKnowledgeStore(persist_directory=str(tmp_path / "store"))
+
+
+class TestChunker:
+    """Test split_into_chunks."""
+
+    def test_chunks_cover_text_with_overlap(self):
+        text = " ".join(f"Sentence number {i}." for i in range(500))
+        chunks = split_into_chunks(text, max_chunk_size=300, overlap=50)
+        assert all(len(c) <= 300 for c in chunks)
+        assert chunks[0].startswith("Sentence number 0.") and chunks[-1].endswith("Sentence number 499.")
+        assert not chunks[-2].endswith(chunks[-1])  # No trailing chunk repeating the previous one's end
+        assert split_into_chunks("   ") == []
+
+    def test_terminates_on_early_boundary(self):
+        chunks = split_into_chunks("A. " + "x" * 3000, max_chunk_size=1000, overlap=200)
+        assert 3 <= len(chunks) <= 5 and all(len(c) <= 1000 for c in chunks)
+        assert chunks[0].startswith("A.") and chunks[-1].endswith("x")
+
+
+class TestDirectoryIngestion:
+    """Test DocumentIngester.ingest_directory."""
+
+    def test_ingest_then_skip_unchanged(self, corpus, store):
+        ingester = DocumentIngester(store, batch_size=8)
+        calls = []
+        result = ingester.ingest_directory(str(corpus), workers=2, progress=lambda *args: calls.append(args))
+        assert result["success"] and result["files"] == 3
+        assert result["chunks_added"] == store.count() > 3
+        assert calls[-1] == (3, 3, result["chunks_added"])
+        assert (corpus / MANIFEST_NAME).exists()
+
+        again = ingester.ingest_directory(str(corpus), workers=2)
+        assert again["files_skipped"] == 3 and again["chunks_added"] == 0
+        assert ingester.ingest_file(str(corpus / "manual.txt")) == (0, [])
+        assert store.count() == result["chunks_added"]
+
+    def test_changed_and_deleted_files(self, corpus, store):
+        ingester = DocumentIngester(store)
+        ingester.ingest_directory(str(corpus), workers=0)
+        before = store.count()
+
+        (corpus / "engine" / "notes.md").write_text("Revised note on knock and timing.")
+        (corpus / "engine" / "table.json").unlink()
+        result = ingester.ingest_directory(str(corpus), workers=0)
+        assert result["files_skipped"] == 1 and result["chunks_added"] == 1
+        texts = set(store.documents)
+        assert "Revised note on knock and timing." in texts and "Short note on knock." not in texts
+        assert not any("cell_1:" in t for t in texts)
+        assert store.count() < before
+
+    def test_resume_after_interruption(self, corpus, store):
+        ingester = DocumentIngester(store)
+        ingester.ingest_file(str(corpus / "manual.txt"))  # Stored, but not in a manifest
+        stored = store.count()
+
+        result = ingester.ingest_directory(str(corpus), workers=0)
+        assert result["chunks_skipped"] == stored
+        assert result["chunks_added"] == store.count() - stored
+
+        # A store that lost the chunks is refilled even though the manifest lists the files
+        store.clear()
+        result = ingester.ingest_directory(str(corpus), workers=0)
+        assert result["files_skipped"] == 0 and store.count() == result["chunks_added"]
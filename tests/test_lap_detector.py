@@ -0,0 +1,124 @@
+"""
+Lap Detector Tests
+
+Tests interpolated gate timing (live and offline) against a synthetic circuit
+with known lap and sector times.
+"""
+
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.lap_detector import EARTH_RADIUS_M, LapDetector, TimingLine, split_session
+
+# Circular circuit driven counter-clockwise with speed varying around the lap
+LAT0, LON0, RADIUS = 36.58, -121.75, 300.0
+GATE_ANGLES = (math.pi / 4, math.pi / 4 + 2 * math.pi / 3, math.pi / 4 + 4 * math.pi / 3)
+
+
+def _speed(theta):
+    return 35.0 + 12.0 * np.cos(2 * theta)  # m/s
+
+
+_FINE = np.linspace(0.0, 2 * math.pi, 200_001)
+_ELAPSED = np.concatenate((
+    [0.0],
+    np.cumsum(np.diff(_FINE) * RADIUS / ((_speed(_FINE[:-1]) + _speed(_FINE[1:])) / 2)),
+))
+LAP_TIME = _ELAPSED[-1]
+
+
+def _elapsed_at(theta):
+    laps, remainder = divmod(theta, 2 * math.pi)
+    return laps * LAP_TIME + np.interp(remainder, _FINE, _ELAPSED)
+
+
+SECTOR_TIMES = np.diff([_elapsed_at(angle) for angle in GATE_ANGLES + (GATE_ANGLES[0] + 2 * math.pi,)])
+
+
+def _to_latlon(theta):
+    east, north = RADIUS * np.cos(theta), RADIUS * np.sin(theta)
+    lat = LAT0 + np.degrees(north / EARTH_RADIUS_M)
+    lon = LON0 + np.degrees(east / (EARTH_RADIUS_M * math.cos(math.radians(LAT0))))
+    return lat, lon
+
+
+def _gate(theta):
+    lat, lon = _to_latlon(theta)
+    heading = math.degrees(math.atan2(-math.sin(theta), math.cos(theta)))
+    return TimingLine.from_center(float(lat), float(lon), heading, width=40.0)
+
+
+def _session(rate_hz, duration, phase=0.137):
+    t = np.arange(phase, duration, 1.0 / rate_hz)
+    laps, remainder = np.divmod(t, LAP_TIME)
+    theta = laps * 2 * math.pi + np.interp(remainder, _ELAPSED, _FINE)
+    lat, lon = _to_latlon(theta)
+    return lat, lon, t, _speed(theta)
+
+
+START_FINISH = _gate(GATE_ANGLES[0])
+SECTORS = [_gate(angle) for angle in GATE_ANGLES[1:]]
+
+
+class TestGateTiming:
+    """Test line-crossing lap and sector timing."""
+
+    @pytest.mark.parametrize("rate_hz", [1, 5, 10, 25])
+    def test_live_and_offline_match_ground_truth(self, rate_hz):
+        lat, lon, t, speed = _session(rate_hz, LAP_TIME * 5)
+
+        offline = split_session(lat, lon, t, START_FINISH, SECTORS, speeds=speed, min_lap_time=10.0)
+
+        detector = LapDetector(0.0, 0.0, min_lap_time=10.0, start_finish_line=START_FINISH)
+        detector.set_sector_lines(SECTORS)
+        completed = []
+        for fix in zip(lat.tolist(), lon.tolist(), speed.tolist(), t.tolist()):
+            lap = detector.update(fix[0], fix[1], speed=fix[2], timestamp=fix[3])
+            if lap:
+                completed.append(lap)
+
+        assert len(offline) == len(completed) == 4
+        for live_lap, offline_lap in zip(completed, offline):
+            assert abs(live_lap.duration - LAP_TIME) < 0.005
+            assert offline_lap.duration == pytest.approx(live_lap.duration, abs=1e-9)
+            assert np.allclose(offline_lap.sectors, SECTOR_TIMES, atol=0.005)
+            assert sum(live_lap.sectors) == pytest.approx(live_lap.duration)
+        assert offline[0].distance == pytest.approx(2 * math.pi * RADIUS, rel=1e-3)
+
+    def test_reverse_and_off_gate_passes_are_ignored(self):
+        lat, lon, t, speed = _session(10, LAP_TIME * 3)
+        # Driving the circuit backwards never crosses the gate forwards
+        assert split_session(lat[::-1], lon[::-1], t, START_FINISH, min_lap_time=10.0) == []
+
+        # A gate placed away from the racing line is never crossed
+        far = TimingLine.from_center(LAT0 + 0.05, LON0, 0.0, width=40.0)
+        assert split_session(lat, lon, t, far, min_lap_time=10.0) == []
+
+        both_ways = TimingLine(**{**START_FINISH.__dict__, "bidirectional": True})
+        assert len(split_session(lat[::-1], lon[::-1], t, both_ways, min_lap_time=10.0)) == 2
+
+    def test_radius_mode_unchanged(self):
+        lat, lon, t, speed = _session(10, LAP_TIME * 2.5)
+        center_lat, center_lon = START_FINISH.center
+        detector = LapDetector(center_lat, center_lon, detection_radius=10.0, min_lap_time=10.0)
+        laps = [lap for fix in zip(lat, lon, speed, t) if (lap := detector.update(*fix))]
+        assert len(laps) == 2
+        assert abs(laps[0].duration - LAP_TIME) < 0.2  # Quantized to the fix interval
+
+    def test_two_hour_session_splits_quickly(self):
+        lat, lon, t, speed = _session(25, 2 * 3600.0)
+        start = time.perf_counter()
+        laps = split_session(lat, lon, t, START_FINISH, SECTORS, speeds=speed)
+        elapsed = time.perf_counter() - start
+
+        assert abs(len(laps) - 7200.0 / LAP_TIME) <= 2
+        assert max(abs(lap.duration - LAP_TIME) for lap in laps) < 0.005
+        assert elapsed < 1.0
@@ -0,0 +1,113 @@
+"""
+Live Plot Buffer Tests
+
+Tests the ring-buffer storage behind TelemetryPanel and the panel's
+decoupled refresh.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from ui.live_plot_buffer import LivePlotBuffer
+
+
+class TestLivePlotBuffer:
+    """Test ring storage and alias resolution."""
+
+    def test_views_are_ordered_and_wrap(self):
+        buf = LivePlotBuffer(["RPM", "Speed"], history=5)
+        for i in range(1, 4):
+            buf.append({"RPM": i * 100, "Speed": i})
+        assert buf.view("RPM").tolist() == [100, 200, 300]
+        assert buf.x_view().tolist() == [1, 2, 3]
+
+        for i in range(4, 9):
+            buf.append({"RPM": i * 100, "Speed": i})
+        assert buf.view("RPM").tolist() == [400, 500, 600, 700, 800]
+        assert buf.view("Speed").tolist() == [4, 5, 6, 7, 8]
+        assert buf.latest("RPM") == 800
+
+    def test_views_share_storage(self):
+        buf = LivePlotBuffer(["RPM"], history=100)
+        for i in range(250):
+            buf.append({"RPM": i})
+        view = buf.view("RPM")
+        assert np.shares_memory(view, buf._values)
+        assert not view.flags.writeable
+
+    def test_aliases_resolved_and_cached(self):
+        aliases = {"Boost": "Boost_Pressure", "GPS_Speed": ("GPS_Speed", "gps_speed", "KF_Speed")}
+        buf = LivePlotBuffer(["Boost", "GPS_Speed", "Missing"], history=10, aliases=aliases)
+
+        found = buf.append({"Boost_Pressure": 12.5, "KF_Speed": 30.0})
+        assert found == 2
+        assert buf._resolved == ["Boost_Pressure", "KF_Speed", None]
+
+        # Source key changes mid-session
+        buf.append({"Boost": 14.0, "gps_speed": 31.0})
+        assert buf.view("Boost").tolist() == [12.5, 14.0]
+        assert buf.view("GPS_Speed").tolist() == [30.0, 31.0]
+        assert buf.view("Missing").tolist() == [0.0, 0.0]
+
+    def test_append_cost_independent_of_history(self):
+        sample = {f"ch{i}": float(i) for i in range(13)}
+        timings = {}
+        for history in (400, 40_000):
+            buf = LivePlotBuffer(list(sample), history=history)
+            start = time.perf_counter()
+            for _ in range(5000):
+                buf.append(sample)
+            timings[history] = time.perf_counter() - start
+        assert timings[40_000] < timings[400] * 3
+
+
+class TestTelemetryPanelRefresh:
+    """Test that redraws are decoupled from the data rate."""
+
+    def test_updates_batched_until_refresh(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        pytest.importorskip("PySide6")
+        pytest.importorskip("pyqtgraph")
+        from PySide6.QtWidgets import QApplication
+
+        from ui.telemetry_panel import TelemetryPanel
+
+        app = QApplication.instance() or QApplication([])
+        panel = TelemetryPanel(max_len=50)
+        panel.refresh_timer.stop()
+        panel.show()
+
+        calls = []
+        curve = panel.curves["RPM"]
+        original = curve.setData
+        curve.setData = lambda *a, **k: (calls.append(a), original(*a, **k))
+
+        for i in range(100):
+            panel.update_data({"RPM": 1000 + i, "Boost_Pressure": 5.0})
+        assert calls == []
+
+        assert panel.refresh_plots() == len(panel.curves)
+        assert len(calls) == 1
+        x, y = calls[0]
+        assert len(x) == len(y) == 50
+        assert y[-1] == 1099
+        assert panel.buffer.view("Boost")[-1] == 5.0
+
+        # Nothing new: refresh is a no-op
+        assert panel.refresh_plots() == 0
+
+        panel.plots["gps"].hide()
+        panel.update_data({"RPM": 2000})
+        assert panel.refresh_plots() == len(panel.curves) - len(panel.GPS_CHANNELS)
+
+        panel.close()
+        panel.deleteLater()
+        app.processEvents()
@@ -0,0 +1,183 @@
+"""
+LLM Streaming Tests
+
+Tests token streaming from LocalLLMAdapter and RAGAIAdvisor.answer_stream
+against fake backends: time to first token does not grow with answer
+length, cancellation stops the backend, and the streamed answer matches
+the non-streaming one.
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+class FakeStream:
+    """Token stream that produces one chunk every ``delay`` seconds."""
+
+    def __init__(self, tokens, wrap, delay=0.002):
+        self.tokens = tokens
+        self.wrap = wrap
+        self.delay = delay
+        self.produced = 0
+        self.closed = False
+
+    def __iter__(self):
+        for token in self.tokens:
+            if self.closed:
+                return
+            time.sleep(self.delay)
+            self.produced += 1
+            yield self.wrap(token)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeOllama:
+    """Stands in for the ollama module: chat()/generate() with stream=True."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.streams = []
+
+    def _respond(self, wrap, stream):
+        if not stream:
+            return wrap("".join(self.tokens))
+        self.streams.append(FakeStream(self.tokens, wrap))
+        return self.streams[-1]
+
+    def chat(self, model, messages, options=None, stream=False):
+        return self._respond(lambda text: {"message": {"content": text}}, stream)
+
+    def generate(self, model, prompt, system=None, options=None, stream=False):
+        return self._respond(lambda text: {"response": text}, stream)
+
+
+def _answer_tokens(count):
+    return ["Boost", " creep", " is"] + [f" word{i}" for i in range(count)] + ["."]
+
+
+class TestLocalLLMAdapterStreaming:
+    """Test LocalLLMAdapter.generate_stream backends."""
+
+    def _adapter(self, backend):
+        from services.local_llm_adapter import LocalLLMAdapter
+        adapter = LocalLLMAdapter(backend="none")
+        adapter.backend = backend
+        adapter.model_name = "fake"
+        adapter.available = True
+        return adapter
+
+    def test_ollama_stream_and_cancel(self, monkeypatch):
+        import services.local_llm_adapter as adapter_module
+        fake = FakeOllama(_answer_tokens(50))
+        monkeypatch.setattr(adapter_module, "ollama", fake)
+        adapter = self._adapter("ollama")
+
+        assert "".join(adapter.generate_stream("what is boost creep")) == "".join(fake.tokens)
+
+        cancel = threading.Event()
+        received = []
+        for token in adapter.generate_stream("what is boost creep", cancel=cancel):
+            received.append(token)
+            if len(received) == 5:
+                cancel.set()
+        assert len(received) == 5
+        assert fake.streams[-1].closed and fake.streams[-1].produced < 10
+
+    def test_llama_cpp_stream_closed_early(self):
+        adapter = self._adapter("llama_cpp")
+        stream = FakeStream(_answer_tokens(50), lambda text: {"choices": [{"text": text}]})
+        adapter.model = lambda prompt, **kwargs: stream if kwargs.get("stream") else None
+
+        tokens = adapter.generate_stream("what is boost creep", system_prompt="You are a tuner")
+        assert next(tokens) == "Boost"
+        tokens.close()
+        assert stream.closed and stream.produced == 1
+
+    def test_unavailable_backend_raises(self):
+        from services.local_llm_adapter import LocalLLMAdapter
+        with pytest.raises(RuntimeError):
+            next(LocalLLMAdapter(backend="none").generate_stream("hello"))
+
+
+class TestAdvisorStreaming:
+    """Test RAGAIAdvisor.answer_stream with a fake Ollama backend."""
+
+    @pytest.fixture
+    def make_advisor(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        import services.auto_knowledge_ingestion_service as ingestion
+        monkeypatch.setattr(ingestion, "start_auto_ingestion", lambda *a, **k: False)
+        import services.ai_advisor_rag as rag
+        from services.vector_knowledge_store import VectorKnowledgeStore
+
+        def make(tokens):
+            fake = FakeOllama(tokens)
+            monkeypatch.setattr(rag, "ollama", fake)
+            monkeypatch.setattr(rag, "OLLAMA_AVAILABLE", True)
+            store = VectorKnowledgeStore(persist_directory=tempfile.mkdtemp(dir=tmp_path))
+            store.add_knowledge("Boost creep is boost rising past target at high rpm.", {"topic": "boost creep"})
+            advisor = rag.RAGAIAdvisor(use_local_llm=False, enable_web_search=False, vector_store=store,
+                                       enable_answer_cache=False)
+            advisor.auto_populator = None
+            advisor.conversation_manager = None  # Randomized openings
+            advisor.use_local_llm = True
+            advisor.llm_available = True
+            return advisor, fake
+
+        return make
+
+    def _time_to_first_token(self, advisor, question):
+        start = time.perf_counter()
+        events = advisor.answer_stream(question)
+        for event in events:
+            if event["type"] == "token":
+                first = time.perf_counter() - start
+                break
+        rest = list(events)
+        return first, time.perf_counter() - start, rest
+
+    def test_first_token_time_independent_of_length(self, make_advisor):
+        advisor, _ = make_advisor(_answer_tokens(20))
+        short_first, _, _ = self._time_to_first_token(advisor, "what is boost creep")
+        advisor, _ = make_advisor(["**Step 1: Think about it**\n"] + _answer_tokens(400))
+        long_first, long_total, rest = self._time_to_first_token(advisor, "what is boost creep")
+
+        assert long_total > 0.8
+        assert long_first < 0.25 and long_first < long_total / 4
+        assert long_first < short_first + 0.1
+        assert rest[-1]["type"] == "done"
+
+    def test_stream_matches_answer(self, make_advisor):
+        tokens = ["**Step 1: Think**\n", "Answer:", " Boost", " creep is", " boost past", " target.\n", "- Check the", " wastegate"]
+        advisor, _ = make_advisor(tokens)
+        events = list(advisor.answer_stream("what is boost creep"))
+        assert events[0]["type"] == "sources" and events[0]["sources"]
+        assert events[-1]["type"] == "done"
+        streamed = "".join(e["text"] for e in events if e["type"] == "token")
+        assert streamed == "Boost creep is boost past target.\n- Check the wastegate"
+
+        response = advisor.answer("what is boost creep")
+        assert events[-1]["response"].answer == response.answer
+        assert response.answer.startswith(streamed)
+
+    def test_cancel_stops_generation(self, make_advisor):
+        advisor, fake = make_advisor(_answer_tokens(400))
+        cancel = threading.Event()
+        events = []
+        for event in advisor.answer_stream("what is boost creep", cancel=cancel):
+            events.append(event)
+            if event["type"] == "token":
+                cancel.set()
+        assert [e["type"] for e in events] == ["sources", "token"]
+        assert fake.streams[-1].closed and fake.streams[-1].produced < 20
+        assert advisor.conversation_history == []
@@ -0,0 +1,147 @@
+"""
+Log Decimation Tests
+
+Tests the min/max level-of-detail pyramid used by the log graphing widget.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.log_decimation import ChannelPyramid, LogPyramid, cache_path_for, finite_runs
+from services.universal_log_parser import LogData, LogFormat, LogMetadata
+
+
+def _signal(n):
+    t = np.arange(n) * 0.01
+    rng = np.random.default_rng(7)
+    v = np.sin(t * 0.5) * 100 + rng.normal(0, 5, n)
+    v[n // 3] = 500.0  # Single-sample spike must survive decimation
+    v[2 * n // 3] = -500.0
+    return t, v
+
+
+class TestChannelPyramid:
+    """Test pyramid construction and queries."""
+
+    def test_levels_preserve_envelope(self):
+        t, v = _signal(100_000)
+        pyramid = ChannelPyramid.build(t, v)
+
+        assert pyramid.sample_count == len(t)
+        assert len(pyramid.levels) > 3
+        for level in pyramid.levels[1:]:
+            assert level.max_value.max() == 500.0
+            assert level.min_value.min() == -500.0
+            assert np.all(level.min_value <= level.max_value)
+        assert pyramid.value_range() == (-500.0, 500.0)
+
+    def test_envelope_bounded_by_pixel_width(self):
+        t, v = _signal(1_000_000)
+        pyramid = ChannelPyramid.build(t, v)
+
+        xs, lower, upper = pyramid.envelope(t[0], t[-1], 800)
+        assert len(xs) <= 800 + 2
+        assert upper.max() == 500.0 and lower.min() == -500.0
+        assert np.all(np.diff(xs) >= 0)
+
+        # Zoomed right in, raw samples are returned
+        xs, lower, upper = pyramid.envelope(100.0, 101.0, 800)
+        assert lower is upper
+        assert np.allclose(np.diff(xs), 0.01)
+
+    def test_missing_samples_do_not_blank_buckets(self):
+        t, v = _signal(100_000)
+        v[12_345] = np.nan
+        v[50_000:50_004] = np.nan  # One whole level-1 bucket
+        pyramid = ChannelPyramid.build(t, v)
+
+        level = pyramid.levels[1]
+        assert np.isnan(level.min_value).sum() == 1 and np.isnan(level.max_value).sum() == 1
+        for level in pyramid.levels[2:]:
+            assert not np.isnan(level.min_value).any()
+            assert not np.isnan(level.max_value).any()
+            assert level.max_value.max() == 500.0
+
+    def test_gaps_split_plot_runs(self):
+        t, v = _signal(1_000)
+        v[100] = np.nan
+        v[500:510] = np.nan
+        v[998] = np.inf
+        xs, lower, upper = ChannelPyramid.build(t, v).envelope(float(t[0]), float(t[-1]), 2_000)
+        assert lower is upper
+        assert finite_runs(xs, lower, upper) == [slice(0, 100), slice(101, 500), slice(510, 998), slice(999, 1000)]
+        assert finite_runs(np.array([np.nan])) == [] and finite_runs(np.array([])) == []
+
+    def test_disk_cache_round_trip(self, tmp_path):
+        t, v = _signal(50_000)
+        log_path = tmp_path / "run.csv"
+        log_path.write_text("Time,RPM\n")
+        log_data = LogData(metadata=LogMetadata(format=LogFormat.CSV_GENERIC), data={"RPM": v}, time=t)
+
+        built = LogPyramid.load_or_build(log_path, log_data)
+        assert cache_path_for(log_path).exists()
+
+        loaded = LogPyramid.load_or_build(log_path, LogData(
+            metadata=LogMetadata(format=LogFormat.CSV_GENERIC), data={}, time=[],
+        ))
+        assert list(loaded.channels) == ["RPM"]
+        for a, b in zip(built.get("RPM").levels, loaded.get("RPM").levels):
+            np.testing.assert_array_equal(a.max_value, b.max_value)
+            np.testing.assert_array_equal(a.min_time, b.min_time)
+
+        # Modified log invalidates the cache
+        log_path.write_text("Time,RPM,TPS\n")
+        rebuilt = LogPyramid.load_or_build(log_path, LogData(
+            metadata=LogMetadata(format=LogFormat.CSV_GENERIC), data={}, time=[],
+        ))
+        assert rebuilt.channels == {}
+
+
+class TestGraphRepaint:
+    """Paint-time check for the graph widget with a 1M-sample channel."""
+
+    def test_repaint_under_frame_budget(self, tmp_path):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        pytest.importorskip("PySide6")
+        from PySide6.QtGui import QImage
+        from PySide6.QtWidgets import QApplication
+
+        from services.multi_log_comparison import LogFile
+        from ui.advanced_log_graphing import AdvancedLogGraphWidget, GraphChannel
+
+        app = QApplication.instance() or QApplication([])
+        t, v = _signal(1_000_000)
+        log_path = tmp_path / "long.csv"
+        log_path.write_text("Time,RPM\n")
+
+        widget = AdvancedLogGraphWidget()
+        widget.resize(1280, 720)
+        widget.comparison.logs.append(LogFile(
+            file_path=str(log_path),
+            name="long",
+            log_data=LogData(metadata=LogMetadata(format=LogFormat.CSV_GENERIC), data={"RPM": v}, time=t),
+        ))
+        widget.channels["RPM"] = GraphChannel(name="RPM")
+        widget.x_min, widget.x_max = float(t[0]), float(t[-1])
+        widget.y_min, widget.y_max = -600.0, 600.0
+
+        image = QImage(widget.size(), QImage.Format_ARGB32)
+        widget.render(image)  # First paint builds the pyramid
+
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            widget.render(image)
+            timings.append(time.perf_counter() - start)
+        widget.deleteLater()
+        app.processEvents()
+
+        assert min(timings) * 1000.0 < 16.0
@@ -0,0 +1,134 @@
+"""
+Map Correction Engine Tests
+
+Tests cell binning, transient filtering and knock statistics of the batch
+VE/ignition correction engine.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.map_correction_engine import CorrectionFilters, MapCorrectionEngine
+from services.tune_map_database import MapCategory, TuningMap
+from services.universal_log_parser import LogData, LogFormat, LogMetadata
+
+RPM_AXIS = [1000, 2000, 3000, 4000, 5000, 6000]
+LOAD_AXIS = [30, 60, 90, 120, 150]
+
+
+def _steady_log(n=50_000, seed=0):
+    """Steady-state samples with a known lean cell at 3000 rpm / 90 kPa."""
+    rng = np.random.default_rng(seed)
+    rpm = rng.uniform(800, 6200, n)
+    load = rng.uniform(25, 155, n)
+    lam = np.full(n, 1.0) + rng.normal(0, 0.005, n)
+    lean = (np.abs(rpm - 3000) < 500) & (np.abs(load - 90) < 15)
+    lam[lean] *= 1.08
+    return rpm, load, lam, lean
+
+
+class TestMapCorrectionEngine:
+    """Test batch cell-binned corrections."""
+
+    def test_lean_cell_gets_enrichment(self):
+        rpm, load, lam, _ = _steady_log()
+        engine = MapCorrectionEngine(RPM_AXIS, LOAD_AXIS, target_lambda=1.0)
+        table = engine.analyze_arrays(rpm, load, lam)
+
+        assert table.shape == (len(RPM_AXIS), len(LOAD_AXIS))
+        assert table.hit_count.sum() == len(rpm)
+        assert table.ve_correction[2, 2] == pytest.approx(1.08, abs=0.01)
+        assert table.ve_correction[0, 0] == pytest.approx(1.0, abs=0.005)
+        assert table.confidence[2, 2] > 0.9
+
+    def test_correction_is_capped(self):
+        rpm, load, lam, _ = _steady_log()
+        engine = MapCorrectionEngine(RPM_AXIS, LOAD_AXIS, max_correction=0.05)
+        table = engine.analyze_arrays(rpm, load, lam * 1.3)
+        assert table.ve_correction.max() <= 1.05 + 1e-12
+
+    def test_transients_and_warmup_rejected(self):
+        n = 1000
+        t = np.arange(n) * 0.01
+        rpm = np.full(n, 3000.0)
+        load = np.full(n, 90.0)
+        lam = np.full(n, 1.0)
+        tps = np.full(n, 30.0)
+        tps[500:] = 80.0  # Throttle stab at t=5.0s
+        lam[500:560] = 0.8  # Accel enrichment dip during the settle window
+        coolant = np.full(n, 90.0)
+        coolant[:100] = 40.0
+
+        engine = MapCorrectionEngine(RPM_AXIS, LOAD_AXIS, filters=CorrectionFilters(transient_settle_s=0.5))
+        table = engine.analyze_arrays(rpm, load, lam, time=t, throttle=tps, coolant_temp=coolant)
+
+        assert table.rejected["warm_up"] == 100
+        assert table.rejected["transient"] == 51  # the step sample plus 0.5s of settle
+        assert table.ve_correction[2, 2] == pytest.approx(1.0, abs=0.02)
+
+    def test_knock_statistics(self):
+        n = 2000
+        rpm = np.full(n, 5000.0)
+        load = np.full(n, 150.0)
+        lam = np.full(n, 0.8)
+        knock = np.zeros(n)
+        knock[::5] = 2.0  # 20% knock rate
+
+        engine = MapCorrectionEngine(RPM_AXIS, LOAD_AXIS, target_lambda=0.8)
+        table = engine.analyze_arrays(rpm, load, lam, knock=knock)
+
+        assert table.knock_rate[4, 4] == pytest.approx(0.2)
+        assert table.knock_max[4, 4] == 2.0
+        assert table.timing_correction[4, 4] == -4.0
+        assert table.timing_correction[0, 0] == 0.0
+
+    def test_analyze_log_and_apply_to_tuning_map(self):
+        rpm, load, lam, _ = _steady_log(n=20_000)
+        afr = lam * 14.7
+        log = LogData(
+            metadata=LogMetadata(format=LogFormat.CSV_GENERIC, sample_rate=100.0),
+            data={"RPM": rpm.tolist(), "MAP": load.tolist(), "AFR": afr.tolist()},
+            time=[],
+        )
+        fuel_map = TuningMap(
+            category=MapCategory.FUEL_MAP,
+            name="VE",
+            description="",
+            data={"rpm_axis": RPM_AXIS, "load_axis": LOAD_AXIS, "afr_target": 14.7},
+        )
+
+        from services.auto_tuning_engine import AutoTuningEngine
+
+        table = AutoTuningEngine().analyze_log(log, fuel_map)
+        ve = [[50.0] * len(LOAD_AXIS) for _ in RPM_AXIS]
+        corrected = table.apply_to_table(ve)
+        assert corrected[2][2] == pytest.approx(54.0, abs=0.5)
+        assert corrected[0][0] == pytest.approx(50.0, abs=0.3)
+
+    def test_missing_axes_rejected(self):
+        bad_map = TuningMap(category=MapCategory.FUEL_MAP, name="x", description="", data={"value": 1})
+        with pytest.raises(ValueError):
+            MapCorrectionEngine.from_tuning_map(bad_map)
+
+    @pytest.mark.slow
+    def test_million_samples_performance(self):
+        rpm, load, lam, _ = _steady_log(n=2_000_000, seed=1)
+        n = len(rpm)
+        t = np.arange(n) * 0.01
+        tps = np.full(n, 40.0)
+        knock = np.zeros(n)
+        engine = MapCorrectionEngine(RPM_AXIS, LOAD_AXIS)
+
+        start = time.perf_counter()
+        table = engine.analyze_arrays(rpm, load, lam, time=t, throttle=tps, knock=knock)
+        elapsed = time.perf_counter() - start
+
+        assert table.samples_used == n
+        assert elapsed < 3.0
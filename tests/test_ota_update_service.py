@@ -0,0 +1,296 @@
+"""
+OTA Update Service Tests
+
+Runs fully offline against a local HTTP fixture server: delta patch round
+trips, ranged downloads resumed after mid-transfer disconnects, A/B slot
+installs, a corrupted patch and rollback after a failed health check.
+"""
+
+import hashlib
+import json
+import random
+import sys
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import services.ota_update_service as ota_module
+from services.ota_delta import DeltaError, apply_delta, create_delta, tree_files
+from services.ota_update_service import OTAUpdateService, UpdateStatus
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        if self.path.startswith("/api/updates/check"):
+            body = json.dumps(server.check_response).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        data = server.files.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        start = int(self.headers["Range"].split("=")[1].split("-")[0]) if self.headers.get("Range") else 0
+        server.requests.append((self.path, start))
+        if start >= len(data):
+            self.send_response(416)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+        self.send_header("Content-Length", str(len(data) - start))
+        self.end_headers()
+        body = data[start:]
+        drop = server.drops.pop(0) if server.drops else None
+        if drop is not None:
+            body = body[:drop]  # Disconnect mid-transfer
+            self.close_connection = True
+        self.wfile.write(body)
+        server.bytes_sent += len(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    httpd.files, httpd.drops, httpd.requests, httpd.bytes_sent = {}, [], [], 0
+    httpd.check_response = {"update_available": False}
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _write_tree(root, files):
+    for rel, data in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return root
+
+
+def _source(seed, lines=1500):
+    rng = random.Random(seed)
+    words = ["boost", "timing", "fuel", "knock", "lambda", "rpm", "map", "duty", "ecu", "table"]
+    return "".join(f"VALUE_{i} = '{' '.join(rng.choices(words, k=6))}'\n" for i in range(lines)).encode()
+
+
+BASE = {
+    "services/engine.py": _source(1),
+    "services/sensors.py": _source(2, 400),
+    "config.py": b"VERSION = '1.0.0'\n",
+    "old_notes.txt": b"obsolete\n",
+}
+
+
+def _target():
+    engine = BASE["services/engine.py"].replace(b"VALUE_700 = ", b"VALUE_700 = 'retuned' or ")
+    return {
+        "services/engine.py": engine,
+        "services/sub/sensors.py": BASE["services/sensors.py"],  # Moved
+        "services/new_feature.py": b"ENABLED = True\n",
+        "config.py": b"VERSION = '1.1.0'\n",
+    }
+
+
+def _zip_tree(root, output):
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        for rel, path in tree_files(root).items():
+            archive.write(path, rel)
+    return output.read_bytes()
+
+
+SERVICE_DIRECTORIES = ("slots", "downloads", "backups", "data")  # Created in the install directory
+
+
+def _contents(root):
+    return {rel: path.read_bytes() for rel, path in tree_files(root, SERVICE_DIRECTORIES).items()}
+
+
+def _publish(server, tmp_path, target, version="1.1.0", base_version="1.0.0", base=None, corrupt_delta=False):
+    """Serve full and delta packages for ``target`` and announce them."""
+    base_dir = _write_tree(tmp_path / f"release_{base_version}", base or BASE)
+    target_dir = _write_tree(tmp_path / f"release_{version}", target)
+    full = _zip_tree(target_dir, tmp_path / f"full_{version}.zip")
+    delta_path = tmp_path / f"delta_{version}.zip"
+    create_delta(base_dir, target_dir, delta_path, base_version, version)
+    if corrupt_delta:
+        with zipfile.ZipFile(delta_path) as archive:
+            manifest, literal = archive.read("delta_manifest.json"), bytearray(archive.read("delta_data.bin"))
+        literal[len(literal) // 2] ^= 0xFF
+        with zipfile.ZipFile(delta_path, "w") as archive:
+            archive.writestr("delta_manifest.json", manifest)
+            archive.writestr("delta_data.bin", bytes(literal))
+    delta = delta_path.read_bytes()
+    server.files[f"/full_{version}.zip"] = full
+    server.files[f"/delta_{version}.zip"] = delta
+    server.check_response = {
+        "update_available": True,
+        "version": version,
+        "download_url": f"{server.url}/full_{version}.zip",
+        "file_size": len(full),
+        "checksum": hashlib.sha256(full).hexdigest(),
+        "base_version": base_version,
+        "delta_url": f"{server.url}/delta_{version}.zip",
+        "delta_size": len(delta),
+        "delta_checksum": hashlib.sha256(delta).hexdigest(),
+    }
+    return full, delta
+
+
+@pytest.fixture
+def install_dir(tmp_path):
+    return _write_tree(tmp_path / "install", BASE)
+
+
+def _service(server, install_dir, **kwargs):
+    kwargs.setdefault("entry_module", "config")
+    return OTAUpdateService(server.url, "1.0.0", install_directory=install_dir, retry_delay=0.0, **kwargs)
+
+
+class TestDelta:
+    """Test delta patch creation and application."""
+
+    def test_round_trip_is_small_and_exact(self, tmp_path):
+        base_dir = _write_tree(tmp_path / "base", BASE)
+        target_dir = _write_tree(tmp_path / "target", _target())
+        stats = create_delta(base_dir, target_dir, tmp_path / "delta.zip", "1.0.0", "1.1.0")
+        full = _zip_tree(target_dir, tmp_path / "full.zip")
+        assert stats["deleted"] == 2 and stats["literal_bytes"] < 4096
+        assert (tmp_path / "delta.zip").stat().st_size * 5 < len(full)
+
+        output = _write_tree(tmp_path / "output", BASE)
+        apply_delta(tmp_path / "delta.zip", base_dir, output)
+        assert _contents(output) == _target()
+
+        (base_dir / "services" / "engine.py").write_bytes(b"locally modified")
+        with pytest.raises(DeltaError):
+            apply_delta(tmp_path / "delta.zip", base_dir, tmp_path / "other")
+
+
+class TestDownload:
+    """Test resumable downloads."""
+
+    def test_resumes_after_disconnects(self, server, install_dir, tmp_path, monkeypatch):
+        monkeypatch.setattr(ota_module, "PROGRESS_NOTIFY_INTERVAL", 3600.0)
+        target = dict(_target(), **{"assets/map.bin": random.Random(3).randbytes(600_000)})
+        full, _ = _publish(server, tmp_path, target)
+        service = _service(server, install_dir)
+        progress = []
+        service.set_progress_callback(lambda p: progress.append((p.status, p.downloaded_bytes)))
+
+        server.drops = [150_000, 200_000]
+        update = service.check_for_updates(force=True)
+        assert service.download_update(update, prefer_delta=False)
+        assert service.current_update_file.read_bytes() == full
+        # Resumed from the last whole chunk written before each drop
+        starts = [start for _, start in server.requests]
+        assert len(starts) == 3 and 0 == starts[0] < starts[1] <= 150_000 < starts[2] <= 350_000
+        assert server.bytes_sent < len(full) + 2 * ota_module.DOWNLOAD_CHUNK_SIZE
+        downloading = [p for p in progress if p[0] == UpdateStatus.DOWNLOADING]
+        assert len(downloading) <= 3 and downloading[-1][1] == len(full)
+
+    def test_gives_up_without_progress(self, server, install_dir, tmp_path):
+        _publish(server, tmp_path, _target())
+        service = _service(server, install_dir, download_retries=3)
+        server.drops = [0, 0, 0]
+        assert not service.download_update(service.check_for_updates(force=True))
+        assert service.update_progress.status == UpdateStatus.FAILED and len(server.requests) == 3
+
+
+class TestInstall:
+    """Test A/B installs, fallback and rollback."""
+
+    def test_delta_installs_into_slots(self, server, install_dir, tmp_path):
+        service = _service(server, install_dir)
+        _, delta = _publish(server, tmp_path, _target())
+        update = service.check_for_updates(force=True)
+        assert service.download_update(update) and service.install_update(update)
+        assert server.requests == [("/delta_1.1.0.zip", 0)]
+        assert service.active_directory == service.slots_directory / "a"
+        assert _contents(service.active_directory) == _target()
+        assert _contents(install_dir) == BASE  # The previous tree is untouched
+        assert (service.slots_directory / "current").resolve() == (service.slots_directory / "a").resolve()
+        assert service.app_version == "1.1.0" and service.get_update_history()[-1]["delta"]
+
+        # The next update goes to slot B, patched against slot A
+        newer = dict(_target(), **{"config.py": b"VERSION = '1.2.0'\n"})
+        _publish(server, tmp_path, newer, version="1.2.0", base_version="1.1.0", base=_target())
+        update = service.check_for_updates(force=True)
+        assert service.download_update(update) and service.install_update(update)
+        assert service.active_directory == service.slots_directory / "b"
+        assert _contents(service.active_directory) == newer
+        assert _contents(service.slots_directory / "a") == _target()
+
+        assert service.rollback_update()
+        assert service.active_directory == service.slots_directory / "a" and service.app_version == "1.1.0"
+
+    def test_corrupted_patch_falls_back_to_full_package(self, server, install_dir, tmp_path):
+        service = _service(server, install_dir)
+        _publish(server, tmp_path, _target(), corrupt_delta=True)
+        update = service.check_for_updates(force=True)
+        assert service.download_update(update) and service.install_update(update)
+        assert [path for path, _ in server.requests] == ["/delta_1.1.0.zip", "/full_1.1.0.zip"]
+        installed = _contents(service.active_directory)
+        assert {rel: installed[rel] for rel in _target()} == _target()
+
+        # Without a full package the install fails and nothing changes
+        service = _service(server, _write_tree(tmp_path / "install2", BASE))
+        update = service.check_for_updates(force=True)
+        update.download_url = ""
+        assert service.download_update(update) and not service.install_update(update)
+        assert service.update_progress.status == UpdateStatus.FAILED
+        assert service.active_directory == tmp_path / "install2" and service.app_version == "1.0.0"
+
+    def test_failed_health_check_rolls_back(self, server, install_dir, tmp_path):
+        service = _service(server, install_dir)
+        broken = dict(_target(), **{"services/new_feature.py": b"def broken(:\n"})
+        _publish(server, tmp_path, broken)
+        update = service.check_for_updates(force=True)
+        assert service.download_update(update) and not service.install_update(update)
+        assert service.active_directory == install_dir and service.app_version == "1.0.0"
+        assert service.update_progress.status == UpdateStatus.FAILED
+        assert not service.rollback_update()  # Nothing older to go back to
+
+        service.health_check = lambda slot: True
+        assert service.download_update(update) and service.install_update(update)
+        assert service.active_directory == service.slots_directory / "a"
+
+    def test_health_check_covers_written_files_and_entry_import(self, server, install_dir, tmp_path):
+        # Not part of the update: neither copied nor checked when outside the app paths
+        _write_tree(install_dir, {
+            "services/legacy.py": b"def newer_syntax(:\n",
+            "telemetry/buffer.sqlite": b"runtime data",
+            "venv/bin/python": b"interpreter",
+        })
+        service = _service(server, install_dir)
+        _publish(server, tmp_path, _target())
+        update = service.check_for_updates(force=True)
+        assert service.download_update(update) and service.install_update(update)
+        slot = service.active_directory
+        assert (slot / "services" / "legacy.py").exists()
+        assert not (slot / "telemetry").exists() and not (slot / "venv").exists()
+        assert "services/new_feature.py" in service.installed_files
+
+        # The entry module fails to import: rolled back
+        newer = dict(_target(), **{"config.py": b"import module_removed_in_this_release\n"})
+        _publish(server, tmp_path, newer, version="1.2.0", base_version="1.1.0", base=_target())
+        update = service.check_for_updates(force=True)
+        assert service.download_update(update) and not service.install_update(update)
+        assert service.active_directory == slot and service.app_version == "1.1.0"
@@ -0,0 +1,108 @@
+"""
+Performance Tracker Tests
+
+Tests the ring-buffer track/history storage, snapshot views and incremental
+deltas.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.performance_tracker import PerformanceTracker, RingSeries
+
+
+class TestRingSeries:
+    """Test the double-write ring."""
+
+    def test_views_are_contiguous_and_read_only(self):
+        ring = RingSeries(4, 2)
+        for i in range(10):
+            ring.append(i, -i)
+            view = ring.view()
+            expected = [[j, -j] for j in range(max(0, i - 3), i + 1)]
+            assert view.tolist() == expected
+            assert view.flags.c_contiguous
+        with pytest.raises(ValueError):
+            view[0, 0] = 1.0
+
+    def test_since(self):
+        ring = RingSeries(4, 1)
+        ring.append(1.0)
+        ring.append(2.0)
+        rows, version = ring.since(0)
+        assert rows.ravel().tolist() == [1.0, 2.0]
+        ring.append(3.0)
+        rows, version = ring.since(version)
+        assert rows.ravel().tolist() == [3.0]
+        assert ring.since(version)[0].size == 0
+
+        # Fell behind by more than the capacity: whole window
+        for value in range(4, 12):
+            ring.append(float(value))
+        assert ring.since(version)[0].ravel().tolist() == [8.0, 9.0, 10.0, 11.0]
+
+        ring.clear()
+        ring.append(20.0)
+        assert ring.since(ring.version - 2)[0].ravel().tolist() == [20.0]
+
+
+class TestPerformanceTracker:
+    """Test tracker storage and snapshots."""
+
+    def test_snapshot_track_behaves_like_point_list(self):
+        tracker = PerformanceTracker(track_capacity=3)
+        assert not tracker.snapshot().track_points
+        for i in range(5):
+            tracker.update_gps(36.0 + i, -121.0 - i)
+
+        snapshot = tracker.snapshot()
+        points = snapshot.track_points
+        assert points == [(38.0, -123.0), (39.0, -124.0), (40.0, -125.0)]
+        assert len(points) == 3 and points
+        assert points[-1] == (40.0, -125.0)
+        assert [lat for lat, _ in points] == [38.0, 39.0, 40.0]
+        assert points.array.shape == (3, 2)
+
+        new_points, version = tracker.track_since(snapshot.track_version)
+        assert new_points.size == 0
+        tracker.update_gps(50.0, -130.0)
+        new_points, _ = tracker.track_since(version)
+        assert new_points.tolist() == [[50.0, -130.0]]
+
+    def test_speed_history_and_metrics(self):
+        tracker = PerformanceTracker()
+        for i in range(80):
+            tracker.update_speed(i * 1.5, timestamp=1000.0 + i * 0.1)
+
+        history = tracker.speed_history()
+        assert history.shape == (80, 3)
+        assert history[-1, 1] == pytest.approx(79 * 1.5)
+        assert history[-1, 2] == pytest.approx(tracker.distance_m)
+        assert tracker.snapshot().metrics["0-60 mph"] == pytest.approx(3.9)
+
+        # Coming to a stop for more than 5 s resets the session
+        tracker.update_speed(0.0, timestamp=1010.0)
+        tracker.update_speed(0.0, timestamp=1020.0)
+        assert tracker.speed_history().shape == (0, 3)
+        assert tracker.snapshot().best_metrics["0-60 mph"] == pytest.approx(3.9)
+
+    def test_snapshot_cost_independent_of_track_length(self):
+        def snapshot_seconds(points):
+            tracker = PerformanceTracker(track_capacity=points)
+            lat = np.linspace(36.0, 36.1, points)
+            for a in lat.tolist():
+                tracker.update_gps(a, -121.0)
+            start = time.perf_counter()
+            for _ in range(2000):
+                tracker.snapshot()
+            return time.perf_counter() - start
+
+        small, large = snapshot_seconds(2_000), snapshot_seconds(200_000)
+        assert large < small * 3
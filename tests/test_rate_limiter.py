@@ -0,0 +1,247 @@
+"""
+Rate Limiter Tests
+
+Property tests of the token-bucket limiter against an exact reference
+model (random request sequences, hierarchical tiers), bounded memory with
+100,000 distinct clients, exact limits under concurrent use and the
+route decorator.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import random
+import sys
+import threading
+import tracemalloc
+from fractions import Fraction
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi import FastAPI, Request
+from pydantic import BaseModel
+
+# Loaded from its file: importing the api package needs the whole server's dependencies
+_spec = importlib.util.spec_from_file_location(
+    "rate_limiter", Path(__file__).parent.parent / "api" / "rate_limiter.py"
+)
+rate_limiter_module = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = rate_limiter_module
+_spec.loader.exec_module(rate_limiter_module)
+RateLimit = rate_limiter_module.RateLimit
+RateLimiter = rate_limiter_module.RateLimiter
+rate_limit = rate_limiter_module.rate_limit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ReferenceBucket:
+    """Token bucket with exact arithmetic."""
+
+    def __init__(self, limit, start):
+        self.capacity = Fraction(limit.capacity)
+        self.rate = Fraction(limit.requests, limit.window)
+        self.tokens = self.capacity
+        self.last = Fraction(start)
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (Fraction(now) - self.last) * self.rate)
+        self.last = Fraction(now)
+
+
+def _limiter(clock, **kwargs):
+    # Intervals and times are binary fractions, so float arithmetic is exact
+    limiter = RateLimiter(clock=clock, **kwargs)
+    limiter.add_limit("/api/ai", RateLimit(requests=8, window=2, burst=3))
+    limiter.add_limit("/api/telemetry", RateLimit(requests=4, window=4))
+    limiter.add_endpoint_limit("/api/ai", RateLimit(requests=16, window=2, burst=5))
+    limiter.set_global_limit(RateLimit(requests=32, window=4, burst=12))
+    return limiter
+
+
+class TestTokenBucket:
+    """Test limits against the reference model."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_reference_model(self, seed):
+        rng = random.Random(seed)
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        buckets = {}
+
+        def tiers(client, endpoint):
+            prefix = limiter.match_endpoint(endpoint)
+            keys = [(("client", prefix, client), limiter.limits.get(prefix, limiter.default_limit))]
+            if prefix in limiter.endpoint_limits:
+                keys.append((("endpoint", prefix), limiter.endpoint_limits[prefix]))
+            keys.append((("global",), limiter.global_limit))
+            return [buckets.setdefault(key, ReferenceBucket(limit, clock.now)) for key, limit in keys]
+
+        admitted = {}
+        for _ in range(3000):
+            clock.now += rng.choice([0, 0, 0, 1, 2, 5, 16, 64]) / 64
+            client = f"ip:10.0.0.{rng.randrange(4)}"
+            endpoint = rng.choice(["/api/ai/ask", "/api/ai", "/api/telemetry/live", "/api/other"])
+            reference = tiers(client, endpoint)
+            for bucket in reference:
+                bucket.refill(clock.now)
+            expected = all(bucket.tokens >= 1 for bucket in reference)
+            if expected:
+                for bucket in reference:
+                    bucket.tokens -= 1
+
+            allowed, info = limiter.check(client, endpoint)
+            assert allowed == expected
+            assert info["remaining"] == min(int(b.tokens) for b in reference)
+            if allowed:
+                admitted.setdefault((client, limiter.match_endpoint(endpoint)), []).append(clock.now)
+            else:
+                assert info["retry_after"] >= 1
+
+        # Any interval [a, b] admits at most burst + (b - a) * rate per client
+        for (_, prefix), times in admitted.items():
+            limit = limiter.limits.get(prefix, limiter.default_limit)
+            for i in range(len(times)):
+                for j in range(i, min(len(times), i + 40)):
+                    assert j - i + 1 <= limit.capacity + (times[j] - times[i]) / limit.interval + 1e-9
+
+    def test_burst_is_bucket_size_not_extra_quota(self):
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        limiter.add_limit("/api/ai", RateLimit(requests=50, window=60, burst=10))
+
+        assert sum(limiter.check("c", "/api/ai/ask")[0] for _ in range(100)) == 10
+        allowed = 0
+        for _ in range(600):  # One request per 0.1 s for 60 s
+            clock.now += 0.1
+            allowed += limiter.check("c", "/api/ai/ask")[0]
+        assert allowed == 50
+        allowed, info = limiter.check("c", "/api/ai/ask")
+        assert not allowed and 1 <= info["retry_after"] <= 2  # One token per 1.2 s
+
+    def test_rejection_consumes_nothing(self):
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        limiter.add_limit("/api/fleet", RateLimit(requests=100, window=60))
+        limiter.set_global_limit(RateLimit(requests=1, window=60, burst=2))
+        assert limiter.check("a", "/api/fleet")[0] and limiter.check("a", "/api/fleet")[0]
+        for _ in range(50):
+            assert not limiter.check("b", "/api/fleet")[0]
+        assert "client:/api/fleet:b" not in limiter.entries
+        clock.now += 60.0
+        assert limiter.check("b", "/api/fleet")[0]
+        assert limiter.entries["client:/api/fleet:b"] == clock.now + 0.6
+
+    @pytest.mark.parametrize("requests,window,burst", [(0, 60, None), (10, 0, None), (10, 60, 0), (10, 60, -1)])
+    def test_invalid_limits_rejected(self, requests, window, burst):
+        limit = RateLimit(requests=requests, window=window, burst=burst)
+        limiter = RateLimiter()
+        for add in (limiter.add_limit, limiter.add_endpoint_limit):
+            with pytest.raises(ValueError):
+                add("/api/ai", limit)
+        with pytest.raises(ValueError):
+            limiter.set_global_limit(limit)
+        assert limiter.check("c", "/api/ai/ask")[0]
+
+
+class BodyModel(BaseModel):
+    question: str
+
+
+class TestDecorator:
+    """Test rate_limit on FastAPI routes (the request arrives as a keyword argument)."""
+
+    def test_route_with_body_is_limited(self, monkeypatch):
+        pytest.importorskip("httpx")
+        from fastapi.testclient import TestClient
+
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        limiter.add_limit("/api/ai", RateLimit(requests=60, window=60, burst=2))
+        monkeypatch.setattr(rate_limiter_module, "rate_limiter", limiter)
+
+        app = FastAPI()
+
+        @app.post("/api/ai/ask")
+        @rate_limit("/api/ai/ask")
+        async def ask(request: BodyModel, http_request: Request):
+            return {"question": request.question}
+
+        client = TestClient(app)
+        for _ in range(2):
+            response = client.post("/api/ai/ask", json={"question": "boost?"})
+            assert response.status_code == 200 and response.json() == {"question": "boost?"}
+        response = client.post("/api/ai/ask", json={"question": "boost?"})
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+        clock.now += 1.0
+        assert client.post("/api/ai/ask", json={"question": "boost?"}).status_code == 200
+
+
+class TestMemoryAndConcurrency:
+    """Test the bounded client table and concurrent checks."""
+
+    def test_distinct_clients_keep_memory_bounded(self):
+        clock = FakeClock()
+        limiter = RateLimiter(max_entries=10_000, clock=clock)
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            for i in range(100_000):
+                clock.now += 0.000001  # Buckets are still refilling when evicted
+                assert limiter.check(f"ip:{i}", "/api/social")[0]
+            size = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+        assert len(limiter.entries) == 10_000
+        assert size < 4 * 1024 * 1024
+        assert limiter.stats["evicted_active"] == 90_000
+
+        clock.now += 120.0
+        assert limiter.cleanup_old_entries() == 10_000 and not limiter.entries
+
+    def test_idle_buckets_are_swept(self):
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        for i in range(1000):
+            limiter.check(f"ip:{i}", "/api/social")
+            clock.now += 1.0  # Each bucket refills within 0.6 s
+        assert len(limiter.entries) < 5 and limiter.stats["evicted_active"] == 0
+
+    def test_threads_admit_exactly_the_limit(self):
+        limiter = RateLimiter()
+        limiter.add_limit("/api/social", RateLimit(requests=10**6, window=1))
+        limiter.set_global_limit(RateLimit(requests=1000, window=10**6))
+        allowed = []
+
+        def worker(n):
+            allowed.append(sum(limiter.check(f"ip:{n}", "/api/social")[0] for _ in range(500)))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sum(allowed) == 1000
+
+    def test_async_requests_admit_exactly_the_limit(self):
+        limiter = RateLimiter()
+        limiter.add_limit("/api/ai", RateLimit(requests=20, window=10**6))
+
+        async def request():
+            await asyncio.sleep(0)
+            return limiter.check("user:1", "/api/ai/ask")[0]
+
+        async def main():
+            return await asyncio.gather(*(request() for _ in range(200)))
+
+        assert sum(asyncio.run(main())) == 20
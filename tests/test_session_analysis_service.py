@@ -0,0 +1,143 @@
+"""
+Session Analysis Service Tests
+
+Tests the streaming log statistics against an in-memory analysis, the
+t-digest percentiles, time above threshold and bounded memory use.
+"""
+
+import csv
+import math
+import sys
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.log_statistics import TDigest, analyze_delimited_log
+from services.session_analysis_service import SessionAnalysisService
+
+THRESHOLDS = {"CoolantTemp": 105.0, "AFR": 15.0}
+
+
+def _write_log(path, rows, seed=0):
+    """Synthetic session log with a lower-rate AFR channel (empty cells)."""
+    rng = np.random.default_rng(seed)
+    time_s = np.cumsum(rng.uniform(0.005, 0.015, rows))
+    columns = {
+        "Timestamp": time_s,
+        "RPM": rng.normal(5000, 1200, rows),
+        "CoolantTemp": 95 + 12 * np.sin(time_s / 30) + rng.normal(0, 1, rows),
+        "AFR": rng.gamma(40, 0.36, rows),
+    }
+    columns["AFR"][rng.random(rows) < 0.3] = np.nan
+    matrix = np.column_stack(list(columns.values()))
+    with open(path, "w", newline="") as f:
+        f.write(",".join(columns) + "\n")
+        for start in range(0, rows, 10_000):
+            f.writelines(
+                ",".join("" if math.isnan(v) else repr(v) for v in row) + "\n"
+                for row in matrix[start:start + 10_000].tolist()
+            )
+    return path
+
+
+def _in_memory(path):
+    """All rows in memory, then exact statistics per channel."""
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    time_s = np.array([float(r["Timestamp"]) for r in rows])
+    hold = np.append(np.diff(time_s), 0.0)
+    result = {}
+    for name in ("RPM", "CoolantTemp", "AFR"):
+        values = np.array([float(r[name]) if r[name] else np.nan for r in rows])
+        present = ~np.isnan(values)
+        finite = values[present]
+        above = present & (values > THRESHOLDS.get(name, np.inf))
+        result[name] = {
+            "count": finite.size,
+            "min": finite.min(),
+            "max": finite.max(),
+            "avg": finite.mean(),
+            "std": finite.std(),
+            "values": np.sort(finite),
+            "time_above": hold[above].sum() if name in THRESHOLDS else None,
+        }
+    return len(rows), time_s[-1] - time_s[0], result
+
+
+@pytest.fixture(scope="module")
+def session_log(tmp_path_factory):
+    return _write_log(tmp_path_factory.mktemp("logs") / "session.csv", 60_000)
+
+
+class TestTDigest:
+    """Test percentile estimates."""
+
+    def test_quantiles_close_to_exact(self):
+        rng = np.random.default_rng(1)
+        values = np.concatenate((rng.lognormal(0, 1, 100_000), rng.normal(50, 5, 20_000)))
+        digest = TDigest()
+        for chunk in np.array_split(rng.permutation(values), 37):
+            part = TDigest()
+            part.update(chunk)
+            digest.merge(part)
+        assert digest.count == values.size
+        assert digest.quantile(0.0) == values.min() and digest.quantile(1.0) == values.max()
+        for q in (0.01, 0.05, 0.5, 0.95, 0.99):
+            rank = np.mean(values <= digest.quantile(q))
+            assert rank == pytest.approx(q, abs=0.002)
+        assert digest.weights.size < digest.compression
+
+
+class TestStreamingAnalysis:
+    """Test the session report against the in-memory analysis."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_matches_in_memory_analysis(self, session_log, workers):
+        rows, duration, expected = _in_memory(session_log)
+        service = SessionAnalysisService(thresholds=THRESHOLDS, workers=workers, chunk_bytes=128 * 1024)
+        report = service.analyze_specific_log(session_log)
+
+        assert report.sample_count == rows
+        assert report.duration_s == pytest.approx(duration)
+        summaries = {s.name: s for s in report.channel_summaries}
+        assert list(summaries) == ["RPM", "CoolantTemp", "AFR"]
+        for name, exact in expected.items():
+            summary = summaries[name]
+            assert summary.count == exact["count"]
+            assert summary.min == exact["min"] and summary.max == exact["max"]
+            assert summary.avg == pytest.approx(exact["avg"], rel=1e-12)
+            assert summary.std == pytest.approx(exact["std"], rel=1e-9)
+            for key, value in summary.percentiles.items():
+                rank = np.searchsorted(exact["values"], value, side="right") / exact["count"]
+                assert rank == pytest.approx(int(key[1:]) / 100.0, abs=0.003)
+            if exact["time_above"] is None:
+                assert summary.time_above_s is None
+            else:
+                assert summary.time_above_s == pytest.approx(exact["time_above"], rel=1e-9)
+                assert summary.time_above_s > 0
+
+    def test_empty_and_header_only_logs(self, tmp_path):
+        service = SessionAnalysisService()
+        for content in ("", "Timestamp,RPM\n"):
+            path = tmp_path / "empty.csv"
+            path.write_text(content)
+            report = service.analyze_specific_log(path)
+            assert report.sample_count == 0 and not report.channel_summaries
+
+    def test_memory_bounded_by_chunk_size(self, tmp_path):
+        def peak_bytes(path):
+            tracemalloc.start()
+            analyze_delimited_log(path, thresholds=THRESHOLDS, chunk_bytes=256 * 1024)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        small = peak_bytes(_write_log(tmp_path / "small.csv", 20_000))
+        large = peak_bytes(_write_log(tmp_path / "large.csv", 150_000))
+        assert large < small * 1.5
+        assert large < 16 * 1024 * 1024
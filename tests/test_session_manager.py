@@ -0,0 +1,120 @@
+"""
+Session Manager Tests
+
+Tests the SQLite session catalog, legacy JSON migration and query scaling.
+"""
+
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.session_manager import SessionManager, SessionMetadata
+
+
+def _session(i, **overrides):
+    values = dict(
+        session_id=f"s{i}",
+        name=f"Session {i}",
+        start_time=1_700_000_000 + i * 3600,
+        track_name="Sebring" if i % 2 else "VIR",
+        vehicle_config={"name": "Miata" if i % 3 else "Mustang"},
+        tags=["race"] if i % 4 == 0 else ["practice"],
+        best_lap_time=None if i % 5 == 0 else 150.0 - i,
+    )
+    values.update(overrides)
+    return SessionMetadata(**values)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    mgr = SessionManager(tmp_path)
+    yield mgr
+    mgr.close()
+
+
+class TestSessionCatalog:
+    """Test persistence and indexed queries."""
+
+    def test_migrates_legacy_json_once(self, tmp_path):
+        legacy = {"sessions": [asdict(_session(i)) for i in range(6)], "last_updated": "2024-01-01"}
+        legacy["sessions"][0]["obsolete_field"] = 1
+        (tmp_path / "sessions.json").write_text(json.dumps(legacy))
+
+        mgr = SessionManager(tmp_path)
+        assert mgr.session_count() == 6
+        assert mgr.get_session("s3").track_name == "Sebring"
+        assert not (tmp_path / "sessions.json").exists()
+        assert (tmp_path / "sessions.json.migrated").exists()
+        mgr.close()
+
+        # Reopening does not import again
+        mgr = SessionManager(tmp_path)
+        assert mgr.session_count() == 6
+        mgr.close()
+
+    def test_filters_and_ordering(self, manager):
+        manager.save_sessions(_session(i) for i in range(20))
+
+        sebring = manager.list_sessions(track_name="Sebring")
+        assert [s.session_id for s in sebring[:2]] == ["s19", "s17"]  # Newest first
+        assert {s.track_name for s in sebring} == {"Sebring"}
+
+        assert {s.session_id for s in manager.list_sessions(vehicle="Mustang")} == {f"s{i}" for i in range(0, 20, 3)}
+        assert {s.session_id for s in manager.list_sessions(tags=["race"])} == {"s0", "s4", "s8", "s12", "s16"}
+
+        window = manager.list_sessions(start_date=_session(5).start_time, end_date=_session(7).start_time)
+        assert [s.session_id for s in window] == ["s7", "s6", "s5"]
+
+        best = manager.best_sessions("Sebring", limit=3)
+        assert [s.session_id for s in best] == ["s19", "s17", "s13"]  # s15 has no lap
+        assert manager.list_tracks() == ["Sebring", "VIR"]
+        assert manager.list_sessions(limit=2, offset=1)[0].session_id == "s18"
+
+    def test_update_end_and_delete(self, manager):
+        session = manager.create_session("Morning", track_name="VIR", tags=["test"])
+        other = manager.create_session("Afternoon")
+        assert other.session_id != session.session_id
+
+        manager.update_session(session.session_id, best_lap_time=101.5, tags=["race"])
+        reloaded = manager.get_session(session.session_id)
+        assert reloaded.best_lap_time == 101.5
+        assert manager.list_sessions(tags=["race"])[0].session_id == session.session_id
+        assert manager.list_sessions(tags=["test"]) == []
+
+        ended = manager.end_session()
+        assert ended.session_id == other.session_id and ended.duration is not None
+        assert manager.get_current_session() is None
+
+        assert manager.delete_session(session.session_id)
+        assert not manager.delete_session(session.session_id)
+        assert manager.get_session(session.session_id) is None
+
+    def test_export_import_round_trip(self, manager, tmp_path):
+        manager.save_session(_session(1))
+        exported = manager.export_session("s1", tmp_path / "export.json")
+        imported = manager.import_session(exported)
+        assert imported.session_id != "s1"
+        assert imported.track_name == "Sebring"
+        assert manager.session_count() == 2
+
+    def test_update_and_list_latency_flat(self, tmp_path):
+        def latency(count):
+            mgr = SessionManager(tmp_path / str(count))
+            mgr.save_sessions(_session(i) for i in range(count))
+            start = time.perf_counter()
+            for i in range(100):
+                mgr.update_session(f"s{(i * 7) % count}", lap_count=i)
+                mgr.list_sessions(track_name="VIR", limit=20)
+            elapsed = time.perf_counter() - start
+            mgr.close()
+            return elapsed
+
+        small, large = latency(100), latency(20_000)
+        assert large < small * 4
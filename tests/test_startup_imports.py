@@ -0,0 +1,109 @@
+"""
+Startup Import Tests
+
+Import-time budget for the entry points and checks for the lazy package
+exports that keep heavy dependencies out of the startup path.
+"""
+
+import os
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "tools"))
+
+from core.lazy_imports import lazy_exports
+from startup_profiler import profile_import
+
+# Wall-clock budget for importing an entry point in a fresh interpreter.
+# Generous enough for a Pi 5 cold start; override for slower CI runners.
+IMPORT_BUDGET_S = float(os.environ.get("AI_TUNER_IMPORT_BUDGET_S", "1.5"))
+
+
+def _profile_or_skip(target, cwd):
+    report = profile_import(target, cwd=cwd)
+    if not report.ok and "No module named" in report.error:
+        pytest.skip(f"{target} dependency missing: {report.error}")
+    assert report.ok, report.error
+    return report
+
+
+class TestImportBudget:
+    """Entry points must import quickly and without heavy dependencies."""
+
+    @pytest.mark.parametrize("target", ["start_ai_tuner.py", "main.py"])
+    def test_entry_point_budget(self, target, tmp_path):
+        report = _profile_or_skip(target, tmp_path)
+        assert report.wall_s < IMPORT_BUDGET_S, report.top(10, key="cumulative_us")
+        assert report.heavy_modules() == []
+
+    def test_single_service_import_is_isolated(self, tmp_path):
+        report = _profile_or_skip("services:DataLogger", tmp_path)
+        assert "services.data_logger" in report.module_names
+        assert "services.ar_racing_overlay" not in report.module_names
+        assert "services.social_racing_platform" not in report.module_names
+        assert report.heavy_modules() == []
+
+
+class TestLazyExports:
+    """Test the PEP 562 helper used by the package __init__ files."""
+
+    def _package(self, monkeypatch, optional=()):
+        pkg = types.ModuleType("lazypkg")
+        pkg.__path__ = []
+        good = types.ModuleType("lazypkg.good")
+        good.Thing = object()
+        good.Shared = "good"
+        override = types.ModuleType("lazypkg.override")
+        override.Shared = "override"
+        for mod in (pkg, good, override):
+            monkeypatch.setitem(sys.modules, mod.__name__, mod)
+
+        exports = {
+            ".good": ("Thing", "Shared"),
+            ".override": ("Shared",),
+            ".missing": ("Ghost", "Shared"),
+        }
+        pkg.__getattr__, pkg.__dir__, pkg.__all__ = lazy_exports(
+            "lazypkg", vars(pkg), exports, optional=optional, flags={"MISSING_AVAILABLE": ".missing"},
+        )
+        return pkg, good
+
+    def test_resolves_and_caches(self, monkeypatch):
+        pkg, good = self._package(monkeypatch, optional={".missing"})
+        assert pkg.Thing is good.Thing
+        assert "Thing" in vars(pkg)
+        assert set(pkg.__all__) == {"Thing", "Shared", "Ghost"}
+        assert "MISSING_AVAILABLE" in dir(pkg)
+
+    def test_optional_module_falls_back(self, monkeypatch):
+        pkg, _ = self._package(monkeypatch, optional={".missing"})
+        assert pkg.Ghost is None
+        assert pkg.MISSING_AVAILABLE is False
+        # Later module wins; unavailable ones fall back to earlier exporters
+        assert pkg.Shared == "override"
+
+    def test_required_module_error_propagates(self, monkeypatch):
+        pkg, _ = self._package(monkeypatch)
+        with pytest.raises(ImportError):
+            pkg.Ghost
+        with pytest.raises(AttributeError):
+            pkg.NotExported
+
+    def test_packages_export_everything(self):
+        import core
+        import interfaces
+        import services
+        import ui
+
+        assert "DataLogger" in services.__all__
+        assert "OBDInterface" in interfaces.__all__
+        assert "ConfigManager" in core.__all__
+        assert "TelemetryPanel" in ui.__all__
+        from services import DataLogger
+
+        assert DataLogger.__module__ == "services.data_logger"
@@ -0,0 +1,153 @@
+"""
+Track Learning AI Tests
+
+Tests the track spatial index, coaching lookups and geometric track
+identification with noisy and partial laps.
+"""
+
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.track_learning_ai import TrackLearningAI
+from services.track_spatial_index import EARTH_RADIUS_M, TrackSpatialIndex
+
+
+def _circuit(center_lat, center_lon, points, rx=400.0, ry=250.0, wobble=0.0, noise=0.0, seed=0, start=0.0, span=1.0):
+    """Ellipse-shaped lap (optionally with a wavy edge), as lat/lon arrays."""
+    rng = np.random.default_rng(seed)
+    theta = 2 * math.pi * (start + span * np.arange(points) / points)
+    radius = 1.0 + wobble * np.sin(3 * theta)
+    east = rx * radius * np.cos(theta) + rng.normal(0, noise, points)
+    north = ry * radius * np.sin(theta) + rng.normal(0, noise, points)
+    lat = center_lat + np.degrees(north / EARTH_RADIUS_M)
+    lon = center_lon + np.degrees(east / (EARTH_RADIUS_M * math.cos(math.radians(center_lat))))
+    return lat, lon
+
+
+def _trace(lat, lon):
+    return [{"latitude": a, "longitude": b} for a, b in zip(lat.tolist(), lon.tolist())]
+
+
+def _telemetry(count):
+    # Throttle lift every 50 points gives braking points
+    return [
+        {"Vehicle_Speed": 80.0 - (i % 50), "Throttle_Position": 10.0 if i % 50 == 49 else 90.0}
+        for i in range(count)
+    ]
+
+
+TRACKS = {
+    "Laguna Seca": (36.584, -121.753, 0.0),
+    "Sonoma": (38.161, -122.455, 0.0),
+    "Thunderhill": (39.539, -122.331, 0.0),
+    "Thunderhill East": (39.539, -122.331, 0.25),  # Same place, different shape
+}
+
+
+@pytest.fixture
+def track_ai():
+    ai = TrackLearningAI()
+    for name, (lat0, lon0, wobble) in TRACKS.items():
+        lat, lon = _circuit(lat0, lon0, 800, wobble=wobble)
+        ai.learn_from_lap(name, _trace(lat, lon), _telemetry(800), lap_time=95.0)
+    return ai
+
+
+def _track_id(ai, name):
+    return next(pid for pid, profile in ai.track_profiles.items() if profile.track_name == name)
+
+
+class TestTrackSpatialIndex:
+    """Test the grid index against a brute-force scan."""
+
+    def test_matches_brute_force(self):
+        lat, lon = _circuit(36.584, -121.753, 10_000, wobble=0.2)
+        index = TrackSpatialIndex(lat, lon)
+        rng = np.random.default_rng(3)
+        x, y = index.project(lat, lon)
+        for i in rng.integers(0, lat.size, 200):
+            q_lat = lat[i] + rng.normal(0, 1e-4)
+            q_lon = lon[i] + rng.normal(0, 1e-4)
+            qx, qy = index.project(q_lat, q_lon)
+            expected = int(np.argmin((x - qx) ** 2 + (y - qy) ** 2))
+            found, distance = index.nearest_index(q_lat, q_lon)
+            assert found == expected
+            assert distance == pytest.approx(math.hypot(x[expected] - qx, y[expected] - qy))
+
+        # Far off-track queries fall back to a full scan
+        qx, qy = index.project(lat[0] + 0.1, lon[0])
+        assert index.nearest_index(lat[0] + 0.1, lon[0])[0] == int(np.argmin((x - qx) ** 2 + (y - qy) ** 2))
+
+    def test_along_track_distance(self):
+        lat, lon = _circuit(36.584, -121.753, 2000, rx=300.0, ry=300.0)
+        index = TrackSpatialIndex(lat, lon)
+        assert index.length == pytest.approx(2 * math.pi * 300.0 * 1999 / 2000, rel=1e-3)
+        quarter = index.locate(lat[500], lon[500])
+        assert quarter.distance < 0.01
+        assert quarter.along_track == pytest.approx(index.length * 500 / 1999, rel=1e-3)
+
+    def test_lookup_faster_than_linear_scan(self):
+        lat, lon = _circuit(36.584, -121.753, 10_000)
+        index = TrackSpatialIndex(lat, lon)
+        points = list(zip(lat.tolist(), lon.tolist()))
+        queries = points[::100]
+
+        start = time.perf_counter()
+        for q in queries:
+            min(points, key=lambda p: (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2)
+        linear = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for q in queries:
+            index.nearest_index(*q)
+        indexed = time.perf_counter() - start
+        assert indexed * 5 < linear
+
+
+class TestTrackIdentification:
+    """Test geometric identification of new laps."""
+
+    def test_new_laps_reuse_profile(self, track_ai):
+        lat, lon = _circuit(*TRACKS["Sonoma"][:2], 650, noise=2.0, seed=7)
+        profile = track_ai.learn_from_lap("Sonoma", _trace(lat, lon), _telemetry(650), lap_time=93.0)
+        assert len(track_ai.track_profiles) == len(TRACKS)
+        assert profile.learned_from_laps == 2
+        assert len(profile.track_points) == 650  # Relearned from the faster lap
+        assert profile.total_distance > 2000
+
+    @pytest.mark.parametrize("name", list(TRACKS))
+    def test_identifies_noisy_lap(self, track_ai, name):
+        lat0, lon0, wobble = TRACKS[name]
+        lat, lon = _circuit(lat0, lon0, 300, wobble=wobble, noise=4.0, seed=1, start=0.3)
+        assert track_ai.identify_track(_trace(lat, lon)) == _track_id(track_ai, name)
+
+    def test_identifies_partial_lap(self, track_ai):
+        lat, lon = _circuit(*TRACKS["Thunderhill East"][:2], 120, wobble=0.25, noise=3.0, seed=2, start=0.1, span=0.3)
+        assert track_ai.identify_track(_trace(lat, lon)) == _track_id(track_ai, "Thunderhill East")
+
+    def test_unknown_track(self, track_ai):
+        lat, lon = _circuit(40.0, -120.0, 300)
+        assert track_ai.identify_track(_trace(lat, lon)) is None
+        # Same area as a known track but a different shape
+        lat, lon = _circuit(36.584, -121.753, 300, rx=150.0, ry=150.0)
+        assert track_ai.identify_track(_trace(lat, lon)) is None
+
+    def test_coaching_and_position(self, track_ai):
+        track_id = _track_id(track_ai, "Laguna Seca")
+        profile = track_ai.track_profiles[track_id]
+        braking = next(p for p in profile.track_points if p.braking_point)
+        assert "Braking point ahead. Prepare to brake." in track_ai.get_coaching_for_track(
+            (braking.latitude, braking.longitude), track_id
+        )
+        position = track_ai.get_track_position((braking.latitude, braking.longitude), track_id)
+        assert position.distance < 0.01
+        assert 0 < position.along_track < profile.total_distance
+        assert track_ai.get_track_position((0.0, 0.0), "missing") is None
@@ -0,0 +1,139 @@
+"""
+Tune Map Database Tests
+
+Tests the metadata index: search filters, lazy map loading and automatic
+re-indexing when tune files are added, changed or removed.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.tune_map_database import (
+    MapCategory,
+    PerformanceGains,
+    TuneMap,
+    TuneMapDatabase,
+    TuneType,
+    TuningMap,
+    VehicleIdentifier,
+)
+
+
+def _tune(tune_id, make="Honda", model="Civic", year=2020, ecu="Haltech", tune_type=TuneType.PERFORMANCE,
+          hp_gain=None, engine_code=None, tags=()):
+    return TuneMap(
+        tune_id=tune_id,
+        name=f"Tune {tune_id}",
+        description="test tune",
+        tune_type=tune_type,
+        vehicle=VehicleIdentifier(make=make, model=model, year=year, engine_code=engine_code),
+        ecu_type=ecu,
+        maps=[TuningMap(MapCategory.FUEL_MAP, "VE", "fuel table", {"table": [[1.0] * 16] * 16})],
+        performance_gains=PerformanceGains(hp_gain=hp_gain) if hp_gain is not None else None,
+        tags=list(tags),
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = TuneMapDatabase(storage_path=tmp_path)
+    for tune in [
+        _tune("civic_a", hp_gain=30, engine_code="K20C1", tags=["Street"]),
+        _tune("civic_b", hp_gain=5, tune_type=TuneType.BASE_MAP),
+        _tune("supra_a", make="Toyota", model="Supra", year=2021, ecu="AEM", hp_gain=80, tags=["race"]),
+        _tune("supra_b", make="Toyota", model="Supra", year=2021, ecu="aem"),
+    ]:
+        assert database.add_tune(tune)
+    return database
+
+
+def _ids(tunes):
+    return sorted(t.tune_id for t in tunes)
+
+
+class TestSearch:
+    """Test index-backed search."""
+
+    def test_filters(self, db):
+        assert _ids(db.search_tunes(make="toyota", ecu_type="AEM")) == ["supra_a", "supra_b"]
+        assert _ids(db.search_tunes(make="HONDA", year=2020, tune_type=TuneType.PERFORMANCE)) == ["civic_a"]
+        assert _ids(db.search_tunes(model="civic", engine_code="k20c1")) == ["civic_a", "civic_b"]  # No code = any
+        assert _ids(db.search_tunes(make="honda", engine_code="B18C")) == ["civic_b"]
+        assert _ids(db.search_tunes(tag="street")) == ["civic_a"]
+        # Tunes without gains information are not excluded by min_hp_gain
+        assert "supra_b" in _ids(db.search_tunes(min_hp_gain=20))
+        assert "civic_b" not in _ids(db.search_tunes(min_hp_gain=20))
+
+    def test_results_are_metadata_only(self, db):
+        result = db.search_tunes(make="Toyota", tag="race")[0]
+        assert result.maps == [] and result.maps_loaded is False
+        assert result.performance_gains.hp_gain == 80
+        assert result.vehicle.model == "Supra"
+
+        full = db.get_tune("supra_a")
+        assert full.maps_loaded and full.maps[0].data["table"][0][0] == 1.0
+        assert db.get_tune("missing") is None
+
+        # Saving a search result keeps the maps on disk
+        result.rating = 4.5
+        assert db.add_tune(result)
+        stored = db.get_tune("supra_a")
+        assert stored.rating == 4.5 and len(stored.maps) == 1
+
+    def test_apply_tune_loads_maps(self, db):
+        class ECU:
+            def __init__(self):
+                self.params = {}
+
+            def set_parameter(self, name, value):
+                self.params[name] = value
+                return True, []
+
+        ecu = ECU()
+        success, warnings = db.apply_tune("civic_a", ecu)
+        assert success and not warnings
+        assert ecu.params["fuel_map"]["table"][0][0] == 1.0
+        assert db.get_tune("civic_a").download_count == 1
+
+
+class TestIndexRefresh:
+    """Test re-indexing when tune files change."""
+
+    def test_startup_reads_only_changed_files(self, db, tmp_path, monkeypatch):
+        reads = []
+        original = TuneMapDatabase._read_tune_file
+        monkeypatch.setattr(TuneMapDatabase, "_read_tune_file", lambda self, f: reads.append(f.name) or original(self, f))
+
+        reopened = TuneMapDatabase(storage_path=tmp_path)
+        assert reads == [] and reopened.tune_count() == db.tune_count()
+        assert reopened.ecu_index["Haltech"] == ["civic_a", "civic_b"]
+
+        # Changed in place (picked up by refresh), added and removed files
+        path = tmp_path / "tunes" / "civic_b.json"
+        data = json.loads(path.read_text())
+        data["vehicle"]["make"] = "Acura"
+        path.write_text(json.dumps(data))
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        reopened.refresh()
+        assert reads == ["civic_b.json"]
+        assert _ids(reopened.search_tunes(make="acura")) == ["civic_b"]
+
+        (tmp_path / "tunes" / "imported.json").write_text(json.dumps(_tune("imported", make="Mazda").to_dict()))
+        (tmp_path / "tunes" / "supra_a.json").unlink()
+        (tmp_path / "tunes" / "broken.json").write_text("{not json")
+        assert _ids(reopened.search_tunes(make="mazda")) == ["imported"]  # Directory change detected
+        assert reopened.get_tune("supra_a") is None
+        assert _ids(reopened.search_tunes(ecu_type="haltech")) == ["civic_a", "civic_b", "imported"]
+        assert _ids(reopened.search_tunes(model="supra")) == ["supra_b"]
+        assert reopened.get_tune("imported").maps
+
+        reads.clear()
+        reopened.refresh()
+        assert reads == []  # Unreadable files are not retried until they change
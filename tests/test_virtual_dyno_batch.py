@@ -0,0 +1,137 @@
+"""
+Virtual Dyno Batch Tests
+
+Tests the columnar horsepower engine against the per-sample path, time-based
+acceleration for uneven sample spacing and the DynoBatch result container.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.virtual_dyno import DynoBatch, DynoReading, VehicleSpecs, VirtualDyno
+
+MPS_TO_MPH = 2.23694
+
+
+def _dyno():
+    return VirtualDyno(VehicleSpecs(curb_weight_kg=1450.0, gear_ratios=[3.2, 2.1, 1.5, 1.1, 0.9]))
+
+
+def _pull(samples, seed=0):
+    """Noisy wide-open-throttle pull with uneven sample spacing."""
+    rng = np.random.default_rng(seed)
+    time_s = np.cumsum(rng.uniform(0.02, 0.08, samples))
+    speed_mps = np.clip(np.linspace(0, 60, samples) + rng.normal(0, 0.3, samples), 0, None)
+    accel = np.gradient(speed_mps, time_s) + rng.normal(0, 0.4, samples)
+    rpm = np.linspace(900, 7000, samples)
+    rpm[::97] = 0.0  # Dropped RPM frames
+    return time_s, speed_mps, accel, rpm
+
+
+class TestHorsepowerBatch:
+    """Test the columnar engine."""
+
+    @pytest.mark.parametrize("with_rpm", [True, False])
+    def test_matches_per_sample_path(self, with_rpm):
+        time_s, speed_mps, accel, rpm = _pull(1500)
+        scalar_dyno, batch_dyno = _dyno(), _dyno()
+        for dyno in (scalar_dyno, batch_dyno):  # Same buffered history
+            for i in range(4):
+                dyno.calculate_horsepower(speed_mph=5.0 + i, acceleration_mps2=1.0 + 0.3 * i, rpm=1000.0, timestamp=i * 0.1)
+
+        scalar = [
+            scalar_dyno.calculate_horsepower(
+                speed_mph=float(speed_mps[i] * MPS_TO_MPH),
+                acceleration_mps2=float(accel[i]),
+                rpm=float(rpm[i]) if with_rpm else None,
+                timestamp=float(time_s[i]),
+            )
+            for i in range(time_s.size)
+        ]
+        batch = batch_dyno.calculate_horsepower_batch(
+            time_s, speed_mps * MPS_TO_MPH, accel, rpm=rpm if with_rpm else None
+        )
+
+        assert len(batch) == len(scalar)
+        for field in ("horsepower_wheel", "horsepower_crank", "confidence", "acceleration_mps2", "timestamp"):
+            np.testing.assert_allclose(batch[field], [getattr(r, field) for r in scalar], rtol=0, atol=1e-6)
+        for expected, reading in zip(scalar, batch):
+            assert reading.method == expected.method
+            assert (reading.torque_ftlb is None) == (expected.torque_ftlb is None)
+
+        expected_curve, curve = scalar_dyno.current_curve, batch_dyno.current_curve
+        assert len(curve.readings) == len(expected_curve.readings)
+        assert curve.peak_hp_crank == pytest.approx(expected_curve.peak_hp_crank)
+        assert curve.peak_hp_rpm == expected_curve.peak_hp_rpm
+        assert curve.peak_torque_ftlb == pytest.approx(expected_curve.peak_torque_ftlb)
+        assert list(batch_dyno.accel_buffer) == pytest.approx(list(scalar_dyno.accel_buffer))
+        assert list(batch_dyno.speed_buffer) == list(scalar_dyno.speed_buffer)
+
+    def test_record_false_leaves_state_untouched(self):
+        dyno = _dyno()
+        time_s, speed_mps, accel, rpm = _pull(200)
+        dyno.calculate_horsepower_batch(time_s, speed_mps * MPS_TO_MPH, accel, rpm=rpm, record=False)
+        assert not dyno.current_curve.readings
+        assert dyno.current_curve.peak_hp_crank == 0.0
+        assert not dyno.accel_buffer
+
+    def test_100k_samples_under_50ms(self):
+        samples = 100_000
+        time_s = np.cumsum(np.random.default_rng(1).uniform(0.005, 0.015, samples))
+        speed_mph = np.linspace(0, 150, samples)
+        accel = np.gradient(speed_mph / MPS_TO_MPH, time_s)
+        rpm = np.linspace(1000, 7000, samples)
+        dyno = _dyno()
+        dyno.calculate_horsepower_batch(time_s[:1000], speed_mph[:1000], accel[:1000], rpm=rpm[:1000], record=False)
+
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            dyno.calculate_horsepower_batch(time_s, speed_mph, accel, rpm=rpm, record=False)
+            best = min(best, time.perf_counter() - start)
+        assert best < 0.05
+
+
+class TestTimeseries:
+    """Test the timeseries front end."""
+
+    def test_acceleration_uses_sample_times(self):
+        time_s = np.cumsum(np.random.default_rng(2).uniform(0.01, 0.2, 400))
+        speed_mps = 2.0 * time_s + 0.05 * time_s ** 2  # a = 2 + 0.1 t
+        batch = _dyno().calculate_horsepower_from_timeseries(time_s, speed_mps, record=False)
+        raw = np.gradient(speed_mps, time_s)
+        np.testing.assert_allclose(raw[1:-1], 2.0 + 0.1 * time_s[1:-1], atol=0.01)
+        assert np.all(np.isfinite(batch["acceleration_mps2"]))
+        assert np.all(batch["timestamp"] == time_s)
+
+        with pytest.raises(ValueError):
+            _dyno().calculate_horsepower_from_timeseries(time_s[::-1], speed_mps)
+
+
+class TestDynoBatch:
+    """Test the result container."""
+
+    def test_lazy_readings_and_records(self):
+        time_s, speed_mps, accel, _ = _pull(50)
+        batch = _dyno().calculate_horsepower_batch(time_s, speed_mps * MPS_TO_MPH, accel, record=False)
+        assert isinstance(batch, DynoBatch)
+        assert not batch._readings
+
+        reading = batch[-1]
+        assert isinstance(reading, DynoReading)
+        assert batch[-1] is reading
+        assert reading.rpm is None and reading.torque_ftlb is None  # No RPM supplied
+        assert reading.horsepower_crank == batch["horsepower_crank"][-1]
+        assert len(batch[10:20]) == 10
+
+        records = batch.to_records()
+        assert records.shape == (50,)
+        assert records["horsepower_wheel"][5] == batch[5].horsepower_wheel
+        assert set(DynoBatch.COLUMNS) <= set(records.dtype.names)
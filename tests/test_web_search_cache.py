@@ -0,0 +1,146 @@
+"""
+Web Search Cache Tests
+
+Tests the persistent search cache (normalization, LRU/TTL bounds) and
+WebSearchService against a stubbed search backend that goes on- and
+offline: stale results served offline, persistence across restarts and
+the prefetch queue.
+"""
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import services.web_search_service as web_search_module
+from services.search_cache import SearchCache, normalize_query
+from services.web_search_service import SearchResult, WebSearchService
+
+
+class StubSearchService(WebSearchService):
+    """WebSearchService whose connectivity and search backend are simulated."""
+
+    online = True
+
+    def __init__(self, *args, **kwargs):
+        self.searches = []
+        super().__init__(*args, **kwargs)
+
+    def _check_internet(self):
+        return self.online
+
+    def _perform_search(self, query, max_results):
+        if not self.online:
+            raise ConnectionError("network unreachable")
+        self.searches.append(query)
+        return [SearchResult(f"{query} #{i}", f"https://example.com/{i}", "snippet") for i in range(max_results)]
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(web_search_module, "CONNECTIVITY_RECHECK_SECONDS", 0.0)
+    stub = StubSearchService(cache_path=tmp_path / "search.db", cache_ttl=60.0)
+    yield stub
+    stub.close()
+
+
+class TestSearchCache:
+    """Test SearchCache."""
+
+    def test_normalization_and_result_counts(self):
+        cache = SearchCache()
+        cache.put("Boost  Creep fix?", [{"n": i} for i in range(5)], max_results=5)
+        assert normalize_query('  "boost creep FIX" ') == "boost creep fix"
+        assert [r["n"] for r in cache.get("boost creep fix", max_results=3).results] == [0, 1, 2]
+        assert cache.get("boost creep fix", max_results=8) is None
+
+    def test_ttl_and_lru_bounds(self):
+        cache = SearchCache(ttl_seconds=0.05, max_entries=3)
+        for name in ("a", "b", "c"):
+            cache.put(name, [{"q": name}])
+        cache.get("a")  # a is now more recent than b
+        cache.put("d", [{"q": "d"}])
+        assert len(cache) == 3 and cache.get("b") is None and cache.stats["evicted"] == 1
+
+        time.sleep(0.06)
+        assert cache.get("a") is None
+        stale = cache.get("a", allow_stale=True)
+        assert stale.stale and stale.results == [{"q": "a"}]
+
+    def test_byte_bound(self):
+        cache = SearchCache(max_bytes=1000)
+        for i in range(10):
+            cache.put(f"q{i}", [{"text": "x" * 200}])
+        assert len(cache) == 4 and cache.get("q9") is not None and cache.get("q0") is None
+
+
+class TestWebSearchService:
+    """Test caching, offline replay and prefetch with a toggling backend."""
+
+    def test_cached_and_stale_offline(self, service):
+        first = service.search("Wastegate duty cycle", max_results=3)
+        again = service.search("wastegate duty cycle?", max_results=2)
+        assert not first.from_cache and again.from_cache and not again.stale
+        assert len(again.results) == 2 and service.searches == ["Wastegate duty cycle"]
+
+        service._cache.ttl_seconds = 0.0
+        service.online = False
+        assert service.search("wastegate duty cycle") is None  # Cached with 3 results, 5 requested
+        offline = service.search("Wastegate duty cycle", max_results=3)
+        assert offline.stale and offline.from_cache and offline.results[0].title == "Wastegate duty cycle #0"
+        assert service.search("never searched") is None
+
+        service.online = True
+        refreshed = service.search("wastegate duty cycle", max_results=3)
+        assert not refreshed.from_cache and len(service.searches) == 2
+
+    def test_advisors_get_stale_results_offline(self, service):
+        from services.ai_advisor_q_enhanced import EnhancedAIAdvisorQ, IntentType
+        from services.ai_advisor_rag import RAGAIAdvisor
+
+        service.search("boost leak symptoms", max_results=5)
+        service._cache.ttl_seconds = 0.0
+        service.online = False
+        advisor = SimpleNamespace(web_search=service)
+
+        fallback = EnhancedAIAdvisorQ._perform_web_search(advisor, "boost leak symptoms", IntentType.FEATURE_QUESTION)
+        assert fallback.stale and len(fallback.results) == 5
+        rag = RAGAIAdvisor._perform_web_search(advisor, "boost leak symptoms")
+        assert len(rag) == 3 and all(result["stale"] for result in rag)
+
+    def test_survives_restart(self, tmp_path, service):
+        service.search("injector dead time")
+        service.close()
+
+        StubSearchService.online = False
+        try:
+            restarted = StubSearchService(cache_path=tmp_path / "search.db", cache_ttl=60.0)
+            result = restarted.search("Injector dead time")
+            assert result.from_cache and not result.stale and restarted.searches == []
+            restarted.close()
+        finally:
+            StubSearchService.online = True
+
+    def test_prefetch_waits_for_connectivity(self, service):
+        service.search("launch control")
+        service.online = False
+        queued = service.prefetch(["launch control", "Anti lag", "anti lag ", "flex fuel"], background=False)
+        assert queued == 2 and service.pending_prefetch() == 2
+        assert service.run_prefetch() == 0 and service.pending_prefetch() == 2
+
+        service.online = True
+        assert service.run_prefetch() == 2 and service.pending_prefetch() == 0
+        service.online = False
+        assert service.search("anti lag").from_cache and service.search("flex fuel").from_cache
+
+    def test_background_prefetch(self, service):
+        service.prefetch(["boost by gear", "traction control slip"])
+        deadline = time.time() + 5.0
+        while len(service.searches) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert sorted(service.searches) == ["boost by gear", "traction control slip"]
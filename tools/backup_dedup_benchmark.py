@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Backup Deduplication Benchmark
+
+Saves a synthetic ECU calibration many times with small edits (a few table
+cells per save), backing it up after each save, and compares the disk used
+by the chunk store with the previous one-gzip-copy-per-backup scheme. The
+previous scheme is measured on a sample of backups and scaled, since its
+cost per backup is constant. Every backup is then restored and checked
+against the SHA-256 of the version it was taken from.
+
+Usage:
+    python tools/backup_dedup_benchmark.py
+    python tools/backup_dedup_benchmark.py --backups 1000 --megabytes 4 --json bench.json
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.backup_manager import BackupManager, BackupSettings, BackupType
+
+
+def calibration(size: int, seed: int = 0) -> bytearray:
+    """Calibration-like image: smooth 16-bit tables, code-like bytes and 0xFF fill."""
+    rng = np.random.default_rng(seed)
+    tables = (np.cumsum(rng.integers(-3, 4, size // 4)) + 20000).astype("<u2").tobytes()
+    code = rng.integers(0, 256, size // 4, dtype=np.uint8).tobytes()
+    return bytearray((tables + code + b"\xff" * size)[:size])
+
+
+def edit(data: bytearray, rng: np.random.Generator) -> None:
+    """A tuning save: a few 16-bit table cells changed in one table region."""
+    start = int(rng.integers(0, len(data) // 2 - 64)) & ~1
+    for _ in range(int(rng.integers(1, 5))):
+        cell = start + 2 * int(rng.integers(0, 32))
+        data[cell:cell + 2] = int(rng.integers(0, 65536)).to_bytes(2, "little")
+
+
+def legacy_bytes_per_backup(path: Path, data: bytearray, samples: int, rng: np.random.Generator) -> float:
+    """The previous scheme: shutil.copy2 plus gzip of the whole file per backup."""
+    out = Path(tempfile.mkdtemp())
+    try:
+        total = 0
+        for i in range(samples):
+            edit(data, rng)
+            path.write_bytes(data)
+            copy = out / f"backup_{i}.bin"
+            shutil.copy2(path, copy)
+            with open(copy, "rb") as f_in, gzip.open(copy.with_suffix(".bin.gz"), "wb") as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            copy.unlink()
+            total += copy.with_suffix(".bin.gz").stat().st_size
+        return total / samples
+    finally:
+        shutil.rmtree(out, ignore_errors=True)
+
+
+def run(backups: int, megabytes: float, legacy_samples: int) -> Dict[str, float]:
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        path = tmp / "calibration.bin"
+        rng = np.random.default_rng(1)
+        data = calibration(int(megabytes * 1024 * 1024))
+        legacy_per_backup = legacy_bytes_per_backup(path, bytearray(data), legacy_samples, np.random.default_rng(2))
+
+        settings = BackupSettings(max_backups_per_file=backups, backup_interval_seconds=0.0)
+        manager = BackupManager(backup_dir=str(tmp / "backups"), settings=settings)
+        hashes = []
+        start = time.perf_counter()
+        for _ in range(backups):
+            edit(data, rng)
+            path.write_bytes(data)
+            manager.create_backup(str(path), BackupType.ECU_CALIBRATION, force=True)
+            hashes.append(hashlib.sha256(data).hexdigest())
+        backup_s = time.perf_counter() - start
+
+        stats = manager.get_backup_statistics()
+        entries = manager.backup_registry[str(path)]
+        start = time.perf_counter()
+        identical = all(
+            hashlib.sha256(manager.chunk_store.get(Path(entry.backup_path))).hexdigest() == expected
+            for entry, expected in zip(entries, hashes)
+        )
+        restore_s = time.perf_counter() - start
+        identical = identical and len(entries) == backups
+        reverted = manager.revert_to_backup(entries[backups // 2], create_backup=False)
+        identical = identical and reverted and hashlib.sha256(path.read_bytes()).hexdigest() == hashes[backups // 2]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    legacy_total = legacy_per_backup * backups
+    return {
+        "backups": backups,
+        "file_mb": megabytes,
+        "store_mb": round(stats["total_size_bytes"] / 1024 / 1024, 2),
+        "legacy_mb": round(legacy_total / 1024 / 1024, 1),
+        "percent_of_legacy": round(100.0 * stats["total_size_bytes"] / legacy_total, 2),
+        "chunks": stats["chunk_count"],
+        "backup_ms": round(backup_s * 1000 / backups, 1),
+        "restore_ms": round(restore_s * 1000 / backups, 1),
+        "restores_identical": identical,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark deduplicated backups")
+    parser.add_argument("--backups", type=int, default=1000)
+    parser.add_argument("--megabytes", type=float, default=4.0, help="Calibration size")
+    parser.add_argument("--legacy-samples", type=int, default=20, help="Backups measured with the previous scheme")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    result = run(args.backups, args.megabytes, args.legacy_samples)
+    print(
+        f"{result['backups']} backups of a {result['file_mb']:g} MB calibration | chunk store "
+        f"{result['store_mb']:.1f} MB ({result['chunks']} chunks) vs gzip copies {result['legacy_mb']:.0f} MB "
+        f"= {result['percent_of_legacy']:.2f}%\n"
+        f"backup {result['backup_ms']:.1f} ms, verified restore {result['restore_ms']:.1f} ms per backup | "
+        f"all restores byte-identical: {result['restores_identical']}"
+    )
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
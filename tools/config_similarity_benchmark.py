@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Config Similarity Benchmark
+
+Fills a temporary configuration history database with synthetic ECU
+snapshots and measures top-10 similar-configuration queries through the
+similarity index against the previous approach (load rows, then score each
+snapshot in Python with ``_calculate_similarity``) over the whole history
+and over its old ``limit * 5`` recent window.
+
+Usage:
+    python tools/config_similarity_benchmark.py
+    python tools/config_similarity_benchmark.py --snapshots 50000 --keys 60 --json bench.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.config_version_control import ChangeType, ConfigVersionControl
+
+MAPS = ("street", "race", "e85", "valet", "track")
+
+
+def make_config(rng: random.Random, keys: int) -> Dict[str, object]:
+    config: Dict[str, object] = {f"param_{i}": round(rng.gauss(50, 15), 2) for i in range(keys) if rng.random() > 0.1}
+    config["map"] = rng.choice(MAPS)
+    config["launch_control"] = rng.random() < 0.5
+    return config
+
+
+def fill(vc: ConfigVersionControl, snapshots: int, keys: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    rows = [
+        (f"snapshot_{i}", float(i), ChangeType.ECU_TUNING.value, json.dumps(make_config(rng, keys)), "{}", "{}", "")
+        for i in range(snapshots)
+    ]
+    with vc._connection() as conn:
+        conn.executemany("INSERT INTO config_snapshots VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.commit()
+
+
+def legacy_query(vc: ConfigVersionControl, query: Dict[str, object], limit: int, window: int = 0):
+    sql = "SELECT * FROM config_snapshots WHERE config_type = ? ORDER BY timestamp DESC"
+    params = [ChangeType.ECU_TUNING.value]
+    if window:
+        sql += " LIMIT ?"
+        params.append(window)
+    with vc._connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+    scored = [(vc._calculate_similarity(query, json.loads(row[3])), row[0]) for row in rows]
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [snapshot_id for _, snapshot_id in scored[:limit]]
+
+
+def median_ms(func, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return round(statistics.median(timings), 2)
+
+
+def run(snapshots: int, keys: int, repeats: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        vc = ConfigVersionControl(db_path=str(Path(tmp) / "config_history.db"))
+        fill(vc, snapshots, keys)
+        query = make_config(random.Random(1), keys)
+
+        start = time.perf_counter()
+        vc.get_similar_configurations(query, ChangeType.ECU_TUNING, limit=10)
+        build_s = time.perf_counter() - start
+
+        indexed_ms = median_ms(lambda: vc.get_similar_configurations(query, ChangeType.ECU_TUNING, limit=10), repeats)
+        create_ms = median_ms(lambda: vc.create_snapshot(ChangeType.ECU_TUNING, make_config(random.Random(2), keys)), repeats)
+        window_ms = median_ms(lambda: legacy_query(vc, query, 10, window=50), repeats)
+        full_ms = median_ms(lambda: legacy_query(vc, query, 10), max(1, repeats // 10))
+
+        expected = legacy_query(vc, query, 10)
+        found = [s.snapshot_id for s in vc.get_similar_configurations(query, ChangeType.ECU_TUNING, limit=10)]
+
+    return {
+        "snapshots": snapshots,
+        "keys": keys,
+        "index_build_s": round(build_s, 2),
+        "indexed_query_ms": indexed_ms,
+        "create_snapshot_ms": create_ms,
+        "legacy_window_query_ms": window_ms,
+        "legacy_full_scan_ms": full_ms,
+        "speedup_vs_full_scan": round(full_ms / indexed_ms, 1),
+        "same_top10_as_full_scan": set(found) == set(expected),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark similar-configuration search")
+    parser.add_argument("--snapshots", type=int, default=50_000)
+    parser.add_argument("--keys", type=int, default=40, help="Numeric parameters per configuration")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    result = run(args.snapshots, args.keys, args.repeats)
+    print(
+        f"{result['snapshots']} snapshots x {result['keys']} keys | index build {result['index_build_s']:.2f} s\n"
+        f"top-10 query | indexed {result['indexed_query_ms']:.1f} ms | legacy full scan "
+        f"{result['legacy_full_scan_ms']:.0f} ms ({result['speedup_vs_full_scan']:.0f}x) | "
+        f"legacy recent-50 window {result['legacy_window_query_ms']:.1f} ms\n"
+        f"create_snapshot with index update {result['create_snapshot_ms']:.2f} ms | "
+        f"same top-10 as full scan: {result['same_top10_as_full_scan']}"
+    )
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Geo Logger Benchmark
+
+Feeds GPS fixes at a paced 50 Hz for a few seconds and counts the commits
+(each one WAL fsync with ``synchronous=FULL``) against the previous
+one-commit-per-fix logger. It then fills a database with a synthetic
+multi-month drive (10 million 1 Hz fixes wandering over a 50 km metro area)
+and times bounding-box queries with and without a time window, plus a
+simplified trajectory for map replay.
+
+Usage:
+    python tools/geo_logger_benchmark.py
+    python tools/geo_logger_benchmark.py --rows 10000000 --queries 200 --json bench.json
+"""
+
+import argparse
+import json
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.geo_logger import GeoLogger
+
+T0 = 1_700_000_000.0
+LAT0, LON0 = 45.50, -122.70
+AREA_DEG = 0.45  # About 50 km north-south
+
+
+def drive(rows: int, chunk: int = 1_000_000, seed: int = 0) -> Iterator[np.ndarray]:
+    """1 Hz fixes of a car wandering the area: rows of (t, lat, lon, speed, heading)."""
+    rng = np.random.default_rng(seed)
+    lat, lon, heading = 0.5, 0.5, 0.0
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        headings = heading + np.cumsum(rng.normal(0.0, 0.15, n))
+        speeds = np.abs(rng.normal(14.0, 4.0, n))
+        step = speeds / 111_000.0 / AREA_DEG
+        lats = lat + np.cumsum(step * np.cos(headings))
+        lons = lon + np.cumsum(step * np.sin(headings) * 1.4)
+        heading, lat, lon = headings[-1], lats[-1], lons[-1]
+        # Reflect at the edges of the area (triangle wave over [0, 1])
+        lats = 1.0 - np.abs(np.mod(lats, 2.0) - 1.0)
+        lons = 1.0 - np.abs(np.mod(lons, 2.0) - 1.0)
+        yield np.column_stack((
+            T0 + start + np.arange(n, dtype=np.float64),
+            LAT0 + lats * AREA_DEG,
+            LON0 + lons * AREA_DEG * 1.4,
+            speeds,
+            np.degrees(headings) % 360.0,
+        ))
+
+
+def ingest(path: Path, seconds: float, rate_hz: float) -> Dict[str, float]:
+    """Paced ingest through GeoLogger.log, and the same fixes with a commit per fix."""
+    geo = GeoLogger(path, batch_size=int(rate_hz))
+    fixes = int(seconds * rate_hz)
+    latencies = []
+    start = time.perf_counter()
+    for i in range(fixes):
+        due = start + i / rate_hz
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        t = time.perf_counter()
+        geo.log({"timestamp": T0 + i / rate_hz, "lat": LAT0, "lon": LON0 + i * 1e-6, "speed_mps": 10.0, "heading": 90.0})
+        latencies.append(time.perf_counter() - t)
+    geo.close()
+    batches = geo.batches_written
+
+    legacy = sqlite3.connect(path.with_name("legacy.db"))
+    legacy.execute(
+        "CREATE TABLE geo_log (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL, "
+        "latitude REAL, longitude REAL, speed_mps REAL, heading REAL)"
+    )
+    start = time.perf_counter()
+    for i in range(fixes):
+        legacy.execute(
+            "INSERT INTO geo_log (timestamp, latitude, longitude, speed_mps, heading) VALUES (?, ?, ?, ?, ?)",
+            (T0 + i / rate_hz, LAT0, LON0 + i * 1e-6, 10.0, 90.0),
+        )
+        legacy.commit()
+    legacy_s = time.perf_counter() - start
+    legacy.close()
+    return {
+        "fixes": fixes,
+        "commits": batches,
+        "log_p99_us": float(np.percentile(latencies, 99) * 1e6),
+        "log_max_us": float(max(latencies) * 1e6),
+        "legacy_commits": fixes,
+        "legacy_ms_per_fix": legacy_s * 1000 / fixes,
+    }
+
+
+def fill(geo: GeoLogger, rows: int) -> float:
+    start = time.perf_counter()
+    for block in drive(rows):
+        for t, lat, lon, speed, heading in block.tolist():
+            geo.log({"timestamp": t, "lat": lat, "lon": lon, "speed_mps": speed, "heading": heading})
+    geo.flush()
+    return time.perf_counter() - start
+
+
+def time_queries(geo: GeoLogger, rows: int, queries: int, box_deg: float, window_s: float) -> Dict[str, float]:
+    rng = np.random.default_rng(1)
+    timings: List[float] = []
+    found: List[int] = []
+    for _ in range(queries):
+        lat = LAT0 + rng.random() * (AREA_DEG - box_deg)
+        lon = LON0 + rng.random() * (AREA_DEG * 1.4 - box_deg)
+        t0 = T0 + rng.random() * max(0.0, rows - window_s) if window_s else None
+        t1 = t0 + window_s if window_s else None
+        start = time.perf_counter()
+        result = geo.query_bbox(lat, lon, lat + box_deg, lon + box_deg, t0, t1)
+        timings.append(time.perf_counter() - start)
+        found.append(len(result))
+    return {
+        "median_ms": float(np.median(timings) * 1000),
+        "p95_ms": float(np.percentile(timings, 95) * 1000),
+        "mean_rows": float(np.mean(found)),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark GeoLogger ingest and queries")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--ingest-seconds", type=float, default=10.0)
+    parser.add_argument("--rate", type=float, default=50.0, help="Ingest rate (Hz)")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        result = {"ingest": ingest(tmp / "ingest.db", args.ingest_seconds, args.rate)}
+        ing = result["ingest"]
+        print(
+            f"{ing['fixes']} fixes at {args.rate:g} Hz: {ing['commits']} commits "
+            f"(previous logger {ing['legacy_commits']}, {ing['legacy_ms_per_fix']:.2f} ms per fix) | "
+            f"log() p99 {ing['log_p99_us']:.0f} us, max {ing['log_max_us']:.0f} us"
+        )
+
+        geo = GeoLogger(tmp / "history.db", batch_size=10_000)
+        result["fill_s"] = fill(geo, args.rows)
+        result["db_mb"] = sum(p.stat().st_size for p in tmp.glob("history.db*")) / 1024 / 1024
+        print(f"{args.rows:,} fixes written in {result['fill_s']:.0f} s ({result['db_mb']:.0f} MB)")
+
+        for name, box_deg, window_s in [
+            ("1 km box, 1 day", 0.01, 86_400.0),
+            ("1 km box, all time", 0.01, 0.0),
+            ("5 km box, 1 hour", 0.05, 3_600.0),
+        ]:
+            stats = time_queries(geo, args.rows, args.queries, box_deg, window_s)
+            result[name] = stats
+            print(
+                f"  {name}: median {stats['median_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms, "
+                f"{stats['mean_rows']:.0f} fixes on average"
+            )
+
+        start = time.perf_counter()
+        track = geo.trajectory(T0, T0 + 86_400, tolerance_m=5.0)
+        result["trajectory_day_ms"] = (time.perf_counter() - start) * 1000
+        result["trajectory_day_points"] = len(track)
+        print(f"  one-day trajectory: 86400 fixes -> {len(track)} in {result['trajectory_day_ms']:.0f} ms")
+        geo.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Geofence Benchmark
+
+Registers 10,000 geofences (half circles, half 8-sided polygons, 50 m to
+2 km across) over a 50 km metro area and times GeofenceEngine.update for
+each fix of a drive through it. The previous check, a haversine distance
+to every fence on every fix (circles only), is timed on the same fixes.
+
+Usage:
+    python tools/geofence_benchmark.py
+    python tools/geofence_benchmark.py --fences 10000 --fixes 5000 --json bench.json
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.geofence_engine import METERS_PER_DEGREE, Geofence, GeofenceEngine, haversine_m
+
+LAT0, LON0 = 45.50, -122.70
+AREA_M = 50_000.0
+
+
+def make_fences(count: int, seed: int = 0) -> List[Geofence]:
+    rng = np.random.default_rng(seed)
+    lon_m = METERS_PER_DEGREE * math.cos(math.radians(LAT0))
+    fences = []
+    for i in range(count):
+        lat = LAT0 + rng.uniform(0, AREA_M) / METERS_PER_DEGREE
+        lon = LON0 + rng.uniform(0, AREA_M) / lon_m
+        radius = float(rng.uniform(25, 1000))
+        if i % 2:
+            fences.append(Geofence(f"circle_{i}", lat, lon, radius, dwell_seconds=300.0))
+        else:
+            angles = np.sort(rng.uniform(0, 2 * math.pi, 8))
+            radii = radius * rng.uniform(0.5, 1.0, 8)
+            vertices = [
+                (lat + r * math.sin(a) / METERS_PER_DEGREE, lon + r * math.cos(a) / lon_m)
+                for a, r in zip(angles, radii)
+            ]
+            fences.append(Geofence.polygon(f"polygon_{i}", vertices))
+    return fences
+
+
+def drive(fixes: int, seed: int = 1) -> np.ndarray:
+    """1 Hz fixes of a car crossing the area: rows of (lat, lon)."""
+    rng = np.random.default_rng(seed)
+    heading = np.cumsum(rng.normal(0.0, 0.1, fixes))
+    step = np.abs(rng.normal(15.0, 4.0, fixes))
+    y = AREA_M / 2 + np.cumsum(step * np.cos(heading))
+    x = AREA_M / 2 + np.cumsum(step * np.sin(heading))
+    y = AREA_M - np.abs(np.mod(y, 2 * AREA_M) - AREA_M)
+    x = AREA_M - np.abs(np.mod(x, 2 * AREA_M) - AREA_M)
+    lon_m = METERS_PER_DEGREE * math.cos(math.radians(LAT0))
+    return np.column_stack((LAT0 + y / METERS_PER_DEGREE, LON0 + x / lon_m))
+
+
+def run(fence_count: int, fixes: int) -> Dict[str, float]:
+    fences = make_fences(fence_count)
+    track = drive(fixes).tolist()
+
+    start = time.perf_counter()
+    engine = GeofenceEngine()
+    for fence in fences:
+        engine.add(fence)
+    build_s = time.perf_counter() - start
+
+    timings = []
+    events = 0
+    for t, (lat, lon) in enumerate(track):
+        start = time.perf_counter()
+        events += len(engine.update(lat, lon, float(t)))
+        timings.append(time.perf_counter() - start)
+
+    legacy = []
+    for lat, lon in track[: max(1, fixes // 10)]:
+        start = time.perf_counter()
+        for fence in fences:
+            inside = haversine_m(lat, lon, fence.center_lat, fence.center_lon) <= fence.radius_meters
+        legacy.append(time.perf_counter() - start)
+
+    return {
+        "fences": fence_count,
+        "fixes": fixes,
+        "build_ms": build_s * 1000,
+        "median_us": float(np.median(timings) * 1e6),
+        "p99_us": float(np.percentile(timings, 99) * 1e6),
+        "max_us": float(max(timings) * 1e6),
+        "events": events,
+        "legacy_median_us": float(np.median(legacy) * 1e6),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark geofence evaluation")
+    parser.add_argument("--fences", type=int, default=10_000)
+    parser.add_argument("--fixes", type=int, default=5_000)
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    result = run(args.fences, args.fixes)
+    print(
+        f"{result['fences']} fences (index built in {result['build_ms']:.0f} ms), {result['fixes']} fixes, "
+        f"{result['events']} events\n"
+        f"  update: median {result['median_us']:.0f} us, p99 {result['p99_us']:.0f} us, max {result['max_us']:.0f} us\n"
+        f"  haversine to every fence: median {result['legacy_median_us']:.0f} us"
+    )
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Kalman Filter Benchmark
+
+Measures the per-step cost of the GPS/IMU Kalman filter at 100 Hz (IMU
+predict plus GPS update every step, as in the live loop) against the
+previous 9x9 matrix formulation, the per-sample cost of batch processing a
+recorded log, and RTS smoothing of the same log.
+
+Usage:
+    python tools/kalman_filter_benchmark.py
+    python tools/kalman_filter_benchmark.py --seconds 600 --json bench.json
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from interfaces.gps_interface import GPSFix
+from interfaces.imu_interface import IMUReading
+from services.kalman_filter import KalmanFilter, KalmanFilterConfig, rts_smooth
+
+
+class LegacyKalman:
+    """The previous predict/update: new F, Q, H and R matrices every step."""
+
+    def __init__(self, config: KalmanFilterConfig) -> None:
+        self.config = config
+        self.state = np.zeros(9)
+        self.covariance = np.eye(9)
+
+    def step(self, dt: float, accel, gyro, measurement) -> None:
+        c = self.config
+        F = np.eye(9, dtype=np.float64)
+        F[0, 3] = F[1, 4] = F[2, 5] = dt
+        self.state = F @ self.state
+        self.state[3] += accel[0] * dt
+        self.state[4] += accel[1] * dt
+        self.state[5] += accel[2] * dt
+        self.state[6] += gyro[2] * dt
+        self.state[7] += gyro[1] * dt
+        self.state[8] += gyro[0] * dt
+        Q = np.zeros((9, 9), dtype=np.float64)
+        for i in range(3):
+            Q[i, i] = c.process_noise_pos * dt
+            Q[i + 3, i + 3] = c.process_noise_vel * dt
+            Q[i + 6, i + 6] = c.process_noise_att * dt
+        self.covariance = F @ self.covariance @ F.T + Q
+
+        x, y, z, vx, vy, heading = measurement
+        z_meas = np.array([x, y, z, vx, vy, 0.0, heading, 0.0, 0.0], dtype=np.float64)
+        H = np.zeros((9, 9), dtype=np.float64)
+        R = np.zeros((9, 9), dtype=np.float64)
+        for i in (0, 1, 2, 3, 4, 6):
+            H[i, i] = 1.0
+        R[0, 0] = R[1, 1] = R[2, 2] = c.gps_position_noise ** 2
+        R[3, 3] = R[4, 4] = c.gps_velocity_noise ** 2
+        R[6, 6] = c.gps_heading_noise ** 2
+        R[5, 5] = R[7, 7] = R[8, 8] = 1e6
+        y_innov = z_meas - (H @ self.state)
+        S = H @ self.covariance @ H.T + R
+        K = self.covariance @ H.T @ np.linalg.inv(S)
+        self.state = self.state + K @ y_innov
+        self.covariance = (np.eye(9) - K @ H) @ self.covariance
+        self.covariance = (self.covariance + self.covariance.T) / 2.0
+
+
+def median_us(func, repeats: int, inner: int = 100) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(inner):
+            func()
+        timings.append((time.perf_counter() - start) * 1e6 / inner)
+    return round(statistics.median(timings), 2)
+
+
+def run(seconds: float, repeats: int) -> Dict[str, float]:
+    kf = KalmanFilter()
+    kf.origin_lat, kf.origin_lon, kf.origin_alt = 40.0, -75.0, 0.0
+    legacy = LegacyKalman(KalmanFilterConfig())
+    imu = IMUReading(0.1, 0.2, 9.8, 1.0, 2.0, 3.0, timestamp=1.0)
+    fix = GPSFix(40.0001, -75.0001, 10.0, 45.0, timestamp=1.0, altitude_m=1.0)
+    heading = math.radians(fix.heading)
+    measurement = (*kf._gps_to_local(fix.latitude, fix.longitude, 1.0), 10.0 * math.sin(heading), 10.0 * math.cos(heading), heading)
+    gyro_rad = tuple(math.radians(g) for g in (imu.gyro_x, imu.gyro_y, imu.gyro_z))
+
+    def live_step() -> None:
+        kf._predict(0.01, imu)
+        kf._update_gps(fix)
+
+    # Recorded log: 100 Hz IMU, 10 Hz GPS
+    samples = int(seconds * 100)
+    rng = np.random.default_rng(0)
+    timestamps = np.arange(samples) * 0.01
+    gps = np.full((samples, 5), np.nan)
+    gps[::10] = (40.0, -75.0, 0.0, 10.0, 45.0)
+    gps[::10, :2] += rng.normal(0, 2e-5, (gps[::10].shape[0], 2))
+    accel = rng.normal(0, 0.5, (samples, 3))
+    gyro = rng.normal(0, 2.0, (samples, 3))
+
+    start = time.perf_counter()
+    track = KalmanFilter().process_batch(timestamps, accel, gyro, gps)
+    batch_s = time.perf_counter() - start
+    start = time.perf_counter()
+    rts_smooth(track)
+    smooth_s = time.perf_counter() - start
+
+    legacy_us = median_us(lambda: legacy.step(0.01, (0.1, 0.2, 9.8), gyro_rad, measurement), repeats)
+    step_us = median_us(live_step, repeats)
+    return {
+        "samples": samples,
+        "legacy_step_us": legacy_us,
+        "step_us": step_us,
+        "speedup": round(legacy_us / step_us, 1),
+        "batch_us_per_sample": round(batch_s * 1e6 / samples, 2),
+        "smooth_us_per_sample": round(smooth_s * 1e6 / samples, 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the GPS/IMU Kalman filter")
+    parser.add_argument("--seconds", type=float, default=300.0, help="Length of the recorded log (100 Hz)")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    result = run(args.seconds, args.repeats)
+    print(
+        f"100 Hz step | legacy {result['legacy_step_us']:.1f} us | core {result['step_us']:.1f} us "
+        f"({result['speedup']:.1f}x)\n"
+        f"{result['samples']} sample log | batch {result['batch_us_per_sample']:.2f} us/sample | "
+        f"RTS smooth {result['smooth_us_per_sample']:.2f} us/sample"
+    )
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Ingestion Benchmark
+
+Generates a corpus of text and JSON documents and ingests it twice into
+fresh vector stores: once the previous way (files parsed one after
+another, one add_knowledge call and one encoder call per chunk) and once
+with DocumentIngester.ingest_directory (process-pool parsing, batched
+embedding). A second ingest_directory run over the unchanged corpus
+shows the content-hash skip.
+
+Without sentence-transformers installed, the encoder is simulated with a
+fixed per-call cost plus a per-text cost, the shape of CPU encoder
+latency (``--encoder none`` measures the bare TF-IDF fallback store).
+
+Usage:
+    python tools/kb_ingestion_benchmark.py
+    python tools/kb_ingestion_benchmark.py --documents 500 --encoder simulated --json bench.json
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.knowledge_base_manager import DocumentIngester, SUPPORTED_EXTENSIONS
+from services.vector_knowledge_store import VectorKnowledgeStore
+
+WORDS = (
+    "boost wastegate duty cycle ignition timing knock retard injector pulse width fuel pressure lambda "
+    "target idle airflow throttle intake manifold turbo compressor intercooler exhaust temperature cam "
+    "phasing torque limiter launch control traction slip sensor calibration table axis interpolation"
+).split()
+
+
+class SimulatedEncoder:
+    """Encoder with a fixed cost per call plus a cost per text."""
+
+    def __init__(self, call_ms: float, per_text_ms: float, dim: int = 384) -> None:
+        self.call_ms = call_ms
+        self.per_text_ms = per_text_ms
+        self.dim = dim
+        self.calls = 0
+
+    def encode(self, texts):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.calls += 1
+        time.sleep((self.call_ms + self.per_text_ms * len(batch)) / 1000.0)
+        vectors = np.stack([
+            np.random.default_rng(int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "little"))
+            .standard_normal(self.dim).astype(np.float32)
+            for t in batch
+        ])
+        return vectors[0] if single else vectors
+
+
+def generate_corpus(directory: Path, documents: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+
+    def sentence() -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))).capitalize() + "."
+
+    for i in range(documents):
+        sub = directory / f"section_{i % 10}"
+        sub.mkdir(parents=True, exist_ok=True)
+        if i % 2:
+            entries = {f"param_{j}": sentence() for j in range(rng.randint(20, 120))}
+            (sub / f"table_{i}.json").write_text(json.dumps(entries))
+        else:
+            paragraphs = ["\n".join(sentence() for _ in range(rng.randint(3, 8))) for _ in range(rng.randint(3, 25))]
+            (sub / f"manual_{i}.txt").write_text("\n\n".join(paragraphs))
+
+
+def make_store(encoder: str):
+    store = VectorKnowledgeStore(persist_directory=tempfile.mkdtemp())
+    if encoder == "simulated" and store.encoder is None:
+        store.encoder = SimulatedEncoder(call_ms=3.0, per_text_ms=0.3)
+    elif encoder == "none":
+        store.encoder = None
+    return store
+
+
+def legacy_ingest(store, files: List[Path]) -> int:
+    """The previous path: sequential parsing, one store call per chunk."""
+    parser = DocumentIngester()
+    added = 0
+    for path in files:
+        chunks = parser.parse_file(path)
+        base = {"source": "document", "file_path": str(path), "file_name": path.name,
+                "file_type": path.suffix, "ingested_at": time.time()}
+        for i, chunk in enumerate(chunks):
+            store.add_knowledge(text=chunk, metadata=dict(base, chunk_index=i, total_chunks=len(chunks)))
+            added += 1
+    return added
+
+
+def run(documents: int, encoder: str, workers: int) -> Dict[str, float]:
+    corpus = Path(tempfile.mkdtemp())
+    generate_corpus(corpus, documents)
+    files = sorted(p for p in corpus.rglob("*") if p.suffix in SUPPORTED_EXTENSIONS)
+
+    store = make_store(encoder)
+    start = time.perf_counter()
+    legacy_chunks = legacy_ingest(store, files)
+    legacy_s = time.perf_counter() - start
+
+    store = make_store(encoder)
+    ingester = DocumentIngester(store)
+    start = time.perf_counter()
+    first = ingester.ingest_directory(str(corpus), workers=workers)
+    pipeline_s = time.perf_counter() - start
+    start = time.perf_counter()
+    second = ingester.ingest_directory(str(corpus), workers=workers)
+    rerun_s = time.perf_counter() - start
+
+    return {
+        "documents": len(files),
+        "encoder": encoder if encoder != "simulated" or isinstance(store.encoder, SimulatedEncoder) else "sentence-transformers",
+        "legacy_chunks": legacy_chunks,
+        "legacy_s": legacy_s,
+        "legacy_chunks_per_s": legacy_chunks / legacy_s,
+        "pipeline_chunks": first["chunks_added"] + first["chunks_skipped"],
+        "pipeline_s": pipeline_s,
+        "pipeline_chunks_per_s": (first["chunks_added"] + first["chunks_skipped"]) / pipeline_s,
+        "rerun_s": rerun_s,
+        "rerun_chunks_added": second["chunks_added"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark knowledge base document ingestion")
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--encoder", choices=["simulated", "none"], default="simulated",
+                        help="Embedding cost model when sentence-transformers is not installed")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    result = run(args.documents, args.encoder, args.workers)
+    print(
+        f"{result['documents']} documents, encoder: {result['encoder']}\n"
+        f"  per-chunk path:   {result['legacy_chunks']} chunks in {result['legacy_s']:.2f} s "
+        f"({result['legacy_chunks_per_s']:.0f} chunks/s)\n"
+        f"  batched pipeline: {result['pipeline_chunks']} chunks in {result['pipeline_s']:.2f} s "
+        f"({result['pipeline_chunks_per_s']:.0f} chunks/s)\n"
+        f"  unchanged re-run: {result['rerun_s'] * 1000:.0f} ms, {result['rerun_chunks_added']} chunks added"
+    )
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Log Parser Benchmark
+
+Generates synthetic vendor-style CSV/TSV logs and measures parse time and
+peak Python memory for the columnar reader (NumPy and pure-Python engines)
+against the previous csv.DictReader approach.
+
+Usage:
+    python tools/log_parser_benchmark.py --rows 200000
+    python tools/log_parser_benchmark.py --rows 2000000 --formats holley motec --skip-legacy --json bench.json
+
+Peak memory is measured with tracemalloc, so it covers Python and NumPy
+allocations (NumPy reports to tracemalloc) but not the interpreter itself.
+"""
+
+import argparse
+import csv
+import json
+import math
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.columnar_log_reader import NUMPY_AVAILABLE, read_delimited
+
+# Channel layouts loosely modelled on each vendor's CSV export
+FORMATS = {
+    "holley": {
+        "delimiter": ",",
+        "header": ["Time", "RPM", "MAP", "TPS", "AFR Left", "AFR Right", "Target AFR", "CTS", "MAT",
+                   "Ignition Timing", "Injector Duty Cycle", "Battery", "Oil Pressure", "Fuel Pressure",
+                   "Knock Retard", "Speed"],
+        "units": None,
+    },
+    "motec": {
+        "delimiter": ",",
+        "header": ["Time", "Engine Speed", "Throttle Pos", "Manifold Pres", "Lambda 1", "Lambda 2",
+                   "Ign Timing", "Fuel Inj Duty", "Coolant Temp", "Air Temp", "Oil Pres", "Oil Temp",
+                   "Ground Speed", "G Force Lat", "G Force Long", "Steered Angle", "Brake Pres Front",
+                   "Gear", "Battery Volts", "Fuel Pres"],
+        "units": ["s", "rpm", "%", "kPa", "LA", "LA", "dBTDC", "%", "C", "C", "kPa", "C", "km/h", "G", "G",
+                  "deg", "kPa", "", "V", "kPa"],
+    },
+    "haltech": {
+        "delimiter": ",",
+        "header": ["Time (s)", "RPM (rpm)", "MAP (kPa)", "TPS (%)", "Wideband (lambda)", "Ignition Angle (deg)",
+                   "Coolant Temp (C)", "Air Temp (C)", "Battery (V)", "Knock Level (dB)"],
+        "units": None,
+    },
+    "generic_tsv": {
+        "delimiter": "\t",
+        "header": ["timestamp", "rpm", "speed", "throttle", "coolant", "boost", "lambda", "timing"],
+        "units": None,
+    },
+}
+
+
+def generate_log(path: Path, fmt: str, rows: int, dirty_every: int = 0) -> None:
+    """Write a synthetic log; every ``dirty_every`` rows gets an empty cell."""
+    spec = FORMATS[fmt]
+    rng = random.Random(42)
+    width = len(spec["header"])
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, delimiter=spec["delimiter"])
+        writer.writerow(spec["header"])
+        if spec["units"]:
+            writer.writerow(spec["units"])
+        for i in range(rows):
+            t = i * 0.01
+            row = [f"{t:.2f}", f"{3000 + 2500 * math.sin(t * 0.2):.0f}"]
+            row.extend(f"{rng.uniform(0, 100):.3f}" for _ in range(width - 2))
+            if dirty_every and i % dirty_every == 0:
+                row[-1] = ""
+            writer.writerow(row)
+
+
+def legacy_dictreader_parse(path: Path, delimiter: str) -> Dict[str, List[float]]:
+    """The previous UniversalLogParser._parse_csv_generic inner loop."""
+    data: Dict[str, List[float]] = {}
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        channels = reader.fieldnames or []
+        for channel in channels:
+            data[channel] = []
+        for row in reader:
+            for channel in channels:
+                try:
+                    data[channel].append(float(row.get(channel, "0")))
+                except (ValueError, TypeError):
+                    data[channel].append(0.0)
+    return data
+
+
+def measure(func: Callable[[], object]) -> Dict[str, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(elapsed, 4), "peak_mb": round(peak / 1e6, 2)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark columnar log parsing")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--formats", nargs="*", default=list(FORMATS), choices=list(FORMATS))
+    parser.add_argument("--dirty-every", type=int, default=0, help="Insert an empty cell every N rows")
+    parser.add_argument("--skip-legacy", action="store_true", help="Skip the slow DictReader baseline")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    engines = ["numpy", "python"] if NUMPY_AVAILABLE else ["python"]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in args.formats:
+            spec = FORMATS[fmt]
+            path = Path(tmp) / f"{fmt}.csv"
+            generate_log(path, fmt, args.rows, args.dirty_every)
+            size_mb = path.stat().st_size / 1e6
+            entry = {"format": fmt, "rows": args.rows, "file_mb": round(size_mb, 2)}
+
+            for engine in engines:
+                stats = measure(lambda: read_delimited(path, delimiter=spec["delimiter"], engine=engine))
+                stats["mb_per_s"] = round(size_mb / stats["seconds"], 1) if stats["seconds"] else None
+                entry[engine] = stats
+            if not args.skip_legacy:
+                entry["legacy_dictreader"] = measure(lambda: legacy_dictreader_parse(path, spec["delimiter"]))
+
+            results.append(entry)
+            line = [f"{fmt:12s} {size_mb:7.1f} MB"]
+            for key in engines + ([] if args.skip_legacy else ["legacy_dictreader"]):
+                line.append(f"{key}: {entry[key]['seconds']:.2f}s / {entry[key]['peak_mb']:.0f} MB peak")
+            print(" | ".join(line))
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Performance Tracker Benchmark
+
+Measures the per-poll cost of PerformanceTracker.snapshot(), GPS updates
+and incremental track reads with a full track of 2k, 20k and 200k points,
+against the previous list storage (pop(0) trimming, list copy per snapshot).
+
+Usage:
+    python tools/performance_tracker_benchmark.py
+    python tools/performance_tracker_benchmark.py --points 2000 20000 200000 --json bench.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.performance_tracker import PerformanceTracker
+
+
+class LegacyTrack:
+    """The previous track storage and snapshot copy."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.track: List[Tuple[float, float]] = []
+
+    def update_gps(self, lat: float, lon: float) -> None:
+        self.track.append((lat, lon))
+        if len(self.track) > self.capacity:
+            self.track.pop(0)
+
+    def snapshot(self) -> List[Tuple[float, float]]:
+        return list(self.track)
+
+
+def median_us(func: Callable[[], object], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return round(statistics.median(timings), 2)
+
+
+def run(points: int, repeats: int) -> Dict[str, float]:
+    tracker = PerformanceTracker(track_capacity=points, history_capacity=points)
+    legacy = LegacyTrack(points)
+    for i in range(points + 10):
+        lat, lon = 36.0 + i * 1e-6, -121.0 - i * 1e-6
+        tracker.update_gps(lat, lon)
+        tracker.update_speed(60.0, timestamp=1000.0 + i * 0.1)
+        legacy.update_gps(lat, lon)
+
+    counter = iter(range(10**9))
+    version = tracker.snapshot().track_version
+
+    def poll_delta() -> None:
+        nonlocal version
+        tracker.update_gps(37.0, -122.0)
+        _, version = tracker.track_since(version)
+
+    return {
+        "points": points,
+        "snapshot_us": median_us(tracker.snapshot, repeats),
+        "legacy_snapshot_us": median_us(legacy.snapshot, repeats),
+        "update_gps_us": median_us(lambda: tracker.update_gps(36.5, float(next(counter))), repeats),
+        "legacy_update_gps_us": median_us(lambda: legacy.update_gps(36.5, float(next(counter))), repeats),
+        "update_and_delta_us": median_us(poll_delta, repeats),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PerformanceTracker snapshots")
+    parser.add_argument("--points", type=int, nargs="*", default=[2_000, 20_000, 200_000])
+    parser.add_argument("--repeats", type=int, default=500)
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for points in args.points:
+        result = run(points, args.repeats)
+        results.append(result)
+        print(
+            f"{points:>7} points | snapshot {result['snapshot_us']:.2f} us (legacy {result['legacy_snapshot_us']:.1f} us) | "
+            f"update_gps {result['update_gps_us']:.2f} us (legacy {result['legacy_update_gps_us']:.2f} us) | "
+            f"update + delta {result['update_and_delta_us']:.2f} us"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
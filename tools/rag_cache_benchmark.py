@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+RAG Answer Cache Benchmark
+
+Replays a 1,000-question session against RAGAIAdvisor with a stub LLM
+backend (fixed generation delay) over a small tuning knowledge base. 40%
+of the questions repeat an earlier one, mostly reworded ("what's boost
+creep?", "explain boost creep"). The replay runs with and without the
+answer cache; per-question latency percentiles and cache hit rates are
+reported. Knowledge is added part-way through to show invalidation.
+
+Usage:
+    python tools/rag_cache_benchmark.py
+    python tools/rag_cache_benchmark.py --questions 1000 --repeat-share 0.4 --llm-ms 150 --json bench.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+TOPICS = [
+    "boost creep", "wastegate duty cycle", "knock retard", "ignition timing advance", "fuel injector dead time",
+    "volumetric efficiency table", "closed loop fueling", "lambda target", "launch control", "anti lag",
+    "flex fuel ethanol content", "idle air control", "cam timing", "boost by gear", "traction control slip",
+    "intercooler heat soak", "fuel pressure regulator", "MAP sensor scaling", "torque management", "rev limiter",
+    "coolant temperature compensation", "intake air temperature correction", "acceleration enrichment",
+    "spark plug gap", "exhaust gas temperature", "turbo lag", "compressor surge", "blow off valve",
+    "throttle body sizing", "nitrous progressive control",
+]
+TEMPLATES = [
+    "what is {}", "how does {} work", "how do I tune {}", "why is {} important",
+    "what causes problems with {}", "how do I diagnose {}",
+]
+VEHICLES = ["", " on a WRX", " on an LS swap", " on a turbo Civic", " on a Supra"]
+PARAPHRASES = {
+    "what is {}": ["what's {}?", "What is {}?", "explain {}", "can you tell me what {} is", "define {} please"],
+    "how does {} work": ["How does {} work?", "how does {} work exactly", "can you explain how {} works"],
+    "how do I tune {}": ["How do I tune {}?", "how do i tune my {}", "how do I tune {} please"],
+    "why is {} important": ["Why is {} important?", "why is {} so important", "why {} is important"],
+    "what causes problems with {}": ["What causes problems with {}?", "what causes {} problems"],
+    "how do I diagnose {}": ["How do I diagnose {}?", "how can I diagnose {}", "how do I diagnose my {}"],
+}
+
+
+def build_session(count: int, repeat_share: float, seed: int = 0) -> List[Tuple[str, bool]]:
+    """Questions paired with whether they repeat an earlier one."""
+    rng = random.Random(seed)
+    asked: List[Tuple[str, str]] = []
+    session = []
+    unique = [(t, topic + vehicle) for topic in TOPICS for vehicle in VEHICLES for t in TEMPLATES]
+    rng.shuffle(unique)
+    for _ in range(count):
+        if asked and (rng.random() < repeat_share or not unique):
+            template, subject = rng.choice(asked)
+            form = rng.choice(PARAPHRASES[template] + [template])
+            session.append((form.format(subject), True))
+        else:
+            template, subject = unique.pop()
+            asked.append((template, subject))
+            session.append((template.format(subject), False))
+    return session
+
+
+def make_advisor(cache: bool, llm_ms: float):
+    from services.ai_advisor_rag import RAGAIAdvisor
+    from services.vector_knowledge_store import VectorKnowledgeStore
+
+    store = VectorKnowledgeStore(persist_directory=tempfile.mkdtemp())
+    for topic in TOPICS:
+        store.add_knowledge(
+            f"{topic.capitalize()} overview: how {topic} affects power, drivability and engine safety when tuning.",
+            {"topic": f"{topic} overview"},
+        )
+    advisor = RAGAIAdvisor(use_local_llm=False, enable_web_search=False, vector_store=store, enable_answer_cache=cache)
+    advisor.auto_populator = None  # Would reach the network
+
+    def stub_llm(question, context, question_analysis=None):
+        time.sleep(llm_ms / 1000.0)
+        return f"Answer to: {question} (context {len(context)} chars)"
+
+    advisor.llm_available = True
+    advisor._generate_llm_response = stub_llm
+    return advisor, store
+
+
+def replay(session: List[Tuple[str, bool]], cache: bool, llm_ms: float) -> Dict[str, float]:
+    advisor, store = make_advisor(cache, llm_ms)
+    latencies = []
+    for i, (question, _) in enumerate(session):
+        if i == len(session) // 2:
+            store.add_knowledge("Boost creep is often fixed with a larger wastegate port.", {"topic": "boost creep fix"})
+        start = time.perf_counter()
+        advisor.answer(question)
+        latencies.append(time.perf_counter() - start)
+    repeats = [t for t, (_, repeat) in zip(latencies, session) if repeat]
+    result = {
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000),
+        "mean_ms": float(np.mean(latencies) * 1000),
+        "repeat_p50_ms": float(np.percentile(repeats, 50) * 1000),
+        "repeat_p95_ms": float(np.percentile(repeats, 95) * 1000),
+    }
+    if advisor.answer_cache is not None:
+        stats = advisor.answer_cache.stats
+        result.update(stats)
+        result["hit_rate"] = advisor.answer_cache.hit_rate()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the RAG answer cache")
+    parser.add_argument("--questions", type=int, default=1000)
+    parser.add_argument("--repeat-share", type=float, default=0.4, help="Share of questions repeating an earlier one")
+    parser.add_argument("--llm-ms", type=float, default=150.0, help="Stub LLM generation time")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    os.environ.setdefault("HOME", tempfile.mkdtemp())
+    session = build_session(args.questions, args.repeat_share)
+    result = {
+        "questions": args.questions,
+        "uncached": replay(session, cache=False, llm_ms=args.llm_ms),
+        "cached": replay(session, cache=True, llm_ms=args.llm_ms),
+    }
+    cached, uncached = result["cached"], result["uncached"]
+    print(
+        f"{args.questions} questions, {args.repeat_share:.0%} repeats (stub LLM {args.llm_ms:g} ms)\n"
+        f"  hit rate {cached['hit_rate']:.1%} ({cached['exact_hits']} exact, {cached['semantic_hits']} paraphrase, "
+        f"{cached['invalidated']} invalidated by the knowledge update)\n"
+        f"  p50 {uncached['p50_ms']:.1f} -> {cached['p50_ms']:.1f} ms, p95 {uncached['p95_ms']:.1f} -> "
+        f"{cached['p95_ms']:.1f} ms, mean {uncached['mean_ms']:.1f} -> {cached['mean_ms']:.1f} ms\n"
+        f"  repeated questions: p50 {uncached['repeat_p50_ms']:.1f} -> {cached['repeat_p50_ms']:.1f} ms, "
+        f"p95 {uncached['repeat_p95_ms']:.1f} -> {cached['repeat_p95_ms']:.1f} ms"
+    )
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Session Analysis Benchmark
+
+Writes a synthetic session log of the requested size and measures wall time
+and peak RSS of the streaming analysis (SessionAnalysisService) against
+the previous all-rows-in-memory csv.DictReader analysis. Each run happens
+in a fresh child process so peak RSS is per run.
+
+Usage:
+    python tools/session_analysis_benchmark.py
+    python tools/session_analysis_benchmark.py --megabytes 5000 --workers 4 --skip-legacy
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.session_analysis_service import SessionAnalysisService
+
+CHANNELS = ("RPM", "MAP", "AFR", "CoolantTemp", "OilTemp", "EGT1", "ThrottlePosition", "Vehicle_Speed")
+
+
+def write_log(path: Path, megabytes: float, seed: int = 0) -> int:
+    """Write about ``megabytes`` of 100 Hz telemetry; returns the row count."""
+    rng = np.random.default_rng(seed)
+    target = int(megabytes * 1024 * 1024)
+    rows, t0 = 0, 0.0
+    with path.open("w", newline="") as f:
+        f.write(",".join(("Timestamp",) + CHANNELS) + "\n")
+        while f.tell() < target:
+            n = 50_000
+            block = np.column_stack(
+                [t0 + np.arange(n) * 0.01] + [rng.normal(100, 20, n) for _ in CHANNELS]
+            )
+            block[rng.random(n) < 0.5, 3] = np.nan  # AFR at a lower rate
+            text = "\n".join(",".join("" if v != v else f"{v:.4f}" for v in row) for row in block.tolist())
+            f.write(text + "\n")
+            rows += n
+            t0 += n * 0.01
+    return rows
+
+
+def legacy_analysis(path: Path) -> None:
+    """The previous implementation's approach: every row in memory."""
+    with path.open("r", newline="") as f:
+        rows = list(csv.DictReader(f))
+    stats = {}
+    for row in rows:
+        for key, value in row.items():
+            try:
+                v = float(value)
+            except (TypeError, ValueError):
+                continue
+            lo, hi, total, count = stats.get(key, (v, v, 0.0, 0))
+            stats[key] = (min(lo, v), max(hi, v), total + v, count + 1)
+
+
+def _child(mode: str, path: str, workers: int, queue) -> None:
+    start = time.perf_counter()
+    if mode == "legacy":
+        legacy_analysis(Path(path))
+    else:
+        SessionAnalysisService(workers=workers).analyze_specific_log(path)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if workers > 1 and mode != "legacy":
+        peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    queue.put((elapsed, peak / 1024.0))  # ru_maxrss is KiB on Linux
+
+
+def measure(mode: str, path: Path, workers: int = 1) -> Dict[str, float]:
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_child, args=(mode, str(path), workers, queue))
+    process.start()
+    elapsed, peak_mb = queue.get()
+    process.join()
+    return {"seconds": round(elapsed, 2), "peak_rss_mb": round(peak_mb, 1)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark streaming session analysis")
+    parser.add_argument("--megabytes", type=float, nargs="*", default=[50.0, 200.0])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--skip-legacy", action="store_true", help="Do not run the in-memory analysis")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for megabytes in args.megabytes:
+            path = Path(tmp) / f"session_{int(megabytes)}mb.csv"
+            rows = write_log(path, megabytes)
+            size_mb = path.stat().st_size / 1024 / 1024
+            result = {"megabytes": round(size_mb, 1), "rows": rows, "streaming": measure("streaming", path, args.workers)}
+            if not args.skip_legacy:
+                result["legacy"] = measure("legacy", path)
+            results.append(result)
+
+            line = (
+                f"{size_mb:>8.0f} MB ({rows} rows) | streaming {result['streaming']['seconds']:.1f} s, "
+                f"peak {result['streaming']['peak_rss_mb']:.0f} MB RSS"
+            )
+            if "legacy" in result:
+                line += f" | legacy {result['legacy']['seconds']:.1f} s, peak {result['legacy']['peak_rss_mb']:.0f} MB RSS"
+            print(line)
+            path.unlink()
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
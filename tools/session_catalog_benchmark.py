@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Session Catalog Benchmark
+
+Measures SessionManager update and query latency as the archive grows, to
+check that ending a lap or listing a track's sessions does not slow down
+with the number of stored sessions.
+
+Usage:
+    python tools/session_catalog_benchmark.py
+    python tools/session_catalog_benchmark.py --sizes 100 1000 10000 100000 --json bench.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.session_manager import SessionManager, SessionMetadata
+
+TRACKS = ["Laguna Seca", "Road Atlanta", "Sebring", "VIR", "Watkins Glen", "COTA", "Thunderhill", "Buttonwillow"]
+VEHICLES = ["Mustang GT", "Corvette Z06", "Miata", "GT3 RS", "Civic Type R"]
+
+
+def populate(manager: SessionManager, count: int, batch: int = 10_000) -> None:
+    rng = random.Random(1)
+    base = time.time() - count * 3600
+    for start in range(0, count, batch):
+        manager.save_sessions(
+            SessionMetadata(
+                session_id=f"bench_{i}",
+                name=f"Session {i}",
+                start_time=base + i * 3600,
+                end_time=base + i * 3600 + 1800,
+                track_name=rng.choice(TRACKS),
+                vehicle_config={"name": rng.choice(VEHICLES)},
+                tags=rng.sample(["practice", "race", "qualifying", "test", "wet"], 2),
+                lap_count=rng.randint(1, 30),
+                best_lap_time=rng.uniform(80, 140),
+            )
+            for i in range(start, min(start + batch, count))
+        )
+
+
+def median_ms(func: Callable[[], object], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return round(statistics.median(timings), 3)
+
+
+def run(size: int, repeats: int) -> Dict[str, float]:
+    rng = random.Random(2)
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SessionManager(tmp)
+        start = time.perf_counter()
+        populate(manager, size)
+        populate_s = time.perf_counter() - start
+
+        mid = manager.list_sessions(limit=1, offset=size // 2)[0].start_time
+        result = {
+            "sessions": size,
+            "populate_s": round(populate_s, 2),
+            "update_ms": median_ms(
+                lambda: manager.update_session(f"bench_{rng.randrange(size)}", lap_count=rng.randint(1, 50)),
+                repeats,
+            ),
+            "get_ms": median_ms(lambda: manager.get_session(f"bench_{rng.randrange(size)}"), repeats),
+            "list_track_ms": median_ms(lambda: manager.list_sessions(track_name=rng.choice(TRACKS), limit=50), repeats),
+            "list_vehicle_ms": median_ms(lambda: manager.list_sessions(vehicle=rng.choice(VEHICLES), limit=50), repeats),
+            "list_date_range_ms": median_ms(
+                lambda: manager.list_sessions(start_date=mid, end_date=mid + 7 * 86400, limit=50), repeats,
+            ),
+            "best_laps_ms": median_ms(lambda: manager.best_sessions(rng.choice(TRACKS), limit=10), repeats),
+        }
+        manager.close()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the session catalog")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    results: List[Dict[str, float]] = []
+    for size in args.sizes:
+        result = run(size, args.repeats)
+        results.append(result)
+        print(
+            f"{size:>7} sessions | update {result['update_ms']:.3f} ms | get {result['get_ms']:.3f} ms | "
+            f"track {result['list_track_ms']:.3f} ms | vehicle {result['list_vehicle_ms']:.3f} ms | "
+            f"dates {result['list_date_range_ms']:.3f} ms | best laps {result['best_laps_ms']:.3f} ms"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
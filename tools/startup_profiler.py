@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Startup Import Profiler
+
+Measures how long it takes to import an entry point (``main.py``,
+``start_ai_tuner.py``, a package, ...) in a fresh interpreter and writes a
+per-module JSON report built from CPython's ``-X importtime`` output.
+
+Usage:
+    python tools/startup_profiler.py start_ai_tuner.py
+    python tools/startup_profiler.py "services:DataLogger" --top 30 --output startup_report.json
+
+Targets may be a script path (imported as a module, ``__main__`` is not run),
+a dotted module name, or ``module:attribute`` to profile ``from module import
+attribute``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Dependencies that should never be loaded just to start the app
+HEAVY_MODULES = ("cv2", "sklearn", "torch", "tensorflow", "pandas", "scipy", "transformers", "chromadb")
+
+
+@dataclass
+class ModuleImport:
+    """One row of ``-X importtime`` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupReport:
+    """Result of profiling one import target."""
+
+    target: str
+    statement: str
+    wall_s: float
+    returncode: int
+    modules: List[ModuleImport]
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    @property
+    def module_names(self) -> List[str]:
+        return [m.module for m in self.modules]
+
+    def heavy_modules(self, candidates: Sequence[str] = HEAVY_MODULES) -> List[str]:
+        """Top-level heavy packages that were imported."""
+        loaded = {m.module.split(".")[0] for m in self.modules}
+        return [name for name in candidates if name in loaded]
+
+    def top(self, n: int = 20, key: str = "self_us") -> List[ModuleImport]:
+        return sorted(self.modules, key=lambda m: getattr(m, key), reverse=True)[:n]
+
+    def by_package(self) -> Dict[str, int]:
+        """Self import time (us) summed per top-level package, largest first."""
+        totals: Dict[str, int] = {}
+        for m in self.modules:
+            root = m.module.split(".")[0]
+            totals[root] = totals.get(root, 0) + m.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def to_dict(self, top: Optional[int] = None) -> Dict:
+        modules = self.top(top) if top else sorted(self.modules, key=lambda m: m.cumulative_us, reverse=True)
+        return {
+            "target": self.target,
+            "statement": self.statement,
+            "ok": self.ok,
+            "error": self.error,
+            "wall_s": round(self.wall_s, 4),
+            "module_count": len(self.modules),
+            "total_self_us": sum(m.self_us for m in self.modules),
+            "heavy_modules": self.heavy_modules(),
+            "packages_us": self.by_package(),
+            "modules": [asdict(m) for m in modules],
+        }
+
+
+def import_statement(target: str) -> str:
+    """Python statement that imports ``target`` (see module docstring)."""
+    if target.endswith(".py"):
+        path = Path(target)
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        parts = list(path.resolve().relative_to(PROJECT_ROOT).with_suffix("").parts)
+        return f"import {'.'.join(parts)}"
+    if ":" in target:
+        module, attribute = target.split(":", 1)
+        return f"from {module} import {attribute}"
+    return f"import {target}"
+
+
+def parse_importtime(stderr: str) -> List[ModuleImport]:
+    """Parse ``-X importtime`` lines; other stderr output is ignored."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append(ModuleImport(
+                module=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(name.lstrip(" ")) - 1) // 2,
+            ))
+        except ValueError:
+            continue  # Header line
+    return rows
+
+
+def profile_import(target: str, cwd: Optional[Path] = None, timeout: float = 120.0) -> StartupReport:
+    """
+    Import ``target`` in a fresh interpreter and collect per-module timings.
+
+    Args:
+        target: Script path, module name or ``module:attribute``
+        cwd: Working directory for the child (entry points may create log dirs)
+        timeout: Seconds before the child is killed
+    """
+    statement = import_statement(target)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=str(cwd or PROJECT_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    wall = time.perf_counter() - start
+
+    error = ""
+    if proc.returncode != 0:
+        lines = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        error = lines[-1] if lines else f"exit code {proc.returncode}"
+    return StartupReport(
+        target=target,
+        statement=statement,
+        wall_s=wall,
+        returncode=proc.returncode,
+        modules=parse_importtime(proc.stderr),
+        error=error,
+    )
+
+
+def write_report(reports: Sequence[StartupReport], output: Path, top: Optional[int] = None) -> None:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "reports": [r.to_dict(top=top) for r in reports],
+    }
+    output.write_text(json.dumps(payload, indent=2))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile application import time")
+    parser.add_argument("targets", nargs="*", default=["start_ai_tuner.py", "main.py"])
+    parser.add_argument("--output", type=Path, default=Path("startup_import_report.json"))
+    parser.add_argument("--top", type=int, default=None, help="Keep only the N slowest modules per target")
+    args = parser.parse_args()
+
+    reports = []
+    for target in args.targets:
+        report = profile_import(target)
+        reports.append(report)
+        status = "ok" if report.ok else f"FAILED ({report.error})"
+        print(f"{target}: {report.wall_s:.3f}s, {len(report.modules)} modules, {status}")
+        heavy = report.heavy_modules()
+        if heavy:
+            print(f"  heavy dependencies: {', '.join(heavy)}")
+        for m in report.top(10):
+            print(f"  {m.self_us / 1000:8.1f} ms  {m.module}")
+
+    write_report(reports, args.output, top=args.top)
+    print(f"\nReport saved to: {args.output}")
+    return 0 if all(r.ok for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Telemetry Panel CPU Benchmark
+
+Feeds TelemetryPanel synthetic telemetry at a fixed rate and reports the
+process CPU usage, so the live-plot cost can be measured on the target
+hardware (e.g. Raspberry Pi 5).
+
+Usage:
+    python tools/telemetry_panel_cpu_benchmark.py --rate 100 --fps 30 --seconds 20
+    python tools/telemetry_panel_cpu_benchmark.py --offscreen --history 2000
+
+Compare runs by varying --rate with --fps fixed: with the ring-buffer
+backend, CPU should track the refresh rate, not the data rate.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure TelemetryPanel CPU usage")
+    parser.add_argument("--rate", type=float, default=100.0, help="Telemetry samples per second")
+    parser.add_argument("--fps", type=int, default=30, help="Plot refresh rate")
+    parser.add_argument("--history", type=int, default=400, help="Samples kept per channel")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Measurement duration")
+    parser.add_argument("--offscreen", action="store_true", help="Use the offscreen Qt platform")
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    args = parser.parse_args()
+
+    if args.offscreen:
+        os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+
+    from ui.telemetry_panel import TelemetryPanel
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    panel = TelemetryPanel(max_len=args.history, refresh_fps=args.fps)
+    panel.resize(1024, 450)
+    panel.show()
+
+    state = {"n": 0}
+
+    def feed() -> None:
+        n = state["n"]
+        t = n / args.rate
+        panel.update_data({
+            "RPM": 3000 + 2500 * math.sin(t),
+            "Speed": 80 + 40 * math.sin(t / 3),
+            "Throttle": 50 + 50 * math.sin(t * 2),
+            "Boost_Pressure": 10 + 8 * math.sin(t),
+            "CoolantTemp": 90.0,
+            "Oil_Pressure": 55.0,
+            "Brake_Pressure": max(0.0, 40 * math.sin(t / 2)),
+            "Battery_Voltage": 13.8,
+            "GForce_Lateral": math.sin(t * 1.5),
+            "GForce_Longitudinal": math.cos(t * 1.5) * 0.6,
+            "GPS_Speed": 22.0,
+            "GPS_Heading": (t * 10) % 360,
+            "GPS_Altitude": 120.0,
+        })
+        state["n"] = n + 1
+
+    feeder = QTimer()
+    feeder.setInterval(max(1, int(1000 / args.rate)))
+    feeder.timeout.connect(feed)
+
+    measured = {}
+
+    def start_measuring() -> None:
+        measured["samples"] = state["n"]
+        measured["cpu"] = time.process_time()
+        measured["wall"] = time.monotonic()
+
+    def stop_measuring() -> None:
+        measured["wall"] = time.monotonic() - measured["wall"]
+        measured["cpu"] = time.process_time() - measured["cpu"]
+        measured["samples"] = state["n"] - measured["samples"]
+        feeder.stop()
+        app.quit()
+
+    # Warm up for two seconds, then measure inside the normal event loop
+    feeder.start()
+    QTimer.singleShot(2000, start_measuring)
+    QTimer.singleShot(2000 + int(args.seconds * 1000), stop_measuring)
+    app.exec()
+    wall, cpu = measured["wall"], measured["cpu"]
+
+    result = {
+        "data_rate_hz": args.rate,
+        "refresh_fps": args.fps,
+        "history": args.history,
+        "samples": measured["samples"],
+        "wall_s": round(wall, 3),
+        "cpu_s": round(cpu, 3),
+        "cpu_percent": round(100.0 * cpu / wall, 1),
+        "platform": sys.platform,
+        "machine": os.uname().machine if hasattr(os, "uname") else "",
+    }
+    print(json.dumps(result, indent=2))
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
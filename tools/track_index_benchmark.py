@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Track Index Benchmark
+
+Measures nearest-point lookup on a learned racing line with the grid
+spatial index against the previous linear scan, plus track identification
+time with several stored profiles.
+
+Usage:
+    python tools/track_index_benchmark.py
+    python tools/track_index_benchmark.py --points 10000 50000 --tracks 20 --json bench.json
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.track_learning_ai import TrackLearningAI, TrackProfile
+from services.track_spatial_index import EARTH_RADIUS_M
+
+
+def circuit(center_lat: float, center_lon: float, points: int, noise: float = 0.0, seed: int = 0) -> List[Dict[str, float]]:
+    """Wavy closed loop roughly 3.5 km long."""
+    rng = random.Random(seed)
+    trace = []
+    for i in range(points):
+        theta = 2 * math.pi * i / points
+        radius = 1.0 + 0.2 * math.sin(3 * theta)
+        east = 600.0 * radius * math.cos(theta) + rng.gauss(0, noise)
+        north = 350.0 * radius * math.sin(theta) + rng.gauss(0, noise)
+        trace.append({
+            "latitude": center_lat + math.degrees(north / EARTH_RADIUS_M),
+            "longitude": center_lon + math.degrees(east / (EARTH_RADIUS_M * math.cos(math.radians(center_lat)))),
+        })
+    return trace
+
+
+def legacy_nearest(profile: TrackProfile, position) -> int:
+    """The previous get_coaching_for_track scan."""
+    nearest, min_distance = -1, float("inf")
+    for i, point in enumerate(profile.track_points):
+        distance = ((point.latitude - position[0]) ** 2 + (point.longitude - position[1]) ** 2) ** 0.5
+        if distance < min_distance:
+            min_distance, nearest = distance, i
+    return nearest
+
+
+def median_us(func: Callable[[], object], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return round(statistics.median(timings), 1)
+
+
+def run(points: int, tracks: int, repeats: int) -> Dict[str, float]:
+    ai = TrackLearningAI()
+    telemetry = [{"Vehicle_Speed": 60.0, "Throttle_Position": 80.0}] * points
+    for n in range(tracks):
+        ai.learn_from_lap(f"Track {n}", circuit(35.0 + n * 0.1, -120.0, points), telemetry, lap_time=100.0)
+    track_id = next(iter(ai.track_profiles))
+    profile = ai.track_profiles[track_id]
+    index = ai._get_index(profile)
+
+    rng = random.Random(1)
+    queries = [
+        (p.latitude + rng.gauss(0, 5e-5), p.longitude + rng.gauss(0, 5e-5))
+        for p in rng.sample(profile.track_points, min(repeats, points))
+    ]
+    cursor = iter(queries * 2)
+    noisy_lap = circuit(35.0, -120.0, 600, noise=4.0, seed=3)
+
+    return {
+        "points": points,
+        "tracks": tracks,
+        "linear_scan_us": median_us(lambda: legacy_nearest(profile, next(cursor)), len(queries) // 4 or 1),
+        "index_nearest_us": median_us(lambda: index.nearest_index(*next(cursor)), len(queries) // 4 or 1),
+        "coaching_us": median_us(lambda: ai.get_coaching_for_track(queries[0], track_id), repeats),
+        "locate_us": median_us(lambda: index.locate(*queries[1]), repeats),
+        "identify_ms": round(median_us(lambda: ai.identify_track(noisy_lap), 20) / 1000.0, 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark track spatial index lookups")
+    parser.add_argument("--points", type=int, nargs="*", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--tracks", type=int, default=10, help="Stored track profiles")
+    parser.add_argument("--repeats", type=int, default=400)
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for points in args.points:
+        result = run(points, args.tracks, args.repeats)
+        results.append(result)
+        print(
+            f"{points:>6} points | linear {result['linear_scan_us']:.0f} us | index {result['index_nearest_us']:.1f} us | "
+            f"coaching {result['coaching_us']:.1f} us | locate {result['locate_us']:.1f} us | "
+            f"identify ({args.tracks} tracks) {result['identify_ms']:.2f} ms"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tune Map Database Benchmark
+
+Generates a library of tunes with small and large map tables and measures,
+each in a fresh child process: startup with an up-to-date metadata index,
+peak RSS, a search and a get_tune call, against loading every tune file in
+full (the previous startup). The first (index-building) startup is timed
+once per library.
+
+Usage:
+    python tools/tune_map_database_benchmark.py
+    python tools/tune_map_database_benchmark.py --tunes 10000 --table-sizes 4 32 --json bench.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.tune_map_database import (
+    MapCategory,
+    PerformanceGains,
+    TuneMap,
+    TuneMapDatabase,
+    TuneType,
+    TuningMap,
+    VehicleIdentifier,
+)
+
+MAKES = {"Honda": ["Civic", "S2000"], "Toyota": ["Supra", "GR86"], "Subaru": ["WRX", "BRZ"], "Ford": ["Mustang", "Focus RS"]}
+ECUS = ["Haltech", "AEM", "Holley", "MoTeC", "Link"]
+CATEGORIES = [MapCategory.FUEL_MAP, MapCategory.IGNITION_TIMING, MapCategory.BOOST_CONTROL, MapCategory.IDLE_CONTROL]
+
+
+def generate_library(path: Path, tunes: int, table_size: int, seed: int = 0) -> int:
+    """Write ``tunes`` tune files with ``table_size`` x ``table_size`` maps; returns total bytes."""
+    rng = random.Random(seed)
+    tunes_dir = path / "tunes"
+    tunes_dir.mkdir(parents=True)
+    total = 0
+    for i in range(tunes):
+        make = rng.choice(list(MAKES))
+        tune = TuneMap(
+            tune_id=f"tune_{i:05d}",
+            name=f"{make} stage {i % 3 + 1}",
+            description="Generated benchmark tune",
+            tune_type=rng.choice(list(TuneType)),
+            vehicle=VehicleIdentifier(make=make, model=rng.choice(MAKES[make]), year=rng.randint(2005, 2024)),
+            ecu_type=rng.choice(ECUS),
+            maps=[
+                TuningMap(category, category.value, "", {"table": [[round(rng.uniform(0, 100), 2)] * table_size] * table_size})
+                for category in CATEGORIES
+            ],
+            performance_gains=PerformanceGains(hp_gain=rng.randint(0, 150)),
+            tags=rng.sample(["street", "race", "e85", "drift", "economy"], 2),
+        )
+        text = json.dumps(tune.to_dict())
+        (tunes_dir / f"{tune.tune_id}.json").write_text(text)
+        total += len(text)
+    return total
+
+
+def legacy_load(path: Path) -> int:
+    """The previous startup: every tune file parsed in full and kept in memory."""
+    tunes = {}
+    for tune_file in (path / "tunes").glob("*.json"):
+        with open(tune_file) as f:
+            tune = TuneMap.from_dict(json.load(f))
+        tunes[tune.tune_id] = tune
+    return len(tunes)
+
+
+def _child(mode: str, path: str, queue) -> None:
+    result = {}
+    start = time.perf_counter()
+    if mode == "legacy":
+        legacy_load(Path(path))
+        result["startup_s"] = time.perf_counter() - start
+    else:
+        db = TuneMapDatabase(storage_path=Path(path))
+        result["startup_s"] = time.perf_counter() - start
+        start = time.perf_counter()
+        found = db.search_tunes(make="honda", ecu_type="haltech", min_hp_gain=50)
+        result["search_ms"] = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        db.get_tune(found[0].tune_id)
+        result["get_tune_ms"] = (time.perf_counter() - start) * 1000
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0  # KiB on Linux
+    queue.put(result)
+
+
+def measure(mode: str, path: Path) -> Dict[str, float]:
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_child, args=(mode, str(path), queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return {key: round(value, 2) for key, value in result.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark tune database startup and search")
+    parser.add_argument("--tunes", type=int, default=10_000)
+    parser.add_argument("--table-sizes", type=int, nargs="*", default=[4, 32], help="Map table rows/columns")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for table_size in args.table_sizes:
+        tmp = Path(tempfile.mkdtemp())
+        try:
+            library_mb = generate_library(tmp, args.tunes, table_size) / 1024 / 1024
+            first = measure("index", tmp)  # Builds the index
+            result = {
+                "tunes": args.tunes,
+                "table_size": table_size,
+                "library_mb": round(library_mb, 1),
+                "index_build_s": first["startup_s"],
+                "indexed": measure("index", tmp),
+                "legacy": measure("legacy", tmp),
+            }
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        results.append(result)
+
+        indexed, legacy = result["indexed"], result["legacy"]
+        print(
+            f"{args.tunes} tunes, {table_size}x{table_size} tables ({library_mb:.0f} MB) | index build "
+            f"{result['index_build_s']:.1f} s\n"
+            f"  indexed startup {indexed['startup_s']:.2f} s, peak {indexed['peak_rss_mb']:.0f} MB RSS, "
+            f"search {indexed['search_ms']:.1f} ms, get_tune {indexed['get_tune_ms']:.1f} ms\n"
+            f"  full-load startup {legacy['startup_s']:.2f} s, peak {legacy['peak_rss_mb']:.0f} MB RSS"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,23 +4,21 @@ UI Toolkit – modular PySide6 widgets for AI Tuner
 =========================================================
 Everything in this namespace is designed to be composable Qt widgets so you can mix,
 match, or embed them elsewhere without rewriting glue code.
+
+Widgets are imported on first access, so importing one widget module does not
+pull in every other widget and its dependencies.
 """
 
-from .ai_insight_panel import AIInsightPanel
-from .dragy_view import DragyPerformanceView, DragyView
-from .fault_panel import FaultPanel
-from .health_score_widget import HealthScoreWidget
-from .settings_dialog import SettingsDialog
-from .status_bar import StatusBar
-from .telemetry_panel import TelemetryPanel
+from core.lazy_imports import lazy_exports
+
+_EXPORTS = {
+    ".ai_insight_panel": ("AIInsightPanel",),
+    ".dragy_view": ("DragyPerformanceView", "DragyView"),
+    ".fault_panel": ("FaultPanel",),
+    ".health_score_widget": ("HealthScoreWidget",),
+    ".settings_dialog": ("SettingsDialog",),
+    ".status_bar": ("StatusBar",),
+    ".telemetry_panel": ("TelemetryPanel",),
+}
 
-__all__ = [
-    "AIInsightPanel",
-    "DragyPerformanceView",
-    "DragyView",
-    "FaultPanel",
-    "HealthScoreWidget",
-    "SettingsDialog",
-    "StatusBar",
-    "TelemetryPanel",
-]
+__getattr__, __dir__, __all__ = lazy_exports(__name__, globals(), _EXPORTS)
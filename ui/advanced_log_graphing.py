@@ -11,8 +11,9 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from PySide6.QtCore import Qt, QPointF, QRectF, Signal, QObject
-from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QFont, QFontMetrics
+from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QFont, QFontMetrics, QPolygonF
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QComboBox,
     QLabel, QSlider, QSpinBox, QDoubleSpinBox, QCheckBox,
@@ -21,6 +22,7 @@ from PySide6.QtWidgets import (
     QScrollArea, QFormLayout,
 )
 
+from services.log_decimation import finite_runs
 from services.multi_log_comparison import MultiLogComparison, AlignmentMethod
 from services.universal_log_parser import UniversalLogParser
 
@@ -252,48 +254,74 @@ class AdvancedLogGraphWidget(QWidget):
         if not self.comparison.logs:
             return
         
+        x_span = (self.x_max - self.x_min) or 1.0
+        y_span = (self.y_max - self.y_min) or 1.0
+        x_scale = rect.width() / x_span
+        y_scale = rect.height() / y_span
+        pixel_width = max(1, int(rect.width()))
+        log_lookup = {log.name: log for log in self.comparison.logs}
+        
         # Draw each visible channel
         for channel_name, channel_config in self.channels.items():
             if not channel_config.visible:
                 continue
             
-            # Get aligned data for this channel
-            aligned_data = self.comparison.get_aligned_data(channel_name)
-            
-            if not aligned_data:
-                continue
+            # Decimated to the plot width - size is independent of log length
+            decimated = self.comparison.get_decimated_data(
+                channel_name, self.x_min, self.x_max, pixel_width
+            )
             
             # Draw each log's data
-            for log_name, data_points in aligned_data.items():
-                if not data_points:
+            for log_name, (xs, lower, upper) in decimated.items():
+                if len(xs) < 2:
                     continue
                 
                 # Find log color
-                log = next((l for l in self.comparison.logs if l.name == log_name), None)
+                log = log_lookup.get(log_name)
                 if not log or not log.visible:
                     continue
                 
                 color = QColor(channel_config.color if channel_config.color else log.color)
-                pen = QPen(color, channel_config.line_width)
-                painter.setPen(pen)
                 
-                # Draw line
-                points = []
-                for time, value in data_points:
-                    # Map to screen coordinates
-                    x = rect.left() + ((time - self.x_min) / (self.x_max - self.x_min)) * rect.width()
-                    y = rect.bottom() - ((value - self.y_min) / (self.y_max - self.y_min)) * rect.height()
-                    
-                    # Clamp to graph area
-                    x = max(rect.left(), min(rect.right(), x))
-                    y = max(rect.top(), min(rect.bottom(), y))
-                    
-                    points.append(QPointF(x, y))
+                # Map to screen coordinates and clamp to graph area
+                sx = np.clip(rect.left() + (xs - self.x_min) * x_scale, rect.left(), rect.right())
+                sy_upper = np.clip(rect.bottom() - (upper - self.y_min) * y_scale, rect.top(), rect.bottom())
                 
-                # Draw polyline
-                if len(points) > 1:
-                    for i in range(len(points) - 1):
-                        painter.drawLine(points[i], points[i + 1])
+                # Missing samples (and all-missing buckets) break the line or band
+                runs = finite_runs(xs, lower, upper)
+                
+                if lower is upper:
+                    # Raw samples: a polyline per run with the configured pen
+                    painter.setPen(QPen(color, channel_config.line_width))
+                    painter.setBrush(Qt.NoBrush)
+                    for run in runs:
+                        polygon = self._to_polygon(sx[run], sy_upper[run])
+                        if len(polygon) > 1:
+                            painter.drawPolyline(polygon)
+                        else:
+                            painter.drawPoints(polygon)
+                else:
+                    # Decimated: one filled min/max band, about one bucket per
+                    # pixel column. A wide or antialiased pen on this shape is far
+                    # too slow to stroke, so it is drawn aliased with a 1px outline.
+                    sy_lower = np.clip(rect.bottom() - (lower - self.y_min) * y_scale, rect.top(), rect.bottom())
+                    band_pen = QPen(color, 1.0)
+                    band_pen.setCosmetic(True)
+                    painter.setPen(band_pen)
+                    painter.setBrush(QBrush(color))
+                    painter.setRenderHint(QPainter.Antialiasing, False)
+                    for run in runs:
+                        painter.drawPolygon(self._to_polygon(
+                            np.concatenate((sx[run], sx[run][::-1])),
+                            np.concatenate((sy_upper[run], sy_lower[run][::-1])),
+                        ))
+                    painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setBrush(Qt.NoBrush)
+    
+    @staticmethod
+    def _to_polygon(xs: np.ndarray, ys: np.ndarray) -> QPolygonF:
+        """Build a QPolygonF from screen coordinate arrays."""
+        return QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())])
     
     def _draw_cursor(self, painter: QPainter, rect: QRectF) -> None:
         """Draw cursor line."""
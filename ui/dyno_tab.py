@@ -686,35 +686,37 @@ class DynoTab(QWidget):
         # Get smoothing level from UI
         smoothing_level = self.smoothing_slider.value() if hasattr(self, 'smoothing_slider') else 5
         
-        # Use improved batch calculation method
-        readings = self.virtual_dyno.calculate_horsepower_from_timeseries(
+        # Use improved batch calculation method (columnar; the curve is replaced below)
+        batch = self.virtual_dyno.calculate_horsepower_from_timeseries(
             time_s=time_s,
             speed_mps=speed_mps,
             rpm=rpm_array if rpm_array is not None else None,
             smoothing_level=smoothing_level,
+            record=False,
         )
         
         # Update curve with processed data
-        if self.virtual_dyno.current_curve:
-            self.virtual_dyno.current_curve.readings = readings
-            # Update peak values
-            if readings:
-                hp_values = [r.horsepower_crank for r in readings]
-                torque_values = [r.torque_ftlb for r in readings if r.torque_ftlb is not None]
-                rpm_values = [r.rpm for r in readings if r.rpm is not None]
+        curve = self.virtual_dyno.current_curve
+        if curve:
+            curve.readings = list(batch)
+            # Update peak values from the batch columns
+            if len(batch):
+                hp_values = batch["horsepower_crank"]
+                torque_values = batch["torque_ftlb"]
+                rpm_values = batch["rpm"]
                 
-                if hp_values:
-                    max_idx = np.argmax(hp_values)
-                    self.virtual_dyno.current_curve.peak_hp_crank = hp_values[max_idx]
-                    self.virtual_dyno.current_curve.peak_hp_wheel = readings[max_idx].horsepower_wheel
-                    if rpm_values:
-                        self.virtual_dyno.current_curve.peak_hp_rpm = rpm_values[max_idx]
+                max_idx = int(np.argmax(hp_values))
+                curve.peak_hp_crank = float(hp_values[max_idx])
+                curve.peak_hp_wheel = float(batch["horsepower_wheel"][max_idx])
+                if rpm_values[max_idx] > 0:
+                    curve.peak_hp_rpm = float(rpm_values[max_idx])
                 
-                if torque_values:
-                    max_torque_idx = np.argmax(torque_values)
-                    self.virtual_dyno.current_curve.peak_torque_ftlb = torque_values[max_torque_idx]
-                    if rpm_values:
-                        self.virtual_dyno.current_curve.peak_torque_rpm = rpm_values[max_torque_idx]
+                valid_torque = np.isfinite(torque_values) & (torque_values != 0)
+                if valid_torque.any():
+                    max_torque_idx = int(np.argmax(np.where(valid_torque, torque_values, -np.inf)))
+                    curve.peak_torque_ftlb = float(torque_values[max_torque_idx])
+                    if rpm_values[max_torque_idx] > 0:
+                        curve.peak_torque_rpm = float(rpm_values[max_torque_idx])
         
         # Update UI
         if hasattr(self, 'dyno_view') and self.dyno_view:
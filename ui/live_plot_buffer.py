@@ -0,0 +1,152 @@
+"""
+Live Plot Buffer
+
+Preallocated ring storage for live telemetry charts. All channels share one
+NumPy matrix (channels x 2*history). Every sample is written twice, at ``i``
+and ``i + history``, so the most recent ``history`` samples are always one
+contiguous slice and can be handed to the plotting library as a view without
+copying or rolling the array.
+
+Channel names are resolved to incoming data keys once and cached per column;
+the cache is only re-resolved when a cached key disappears from the data.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+AliasSpec = Union[str, Sequence[str]]
+
+
+class LivePlotBuffer:
+    """Fixed-size multi-channel ring buffer with zero-copy views."""
+
+    def __init__(
+        self,
+        channels: Sequence[str],
+        history: int = 400,
+        aliases: Optional[Mapping[str, AliasSpec]] = None,
+        missing_value: float = 0.0,
+    ) -> None:
+        """
+        Args:
+            channels: Channel names, one matrix row each
+            history: Number of samples kept per channel
+            aliases: Alternative data keys per channel, tried after the channel name
+            missing_value: Value recorded when no key for a channel is present
+        """
+        if history < 1:
+            raise ValueError("history must be at least 1")
+        self.channels: Tuple[str, ...] = tuple(channels)
+        self.history = int(history)
+        self.missing_value = float(missing_value)
+        self.columns: Dict[str, int] = {name: i for i, name in enumerate(self.channels)}
+
+        self._values = np.zeros((len(self.channels), 2 * self.history), dtype=np.float64)
+        self._x = np.zeros(2 * self.history, dtype=np.float64)
+        self._row = np.empty(len(self.channels), dtype=np.float64)
+        self._head = 0  # Next write slot in [0, history)
+        self.count = 0  # Valid samples (<= history)
+        self.total = 0  # Samples ever appended
+        self.version = 0  # Bumped on every append; lets readers skip unchanged frames
+
+        # Candidate keys per column, and the key that matched last time
+        aliases = aliases or {}
+        self._candidates: Tuple[Tuple[str, ...], ...] = tuple(
+            self._candidate_keys(name, aliases.get(name)) for name in self.channels
+        )
+        self._resolved: list = [None] * len(self.channels)
+
+    @staticmethod
+    def _candidate_keys(name: str, alias: Optional[AliasSpec]) -> Tuple[str, ...]:
+        keys = [name]
+        if isinstance(alias, str):
+            keys.append(alias)
+        elif alias:
+            keys.extend(alias)
+        return tuple(dict.fromkeys(keys))
+
+    def _resolve(self, column: int, data: Mapping[str, float]) -> Optional[str]:
+        for key in self._candidates[column]:
+            if key in data:
+                self._resolved[column] = key
+                return key
+        self._resolved[column] = None
+        return None
+
+    def append(self, data: Mapping[str, float], x: Optional[float] = None) -> int:
+        """
+        Record one sample for every channel.
+
+        Args:
+            data: Incoming telemetry mapping
+            x: X value for the sample (defaults to the running sample number)
+
+        Returns:
+            Number of channels that found a value in ``data``
+        """
+        row = self._row
+        resolved = self._resolved
+        found = 0
+        for column in range(len(self.channels)):
+            key = resolved[column]
+            if key is None or key not in data:
+                key = self._resolve(column, data)
+            if key is None:
+                row[column] = self.missing_value
+                continue
+            try:
+                row[column] = float(data[key])
+                found += 1
+            except (TypeError, ValueError):
+                row[column] = self.missing_value
+
+        self.total += 1
+        head = self._head
+        mirror = head + self.history
+        self._values[:, head] = row
+        self._values[:, mirror] = row
+        self._x[head] = self._x[mirror] = self.total if x is None else x
+        self._head = (head + 1) % self.history
+        if self.count < self.history:
+            self.count += 1
+        self.version += 1
+        return found
+
+    def _window(self) -> slice:
+        end = self._head + self.history
+        return slice(end - self.count, end)
+
+    def x_view(self) -> np.ndarray:
+        """Oldest-to-newest x values (read-only view)."""
+        view = self._x[self._window()]
+        view.flags.writeable = False
+        return view
+
+    def view(self, channel: str) -> np.ndarray:
+        """Oldest-to-newest values of one channel (read-only view)."""
+        view = self._values[self.columns[channel], self._window()]
+        view.flags.writeable = False
+        return view
+
+    def views(self, channels: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Views for several channels at once."""
+        names = self.channels if channels is None else channels
+        return {name: self.view(name) for name in names}
+
+    def latest(self, channel: str) -> Optional[float]:
+        """Most recent value of a channel, or None if empty."""
+        if not self.count:
+            return None
+        return float(self._values[self.columns[channel], (self._head - 1) % self.history])
+
+    def clear(self) -> None:
+        """Forget all samples (storage is kept)."""
+        self._head = 0
+        self.count = 0
+        self.version += 1
+
+
+__all__ = ["LivePlotBuffer"]
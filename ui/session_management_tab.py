@@ -426,19 +426,18 @@ class SessionManagementTab(QWidget):
         search_text = self.search_edit.text().lower()
         track_filter = self.track_filter.currentText()
         
-        # Get sessions
-        sessions = self.session_manager.list_sessions()
+        # Get sessions (track filter is an indexed catalog query)
+        sessions = self.session_manager.list_sessions(
+            track_name=track_filter if track_filter and track_filter != "All Tracks" else None
+        )
         
         # Filter
-        if track_filter != "All Tracks":
-            sessions = [s for s in sessions if s.track_name == track_filter]
-            
         if search_text:
             sessions = [s for s in sessions if search_text in s.name.lower() or 
                        (s.track_name and search_text in s.track_name.lower())]
         
         # Update track filter
-        tracks = set(s.track_name for s in self.session_manager.list_sessions() if s.track_name)
+        tracks = self.session_manager.list_tracks()
         current_track = self.track_filter.currentText()
         self.track_filter.clear()
         self.track_filter.addItem("All Tracks")
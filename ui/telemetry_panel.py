@@ -6,12 +6,13 @@ Telemetry Panel – neon graphs for the car's vital signs
 =========================================================
 """
 
-from collections import deque
 from typing import Dict, Mapping
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget, QHBoxLayout, QSizePolicy
 
+from ui.live_plot_buffer import LivePlotBuffer
+
 try:
     import pyqtgraph as pg
 except Exception:  # pragma: no cover - optional dependency
@@ -49,8 +50,21 @@ class TelemetryPanel(QWidget):
         "GPS_Heading": "#3b82f6",
         "GPS_Altitude": "#8b5cf6",
     }
+    # Accept CamelCase fallback keys for compatibility
+    CHANNEL_ALIASES = {
+        "Boost": "Boost_Pressure",
+        "OilPressure": "Oil_Pressure",
+        "BrakePressure": "Brake_Pressure",
+        "BatteryVoltage": "Battery_Voltage",
+        "GForce_Lateral": ("GForce_Lateral", "LatG", "GForce_X", "Lateral_G"),
+        "GForce_Longitudinal": ("GForce_Longitudinal", "LongG", "GForce_Y", "Longitudinal_G"),
+        "GPS_Speed": ("GPS_Speed", "gps_speed", "GPS_Speed_mps", "speed_mps", "KF_Speed"),
+        "GPS_Heading": ("GPS_Heading", "gps_heading", "heading", "GPS_Heading_deg", "KF_Heading"),
+        "GPS_Altitude": ("GPS_Altitude", "gps_altitude", "altitude_m", "GPS_Altitude_m"),
+    }
+    REFRESH_FPS = 30  # Curve redraw rate, independent of the telemetry rate
 
-    def __init__(self, parent: QWidget | None = None, max_len: int = 400) -> None:
+    def __init__(self, parent: QWidget | None = None, max_len: int = 400, refresh_fps: int = REFRESH_FPS) -> None:
         super().__init__(parent)
         self.max_len = max_len
 
@@ -76,14 +90,15 @@ class TelemetryPanel(QWidget):
 
         self.plots: Dict[str, object] = {}
         self.curves: Dict[str, object] = {}
-        self.data = {
-            **{k: deque(maxlen=self.max_len) for k in self.PRIMARY_CHANNELS},
-            **{k: deque(maxlen=self.max_len) for k in self.SECONDARY_CHANNELS},
-            **{k: deque(maxlen=self.max_len) for k in self.GFORCE_CHANNELS},
-            **{k: deque(maxlen=self.max_len) for k in self.GPS_CHANNELS},
-        }
-        self.xdata = deque(maxlen=self.max_len)
+        self.curve_plots: Dict[str, str] = {}  # channel -> plot key
+        # One preallocated ring matrix for all channels; curves get views into it
+        self.buffer = LivePlotBuffer(
+            self.PRIMARY_CHANNELS + self.SECONDARY_CHANNELS + self.GFORCE_CHANNELS + self.GPS_CHANNELS,
+            history=self.max_len,
+            aliases=self.CHANNEL_ALIASES,
+        )
         self.counter = 0
+        self._drawn_version = -1
 
         if pg:
             # Use light theme for graphs to match main UI
@@ -145,21 +160,31 @@ class TelemetryPanel(QWidget):
                     pen=pg.mkPen(self.CHANNEL_COLORS.get(channel, "#3498db"), width=2),
                     name=channel,
                 )
+                self.curve_plots[channel] = "primary"
             for channel in self.SECONDARY_CHANNELS:
                 self.curves[channel] = self.plots["secondary"].plot(
                     pen=pg.mkPen(self.CHANNEL_COLORS.get(channel, "#3498db"), width=2),
                     name=channel,
                 )
+                self.curve_plots[channel] = "secondary"
             for channel in self.GFORCE_CHANNELS:
                 self.curves[channel] = self.plots["gforce"].plot(
                     pen=pg.mkPen(self.CHANNEL_COLORS.get(channel, "#3498db"), width=2),
                     name=channel.replace("_", " "),
                 )
+                self.curve_plots[channel] = "gforce"
             for channel in self.GPS_CHANNELS:
                 self.curves[channel] = self.plots["gps"].plot(
                     pen=pg.mkPen(self.CHANNEL_COLORS.get(channel, "#3498db"), width=2),
                     name=channel.replace("_", " "),
                 )
+                self.curve_plots[channel] = "gps"
+
+            # Redraw on a fixed timer rather than per sample
+            self.refresh_timer = QTimer(self)
+            self.refresh_timer.setInterval(max(1, int(1000 / max(1, refresh_fps))))
+            self.refresh_timer.timeout.connect(self.refresh_plots)
+            self.refresh_timer.start()
 
             print("[VERIFY] Telemetry panel: Multiple plot widgets created successfully")
         else:
@@ -234,6 +259,7 @@ class TelemetryPanel(QWidget):
                 plot_item.vb.setLimits(minXRange=10, maxXRange=None, minYRange=10, maxYRange=None)
 
     def update_data(self, data: Mapping[str, float]) -> None:
+        """Record a telemetry sample. Curves are redrawn by refresh_plots()."""
         if not self.curves:
             return
 
@@ -242,9 +268,7 @@ class TelemetryPanel(QWidget):
             print(f"[VERIFY] Telemetry update #{self.counter + 1}: {list(data.keys())[:8]}")
 
         self.counter += 1
-        self.xdata.append(self.counter)
 
-        updated_channels = 0
         # Debug GPS data on first few updates
         if self.counter <= 5:
             gps_keys = [k for k in data.keys() if 'GPS' in k.upper() or 'gps' in k.lower()]
@@ -252,55 +276,39 @@ class TelemetryPanel(QWidget):
                 print(f"[GPS DEBUG] Update #{self.counter}: GPS keys in data: {gps_keys}")
                 for gk in gps_keys:
                     print(f"  {gk} = {data.get(gk, 'N/A')}")
-        
-        for key, curve in self.curves.items():
-            # Accept CamelCase fallback keys for compatibility
-            aliases = {
-                "Boost": "Boost_Pressure",
-                "OilPressure": "Oil_Pressure",
-                "BrakePressure": "Brake_Pressure",
-                "BatteryVoltage": "Battery_Voltage",
-                "GForce_Lateral": ("GForce_Lateral", "LatG", "GForce_X", "Lateral_G"),
-                "GForce_Longitudinal": ("GForce_Longitudinal", "LongG", "GForce_Y", "Longitudinal_G"),
-                "GPS_Speed": ("GPS_Speed", "gps_speed", "GPS_Speed_mps", "speed_mps", "KF_Speed"),
-                "GPS_Heading": ("GPS_Heading", "gps_heading", "heading", "GPS_Heading_deg", "KF_Heading"),
-                "GPS_Altitude": ("GPS_Altitude", "gps_altitude", "altitude_m", "GPS_Altitude_m"),
-            }
-            lookup_key = key
-            # Handle tuple aliases (for G-forces and GPS)
-            if lookup_key in aliases:
-                alias_list = aliases[lookup_key]
-                if isinstance(alias_list, tuple):
-                    # Try each alias in order
-                    for alias in alias_list:
-                        if alias in data:
-                            lookup_key = alias
-                            break
-                elif alias_list in data:
-                    lookup_key = alias_list
-
-            # Try to get value - check both key and lookup_key
-            value = None
-            if key in data:
-                value = float(data[key])
-            elif lookup_key in data:
-                value = float(data[lookup_key])
-            else:
-                value = 0.0
-            
-            if key not in self.data:
-                continue
-            self.data[key].append(value)
-            if curve:
-                curve.setData(self.xdata, list(self.data[key]))
-                updated_channels += 1
-                # Debug GPS channels on first few updates
-                if self.counter <= 5 and key in self.GPS_CHANNELS:
-                    print(f"[GPS DEBUG] Updated {key} curve: value={value}, data_len={len(self.data[key])}")
-
-        if updated_channels == 0 and self.counter > 5:
+
+        found = self.buffer.append(data, x=self.counter)
+        if found == 0 and self.counter > 5:
             print(f"[WARN] No telemetry curves updated. Available keys: {list(data.keys())}")
 
+    def refresh_plots(self) -> int:
+        """
+        Push buffered samples to the visible curves.
+
+        Called by the refresh timer; skips work when nothing new arrived or
+        the panel is hidden. Curves receive views into the ring buffer.
+
+        Returns:
+            Number of curves updated
+        """
+        if not self.curves or self.buffer.version == self._drawn_version:
+            return 0
+        if not self.isVisible():
+            return 0
+
+        x_view = self.buffer.x_view()
+        updated = 0
+        for channel, curve in self.curves.items():
+            plot = self.plots.get(self.curve_plots.get(channel, ""))
+            if plot is not None and not plot.isVisible():
+                continue
+            if not curve.isVisible():
+                continue
+            curve.setData(x_view, self.buffer.view(channel))
+            updated += 1
+        self._drawn_version = self.buffer.version
+        return updated
+
 
 __all__ = ["TelemetryPanel"]
 